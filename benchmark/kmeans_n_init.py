@@ -0,0 +1,107 @@
+from time import perf_counter
+
+import numpy as np
+
+# The number of samples of the default benchmark. The batched runs of the `n_init`
+# initializations are expected to pay off on the smallest sizes only, where the fits
+# are bound by the latency of the kernel launches and of the host synchronizations.
+DEFAULT_N_SAMPLES = (1000, 10_000, 100_000, 1_000_000)
+
+
+def benchmark_n_init(
+    n_samples, n_features, n_clusters, n_init, dtype, device, n_repeats
+):
+    """Time a KMeans fit with `n_init` initializations of the `sklearn_numba_dpex`
+    engine, with the initializations run one after the other and with the
+    initializations run at once by `lloyd_batched` (see `set_kmeans_config`).
+
+    Returns the best wall time of `n_repeats` fits for both strategies, after one
+    warmup fit.
+    """
+    import dpctl.tensor as dpt
+    from sklearn import config_context
+    from sklearn.cluster import KMeans
+
+    from sklearn_numba_dpex import kmeans_config_context
+
+    rng = np.random.default_rng(0)
+    X = dpt.asarray(rng.random((n_samples, n_features), dtype=dtype), device=device)
+
+    kmeans = KMeans(
+        n_clusters=n_clusters, n_init=n_init, max_iter=100, tol=0, random_state=0
+    )
+
+    timings = []
+    for batched_n_init in (False, True):
+        with config_context(engine_provider="sklearn_numba_dpex"), (
+            kmeans_config_context(batched_n_init=batched_n_init)
+        ):
+            kmeans.fit(X)
+            best_time = np.inf
+            for _ in range(n_repeats):
+                start = perf_counter()
+                kmeans.fit(X)
+                best_time = min(best_time, perf_counter() - start)
+        timings.append(best_time)
+
+    return tuple(timings)
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    import dpctl
+
+    argparser = ArgumentParser(
+        description=(
+            "Compare the KMeans fits with n_init initializations of sklearn_numba_dpex "
+            "when the initializations are run one after the other and when they are "
+            "run at once in a single batched pass on the data, for several numbers of "
+            "samples. The results are used to choose the default of the "
+            "batched_n_init option of set_kmeans_config."
+        )
+    )
+
+    argparser.add_argument(
+        "--n-samples", nargs="+", default=DEFAULT_N_SAMPLES, type=int
+    )
+
+    argparser.add_argument("--n-features", default=14, type=int)
+
+    argparser.add_argument("--n-clusters", default=127, type=int)
+
+    argparser.add_argument("--n-init", default=10, type=int)
+
+    argparser.add_argument("--dtype", default="float32", choices=["float32", "float64"])
+
+    argparser.add_argument(
+        "--device", default=None, help="Filter string of the device, e.g. 'gpu'."
+    )
+
+    argparser.add_argument("--n-repeats", default=3, type=int)
+
+    args = argparser.parse_args()
+
+    device = dpctl.SyclDevice(args.device) if args.device else dpctl.SyclDevice()
+    dtype = np.dtype(args.dtype).type
+
+    print(
+        f"Running KMeans n_init={args.n_init} benchmark on device {device.name} with "
+        f"n_features={args.n_features}, n_clusters={args.n_clusters} and dtype "
+        f"{args.dtype}...\n"
+    )
+    print(f"{'n_samples':>10} {'sequential (s)':>15} {'batched (s)':>12} {'ratio':>7}")
+    for n_samples in args.n_samples:
+        sequential_time, batched_time = benchmark_n_init(
+            n_samples,
+            args.n_features,
+            args.n_clusters,
+            args.n_init,
+            dtype,
+            device,
+            args.n_repeats,
+        )
+        print(
+            f"{n_samples:>10} {sequential_time:>15.4f} {batched_time:>12.4f} "
+            f"{batched_time / sequential_time:>7.2f}"
+        )
@@ -0,0 +1,172 @@
+from time import perf_counter
+
+import numpy as np
+
+# The shapes `(n_rows_X, n_cols, n_rows_Y_t)` of the default benchmark. They cover the
+# matrix products that are computed for k-means (many samples, few features and
+# centroids) and for the distance computations (many samples on both sides).
+DEFAULT_SHAPES = (
+    (2**16, 14, 127),
+    (2**16, 128, 1024),
+    (2**14, 128, 2**14),
+    (4096, 4096, 4096),
+)
+
+
+def benchmark_matmul(shape, dtype, device, n_repeats, **matmul_parameters):
+    """Time the matmul kernel of `sklearn_numba_dpex` and `dpnp.matmul` on the
+    product of two random matrices of shapes `(n_rows_X, n_cols)` and
+    `(n_cols, n_rows_Y_t)`.
+
+    Returns the best wall time of `n_repeats` runs for both implementations, after one
+    warmup run, and the maximum absolute difference between both results.
+    """
+    import dpctl.tensor as dpt
+    import dpnp
+
+    from sklearn_numba_dpex.common.matmul import make_matmul_2d_kernel
+
+    n_rows_X, n_cols, n_rows_Y_t = shape
+    rng = np.random.default_rng(0)
+    X = rng.random((n_rows_X, n_cols), dtype=dtype)
+    Y_t = rng.random((n_rows_Y_t, n_cols), dtype=dtype)
+
+    X_device = dpt.asarray(X, device=device)
+    Y_t_device = dpt.asarray(Y_t, device=device)
+    result = dpt.empty((n_rows_X, n_rows_Y_t), dtype=dtype, device=device)
+    queue = X_device.sycl_queue
+
+    matmul_2d_kernel = make_matmul_2d_kernel(
+        n_rows_X, n_rows_Y_t, n_cols, dtype, device, **matmul_parameters
+    )
+
+    def run_kernel():
+        matmul_2d_kernel(X_device, Y_t_device, result)
+
+    # NB: `dpnp.matmul` takes `Y` rather than its transpose, it is transposed on
+    # device beforehand so that the copy is not timed.
+    X_dpnp = dpnp.asarray(X_device)
+    Y_dpnp = dpnp.asarray(dpt.asarray(Y_t_device.T, order="C"))
+    dpnp_result = None
+
+    def run_dpnp():
+        nonlocal dpnp_result
+        dpnp_result = dpnp.matmul(X_dpnp, Y_dpnp)
+
+    timings = []
+    for run in (run_kernel, run_dpnp):
+        run()
+        queue.wait()
+        best_time = np.inf
+        for _ in range(n_repeats):
+            start = perf_counter()
+            run()
+            queue.wait()
+            best_time = min(best_time, perf_counter() - start)
+        timings.append(best_time)
+
+    max_abs_diff = np.abs(dpt.asnumpy(result) - dpnp.asnumpy(dpnp_result)).max()
+    return timings[0], timings[1], max_abs_diff
+
+
+def _format_shape(shape):
+    return "x".join(str(dim) for dim in shape)
+
+
+if __name__ == "__main__":
+    from argparse import ArgumentParser
+
+    import dpctl
+
+    argparser = ArgumentParser(
+        description=(
+            "Compare the matmul kernel of sklearn_numba_dpex with dpnp.matmul (that "
+            "calls oneMKL) for several shapes and dtypes. The geometry of the kernel "
+            "is read from the autotuning profile of the device, unless it is passed "
+            "with the options below."
+        )
+    )
+
+    def _parse_shape(shape_str):
+        return tuple(int(dim) for dim in shape_str.split(","))
+
+    argparser.add_argument(
+        "--shapes",
+        nargs="+",
+        default=DEFAULT_SHAPES,
+        type=_parse_shape,
+        help=(
+            "The shapes of the products to benchmark, as n_rows_X,n_cols,n_rows_Y_t "
+            "(e.g. 65536,14,127)."
+        ),
+    )
+
+    argparser.add_argument(
+        "--dtypes",
+        nargs="+",
+        default=["float32", "float64"],
+        choices=["float32", "float64"],
+        help="Floating points precisions.",
+    )
+
+    argparser.add_argument(
+        "--device", default=None, help="Filter string of the device, e.g. 'gpu'."
+    )
+
+    argparser.add_argument("--n-repeats", default=5, type=int)
+
+    argparser.add_argument("--work-group-size", default=None, type=int)
+
+    argparser.add_argument("--sub-group-size", default=None, type=int)
+
+    argparser.add_argument(
+        "--arithmetic-intensity-multiplier",
+        default=None,
+        type=int,
+        help="Used for both arithmetic_intensity_multiplier_X and _Y.",
+    )
+
+    argparser.add_argument(
+        "--double-buffer-local-windows",
+        default=None,
+        choices=["yes", "no"],
+        help="Force double buffering of the windows in shared memory on or off.",
+    )
+
+    args = argparser.parse_args()
+
+    device = dpctl.SyclDevice(args.device) if args.device else dpctl.SyclDevice()
+
+    matmul_parameters = dict(
+        work_group_size=args.work_group_size,
+        sub_group_size=args.sub_group_size,
+        arithmetic_intensity_multiplier_X=args.arithmetic_intensity_multiplier,
+        arithmetic_intensity_multiplier_Y=args.arithmetic_intensity_multiplier,
+    )
+    if args.double_buffer_local_windows is not None:
+        matmul_parameters["double_buffer_local_windows"] = (
+            args.double_buffer_local_windows == "yes"
+        )
+
+    print(f"Running matmul benchmark on device {device.name}...\n")
+    print(
+        f"{'dtype':>8} {'shape':>20} {'kernel (s)':>12} {'dpnp (s)':>12} "
+        f"{'kernel GFLOP/s':>15} {'dpnp GFLOP/s':>13} {'ratio':>7} {'max diff':>10}"
+    )
+    for dtype_name in args.dtypes:
+        dtype = np.dtype(dtype_name).type
+        if dtype is np.float64 and not device.has_aspect_fp64:
+            print(f"Skipping {dtype_name}, not supported by the device.")
+            continue
+
+        for shape in args.shapes:
+            kernel_time, dpnp_time, max_abs_diff = benchmark_matmul(
+                shape, dtype, device, args.n_repeats, **matmul_parameters
+            )
+            n_flops = 2 * shape[0] * shape[1] * shape[2]
+            print(
+                f"{dtype_name:>8} {_format_shape(shape):>20} {kernel_time:>12.4f} "
+                f"{dpnp_time:>12.4f} {n_flops / kernel_time / 1e9:>15.1f} "
+                f"{n_flops / dpnp_time / 1e9:>13.1f} "
+                f"{kernel_time / dpnp_time:>7.2f} {max_abs_diff:>10.2e}"
+            )
@@ -0,0 +1,44 @@
+from ._warmup import warmup
+from .common._kernel_cache import (
+    clear_kernel_cache,
+    kernel_cache_info,
+    set_kernel_cache_maxsize,
+)
+from .common._memory import get_memory_budget, set_memory_budget
+from .kmeans._config import (
+    get_kmeans_config,
+    kmeans_config_context,
+    set_kmeans_config,
+)
+from .kmeans._kmeans_parallel import kmeans_parallel_init
+from .kmeans._memory import plan_kmeans_fit, plan_kmeans_predict
+from .kmeans._streaming import iter_kmeans_predict
+from .neighbors._kneighbors import kneighbors
+
+__all__ = (
+    "warmup",
+    "kernel_cache_info",
+    "clear_kernel_cache",
+    "set_kernel_cache_maxsize",
+    "set_memory_budget",
+    "get_memory_budget",
+    "set_kmeans_config",
+    "get_kmeans_config",
+    "kmeans_config_context",
+    "plan_kmeans_fit",
+    "plan_kmeans_predict",
+    "iter_kmeans_predict",
+    "kmeans_parallel_init",
+    "MiniBatchKMeans",
+    "kneighbors",
+)
+
+
+def __getattr__(name):
+    # NB: `MiniBatchKMeans` subclasses the base classes of scikit-learn, it is imported
+    # lazily so that importing `sklearn_numba_dpex` does not import `sklearn`.
+    if name == "MiniBatchKMeans":
+        from .kmeans._minibatch import MiniBatchKMeans
+
+        return MiniBatchKMeans
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
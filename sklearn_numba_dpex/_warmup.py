@@ -0,0 +1,125 @@
+import time
+
+import dpctl
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache_info
+
+
+def warmup(device=None, dtypes=None, shapes=((1000, 10, 8),)):
+    """Warm up the kernels used by the KMeans engine in the current process.
+
+    The kernels are JIT-compiled the first time they are used with a given set of
+    parameters. `warmup` runs the `k-means++` initialization, the lloyd iterations and
+    the predict routines on random data so that the kernels are compiled before the
+    first actual call in the current process, e.g when a worker of a service starts.
+
+    The compiled kernels are only cached in memory, there is no on-disk cache:
+    `warmup` does not reduce the compilation time after a restart, it only moves it
+    out of the first call, and it must be called again in each new process.
+
+    Parameters
+    ----------
+    device : dpctl.SyclDevice, str or None
+        The device the kernels are compiled for. If None, the default device is used.
+
+    dtypes : sequence of dtype or None
+        The floating point types to compile the kernels for. If None, the kernels are
+        compiled for `float32`, and also for `float64` if the device supports it. All
+        the dtypes are checked before any kernel is compiled.
+
+    shapes : sequence of tuple of int
+        Sequence of `(n_samples, n_features, n_clusters)` triplets. The kernels used
+        for fitting are specialized for all three dimensions, while the kernels used
+        for prediction only depend on `n_features` and `n_clusters`.
+
+    Returns
+    -------
+    report : dict
+        A dict with key `elapsed_time` giving the time in seconds spent in `warmup`,
+        and key `cache_info` that maps the name of each kernel factory that was used to
+        the number of `hits` and `misses` of its cache during `warmup`. A miss
+        corresponds to a kernel that has been compiled.
+    """
+    from sklearn_numba_dpex.common.topk import topk, topk_idx
+    from sklearn_numba_dpex.kmeans.drivers import (
+        get_euclidean_distances,
+        get_labels_inertia,
+        kmeans_plusplus,
+        lloyd,
+        prepare_data_for_lloyd,
+        restore_data_after_lloyd,
+    )
+
+    device = dpctl.SyclDevice(device) if device is not None else dpctl.SyclDevice()
+
+    if dtypes is None:
+        dtypes = [np.float32]
+        if device.has_aspect_fp64:
+            dtypes.append(np.float64)
+
+    dtypes = [np.dtype(dtype).type for dtype in dtypes]
+    if np.float64 in dtypes and not device.has_aspect_fp64:
+        raise ValueError(
+            f"The device {device.name} does not support the float64 data type."
+        )
+
+    cache_info_before = kernel_cache_info()["factories"]
+    start = time.perf_counter()
+
+    rng = np.random.default_rng(0)
+    for dtype in dtypes:
+        for n_samples, n_features, n_clusters in shapes:
+            X_t = dpt.asarray(
+                rng.random((n_features, n_samples), dtype=dtype),
+                order="C",
+                device=device,
+            )
+            sample_weight = dpt.ones(n_samples, dtype=dtype, device=device)
+
+            centers_t, _ = kmeans_plusplus(
+                X_t, sample_weight, n_clusters, random_state=np.random.RandomState(0)
+            )
+
+            (
+                X_t,
+                X_mean,
+                centers_t,
+                tol,
+                sample_weight_is_uniform,
+            ) = prepare_data_for_lloyd(
+                X_t, centers_t, 1e-4, sample_weight, copy_x=False
+            )
+
+            # NB: two iterations are enough to go through all the kernels of the main
+            # loop.
+            _, _, centers_t, _ = lloyd(
+                X_t,
+                sample_weight,
+                centers_t,
+                sample_weight_is_uniform,
+                max_iter=2,
+                tol=tol,
+            )
+
+            restore_data_after_lloyd(X_t, centers_t, X_mean, copy_x=False)
+
+            get_labels_inertia(X_t, centers_t, sample_weight, with_inertia=True)
+            get_euclidean_distances(X_t, centers_t)
+
+            topk(X_t, n_clusters)
+            topk_idx(X_t, n_clusters)
+
+    elapsed_time = time.perf_counter() - start
+    cache_info_after = kernel_cache_info()["factories"]
+
+    cache_info = dict()
+    for factory_name, info_after in cache_info_after.items():
+        info_before = cache_info_before.get(factory_name, dict(hits=0, misses=0))
+        hits = info_after["hits"] - info_before["hits"]
+        misses = info_after["misses"] - info_before["misses"]
+        if hits or misses:
+            cache_info[factory_name] = dict(hits=hits, misses=misses)
+
+    return dict(elapsed_time=elapsed_time, cache_info=cache_info)
@@ -0,0 +1,495 @@
+"""Tune the launch geometry of the kernels for the devices of a machine.
+
+The best `work_group_size`, `sub_group_size` and window geometry of the kernels
+depend on the device, on the dtype and on the shapes of the data. `tune` benchmarks
+candidate geometries and stores the best ones in a profile file for each device,
+that the drivers and the kernel factories consult at runtime. The geometries that
+have not been tuned fall back to hardcoded defaults.
+
+The profiles are stored in the directory given by the environment variable
+`SKLEARN_NUMBA_DPEX_AUTOTUNE_DIR`, or in `~/.cache/sklearn_numba_dpex/autotune` by
+default.
+
+The tuning can be run from the command line::
+
+    python -m sklearn_numba_dpex.autotune --device gpu --dtype float32
+
+Run `python -m sklearn_numba_dpex.autotune --help` for the full list of options.
+"""
+import argparse
+import json
+import math
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+import dpctl
+import numpy as np
+
+_PROFILE_DIR_ENV_VARIABLE = "SKLEARN_NUMBA_DPEX_AUTOTUNE_DIR"
+_PROFILE_FORMAT_VERSION = 1
+
+# The default geometries, that are used when no profile is available. The keys of
+# each dict are the names of the parameters of the corresponding kernel factories.
+DEFAULT_PARAMETERS = dict(
+    lloyd_single_step=dict(sub_group_size=8, work_group_size="max"),
+    label_assignment=dict(sub_group_size=8, work_group_size="max"),
+    matmul_2d=dict(
+        work_group_size=128,
+        sub_group_size=4,
+        arithmetic_intensity_multiplier_X=1,
+        arithmetic_intensity_multiplier_Y=1,
+        double_buffer_local_windows=False,
+    ),
+)
+
+_DEFAULT_SHAPES = (
+    (2**16, 14, 8),
+    (2**16, 14, 127),
+    (2**16, 128, 1024),
+)
+
+_profiles_cache = dict()
+_overridden_parameters = dict()
+_lock = threading.Lock()
+
+
+def get_profile_path(device):
+    """Return the path of the profile file of `device`."""
+    profile_dir = os.getenv(_PROFILE_DIR_ENV_VARIABLE, None)
+    if profile_dir is None:
+        profile_dir = Path.home() / ".cache" / "sklearn_numba_dpex" / "autotune"
+    device_key = "_".join(
+        (device.backend.name, device.name, device.driver_version)
+    ).lower()
+    return Path(profile_dir) / (re.sub(r"[^a-z0-9.]+", "-", device_key) + ".json")
+
+
+def load_profile(device):
+    """Return the profile of `device` as a dict, or None if it has not been tuned."""
+    path = get_profile_path(device)
+    try:
+        mtime = path.stat().st_mtime
+    except FileNotFoundError:
+        return None
+
+    with _lock:
+        cached_mtime, profile = _profiles_cache.get(path, (None, None))
+        if cached_mtime == mtime:
+            return profile
+
+    with open(path) as f:
+        profile = json.load(f)
+
+    if profile.get("version") != _PROFILE_FORMAT_VERSION:
+        return None
+
+    with _lock:
+        _profiles_cache[path] = (mtime, profile)
+    return profile
+
+
+def _save_profile(device, profile):
+    path = get_profile_path(device)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(profile, f, indent=2)
+    with _lock:
+        _profiles_cache[path] = (path.stat().st_mtime, profile)
+    return path
+
+
+def _get_shape_bucket(shape):
+    # NB: the shapes are bucketed by powers of two.
+    return [max(math.ceil(math.log2(max(dim, 1))), 0) for dim in shape]
+
+
+def _format_shape_bucket(shape_bucket):
+    return "x".join(str(2**exponent) for exponent in shape_bucket)
+
+
+def get_tuned_parameters(kernel_name, device, dtype, shape):
+    """Return the geometry to use for the kernel `kernel_name`.
+
+    Parameters
+    ----------
+    kernel_name : str
+        One of the keys of `DEFAULT_PARAMETERS`.
+
+    device : dpctl.SyclDevice
+        The device the kernel runs on.
+
+    dtype : dtype
+        The dtype of the data.
+
+    shape : tuple of int
+        The dimensions of the problem the geometry depends on. If the profile of the
+        device has no entry for the bucket of `shape`, the entry of the closest bucket
+        is used.
+
+    Returns
+    -------
+    parameters : dict
+        The tuned parameters, or the defaults if the kernel has not been tuned for
+        `device` and `dtype`.
+    """
+    parameters = dict(DEFAULT_PARAMETERS[kernel_name])
+
+    if (overridden_parameters := _overridden_parameters.get(kernel_name)) is not None:
+        parameters.update(overridden_parameters)
+        return parameters
+
+    profile = load_profile(device)
+    if profile is None:
+        return parameters
+
+    tuned_buckets = (
+        profile["kernels"].get(kernel_name, dict()).get(np.dtype(dtype).name)
+    )
+    if not tuned_buckets:
+        return parameters
+
+    shape_bucket = _get_shape_bucket(shape)
+    closest_entry = min(
+        tuned_buckets.values(),
+        key=lambda entry: sum(
+            abs(exponent - tuned_exponent)
+            for exponent, tuned_exponent in zip(shape_bucket, entry["shape_bucket"])
+        ),
+    )
+    parameters.update(closest_entry["parameters"])
+    return parameters
+
+
+@contextmanager
+def _override_parameters(kernel_name, parameters):
+    # Force the parameters returned by `get_tuned_parameters`, for benchmarking.
+    _overridden_parameters[kernel_name] = parameters
+    try:
+        yield
+    finally:
+        del _overridden_parameters[kernel_name]
+
+
+def _get_candidates(kernel_name, device):
+    max_work_group_size = device.max_work_group_size
+    work_group_sizes = [
+        2**exponent
+        for exponent in range(5, int(math.log2(max_work_group_size)) + 1)
+        if 2**exponent <= max_work_group_size
+    ]
+
+    if kernel_name in ("lloyd_single_step", "label_assignment"):
+        return [
+            dict(sub_group_size=sub_group_size, work_group_size=work_group_size)
+            for sub_group_size in (4, 8, 16, 32)
+            for work_group_size in work_group_sizes + ["max"]
+            if work_group_size == "max" or sub_group_size < work_group_size
+        ]
+
+    # matmul_2d
+    return [
+        dict(
+            work_group_size=work_group_size,
+            sub_group_size=sub_group_size,
+            arithmetic_intensity_multiplier_X=multiplier,
+            arithmetic_intensity_multiplier_Y=multiplier,
+            double_buffer_local_windows=double_buffer_local_windows,
+        )
+        for work_group_size in work_group_sizes
+        if work_group_size <= 512
+        for sub_group_size in (4, 8, 16)
+        if sub_group_size < work_group_size
+        for multiplier in (1, 2, 4)
+        for double_buffer_local_windows in (False, True)
+    ]
+
+
+def _make_benchmark(kernel_name, device, dtype, shape):
+    # Return a function that runs the kernel `kernel_name` once with the given
+    # parameters.
+    import dpctl.tensor as dpt
+
+    from sklearn_numba_dpex.common.matmul import make_matmul_2d_kernel
+    from sklearn_numba_dpex.common.random import create_xoroshiro128pp_states, uniform
+    from sklearn_numba_dpex.kmeans.drivers import get_labels_inertia, lloyd
+
+    n_samples, n_features, n_clusters = shape
+    # NB: the data is generated on device, with a fixed number of RNG states so that
+    # it is the same on all devices.
+    states = create_xoroshiro128pp_states(1024, seed=0, device=device)
+    X_t = uniform(states, (n_features, n_samples), dtype=dtype)
+    centroids_t = uniform(states, (n_features, n_clusters), dtype=dtype)
+    sample_weight = dpt.ones(n_samples, dtype=dtype, device=device)
+
+    if kernel_name == "lloyd_single_step":
+
+        def benchmark(parameters):
+            with _override_parameters(kernel_name, parameters):
+                lloyd(
+                    X_t,
+                    sample_weight,
+                    centroids_t,
+                    use_uniform_weights=True,
+                    max_iter=3,
+                    tol=0,
+                    # NB: the tuned kernel only runs with the centroid update in
+                    # private copies, the segmented update does not use it.
+                    centroid_update="private_copies",
+                )
+
+    elif kernel_name == "label_assignment":
+
+        def benchmark(parameters):
+            with _override_parameters(kernel_name, parameters):
+                get_labels_inertia(X_t, centroids_t, sample_weight, with_inertia=False)
+
+    else:
+        X = dpt.asarray(X_t.T, order="C")
+        Y_t = dpt.asarray(centroids_t.T, order="C")
+        result = dpt.empty((n_samples, n_clusters), dtype=dtype, device=device)
+
+        def benchmark(parameters):
+            matmul_2d_kernel = make_matmul_2d_kernel(
+                n_samples, n_clusters, n_features, dtype, device, **parameters
+            )
+            matmul_2d_kernel(X, Y_t, result)
+
+    def timed_benchmark(parameters):
+        benchmark(parameters)
+        X_t.sycl_queue.wait()
+        start = time.perf_counter()
+        benchmark(parameters)
+        X_t.sycl_queue.wait()
+        return time.perf_counter() - start
+
+    return timed_benchmark
+
+
+def tune(
+    device=None,
+    dtypes=None,
+    shapes=_DEFAULT_SHAPES,
+    kernel_names=None,
+    n_repeats=3,
+    candidates=None,
+    verbose=False,
+):
+    """Benchmark candidate geometries and store the best ones in the profile of
+    `device`.
+
+    Parameters
+    ----------
+    device : dpctl.SyclDevice, str or None
+        The device to tune. If None, the default device is used.
+
+    dtypes : sequence of dtype or None
+        The dtypes to tune for. If None, `float32`, and `float64` if the device
+        supports it.
+
+    shapes : sequence of tuple of int
+        Sequence of `(n_samples, n_features, n_clusters)` triplets to tune for. For
+        `matmul_2d`, `n_samples` and `n_clusters` are the number of rows of the
+        operands and `n_features` is the size of the contracted dimension.
+
+    kernel_names : sequence of str or None
+        The kernels to tune, among the keys of `DEFAULT_PARAMETERS`. If None, all the
+        kernels are tuned.
+
+    n_repeats : int
+        Each candidate is timed `n_repeats` times (after a first run that compiles
+        the kernels) and the best time is kept.
+
+    candidates : dict or None
+        Maps kernel names to lists of candidate parameters. If None, or for the
+        kernels that are not in the dict, a default grid of candidates is used.
+
+    verbose : bool
+        If True, print the time of each candidate.
+
+    Returns
+    -------
+    profile : dict
+        The updated profile, that is also saved to `get_profile_path(device)`.
+    """
+    from sklearn_numba_dpex.common._kernel_cache import clear_kernel_cache
+
+    if device is None:
+        device = dpctl.SyclDevice()
+    elif not isinstance(device, dpctl.SyclDevice):
+        device = dpctl.SyclDevice(device)
+
+    if dtypes is None:
+        dtypes = [np.float32]
+        if device.has_aspect_fp64:
+            dtypes.append(np.float64)
+
+    if kernel_names is None:
+        kernel_names = list(DEFAULT_PARAMETERS)
+    for kernel_name in kernel_names:
+        if kernel_name not in DEFAULT_PARAMETERS:
+            raise ValueError(
+                f"Expected kernel names in {list(DEFAULT_PARAMETERS)}, got "
+                f"{kernel_name}."
+            )
+
+    if candidates is None:
+        candidates = dict()
+
+    profile = load_profile(device) or dict(
+        version=_PROFILE_FORMAT_VERSION,
+        device=dict(
+            name=device.name,
+            backend=device.backend.name,
+            driver_version=device.driver_version,
+        ),
+        kernels=dict(),
+    )
+
+    for kernel_name in kernel_names:
+        kernel_candidates = candidates.get(kernel_name) or _get_candidates(
+            kernel_name, device
+        )
+        for dtype in dtypes:
+            dtype_name = np.dtype(dtype).name
+            tuned_buckets = profile["kernels"].setdefault(kernel_name, dict())
+            tuned_buckets = tuned_buckets.setdefault(dtype_name, dict())
+            for shape in shapes:
+                shape_bucket = _get_shape_bucket(shape)
+                benchmark = _make_benchmark(kernel_name, device, dtype, shape)
+                best_time, best_parameters = math.inf, None
+                for parameters in kernel_candidates:
+                    try:
+                        elapsed_time = min(
+                            benchmark(parameters) for _ in range(n_repeats)
+                        )
+                    # NB: some candidates can be invalid for the device, e.g. because
+                    # of local memory limits. The errors that are raised by the
+                    # compiler are not consistent, so they're all skipped.
+                    except Exception as e:
+                        if verbose:
+                            print(
+                                f"{kernel_name} {dtype_name} {shape} {parameters}: {e}"
+                            )
+                        continue
+
+                    if verbose:
+                        print(
+                            f"{kernel_name} {dtype_name} {shape} {parameters}: "
+                            f"{elapsed_time:.3e}s"
+                        )
+                    if elapsed_time < best_time:
+                        best_time, best_parameters = elapsed_time, parameters
+
+                if best_parameters is None:
+                    continue
+
+                tuned_buckets[_format_shape_bucket(shape_bucket)] = dict(
+                    shape_bucket=shape_bucket,
+                    parameters=best_parameters,
+                    time=best_time,
+                )
+
+    _save_profile(device, profile)
+
+    # NB: the kernels that have been compiled with the previous geometries must be
+    # compiled again.
+    clear_kernel_cache()
+    return profile
+
+
+def _parse_shape(shape):
+    try:
+        n_samples, n_features, n_clusters = (int(dim) for dim in shape.split(","))
+    except ValueError:
+        raise argparse.ArgumentTypeError(
+            "Expected a shape formatted as n_samples,n_features,n_clusters, got "
+            f"{shape}."
+        )
+    return n_samples, n_features, n_clusters
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog="python -m sklearn_numba_dpex.autotune",
+        description=(
+            "Benchmark the geometries of the kernels on a device and store the best "
+            "ones in the profile of the device."
+        ),
+    )
+    parser.add_argument(
+        "--device",
+        default=None,
+        help="SYCL filter selector of the device, e.g. 'gpu' or 'opencl:cpu'.",
+    )
+    parser.add_argument(
+        "--dtype",
+        action="append",
+        choices=["float32", "float64"],
+        help="dtype to tune for, can be repeated.",
+    )
+    parser.add_argument(
+        "--shape",
+        action="append",
+        type=_parse_shape,
+        help="n_samples,n_features,n_clusters to tune for, can be repeated.",
+    )
+    parser.add_argument(
+        "--kernel",
+        action="append",
+        choices=list(DEFAULT_PARAMETERS),
+        help="kernel to tune, can be repeated. Defaults to all the kernels.",
+    )
+    parser.add_argument("--n-repeats", type=int, default=3)
+    parser.add_argument(
+        "--show",
+        action="store_true",
+        help="print the current profile of the device instead of tuning.",
+    )
+    parser.add_argument(
+        "--reset",
+        action="store_true",
+        help="delete the current profile of the device instead of tuning.",
+    )
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args(argv)
+
+    device = dpctl.SyclDevice(args.device) if args.device else dpctl.SyclDevice()
+    path = get_profile_path(device)
+
+    if args.show:
+        profile = load_profile(device)
+        if profile is None:
+            print(f"No profile for {device.name} at {path}.")
+        else:
+            print(json.dumps(profile, indent=2))
+        return
+
+    if args.reset:
+        if path.exists():
+            path.unlink()
+        print(f"Deleted the profile for {device.name} at {path}.")
+        return
+
+    profile = tune(
+        device,
+        dtypes=args.dtype,
+        shapes=args.shape or _DEFAULT_SHAPES,
+        kernel_names=args.kernel,
+        n_repeats=args.n_repeats,
+        verbose=args.verbose,
+    )
+    for kernel_name, tuned_dtypes in profile["kernels"].items():
+        for dtype_name, tuned_buckets in tuned_dtypes.items():
+            for bucket_name, entry in tuned_buckets.items():
+                print(
+                    f"{kernel_name} {dtype_name} {bucket_name}: {entry['parameters']}"
+                )
+    print(f"Saved the profile for {device.name} to {path}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import os
+import threading
+from collections import OrderedDict, namedtuple
+from functools import wraps
+
+from sklearn_numba_dpex.profiling import _instrument_factory_output
+
+CacheInfo = namedtuple(
+    "CacheInfo", ["hits", "misses", "evictions", "maxsize", "currsize"]
+)
+
+_DEFAULT_MAXSIZE = 512
+_MAXSIZE_ENV_VARIABLE = "SKLEARN_NUMBA_DPEX_KERNEL_CACHE_MAXSIZE"
+
+
+def _get_default_maxsize():
+    maxsize = os.getenv(_MAXSIZE_ENV_VARIABLE, None)
+    if maxsize is None:
+        return _DEFAULT_MAXSIZE
+
+    if maxsize.lower() == "none":
+        return None
+
+    try:
+        maxsize = int(maxsize)
+    except ValueError:
+        maxsize = -1
+
+    if maxsize < 0:
+        raise ValueError(
+            f"Expected the environment variable {_MAXSIZE_ENV_VARIABLE} to be a"
+            ' non-negative integer or "none", but got'
+            f" {os.getenv(_MAXSIZE_ENV_VARIABLE)}."
+        )
+    return maxsize
+
+
+class _KernelCache:
+    """Least-recently-used cache shared by all the kernel factories.
+
+    The number of entries is bounded across all factories, so that a long-running
+    process that sees many distinct combinations of parameters does not accumulate
+    compiled kernels indefinitely. When the cache is full, the least recently used
+    entry is evicted, regardless of the factory that created it.
+
+    Entries are created outside of the lock, so that the compilation of a kernel does
+    not block the other threads. If two threads concurrently miss the same key, the
+    first entry to be stored is kept and returned to both.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.RLock()
+        # Maps the name of each factory to the list [hits, misses, evictions]
+        self._stats = dict()
+
+    def get(self, factory_name, factory, args, kwargs):
+        key = (factory_name, args, tuple(kwargs.items()))
+        stats = self._stats[factory_name]
+
+        with self._lock:
+            try:
+                entry = self._entries[key]
+            except KeyError:
+                pass
+            else:
+                self._entries.move_to_end(key)
+                stats[0] += 1
+                return entry
+
+            stats[1] += 1
+
+        entry = factory(*args, **kwargs)
+
+        with self._lock:
+            if self.maxsize == 0:
+                return entry
+
+            entry = self._entries.setdefault(key, entry)
+            self._entries.move_to_end(key)
+            self._evict(self.maxsize)
+
+        return entry
+
+    def _evict(self, maxsize):
+        if maxsize is None:
+            return
+        while len(self._entries) > maxsize:
+            (factory_name, _, _), _ = self._entries.popitem(last=False)
+            self._stats[factory_name][2] += 1
+
+    def register(self, factory_name):
+        with self._lock:
+            self._stats.setdefault(factory_name, [0, 0, 0])
+
+    def set_maxsize(self, maxsize):
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict(maxsize)
+
+    def clear(self, factory_name=None):
+        with self._lock:
+            if factory_name is None:
+                self._entries.clear()
+                for stats in self._stats.values():
+                    stats[:] = [0, 0, 0]
+                return
+
+            for key in [key for key in self._entries if key[0] == factory_name]:
+                del self._entries[key]
+            self._stats[factory_name][:] = [0, 0, 0]
+
+    def info(self, factory_name=None):
+        with self._lock:
+            if factory_name is None:
+                hits, misses, evictions = (
+                    sum(stats[i] for stats in self._stats.values()) for i in range(3)
+                )
+                currsize = len(self._entries)
+            else:
+                hits, misses, evictions = self._stats[factory_name]
+                currsize = sum(1 for key in self._entries if key[0] == factory_name)
+            return CacheInfo(hits, misses, evictions, self.maxsize, currsize)
+
+    def factory_names(self):
+        with self._lock:
+            return list(self._stats)
+
+
+_kernel_cache = _KernelCache(_get_default_maxsize())
+
+
+def kernel_cache(factory):
+    """Cache the output of a kernel factory in the kernel cache shared by all
+    factories.
+
+    The decorated factory exposes `cache_info` and `cache_clear` methods similar to
+    the ones of `functools.lru_cache`. Like for `functools.lru_cache`, the arguments
+    of the factory must be hashable.
+
+    The kernels returned by the decorated factory are instrumented when a
+    `sklearn_numba_dpex.profiling.record` context is active.
+    """
+    factory_name = f"{factory.__module__}.{factory.__qualname__}"
+    _kernel_cache.register(factory_name)
+
+    @wraps(factory)
+    def cached_factory(*args, **kwargs):
+        return _instrument_factory_output(
+            factory_name, _kernel_cache.get(factory_name, factory, args, kwargs)
+        )
+
+    cached_factory.cache_info = lambda: _kernel_cache.info(factory_name)
+    cached_factory.cache_clear = lambda: _kernel_cache.clear(factory_name)
+    return cached_factory
+
+
+def kernel_cache_info():
+    """Return the statistics of the kernel cache.
+
+    Returns
+    -------
+    cache_info : dict
+        A dict with keys `hits`, `misses`, `evictions`, `maxsize` and `currsize`
+        giving the statistics of the whole cache, and key `factories` that maps the
+        qualified name of each kernel factory to a dict with the same statistics
+        restricted to the kernels created by this factory.
+    """
+    cache_info = _kernel_cache.info()._asdict()
+    cache_info["factories"] = {
+        factory_name: _kernel_cache.info(factory_name)._asdict()
+        for factory_name in _kernel_cache.factory_names()
+    }
+    return cache_info
+
+
+def clear_kernel_cache():
+    """Remove all the kernels from the kernel cache and reset its statistics."""
+    _kernel_cache.clear()
+
+
+def set_kernel_cache_maxsize(maxsize):
+    """Set the maximum number of entries in the kernel cache.
+
+    The default value can also be set with the environment variable
+    `SKLEARN_NUMBA_DPEX_KERNEL_CACHE_MAXSIZE`.
+
+    Parameters
+    ----------
+    maxsize : int or None
+        The maximum number of kernels that are kept in the cache. If the cache is
+        already larger, the least recently used kernels are evicted. If None, the size
+        of the cache is unbounded. If 0, caching is disabled.
+    """
+    if maxsize is not None and (int(maxsize) != maxsize or maxsize < 0):
+        raise ValueError(
+            f"Expected maxsize to be a non-negative integer or None, got {maxsize}."
+        )
+    _kernel_cache.set_maxsize(maxsize)
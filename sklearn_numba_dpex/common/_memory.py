@@ -0,0 +1,65 @@
+import os
+
+_MEMORY_BUDGET_ENV_VARIABLE = "SKLEARN_NUMBA_DPEX_MEMORY_BUDGET"
+
+
+def _check_memory_budget(memory_budget, name="memory_budget"):
+    if memory_budget is None:
+        return None
+    try:
+        checked_memory_budget = int(memory_budget)
+    except (TypeError, ValueError):
+        checked_memory_budget = -1
+    if checked_memory_budget != memory_budget or checked_memory_budget <= 0:
+        raise ValueError(
+            f"Expected {name} to be a positive integer or None, got {memory_budget}."
+        )
+    return checked_memory_budget
+
+
+def _get_default_memory_budget():
+    memory_budget = os.getenv(_MEMORY_BUDGET_ENV_VARIABLE, None)
+    if memory_budget is None or memory_budget.lower() == "none":
+        return None
+    try:
+        memory_budget = int(memory_budget)
+    except ValueError:
+        pass
+    return _check_memory_budget(
+        memory_budget, name=f"the environment variable {_MEMORY_BUDGET_ENV_VARIABLE}"
+    )
+
+
+_memory_budget = _get_default_memory_budget()
+
+
+def set_memory_budget(memory_budget):
+    """Set the maximum amount of device memory, in bytes, that a fit or a predict
+    call is planned to use.
+
+    When the memory that a call would need with the default kernels exceeds the
+    budget, variants of the kernels that need less memory are used. If no such
+    variant fits within the budget, a `MemoryError` is raised before any allocation.
+
+    The default value can also be set with the environment variable
+    `SKLEARN_NUMBA_DPEX_MEMORY_BUDGET`.
+
+    Parameters
+    ----------
+    memory_budget : int or None
+        The budget in bytes. If None, the budget is the size of the global memory of
+        the device.
+    """
+    global _memory_budget
+    _memory_budget = _check_memory_budget(memory_budget)
+
+
+def get_memory_budget(device=None):
+    """Return the memory budget, in bytes, set with `set_memory_budget`.
+
+    If no budget has been set, return the size of the global memory of `device`, or
+    None if `device` is None.
+    """
+    if _memory_budget is not None or device is None:
+        return _memory_budget
+    return device.global_mem_size
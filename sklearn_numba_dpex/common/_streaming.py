@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import dpctl.tensor as dpt
+import numpy as np
+
+
+def iter_device_chunks(X, sample_weight, chunk_size, device, dtype, prefetch=True):
+    """Iterate over chunks of consecutive samples of host data, copied to device.
+
+    Parameters
+    ----------
+    X : array-like of shape (n_samples, n_features) or iterable of array-like
+        Host data, e.g. a numpy array or a `numpy.memmap`, or an iterable (e.g. a
+        generator) of 2D host chunks of samples. Only one chunk at a time is read, so
+        `X` does not need to fit in memory.
+
+    sample_weight : array-like of shape (n_samples,) or None
+        Host weights, chunked alongside `X`.
+
+    chunk_size : int or None
+        Number of samples in each chunk. The last chunk can be smaller. Unused if `X`
+        is an iterable of chunks.
+
+    device : dpctl.SyclDevice
+        Device the chunks are copied to.
+
+    dtype : dtype
+        dtype of the chunks on device.
+
+    prefetch : bool
+        If True, the next chunk is read, transposed, and copied to device in a
+        background thread while the current chunk is being processed, i.e the chunks
+        are double-buffered.
+
+    Yields
+    ------
+    start, stop : int
+        Range of the samples in the chunk.
+
+    X_t_chunk : dpctl.tensor.usm_ndarray of shape (n_features, stop - start)
+        The transposed chunk, with C-contiguous layout.
+
+    sample_weight_chunk : dpctl.tensor.usm_ndarray of shape (stop - start,) or None
+        The weights of the chunk.
+    """
+    host_chunks = _iter_host_chunks(X, sample_weight, chunk_size)
+
+    def load_next_chunk():
+        if (host_chunk := next(host_chunks, None)) is None:
+            return None
+
+        start, stop, X_chunk, sample_weight_chunk = host_chunk
+        X_t_chunk = dpt.asarray(
+            np.ascontiguousarray(np.asarray(X_chunk, dtype=dtype).T),
+            device=device,
+        )
+        if sample_weight_chunk is not None:
+            sample_weight_chunk = dpt.asarray(
+                np.asarray(sample_weight_chunk, dtype=dtype), device=device
+            )
+        return start, stop, X_t_chunk, sample_weight_chunk
+
+    if not prefetch:
+        while (chunk := load_next_chunk()) is not None:
+            yield chunk
+        return
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        next_chunk = executor.submit(load_next_chunk)
+        while (chunk := next_chunk.result()) is not None:
+            next_chunk = executor.submit(load_next_chunk)
+            yield chunk
+
+
+def _iter_host_chunks(X, sample_weight, chunk_size):
+    if hasattr(X, "shape"):
+        n_samples = X.shape[0]
+        X = (X[start : start + chunk_size] for start in range(0, n_samples, chunk_size))
+
+    start = 0
+    for X_chunk in X:
+        stop = start + X_chunk.shape[0]
+        if stop == start:
+            continue
+
+        sample_weight_chunk = None
+        if sample_weight is not None:
+            sample_weight_chunk = sample_weight[start:stop]
+        yield start, stop, X_chunk, sample_weight_chunk
+        start = stop
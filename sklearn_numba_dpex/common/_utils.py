@@ -2,6 +2,8 @@ import math
 import warnings
 
 import dpctl
+import dpctl.tensor as dpt
+import numpy as np
 
 
 def check_power_of_2(x):
@@ -18,6 +20,10 @@ def _square(x):
     return x * x
 
 
+def _negative(x):
+    return -x
+
+
 def _minus(x, y):
     return x - y
 
@@ -26,6 +32,19 @@ def _plus(x, y):
     return x + y
 
 
+def _positive_part(x):
+    # NB: `x - x` rather than `0` so that the output has the same dtype than `x`.
+    if x < 0:
+        return x - x
+    return x
+
+
+def _sqrt_of_positive_part(x):
+    if x < 0:
+        return x - x
+    return math.sqrt(x)
+
+
 def _divide_by(divisor):
     def _divide_closure(x):
         return x / divisor
@@ -33,6 +52,52 @@ def _divide_by(divisor):
     return _divide_closure
 
 
+def _get_compute_dtype(dtype, device):
+    """Returns the dtype of the computations on `device` for input data of type
+    `dtype`: float64 data is processed in float64 if the device supports it, any other
+    data is processed in float32."""
+    dtype = np.dtype(dtype)
+    if dtype == np.float64 and device.has_aspect_fp64:
+        return dtype
+    return np.dtype(np.float32)
+
+
+def _get_input_device_and_dtype(X):
+    """Returns `X` as a `dpctl.tensor.usm_ndarray` or a numpy array, along with the
+    device and the dtype of the computations on `X`.
+
+    Data that is already on device (including `dpnp` arrays) is processed on its
+    device, other data is processed on the default device."""
+    # NB: imported lazily so that importing `sklearn_numba_dpex` does not import
+    # `dpnp`.
+    import dpnp
+
+    if isinstance(X, dpnp.ndarray):
+        X = X.get_array()
+
+    if isinstance(X, dpt.usm_ndarray):
+        device = X.device.sycl_device
+    else:
+        device = dpctl.SyclDevice()
+        X = np.asarray(X)
+
+    return X, device, _get_compute_dtype(X.dtype, device)
+
+
+def _to_device(array, dtype, device):
+    """Returns a C-contiguous copy of `array` of type `dtype` on `device`, or `array`
+    itself if it already is."""
+    # NB: imported lazily so that importing `sklearn_numba_dpex` does not import
+    # `dpnp`.
+    import dpnp
+
+    if isinstance(array, dpnp.ndarray):
+        array = array.get_array()
+    if isinstance(array, dpt.usm_ndarray):
+        return dpt.asarray(dpt.astype(array, dtype), order="C", device=device)
+    return dpt.asarray(np.ascontiguousarray(array, dtype=dtype), device=device)
+
+
 def _get_sequential_processing_device(device):
     """Returns a device most fitted for sequential processing (i.e a cpu rather than a
     gpu). If such a device is not found, returns the input device instead.
@@ -1,14 +1,15 @@
 import math
-from functools import lru_cache
 
 import dpctl.tensor as dpt
 import numba_dpex as dpex
 import numpy as np
 
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
+
 zero_idx = np.int64(0)
 
 
-@lru_cache
+@kernel_cache
 def make_apply_elementwise_func(shape, func, work_group_size):
     func = dpex.func(func)
     n_items = math.prod(shape)
@@ -35,7 +36,7 @@ def make_apply_elementwise_func(shape, func, work_group_size):
     return elementwise_ops
 
 
-@lru_cache
+@kernel_cache
 def make_initialize_to_zeros_kernel(shape, work_group_size, dtype):
     n_items = math.prod(shape)
     global_size = math.ceil(n_items / work_group_size) * work_group_size
@@ -57,7 +58,7 @@ def make_initialize_to_zeros_kernel(shape, work_group_size, dtype):
     return initialize_to_zeros
 
 
-@lru_cache
+@kernel_cache
 def make_broadcast_division_1d_2d_axis0_kernel(shape, work_group_size):
     n_rows, n_cols = shape
     global_size = math.ceil(n_cols / work_group_size) * work_group_size
@@ -82,7 +83,7 @@ def make_broadcast_division_1d_2d_axis0_kernel(shape, work_group_size):
     return broadcast_division[global_size, work_group_size]
 
 
-@lru_cache
+@kernel_cache
 def make_broadcast_ops_1d_2d_axis1_kernel(shape, ops, work_group_size):
     """
     ops must be a function that will be interpreted as a dpex.func and is subject to
@@ -113,7 +114,7 @@ def make_broadcast_ops_1d_2d_axis1_kernel(shape, ops, work_group_size):
     return broadcast_ops[global_size, work_group_size]
 
 
-@lru_cache
+@kernel_cache
 def make_half_l2_norm_2d_axis0_kernel(shape, work_group_size, dtype):
     n_rows, n_cols = shape
     global_size = math.ceil(n_cols / work_group_size) * work_group_size
@@ -143,3 +144,63 @@ def make_half_l2_norm_2d_axis0_kernel(shape, work_group_size, dtype):
         result[col_idx] = l2_norm / two
 
     return half_l2_norm[global_size, work_group_size]
+
+
+@kernel_cache
+def make_sq_distances_operands_kernel(
+    n_features, is_left, work_group_size, dtype, negative=False
+):
+    """Returns a function that augments each row of `X` with two additional features,
+    so that the matrix product of the augmented left and right operands gives the
+    squared euclidean distances:
+
+        [x, ||x||^2, 1] . [-2 * y, 1, ||y||^2] = ||x - y||^2
+
+    If `is_left` is True, the rows `x` of `X` are augmented to `[x, ||x||^2, 1]`, else
+    the rows `y` of `X` are augmented to `[-2 * y, 1, ||y||^2]`. If `negative` is
+    True, the right operands are negated, so that the product gives the opposite of
+    the squared distances, e.g. so that the nearest rows have the greatest values.
+
+    The returned function accepts arrays with any number of rows.
+    """
+    zero = dtype(0.0)
+    sign = dtype(-1.0) if negative and not is_left else dtype(1.0)
+    one = sign
+    minus_two = dtype(-2.0) * sign
+    n_features = np.int64(n_features)
+    n_features_plus_one = n_features + np.int64(1)
+
+    @dpex.kernel
+    # fmt: off
+    def sq_distances_operands(
+        X,              # IN        (n_rows, n_features)
+        result,         # OUT       (n_rows, n_features + 2)
+    ):
+        # fmt: on
+        n_rows = X.shape[zero_idx]
+        row_idx = dpex.get_global_id(zero_idx)
+        if row_idx >= n_rows:
+            return
+
+        sq_norm = zero
+        for feature_idx in range(n_features):
+            value = X[row_idx, feature_idx]
+            sq_norm += value * value
+            if is_left:
+                result[row_idx, feature_idx] = value
+            else:
+                result[row_idx, feature_idx] = minus_two * value
+
+        if is_left:
+            result[row_idx, n_features] = sq_norm
+            result[row_idx, n_features_plus_one] = one
+        else:
+            result[row_idx, n_features] = one
+            result[row_idx, n_features_plus_one] = sign * sq_norm
+
+    def _sq_distances_operands(X, result):
+        n_rows = X.shape[0]
+        global_size = math.ceil(n_rows / work_group_size) * work_group_size
+        sq_distances_operands[global_size, work_group_size](X, result)
+
+    return _sq_distances_operands
@@ -1,15 +1,17 @@
 import math
-from functools import lru_cache
 
+import dpctl.tensor as dpt
 import numba_dpex as dpex
 import numpy as np
 
+from sklearn_numba_dpex.autotune import get_tuned_parameters
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
 from sklearn_numba_dpex.common._utils import _enforce_matmul_like_work_group_geometry
 
 zero_idx = np.int64(0)
 
 
-@lru_cache
+@kernel_cache
 def make_matmul_2d_kernel(
     X_n_rows,
     Y_t_n_rows,
@@ -18,10 +20,11 @@ def make_matmul_2d_kernel(
     device,
     multiply_fn=None,
     out_fused_elementwise_fn=None,
-    # The best values for the parameters defined thereafter depend on the device, but
-    # a stable heuristic is yet to be found.
-    # TODO: find an heuristic for adapting the performance parameters to the device
-    # rather than hardcoding defaults.
+    out_row_reduction=None,
+    with_column_bias=False,
+    # The best values for the parameters defined thereafter depend on the device.
+    # The parameters that are left to None are read from the autotuning profile of
+    # the device, see `sklearn_numba_dpex.autotune`.
     work_group_size=None,
     sub_group_size=None,
     # Arithmetic intensity refers to how much compute a single work item is set to
@@ -36,11 +39,16 @@ def make_matmul_2d_kernel(
     # rather than memory-bound.
     # Setting it too high might pressure local or private memory too much for it to be
     # worth.
-    arithmetic_intensity_multiplier_X=1,
-    arithmetic_intensity_multiplier_Y=1,
+    arithmetic_intensity_multiplier_X=None,
+    arithmetic_intensity_multiplier_Y=None,
     # Width of the window of values of Y_t stored in registries - lower means less
     # values in registries, but more iterations in main loop.
     private_Y_t_sliding_window_width=1,  # must divide `sub_group_size`,
+    # If True, two sliding windows are allocated in shared memory for each input, so
+    # that the next window can be loaded while the current window is accumulated,
+    # with one barrier per iteration instead of two, at the cost of twice as much
+    # shared memory.
+    double_buffer_local_windows=None,
 ):
     """Returns a matmul kernel.
 
@@ -60,6 +68,21 @@ def make_matmul_2d_kernel(
 
     It is expected to take one scalar argument and return one scalar value.
 
+    If `out_row_reduction` is `"argmin"` (resp. `"argmax"`), the output array is not
+    written to global memory. Instead, the minimum (resp. maximum) of each row of the
+    output, and its index, are computed in the work groups right after the values of
+    the row have been computed (and transformed with `out_fused_elementwise_fn`), so
+    that only `O(X_n_rows)` results are written rather than
+    `O(X_n_rows * Y_t_n_rows)`. If moreover `with_column_bias` is True, a bias is
+    added to each column before the reduction, e.g. half the squared norms of the
+    centroids when searching the closest centroids. The returned kernel then has the
+    signature `(X, Y_t, [column_bias,] result_values, result_idx)`, where
+    `result_values` and `result_idx` have shape `(X_n_rows,)` and `result_idx` has
+    dtype int64, and are expected to be C-contiguous. Ties are broken in favor of the
+    smallest index. If several work groups cover the same rows, each call allocates
+    a buffer of shape `(X_n_rows, n_work_groups_per_row)` for their partial
+    reductions.
+
     Likewise, if `multiply_fn` is not None it will be used in place of the scalar
     multiply operator. It is expected to take two scalar arguments and return one
     scalar value.
@@ -90,10 +113,16 @@ def make_matmul_2d_kernel(
     if it's not able to tell at compile time that the input has a contiguous structure
     in memory. Investigating `SPIR-V` code could confirm/infirm this. If not coalesced,
     use of functions such as `reinterpret_cast` for `cuda` are required to manually
-    enforce the coalesced reads.
-    - autotuning: maybe better parameters (`work_group_size`, `sub_group_size`,
-    `arithmetic_intensity` multipliers,...) can be found, those parameters might depend
-    on the device. Is it possible to find parameters that reasonably suit all devices ?
+    enforce the coalesced reads. `numba_dpex` does not expose vector types nor a
+    way to reinterpret the inputs yet, so vectorized loads can't be written for now.
+    - double buffering: the sliding windows in shared memory can be double buffered
+    (see `double_buffer_local_windows`), so that loading the next window overlaps with
+    accumulating the current one. Whether it pays off depends on the device, it is
+    part of the parameters that are tuned with `sklearn_numba_dpex.autotune`.
+    - autotuning: the parameters (`work_group_size`, `sub_group_size`,
+    `arithmetic_intensity` multipliers) can be tuned for each device with
+    `sklearn_numba_dpex.autotune`, but is it possible to find parameters that
+    reasonably suit all devices ?
     - Investigating `SPIR-V` code compiled by `numba-dpex` to look for possible
     issues with the JIT. Are groups dispatched in increasing order of `group_id` ? Do
     consecutive `local_id`s index consecutive work items in the same subgroups ?
@@ -106,16 +135,37 @@ def make_matmul_2d_kernel(
     - https://triton-lang.org/master/getting-started/tutorials/03-matrix-multiplication.html  # noqa
 
     """
+    tuned_parameters = get_tuned_parameters(
+        "matmul_2d", device, dtype, (X_n_rows, n_cols, Y_t_n_rows)
+    )
     if work_group_size is None:
-        work_group_size = 128
+        work_group_size = tuned_parameters["work_group_size"]
     if sub_group_size is None:
-        sub_group_size = 4
+        sub_group_size = tuned_parameters["sub_group_size"]
+    if arithmetic_intensity_multiplier_X is None:
+        arithmetic_intensity_multiplier_X = tuned_parameters[
+            "arithmetic_intensity_multiplier_X"
+        ]
+    if arithmetic_intensity_multiplier_Y is None:
+        arithmetic_intensity_multiplier_Y = tuned_parameters[
+            "arithmetic_intensity_multiplier_Y"
+        ]
+    if double_buffer_local_windows is None:
+        double_buffer_local_windows = tuned_parameters["double_buffer_local_windows"]
+    n_local_buffers = 2 if double_buffer_local_windows else 1
 
     # NB: The following implementation not only works for the best parameters found so
     # far but for other combinations too, to enable exhaustive grid searches on all
     # devices.
 
+    if out_row_reduction not in (None, "argmin", "argmax"):
+        raise ValueError(
+            "Expected `out_row_reduction` to be None, 'argmin' or 'argmax', but got "
+            f"{out_row_reduction}."
+        )
+
     zero = dtype(0.0)
+    one_idx = dpex.int64(1)
     two_as_long = dpex.int64(2)
 
     (
@@ -129,7 +179,16 @@ def make_matmul_2d_kernel(
         required_local_memory_per_item=(
             arithmetic_intensity_multiplier_X + arithmetic_intensity_multiplier_Y
         )
-        * np.dtype(dtype).itemsize,
+        * n_local_buffers
+        * np.dtype(dtype).itemsize
+        # The row reduction epilogue stores a value and an index for each row of each
+        # work item.
+        + (
+            arithmetic_intensity_multiplier_X
+            * (np.dtype(dtype).itemsize + np.dtype(np.int64).itemsize)
+            if out_row_reduction is not None
+            else 0
+        ),
     )
 
     # Automatically set `private_Y_t_sliding_window_width` to `sub_group_size` if
@@ -195,12 +254,15 @@ def make_matmul_2d_kernel(
 
     # Such a work group loads two sliding windows that span relevant rows and colums
     # of the inputs X and Y_t.
+    # With double buffering, the first axis indexes the two buffers.
     local_X_sliding_window_shape = (
+        n_local_buffers,
         result_window_height,
         2 * sub_group_size,  # allocate twice the space to let padding against bank
         # conflicts
     )
     local_Y_t_sliding_window_shape = (
+        n_local_buffers,
         result_window_width,
         2 * sub_group_size,  # allocate twice the space to let padding against bank
         # conflicts
@@ -211,6 +273,7 @@ def make_matmul_2d_kernel(
     # Amount of temporary sliding windows that are needed to accumulate the partial
     # results until the final result
     n_sliding_windows_for_cols = math.ceil(n_cols / sub_group_size)
+    last_sliding_window_idx = n_sliding_windows_for_cols - 1
 
     # If arithmetic intensity parameters are set to 1, a single work item will compute
     # `base_nb_results_per_work_item` results, ordered in a window of size
@@ -277,11 +340,6 @@ def make_matmul_2d_kernel(
     ):
         # fmt: on
         work_item_idx = dpex.get_local_id(zero_idx)
-
-        # Index the work items in the base sliding window:
-        work_item_row_idx = work_item_idx // sub_group_size
-        work_item_col_idx = work_item_idx % sub_group_size
-
         group_idx = dpex.get_group_id(zero_idx)
 
         # Get indices of the row and the column of the top-left corner of the sub-array
@@ -317,11 +375,6 @@ def make_matmul_2d_kernel(
             shape=private_Y_t_sliding_window_shape, dtype=dtype
         )
 
-        # Index of the first column of the sliding window that the current work item
-        # will be responsible for loading. The "sliding" is materialized by the
-        # increments of value `sub_group_size` to this index.
-        first_window_loaded_col_idx = work_item_col_idx
-
         # Indices of the first rows in `X` and `Y_t` and column of the sliding window
         # that the current will multiply.
         first_private_loaded_sliding_X_value_idx = (
@@ -331,32 +384,242 @@ def make_matmul_2d_kernel(
             work_item_idx % nb_work_items_for_Y_t_window
         )
 
+        _compute_private_result(
+            work_item_idx,
+            group_first_row_idx,
+            group_first_col_idx,
+            first_private_loaded_sliding_X_value_idx,
+            first_private_loaded_sliding_Y_t_value_idx,
+            X,
+            Y_t,
+            # BUFFER
+            local_X_sliding_window,
+            local_Y_t_sliding_window,
+            private_Y_t_sliding_window,
+            # OUT
+            private_result
+        )
+
+        _write_result(
+            group_first_row_idx + first_private_loaded_sliding_X_value_idx,
+            group_first_col_idx + first_private_loaded_sliding_Y_t_value_idx,
+            private_result,
+            # OUT
+            result
+        )
+
+    @dpex.kernel
+    # fmt: off
+    def matmul_row_reduction(
+            X,                          # IN      (X_n_rows, n_cols)
+            Y_t,                        # IN      (Y_t_n_rows, n_cols)
+            column_bias,                # IN      (Y_t_n_rows,)
+            partial_values,             # OUT     (X_n_rows, global_grid_n_cols)
+            partial_idx,                # OUT     (X_n_rows, global_grid_n_cols)
+    ):
+        # fmt: on
+        # NB: the first steps are the same than for the `matmul` kernel, only the
+        # epilogue differs.
+        work_item_idx = dpex.get_local_id(zero_idx)
+        group_idx = dpex.get_group_id(zero_idx)
+
+        group_row_idx = group_idx // global_grid_n_cols
+        group_col_idx = group_idx % global_grid_n_cols
+
+        group_first_row_idx = (
+            group_row_idx * result_window_height
+        )
+        group_first_col_idx = (
+            group_col_idx * result_window_width
+        )
+
+        local_X_sliding_window = dpex.local.array(
+            shape=local_X_sliding_window_shape, dtype=dtype
+        )
+        local_Y_t_sliding_window = dpex.local.array(
+            shape=local_Y_t_sliding_window_shape, dtype=dtype
+        )
+
+        # Allocate shared memory for the reductions of the rows of the private
+        # results of each work item.
+        local_row_values = dpex.local.array(
+            shape=local_row_reduction_shape, dtype=dtype
+        )
+        local_row_idx = dpex.local.array(
+            shape=local_row_reduction_shape, dtype=np.int64
+        )
+
+        private_result = dpex.private.array(
+            shape=thread_private_result_array_shape, dtype=dtype
+        )
+        private_Y_t_sliding_window = dpex.private.array(
+            shape=private_Y_t_sliding_window_shape, dtype=dtype
+        )
+
+        first_private_loaded_sliding_X_value_idx = (
+            work_item_idx // nb_work_items_for_Y_t_window
+        )
+        first_private_loaded_sliding_Y_t_value_idx = (
+            work_item_idx % nb_work_items_for_Y_t_window
+        )
+
+        _compute_private_result(
+            work_item_idx,
+            group_first_row_idx,
+            group_first_col_idx,
+            first_private_loaded_sliding_X_value_idx,
+            first_private_loaded_sliding_Y_t_value_idx,
+            X,
+            Y_t,
+            # BUFFER
+            local_X_sliding_window,
+            local_Y_t_sliding_window,
+            private_Y_t_sliding_window,
+            # OUT
+            private_result
+        )
+
+        # The work items that compute results on the same rows are consecutive, each
+        # of them first reduces its private results on each row, then the first work
+        # item merges the results for the rows.
+        _reduce_private_result(
+            first_private_loaded_sliding_X_value_idx,
+            first_private_loaded_sliding_Y_t_value_idx,
+            group_first_col_idx + first_private_loaded_sliding_Y_t_value_idx,
+            private_result,
+            column_bias,
+            # OUT
+            local_row_values,
+            local_row_idx
+        )
+
+        dpex.barrier(dpex.LOCAL_MEM_FENCE)
+
+        if first_private_loaded_sliding_Y_t_value_idx == zero_idx:
+            _write_row_reduction(
+                first_private_loaded_sliding_X_value_idx,
+                group_first_row_idx + first_private_loaded_sliding_X_value_idx,
+                group_col_idx,
+                local_row_values,
+                local_row_idx,
+                # OUT
+                partial_values,
+                partial_idx
+            )
+
+    # HACK 906: see sklearn_numba_dpex.patches.tests.test_patches.test_need_to_workaround_numba_dpex_906  # noqa
+    @dpex.func
+    # fmt: off
+    def _compute_private_result(
+        work_item_idx,                                  # PARAM
+        group_first_row_idx,                            # PARAM
+        group_first_col_idx,                            # PARAM
+        first_private_loaded_sliding_X_value_idx,       # PARAM
+        first_private_loaded_sliding_Y_t_value_idx,     # PARAM
+        X,                                              # IN      (X_n_rows, n_cols)
+        Y_t,                                            # IN      (Y_t_n_rows, n_cols)
+        local_X_sliding_window,                         # BUFFER  (n_local_buffers, result_window_height, 2 * sub_group_size)  # noqa
+        local_Y_t_sliding_window,                       # BUFFER  (n_local_buffers, result_window_width, 2 * sub_group_size)  # noqa
+        private_Y_t_sliding_window,                     # BUFFER  (private_result_array_width, private_Y_t_sliding_window_width)  # noqa
+        private_result,                                 # OUT     (private_result_array_height, private_result_array_width)  # noqa
+    ):
+        # fmt: on
+        # Index the work items in the base sliding window:
+        work_item_row_idx = work_item_idx // sub_group_size
+        work_item_col_idx = work_item_idx % sub_group_size
+
+        # Index of the first column of the sliding window that the current work item
+        # will be responsible for loading. The "sliding" is materialized by the
+        # increments of value `sub_group_size` to this index.
+        first_window_loaded_col_idx = work_item_col_idx
+
         work_item_col_idx_padded = two_as_long * work_item_col_idx
         first_X_loaded_row_idx = group_first_row_idx + work_item_row_idx
         first_Y_t_loaded_row_idx = group_first_col_idx + work_item_row_idx
 
         window_loaded_col_idx = first_window_loaded_col_idx
-        for _ in range(n_sliding_windows_for_cols):
-            _load_sliding_windows(
-                work_item_row_idx,
-                work_item_col_idx,
-                work_item_col_idx_padded,
-                first_X_loaded_row_idx,
-                first_Y_t_loaded_row_idx,
-                window_loaded_col_idx,
-                X,
-                Y_t,
-                # OUT
-                local_X_sliding_window,
-                local_Y_t_sliding_window
-            )
-            window_loaded_col_idx += sub_group_size
 
-            dpex.barrier(dpex.LOCAL_MEM_FENCE)
+        if not double_buffer_local_windows:
+            for _ in range(n_sliding_windows_for_cols):
+                _load_sliding_windows(
+                    work_item_row_idx,
+                    work_item_col_idx,
+                    work_item_col_idx_padded,
+                    first_X_loaded_row_idx,
+                    first_Y_t_loaded_row_idx,
+                    window_loaded_col_idx,
+                    zero_idx,
+                    X,
+                    Y_t,
+                    # OUT
+                    local_X_sliding_window,
+                    local_Y_t_sliding_window
+                )
+                window_loaded_col_idx += sub_group_size
+
+                dpex.barrier(dpex.LOCAL_MEM_FENCE)
+
+                _accumulate_private_windows(
+                    first_private_loaded_sliding_X_value_idx,
+                    first_private_loaded_sliding_Y_t_value_idx,
+                    zero_idx,
+                    local_X_sliding_window,
+                    local_Y_t_sliding_window,
+                    # BUFFER
+                    private_Y_t_sliding_window,
+                    # OUT
+                    private_result
+                )
+
+                dpex.barrier(dpex.LOCAL_MEM_FENCE)
+            return
+
+        # With double buffering, the window that is accumulated at a given iteration
+        # has been loaded at the previous iteration, in the other buffer. The barrier
+        # at the end of each iteration both guarantees that the next window is fully
+        # loaded and that the current window is no longer read before it is
+        # overwritten.
+        _load_sliding_windows(
+            work_item_row_idx,
+            work_item_col_idx,
+            work_item_col_idx_padded,
+            first_X_loaded_row_idx,
+            first_Y_t_loaded_row_idx,
+            window_loaded_col_idx,
+            zero_idx,
+            X,
+            Y_t,
+            # OUT
+            local_X_sliding_window,
+            local_Y_t_sliding_window
+        )
+
+        dpex.barrier(dpex.LOCAL_MEM_FENCE)
+
+        buffer_idx = zero_idx
+        for window_idx in range(n_sliding_windows_for_cols):
+            next_buffer_idx = one_idx - buffer_idx
+            window_loaded_col_idx += sub_group_size
+            if window_idx < last_sliding_window_idx:
+                _load_sliding_windows(
+                    work_item_row_idx,
+                    work_item_col_idx,
+                    work_item_col_idx_padded,
+                    first_X_loaded_row_idx,
+                    first_Y_t_loaded_row_idx,
+                    window_loaded_col_idx,
+                    next_buffer_idx,
+                    X,
+                    Y_t,
+                    # OUT
+                    local_X_sliding_window,
+                    local_Y_t_sliding_window
+                )
 
             _accumulate_private_windows(
                 first_private_loaded_sliding_X_value_idx,
                 first_private_loaded_sliding_Y_t_value_idx,
+                buffer_idx,
                 local_X_sliding_window,
                 local_Y_t_sliding_window,
                 # BUFFER
@@ -366,14 +629,7 @@ def make_matmul_2d_kernel(
             )
 
             dpex.barrier(dpex.LOCAL_MEM_FENCE)
-
-        _write_result(
-            group_first_row_idx + first_private_loaded_sliding_X_value_idx,
-            group_first_col_idx + first_private_loaded_sliding_Y_t_value_idx,
-            private_result,
-            # OUT
-            result
-        )
+            buffer_idx = next_buffer_idx
 
     # HACK 906: see sklearn_numba_dpex.patches.tests.test_patches.test_need_to_workaround_numba_dpex_906  # noqa
     @dpex.func
@@ -385,10 +641,11 @@ def make_matmul_2d_kernel(
         first_X_loaded_row_idx,     # PARAM
         first_Y_t_loaded_row_idx,   # PARAM
         window_loaded_col_idx,      # PARAM
+        buffer_idx,                 # PARAM
         X,                          # IN      (X_n_rows, n_cols)
         Y_t,                        # IN      (Y_t_n_rows, n_cols)
-        local_X_sliding_window,     # OUT     (result_window_height, 2 * sub_group_size)
-        local_Y_t_sliding_window    # OUT     (result_window_width, 2* sub_group_size)
+        local_X_sliding_window,     # OUT     (n_local_buffers, result_window_height, 2 * sub_group_size)  # noqa
+        local_Y_t_sliding_window    # OUT     (n_local_buffers, result_window_width, 2* sub_group_size)  # noqa
     ):
         # fmt: on
         X_loaded_row_idx = first_X_loaded_row_idx
@@ -400,7 +657,7 @@ def make_matmul_2d_kernel(
                 loaded_X_value = zero
 
             local_X_sliding_window[
-                X_local_loaded_row_idx, work_item_col_idx_padded
+                buffer_idx, X_local_loaded_row_idx, work_item_col_idx_padded
             ] = loaded_X_value
             X_loaded_row_idx += base_result_window_side
             X_local_loaded_row_idx += base_result_window_side
@@ -414,7 +671,7 @@ def make_matmul_2d_kernel(
                 loaded_Y_t_value = zero
 
             local_Y_t_sliding_window[
-                Y_t_local_loaded_row_idx, work_item_col_idx_padded
+                buffer_idx, Y_t_local_loaded_row_idx, work_item_col_idx_padded
             ] = loaded_Y_t_value
             Y_t_loaded_row_idx += base_result_window_side
             Y_t_local_loaded_row_idx += base_result_window_side
@@ -424,8 +681,9 @@ def make_matmul_2d_kernel(
     def _accumulate_private_windows(
         private_first_loaded_sliding_X_value_idx,    # PARAM
         private_first_loaded_sliding_Y_t_value_idx,  # PARAM
-        local_X_sliding_window,                      # IN       (result_window_height, 2 * sub_group_size)  # noqa
-        local_Y_t_sliding_window,                    # IN       (result_window_width, 2* sub_group_size)  # noqa
+        buffer_idx,                                  # PARAM
+        local_X_sliding_window,                      # IN       (n_local_buffers, result_window_height, 2 * sub_group_size)  # noqa
+        local_Y_t_sliding_window,                    # IN       (n_local_buffers, result_window_width, 2* sub_group_size)  # noqa
         private_Y_t_sliding_window,                  # BUFFER   (private_result_array_width, private_Y_t_sliding_window_width)  # noqa
         private_result,                              # OUT      (private_result_array_height, private_result_array_width)  # noqa
     ):
@@ -439,6 +697,7 @@ def make_matmul_2d_kernel(
             for i in range(private_result_array_width):
                 for j in range(private_Y_t_sliding_window_width):
                     private_Y_t_sliding_window[i, j] = local_Y_t_sliding_window[
+                        buffer_idx,
                         private_loaded_sliding_Y_t_value_idx,
                         two_as_long * (private_array_first_col + j),
                     ]
@@ -450,6 +709,7 @@ def make_matmul_2d_kernel(
             for i in range(private_result_array_height):
                 for j in range(private_Y_t_sliding_window_width):
                     private_loaded_X_value = local_X_sliding_window[
+                        buffer_idx,
                         private_loaded_sliding_X_value_idx,
                         two_as_long * (private_array_first_col + j),
                     ]
@@ -486,7 +746,172 @@ def make_matmul_2d_kernel(
                         result_col_idx += nb_work_items_for_Y_t_window
             result_row_idx += nb_work_items_for_X_window
 
-    return matmul[global_size, work_group_size]
+    @dpex.func
+    # fmt: off
+    def _reduce_private_result(
+        local_first_row_idx,     # PARAM
+        local_col_idx,           # PARAM
+        result_first_col_idx,    # PARAM
+        private_result,          # IN      (private_result_array_height, private_result_array_width)  # noqa
+        column_bias,             # IN      (Y_t_n_rows,)
+        local_row_values,        # OUT     (result_window_height, nb_work_items_for_Y_t_window)  # noqa
+        local_row_idx,           # OUT     (result_window_height, nb_work_items_for_Y_t_window)  # noqa
+    ):
+        # fmt: on
+        local_row_idx_ = local_first_row_idx
+        for i in range(private_result_array_height):
+            best_value = worst_value
+            best_idx = Y_t_n_rows
+            result_col_idx = result_first_col_idx
+            for j in range(private_result_array_width):
+                if result_col_idx < Y_t_n_rows:
+                    value = out_fused_elementwise_fn(private_result[i, j])
+                    if with_column_bias:
+                        value += column_bias[result_col_idx]
+                    # NB: the columns are visited in increasing order, hence ties are
+                    # already broken in favor of the smallest index.
+                    if is_better(value, best_value):
+                        best_value = value
+                        best_idx = result_col_idx
+                result_col_idx += nb_work_items_for_Y_t_window
+            local_row_values[local_row_idx_, local_col_idx] = best_value
+            local_row_idx[local_row_idx_, local_col_idx] = best_idx
+            local_row_idx_ += nb_work_items_for_X_window
+
+    @dpex.func
+    # fmt: off
+    def _write_row_reduction(
+        local_first_row_idx,     # PARAM
+        result_first_row_idx,    # PARAM
+        group_col_idx,           # PARAM
+        local_row_values,        # IN      (result_window_height, nb_work_items_for_Y_t_window)  # noqa
+        local_row_idx,           # IN      (result_window_height, nb_work_items_for_Y_t_window)  # noqa
+        partial_values,          # OUT     (X_n_rows, global_grid_n_cols)
+        partial_idx,             # OUT     (X_n_rows, global_grid_n_cols)
+    ):
+        # fmt: on
+        local_row_idx_ = local_first_row_idx
+        result_row_idx = result_first_row_idx
+        for _ in range(private_result_array_height):
+            if result_row_idx < X_n_rows:
+                best_value = local_row_values[local_row_idx_, zero_idx]
+                best_idx = local_row_idx[local_row_idx_, zero_idx]
+                for k in range(1, nb_work_items_for_Y_t_window):
+                    value = local_row_values[local_row_idx_, k]
+                    idx = local_row_idx[local_row_idx_, k]
+                    if is_better(value, best_value) or (
+                        value == best_value and idx < best_idx
+                    ):
+                        best_value = value
+                        best_idx = idx
+                partial_values[result_row_idx, group_col_idx] = best_value
+                partial_idx[result_row_idx, group_col_idx] = best_idx
+            local_row_idx_ += nb_work_items_for_X_window
+            result_row_idx += nb_work_items_for_X_window
+
+    if out_row_reduction is None:
+        return matmul[global_size, work_group_size]
+
+    # The partial reductions of the work groups that cover the same rows are merged by
+    # a second kernel. If a single work group covers entire rows, its results are
+    # written directly in the output arrays.
+    local_row_reduction_shape = (result_window_height, nb_work_items_for_Y_t_window)
+    worst_value, is_better = _get_row_reduction_comparison(out_row_reduction, dtype)
+    matmul_row_reduction_kernel = matmul_row_reduction[global_size, work_group_size]
+
+    if global_grid_n_cols > 1:
+        merge_row_reductions = _make_merge_row_reductions_kernel(
+            X_n_rows,
+            global_grid_n_cols,
+            is_better,
+            device.max_work_group_size,
+            dtype,
+        )
+    else:
+        merge_row_reductions = None
+
+    def _matmul_row_reduction(X, Y_t, column_bias, result_values, result_idx):
+        if merge_row_reductions is None:
+            matmul_row_reduction_kernel(
+                X,
+                Y_t,
+                column_bias,
+                dpt.reshape(result_values, (X_n_rows, 1)),
+                dpt.reshape(result_idx, (X_n_rows, 1)),
+            )
+            return
+
+        # NB: the partial reductions are allocated at each call rather than by the
+        # factory, so that concurrent calls of the cached kernel don't share them.
+        partial_values = dpt.empty(
+            (X_n_rows, global_grid_n_cols), dtype=dtype, device=device
+        )
+        partial_idx = dpt.empty(
+            (X_n_rows, global_grid_n_cols), dtype=np.int64, device=device
+        )
+        matmul_row_reduction_kernel(X, Y_t, column_bias, partial_values, partial_idx)
+        merge_row_reductions(partial_values, partial_idx, result_values, result_idx)
+
+    if with_column_bias:
+        return _matmul_row_reduction
+
+    def _matmul_row_reduction_without_bias(X, Y_t, result_values, result_idx):
+        # NB: the kernel expects an array for the (unused) column bias.
+        no_column_bias = dpt.empty((1,), dtype=dtype, device=device)
+        _matmul_row_reduction(X, Y_t, no_column_bias, result_values, result_idx)
+
+    return _matmul_row_reduction_without_bias
+
+
+def _get_row_reduction_comparison(out_row_reduction, dtype):
+    if out_row_reduction == "argmin":
+
+        @dpex.func
+        def is_better(value, best_value):
+            return value < best_value
+
+        return dtype(math.inf), is_better
+
+    @dpex.func
+    def is_better(value, best_value):
+        return value > best_value
+
+    return dtype(-math.inf), is_better
+
+
+def _make_merge_row_reductions_kernel(
+    n_rows, n_partials, is_better, work_group_size, dtype
+):
+    n_partials = np.int64(n_partials)
+    global_size = math.ceil(n_rows / work_group_size) * work_group_size
+
+    @dpex.kernel
+    # fmt: off
+    def merge_row_reductions(
+        partial_values,     # IN      (n_rows, n_partials)
+        partial_idx,        # IN      (n_rows, n_partials)
+        result_values,      # OUT     (n_rows,)
+        result_idx,         # OUT     (n_rows,)
+    ):
+        # fmt: on
+        row_idx = dpex.get_global_id(zero_idx)
+        if row_idx >= n_rows:
+            return
+
+        # NB: the partial results are ordered by increasing column indices, hence ties
+        # are broken in favor of the smallest index.
+        best_value = partial_values[row_idx, zero_idx]
+        best_idx = partial_idx[row_idx, zero_idx]
+        for partial_idx_ in range(1, n_partials):
+            value = partial_values[row_idx, partial_idx_]
+            if is_better(value, best_value):
+                best_value = value
+                best_idx = partial_idx[row_idx, partial_idx_]
+
+        result_values[row_idx] = best_value
+        result_idx[row_idx] = best_idx
+
+    return merge_row_reductions[global_size, work_group_size]
 
 
 def _make_accumulate_step_unrolled_kernel_func(private_result_array_width, multiply_fn):
@@ -564,4 +989,16 @@ def _make_accumulate_step_unrolled_kernel_func(private_result_array_width, multi
                 private_loaded_X_value, private_Y_t_sliding_window[7, j]
             )
 
+    else:
+        # Larger private windows, that are reached with high arithmetic intensity
+        # multipliers, are not manually unrolled.
+        @dpex.func
+        def _accumulate_step_unrolled(
+            i, j, private_loaded_X_value, private_Y_t_sliding_window, private_result
+        ):
+            for k in range(private_result_array_width):
+                private_result[i, k] += multiply_fn(
+                    private_loaded_X_value, private_Y_t_sliding_window[k, j]
+                )
+
     return _accumulate_step_unrolled
@@ -1,5 +1,6 @@
+import math
+import numbers
 import random
-from functools import lru_cache
 
 import dpctl
 import dpctl.tensor as dpt
@@ -7,7 +8,9 @@ import numba_dpex as dpex
 import numpy as np
 from numba import float32, float64, int64, uint32, uint64
 
+from ._kernel_cache import kernel_cache
 from ._utils import _get_sequential_processing_device
+from .topk import topk_idx
 
 # This code is largely inspired from the numba.cuda.random module and the
 # numba/cuda/random.py where it's defined (v<0.57), and by the implementation of the
@@ -19,8 +22,9 @@ from ._utils import _get_sequential_processing_device
 # NB1: we implement xoroshiro128++ rather than just xoroshiro128+, which is preferred.
 # Reference resource about PRNG: https://prng.di.unimi.it/
 
-# NB2: original numba.cuda.random code also includes functions for generating normally
-# distributed floats but we don't include it here as long as it's not needed.
+# NB2: unlike in the original numba.cuda.random code, normally distributed floats are
+# generated with the Box-Muller transform in the bulk generator `normal`, there is no
+# kernel function that returns a single normally distributed float.
 
 zero_idx = int64(0)
 one_idx = int64(1)
@@ -38,7 +42,7 @@ def get_random_raw(states):
     return result
 
 
-@lru_cache
+@kernel_cache
 def make_random_raw_kernel():
     """Returns a single pseudo-random `uint64` integer value.
     Similar to numpy.random.BitGenerator.random_raw(size=1).
@@ -121,6 +125,37 @@ def make_rand_uniform_kernel_func(dtype):
     return xoroshiro128pp_uniform
 
 
+def make_randint_kernel_func():
+    """Instantiate a kernel function that returns a random integer in [0, high)
+
+    The returned kernel function takes three arguments:
+
+    - states : a state array. See create_xoroshiro128pp_states for details.
+
+    - state_idx : the index of the RNG state to use to generate the next
+      random integer.
+
+    - high : the (exclusive) upper bound of the range of the random integer. It is
+      expected to be an `uint64` integer. The returned value is also an `uint64`
+      integer.
+
+    NB: the random integer is obtained with a modulo of a random `uint64` value, which
+    has a bias of order `high / 2**64`, negligible for the values of `high` (typically,
+    a number of samples) this function is meant to be used with.
+    """
+
+    @dpex.func
+    def xoroshiro128pp_randint(states, state_idx, high):
+        """Return one random integer in [0, high)
+
+        Calling this function advances the states[state_idx] by a single RNG step and
+        leaves the other states unchanged.
+        """
+        return _xoroshiro128pp_next(states, state_idx) % high
+
+    return xoroshiro128pp_randint
+
+
 def create_xoroshiro128pp_states(n_states, subsequence_start=0, seed=None, device=None):
     """Returns a new device array initialized for n random number generators.
 
@@ -184,7 +219,385 @@ def create_xoroshiro128pp_states(n_states, subsequence_start=0, seed=None, devic
     return states
 
 
-@lru_cache
+def uniform(states, size, dtype=np.float32, low=0.0, high=1.0):
+    """Returns a new device array of floats drawn uniformly in [low, high).
+
+    The `n_states` RNG states in `states` (see `create_xoroshiro128pp_states`) are used
+    in parallel, by one work item each. The item at position `item_idx` (in C order)
+    is drawn by the state `item_idx % n_states`, and each state draws its items in
+    increasing order. Hence, for a given seed and a given number of states, the
+    output is the same on all devices, whatever the work group size. The float32 and
+    float64 outputs are equal up to the float32 precision.
+
+    Calling this function advances each RNG state by up to `ceil(size / n_states)`
+    steps.
+
+    Parameters
+    ----------
+    states : dpctl.tensor array of shape (n_states, 2)
+        The RNG states, that are updated inplace.
+
+    size : int or tuple of int
+        The shape of the output.
+
+    dtype : {np.float32, np.float64}
+        The dtype of the output.
+
+    low, high : float
+        The bounds of the range of the output.
+    """
+    dtype = np.dtype(dtype).type
+    return _fill_random(states, size, "uniform", dtype, (dtype(low), dtype(high)))
+
+
+def normal(states, size, dtype=np.float32, loc=0.0, scale=1.0):
+    """Returns a new device array of floats drawn from a normal distribution.
+
+    Each float is computed with the Box-Muller transform of two successive uniform
+    floats of the same RNG state. See `uniform` for the reproducibility guarantees and
+    the parameters `states`, `size` and `dtype`.
+
+    Parameters
+    ----------
+    loc, scale : float
+        The mean and the standard deviation of the distribution.
+    """
+    dtype = np.dtype(dtype).type
+    return _fill_random(states, size, "normal", dtype, (dtype(loc), dtype(scale)))
+
+
+def integers(states, low, high, size):
+    """Returns a new device array of int64 integers drawn uniformly in [low, high).
+
+    See `uniform` for the reproducibility guarantees and the parameters `states` and
+    `size`, and `make_randint_kernel_func` for the bias of the sampling.
+    """
+    if high <= low:
+        raise ValueError(f"Expected low < high, got low={low} and high={high}.")
+    return _fill_random(
+        states, size, "integers", np.int64, (np.int64(low), np.uint64(high - low))
+    )
+
+
+def permutation(states, n):
+    """Returns a new device array with a random permutation of [0, n), with dtype
+    int64.
+
+    The permutation is a Feistel network on the smallest range of even bit width
+    that contains [0, n), whose round functions are keyed with values drawn from
+    `states`, and restricted to [0, n) by cycle walking, i.e by applying the network
+    again to the values that fall outside of [0, n). It is computed in parallel for
+    all the items, without sorting. For a given seed and a given number of states, the
+    output is the same on all devices.
+
+    NB: the permutation is pseudo-random, it is meant to shuffle or subsample data
+    rather than to be used for cryptographic purposes.
+
+    See: Mitchell, R., Stokes, D., Frank, E., & Holmes, G. (2022). Bandwidth-optimal
+    random shuffling for GPUs. ACM Transactions on Parallel Computing, 9(1).
+    """
+    round_keys = _fill_random(states, _N_FEISTEL_ROUNDS, "raw", np.uint64, ())
+
+    n_half_bits = max(math.ceil(math.ceil(math.log2(max(n, 2))) / 2), 1)
+
+    device = states.device.sycl_device
+    permutation_kernel = _make_permutation_kernel(device.max_work_group_size)
+    result = dpt.empty((n,), dtype=np.int64, device=device)
+    permutation_kernel(
+        round_keys,
+        n_half_bits,
+        # OUT
+        result,
+    )
+    return result
+
+
+def _fill_random(states, size, distribution, dtype, parameters):
+    shape = (size,) if isinstance(size, numbers.Integral) else tuple(size)
+    n_items = math.prod(shape)
+    device = states.device.sycl_device
+
+    result = dpt.empty((n_items,), dtype=dtype, device=device)
+    if n_items == 0:
+        return dpt.reshape(result, shape)
+
+    # NB: the distributions without parameters still pass two (unused) parameters,
+    # so that all the distributions share the same kernel signature.
+    first_parameter, second_parameter = parameters or (dtype(0), dtype(0))
+
+    fill_random_kernel = _make_fill_random_kernel(
+        device.max_work_group_size, distribution, dtype
+    )
+    fill_random_kernel(
+        first_parameter,
+        second_parameter,
+        # INOUT
+        states,
+        # OUT
+        result,
+    )
+    return dpt.reshape(result, shape)
+
+
+@kernel_cache
+def _make_fill_random_kernel(work_group_size, distribution, dtype):
+    """Returns a function that fills an array with random values drawn from
+    `distribution`, using all the RNG states of `states`.
+
+    The parameters of the distribution are arguments of the kernel, so that the
+    kernel is compiled once per dtype, distribution and work group size. The
+    returned function accepts arrays of states and of results of any size.
+    """
+    if distribution == "raw":
+
+        @dpex.func
+        def draw(states, state_idx, first_parameter, second_parameter):
+            return _xoroshiro128pp_next(states, state_idx)
+
+    elif distribution == "integers":
+        randint = make_randint_kernel_func()
+
+        @dpex.func
+        def draw(states, state_idx, low, n_values):
+            return low + int64(randint(states, state_idx, n_values))
+
+    else:
+        rand_uniform_kernel_func = make_rand_uniform_kernel_func(np.dtype(dtype))
+        one = dtype(1.0)
+
+        if distribution == "uniform":
+
+            @dpex.func
+            def draw(states, state_idx, low, high):
+                return low + (high - low) * rand_uniform_kernel_func(states, state_idx)
+
+        elif distribution == "normal":
+            minus_two = dtype(-2.0)
+            two_pi = dtype(2 * math.pi)
+
+            @dpex.func
+            def draw(states, state_idx, loc, scale):
+                # NB: `1 - u` is in (0, 1], so that its log is finite.
+                radius = math.sqrt(
+                    minus_two
+                    * math.log(one - rand_uniform_kernel_func(states, state_idx))
+                )
+                angle = two_pi * rand_uniform_kernel_func(states, state_idx)
+                return loc + scale * radius * math.cos(angle)
+
+        else:
+            raise ValueError(f"Unknown distribution {distribution}.")
+
+    one_idx = int64(1)
+
+    @dpex.kernel
+    # fmt: off
+    def fill_random(
+        first_parameter,    # PARAM
+        second_parameter,   # PARAM
+        states,             # INOUT     (n_states, 2)
+        result,             # OUT       (n_items,)
+    ):
+        # fmt: on
+        n_states = states.shape[zero_idx]
+        n_items = result.shape[zero_idx]
+        state_idx = dpex.get_global_id(zero_idx)
+        if state_idx >= n_states:
+            return
+
+        n_items_per_state = (n_items + n_states - one_idx) // n_states
+
+        # NB: the work items write consecutive items at each iteration.
+        for iteration_idx in range(n_items_per_state):
+            item_idx = iteration_idx * n_states + state_idx
+            if item_idx < n_items:
+                result[item_idx] = draw(
+                    states, state_idx, first_parameter, second_parameter
+                )
+
+    def _fill_random(first_parameter, second_parameter, states, result):
+        n_states = states.shape[0]
+        global_size = math.ceil(n_states / work_group_size) * work_group_size
+        fill_random[global_size, work_group_size](
+            first_parameter, second_parameter, states, result
+        )
+
+    return _fill_random
+
+
+_N_FEISTEL_ROUNDS = 4
+
+
+@kernel_cache
+def _make_permutation_kernel(work_group_size):
+    """Returns a function that writes a random permutation of [0, n) in an array of
+    size `n`, see `permutation`.
+
+    The size of the permutation and the bit width of the Feistel network are
+    arguments of the kernel, so that it is compiled once for all the sizes.
+    """
+    n_rounds = int64(_N_FEISTEL_ROUNDS)
+    one_as_uint64 = uint64(1)
+
+    # Constants of the finalizer of splitmix64 (see
+    # `_make_init_xoroshiro128pp_states_kernel`).
+    mix_const_1 = uint64(0xBF58476D1CE4E5B9)
+    mix_const_2 = uint64(0x94D049BB133111EB)
+    mix_rshift_1 = uint32(30)
+    mix_rshift_2 = uint32(27)
+    mix_rshift_3 = uint32(31)
+
+    @dpex.func
+    def _round_func(value, round_key):
+        z = value ^ round_key
+        z = (z ^ (z >> mix_rshift_1)) * mix_const_1
+        z = (z ^ (z >> mix_rshift_2)) * mix_const_2
+        return z ^ (z >> mix_rshift_3)
+
+    @dpex.func
+    def _feistel_network(value, round_keys, n_half_bits, half_mask):
+        left = value >> n_half_bits
+        right = value & half_mask
+        for round_idx in range(n_rounds):
+            new_right = left ^ (_round_func(right, round_keys[round_idx]) & half_mask)
+            left = right
+            right = new_right
+        return (left << n_half_bits) | right
+
+    @dpex.kernel
+    # fmt: off
+    def permutation(
+        round_keys,     # IN        (_N_FEISTEL_ROUNDS,)
+        n_half_bits,    # PARAM
+        result,         # OUT       (n,)
+    ):
+        # fmt: on
+        n = result.shape[zero_idx]
+        item_idx = dpex.get_global_id(zero_idx)
+        if item_idx >= n:
+            return
+
+        n_as_uint64 = uint64(n)
+        half_mask = (one_as_uint64 << n_half_bits) - one_as_uint64
+
+        # NB: the Feistel network is a bijection on [0, 2**(2 * n_half_bits)), hence
+        # walking its cycle from a value in [0, n) always comes back to [0, n), and
+        # the mapping of each value to the first value of its cycle in [0, n) is a
+        # bijection on [0, n). Since 2**(2 * n_half_bits) < 4 * n, the expected number
+        # of iterations is small.
+        value = _feistel_network(uint64(item_idx), round_keys, n_half_bits, half_mask)
+        while value >= n_as_uint64:
+            value = _feistel_network(value, round_keys, n_half_bits, half_mask)
+        result[item_idx] = int64(value)
+
+    def _permutation(round_keys, n_half_bits, result):
+        n = result.shape[0]
+        global_size = math.ceil(n / work_group_size) * work_group_size
+        permutation[global_size, work_group_size](
+            round_keys, uint64(n_half_bits), result
+        )
+
+    return _permutation
+
+
+def weighted_sample_without_replacement(weights, n_draws, seed=None):
+    """Draw `n_draws` distinct indices in [0, len(weights)) with probabilities
+    proportional to `weights`, without replacement, on the device of `weights`.
+
+    The sampling has the same distribution than successive weighted draws among
+    the remaining items, as in `numpy.random.RandomState.choice(..., replace=False)`.
+    Each item is given the key `log(1 - u) / weight`, where `u` is drawn uniformly
+    in [0, 1), and the items with the `n_draws` greatest keys are selected with
+    `topk_idx`. Items with zero weight are only selected if there are less than
+    `n_draws` items with a positive weight.
+
+    See: Efraimidis, P. S., & Spirakis, P. G. (2006). Weighted random sampling with a
+    reservoir. Information processing letters, 97(5).
+
+    Parameters
+    ----------
+    weights : dpctl.tensor array of shape (n_items,)
+        The non-negative weights of the items.
+
+    n_draws : int
+        The number of indices to draw, lesser or equal to `n_items`.
+
+    seed : int, numpy.random.RandomState or None
+        Seed for the RNG states, see `create_xoroshiro128pp_states`.
+
+    Returns
+    -------
+    result : dpctl.tensor array
+        An int64 array of shape (n_draws,) with the indices of the drawn items, in
+        the order they would be drawn by successive weighted draws.
+    """
+    (n_items,) = weights.shape
+    device = weights.device.sycl_device
+    work_group_size = device.max_work_group_size
+    n_states = min(n_items, 4 * work_group_size)
+
+    sampling_keys_kernel = _make_weighted_sampling_keys_kernel(
+        n_items, n_states, work_group_size, weights.dtype.type
+    )
+
+    states = create_xoroshiro128pp_states(n_states, seed=seed, device=device)
+    keys = dpt.empty((n_items,), dtype=weights.dtype, device=device)
+    sampling_keys_kernel(
+        weights,
+        # OUT
+        states,
+        keys,
+    )
+
+    result = topk_idx(keys, n_draws)
+
+    # NB: the order of the output of `topk_idx` is not deterministic, the `n_draws`
+    # indices are sorted by decreasing key, which only requires to copy `n_draws`
+    # items to the host.
+    order = np.argsort(-dpt.asnumpy(dpt.take(keys, result)), kind="stable")
+    return dpt.take(result, dpt.asarray(order, device=device))
+
+
+@kernel_cache
+def _make_weighted_sampling_keys_kernel(n_items, n_states, work_group_size, dtype):
+    rand_uniform_kernel_func = make_rand_uniform_kernel_func(np.dtype(dtype))
+
+    zero = dtype(0.0)
+    one = dtype(1.0)
+    minus_inf = dtype(-np.inf)
+    n_items_per_state = math.ceil(n_items / n_states)
+
+    @dpex.kernel
+    # fmt: off
+    def weighted_sampling_keys(
+        weights,        # IN        (n_items,)
+        states,         # INOUT     (n_states, 2)
+        keys,           # OUT       (n_items,)
+    ):
+        # fmt: on
+        state_idx = dpex.get_global_id(zero_idx)
+        if state_idx >= n_states:
+            return
+
+        # NB: the work items read consecutive items at each iteration.
+        for iteration_idx in range(n_items_per_state):
+            item_idx = iteration_idx * n_states + state_idx
+            if item_idx < n_items:
+                weight = weights[item_idx]
+                random_value = rand_uniform_kernel_func(states, state_idx)
+                if weight > zero:
+                    # NB: `1 - u` is in (0, 1], so that the key of an item with a
+                    # positive weight is finite, and always greater than the key of
+                    # the items with zero weight.
+                    keys[item_idx] = math.log(one - random_value) / weight
+                else:
+                    keys[item_idx] = minus_inf
+
+    global_size = math.ceil(n_states / work_group_size) * work_group_size
+    return weighted_sampling_keys[global_size, work_group_size]
+
+
+@kernel_cache
 def _make_init_xoroshiro128pp_states_kernel(n_states, subsequence_start):
     n_states = int64(n_states)
 
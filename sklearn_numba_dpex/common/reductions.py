@@ -1,20 +1,21 @@
 import math
-from functools import lru_cache
 
 import dpctl.tensor as dpt
 import numba_dpex as dpex
 import numpy as np
 
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
 from sklearn_numba_dpex.common._utils import (
     _check_max_work_group_size,
     check_power_of_2,
     get_maximum_power_of_2_smaller_than,
 )
+from sklearn_numba_dpex.profiling import profiled
 
 zero_idx = np.int64(0)
 
 
-@lru_cache
+@kernel_cache
 def make_argmin_reduction_1d_kernel(size, device, dtype, work_group_size="max"):
     """Implement 1d argmin with the same strategy than for
     make_sum_reduction_2d_axis1_kernel."""
@@ -211,6 +212,7 @@ def make_argmin_reduction_1d_kernel(size, device, dtype, work_group_size="max"):
 
 # TODO: this kernel could be abstracted away to support other commutative binary
 # operators than sum.
+@profiled
 def make_sum_reduction_2d_kernel(
     shape,
     device,
@@ -393,7 +395,7 @@ def make_sum_reduction_2d_kernel(
     return sum_reduction
 
 
-@lru_cache
+@kernel_cache
 def _prepare_sum_reduction_2d_axis0(
     n_cols, work_group_size, sub_group_size, fused_elementwise_func, dtype, device
 ):
@@ -639,7 +641,7 @@ def _make_partial_sum_reduction_2d_axis0_kernel(
     return work_group_shape, reduction_block_size, partial_sum_reduction
 
 
-@lru_cache
+@kernel_cache
 def _prepare_sum_reduction_2d_axis1(
     n_rows, work_group_size, fused_elementwise_func, dtype, device
 ):
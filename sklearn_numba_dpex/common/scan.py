@@ -0,0 +1,141 @@
+import math
+
+import dpctl.tensor as dpt
+import numba_dpex as dpex
+import numpy as np
+
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
+from sklearn_numba_dpex.common._utils import (
+    _check_max_work_group_size,
+    check_power_of_2,
+    get_maximum_power_of_2_smaller_than,
+)
+
+zero_idx = np.int64(0)
+one_idx = np.int64(1)
+two_idx = np.int64(2)
+
+
+@kernel_cache
+def make_inclusive_scan_1d_kernel(size, device, dtype, work_group_size="max"):
+    """Returns a function that computes the inclusive prefix sum (i.e the cumulative
+    sum) of a 1d array of `size` items.
+
+    The array is tiled with non-overlapping windows of `work_group_size` items, and
+    each window is scanned in local memory by a work group, with `log2(work_group_size)`
+    iterations in which each work item adds the value `2**iteration_idx` positions
+    before its own (Hillis-Steele). The sums of the windows are written to an
+    intermediary array, that is scanned recursively with the same strategy, before
+    being added to the items of the next windows. Hence the number of sequential
+    steps is `O(log(size))`.
+
+    The returned function returns a new array and leaves its input unchanged.
+    """
+    input_work_group_size = work_group_size
+    work_group_size = _check_max_work_group_size(
+        work_group_size, device, np.dtype(dtype).itemsize
+    )
+    if work_group_size == input_work_group_size:
+        check_power_of_2(work_group_size)
+    else:
+        # Round to the maximum smaller power of two
+        work_group_size = get_maximum_power_of_2_smaller_than(work_group_size)
+
+    n_local_iterations = np.int64(math.log2(work_group_size))
+    last_local_work_id = np.int64(work_group_size - 1)
+    zero = dtype(0.0)
+
+    @dpex.kernel
+    # fmt: off
+    def partial_inclusive_scan(
+        values,             # INOUT     (current_size,)
+        window_sums,        # OUT       (math.ceil(current_size / work_group_size),)
+    ):
+        # fmt: on
+        current_size = values.shape[zero_idx]
+        group_id = dpex.get_group_id(zero_idx)
+        local_work_id = dpex.get_local_id(zero_idx)
+        item_idx = group_id * work_group_size + local_work_id
+
+        local_values = dpex.local.array(work_group_size, dtype=dtype)
+
+        if item_idx < current_size:
+            local_values[local_work_id] = values[item_idx]
+        else:
+            local_values[local_work_id] = zero
+
+        dpex.barrier(dpex.LOCAL_MEM_FENCE)
+
+        offset = one_idx
+        for _ in range(n_local_iterations):
+            addend = zero
+            if local_work_id >= offset:
+                addend = local_values[local_work_id - offset]
+
+            # NB: all the work items must have read their addend before the local
+            # values are updated.
+            dpex.barrier(dpex.LOCAL_MEM_FENCE)
+            local_values[local_work_id] += addend
+            dpex.barrier(dpex.LOCAL_MEM_FENCE)
+            offset *= two_idx
+
+        if item_idx < current_size:
+            values[item_idx] = local_values[local_work_id]
+
+        if local_work_id == last_local_work_id:
+            window_sums[group_id] = local_values[local_work_id]
+
+    @dpex.kernel
+    # fmt: off
+    def add_window_offsets(
+        values,                 # INOUT     (current_size,)
+        scanned_window_sums,    # IN        (math.ceil(current_size / work_group_size),)
+    ):
+        # fmt: on
+        current_size = values.shape[zero_idx]
+        group_id = dpex.get_group_id(zero_idx)
+        item_idx = dpex.get_global_id(zero_idx)
+
+        if (group_id == zero_idx) or (item_idx >= current_size):
+            return
+
+        values[item_idx] += scanned_window_sums[group_id - one_idx]
+
+    # As many partial scans as necessary are chained until a single window remains.
+    sizes_and_empty_tensors_tuples = []
+    n_windows = size
+    while True:
+        n_windows = math.ceil(n_windows / work_group_size)
+        sizes = (n_windows * work_group_size, work_group_size)
+        window_sums = dpt.empty(n_windows, dtype=dtype, device=device)
+        sizes_and_empty_tensors_tuples.append((sizes, window_sums))
+        if n_windows == 1:
+            break
+
+    def inclusive_scan(values):
+        result = dpt.asarray(values, dtype=dtype, copy=True)
+
+        level_values = result
+        for sizes, window_sums in sizes_and_empty_tensors_tuples:
+            partial_inclusive_scan[sizes](
+                level_values,
+                # OUT
+                window_sums,
+            )
+            level_values = window_sums
+
+        # The scanned window sums of each level are added to the windows of the
+        # previous level, starting from the coarsest level, that is fully scanned
+        # since it consists of a single window.
+        for level_idx in range(len(sizes_and_empty_tensors_tuples) - 1, 0, -1):
+            sizes, scanned_window_sums = sizes_and_empty_tensors_tuples[level_idx - 1]
+            level_values = (
+                sizes_and_empty_tensors_tuples[level_idx - 2][1]
+                if level_idx > 1
+                else result
+            )
+            add_window_offsets[sizes](level_values, scanned_window_sums)
+
+        return result
+
+    return inclusive_scan
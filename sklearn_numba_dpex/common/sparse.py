@@ -0,0 +1,76 @@
+import dpctl.tensor as dpt
+import numpy as np
+import scipy.sparse as sp
+from sklearn.utils.extmath import row_norms
+
+
+class DeviceCSRMatrix:
+    """A matrix in the Compressed Sparse Row format, stored in device memory.
+
+    The arrays `data`, `indices` and `indptr` follow the same conventions than the
+    attributes of `scipy.sparse.csr_matrix`. `row_sq_norms` contains the squared
+    euclidean norm of each row, which is needed by the kernels that compute
+    distances on sparse data.
+
+    Use `DeviceCSRMatrix.from_scipy` to create an instance from a scipy sparse
+    matrix.
+    """
+
+    ndim = 2
+
+    def __init__(self, data, indices, indptr, shape, row_sq_norms):
+        self.data = data
+        self.indices = indices
+        self.indptr = indptr
+        self.shape = tuple(shape)
+        self.row_sq_norms = row_sq_norms
+
+    @classmethod
+    def from_scipy(cls, X, device, dtype=None):
+        """Copy the scipy sparse matrix `X` to `device`, in the CSR format.
+
+        The squared norms of the rows are computed on host, before the copy. `X` is
+        not modified: if its indices are not sorted, they are sorted in a copy.
+        """
+        X = sp.csr_matrix(X, dtype=dtype)
+        if not X.has_sorted_indices:
+            X = X.sorted_indices()
+        return cls(
+            data=dpt.asarray(X.data, device=device),
+            indices=dpt.asarray(X.indices, device=device),
+            indptr=dpt.asarray(X.indptr, device=device),
+            shape=X.shape,
+            row_sq_norms=dpt.asarray(
+                row_norms(X, squared=True).astype(X.dtype, copy=False), device=device
+            ),
+        )
+
+    @property
+    def dtype(self):
+        return self.data.dtype
+
+    @property
+    def device(self):
+        return self.data.device
+
+    @property
+    def nnz(self):
+        return self.data.shape[0]
+
+    def to_scipy(self):
+        """Copy the matrix back to host as a `scipy.sparse.csr_matrix`."""
+        return sp.csr_matrix(
+            (
+                dpt.asnumpy(self.data),
+                dpt.asnumpy(self.indices),
+                dpt.asnumpy(self.indptr),
+            ),
+            shape=self.shape,
+        )
+
+    def __repr__(self):
+        return (
+            f"<{self.shape[0]}x{self.shape[1]} DeviceCSRMatrix of type "
+            f"{np.dtype(self.dtype)} with {self.nnz} stored elements on "
+            f"{self.device}>"
+        )
@@ -0,0 +1,107 @@
+import threading
+
+import pytest
+
+from sklearn_numba_dpex import kernel_cache_info, set_kernel_cache_maxsize
+from sklearn_numba_dpex.common._kernel_cache import (
+    _kernel_cache,
+    _KernelCache,
+    kernel_cache,
+)
+
+
+@pytest.fixture
+def restore_kernel_cache_maxsize():
+    maxsize = _kernel_cache.maxsize
+    yield
+    set_kernel_cache_maxsize(maxsize)
+
+
+def _make_factory():
+    @kernel_cache
+    def make_dummy_kernel(n_items, dtype=None):
+        # Return a new object for each call so that cache hits can be detected.
+        return [n_items, dtype]
+
+    # NB: all the factories created by `_make_factory` share the same name, and thus
+    # the same entries and statistics in the cache.
+    make_dummy_kernel.cache_clear()
+    return make_dummy_kernel
+
+
+def test_kernel_cache_hits_and_misses():
+    make_dummy_kernel = _make_factory()
+
+    kernel = make_dummy_kernel(10)
+    assert make_dummy_kernel(10) is kernel
+    assert make_dummy_kernel(11) is not kernel
+
+    info = make_dummy_kernel.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (1, 2, 0, 2)
+
+    factory_name = f"{__name__}._make_factory.<locals>.make_dummy_kernel"
+    assert kernel_cache_info()["factories"][factory_name] == info._asdict()
+
+    make_dummy_kernel.cache_clear()
+    info = make_dummy_kernel.cache_info()
+    assert (info.hits, info.misses, info.evictions, info.currsize) == (0, 0, 0, 0)
+    assert make_dummy_kernel(10) is not kernel
+
+
+def test_kernel_cache_eviction():
+    # NB: an isolated cache is used, so that the kernels of the shared cache are not
+    # evicted.
+    cache = _KernelCache(maxsize=2)
+    factory_name = "make_dummy_kernel"
+    cache.register(factory_name)
+
+    def make_dummy_kernel(n_items):
+        return cache.get(factory_name, lambda n_items: [n_items], (n_items,), {})
+
+    kernel_1 = make_dummy_kernel(1)
+    kernel_2 = make_dummy_kernel(2)
+    # Use kernel_1 so that kernel_2 becomes the least recently used entry
+    assert make_dummy_kernel(1) is kernel_1
+
+    make_dummy_kernel(3)
+    info = cache.info(factory_name)
+    assert info.evictions == 1
+    assert info.currsize == 2
+    assert make_dummy_kernel(1) is kernel_1
+    assert make_dummy_kernel(2) is not kernel_2
+
+    cache.set_maxsize(0)
+    assert cache.info(factory_name).currsize == 0
+    assert make_dummy_kernel(1) is not make_dummy_kernel(1)
+
+
+def test_set_kernel_cache_maxsize(restore_kernel_cache_maxsize):
+    maxsize = _kernel_cache.info().currsize + 10
+    set_kernel_cache_maxsize(maxsize)
+    assert kernel_cache_info()["maxsize"] == maxsize
+
+
+def test_kernel_cache_thread_safety():
+    make_dummy_kernel = _make_factory()
+    n_threads = 8
+    results = [None] * n_threads
+
+    def target(thread_idx):
+        results[thread_idx] = make_dummy_kernel(42, dtype="float32")
+
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(n_threads)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert all(result is results[0] for result in results)
+    info = make_dummy_kernel.cache_info()
+    assert info.hits + info.misses == n_threads
+    assert info.currsize == 1
+
+
+@pytest.mark.parametrize("maxsize", [-1, 1.5])
+def test_set_kernel_cache_maxsize_raises(maxsize):
+    with pytest.raises(ValueError, match="non-negative integer"):
+        set_kernel_cache_maxsize(maxsize)
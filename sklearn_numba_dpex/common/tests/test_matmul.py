@@ -4,6 +4,7 @@ import dpctl
 import dpctl.tensor as dpt
 import numpy as np
 import pytest
+from numpy.testing import assert_array_equal
 from sklearn.utils._testing import assert_allclose
 
 from sklearn_numba_dpex.common.matmul import make_matmul_2d_kernel
@@ -21,7 +22,12 @@ def _random_reshaped(shape, dtype, rng):
 
 
 def _test_matmul_2d(
-    test_input_shapes, array_fn, work_group_size, sub_group_size, dtype
+    test_input_shapes,
+    array_fn,
+    work_group_size,
+    sub_group_size,
+    dtype,
+    **matmul_parameters,
 ):
     X_shape, Y_shape = test_input_shapes
 
@@ -58,6 +64,7 @@ def _test_matmul_2d(
         device,
         work_group_size=work_group_size,
         sub_group_size=sub_group_size,
+        **matmul_parameters,
     )
 
     result = dpt.zeros((X_n_rows, Y_t_n_rows), dtype, order="C", device=device)
@@ -127,6 +134,111 @@ def test_matmul_2d_large(test_input_shapes, array_fn, dtype):
     )
 
 
+@pytest.mark.parametrize("double_buffer_local_windows", [False, True])
+@pytest.mark.parametrize("arithmetic_intensity_multiplier", [1, 4])
+@pytest.mark.parametrize(
+    "work_group_size, sub_group_size", [(4, 2), (16, 4), (None, None)]
+)
+@pytest.mark.parametrize("dtype", float_dtype_params)
+@pytest.mark.parametrize(
+    "test_input_shapes",
+    [
+        ((1, 1), (1, 1)),
+        ((5, 4), (4, 10)),
+        ((10, 5), (5, 4)),
+        ((661, 1999), (1999, 563)),
+    ],
+)
+def test_matmul_2d_geometries(
+    test_input_shapes,
+    dtype,
+    work_group_size,
+    sub_group_size,
+    arithmetic_intensity_multiplier,
+    double_buffer_local_windows,
+):
+    _test_matmul_2d(
+        test_input_shapes,
+        "random",
+        work_group_size,
+        sub_group_size,
+        dtype,
+        arithmetic_intensity_multiplier_X=arithmetic_intensity_multiplier,
+        arithmetic_intensity_multiplier_Y=arithmetic_intensity_multiplier,
+        double_buffer_local_windows=double_buffer_local_windows,
+    )
+
+
+@pytest.mark.parametrize("out_row_reduction", ["argmin", "argmax"])
+@pytest.mark.parametrize("with_column_bias", [False, True])
+@pytest.mark.parametrize(
+    "work_group_size, sub_group_size", [(4, 2), (16, 4), (None, None)]
+)
+@pytest.mark.parametrize("dtype", float_dtype_params)
+@pytest.mark.parametrize(
+    "test_input_shapes",
+    [
+        ((1, 1), (1, 1)),
+        ((5, 4), (4, 10)),
+        ((10, 4), (4, 5)),
+        ((661, 31), (31, 563)),
+    ],
+)
+def test_matmul_2d_row_reduction(
+    test_input_shapes,
+    dtype,
+    work_group_size,
+    sub_group_size,
+    with_column_bias,
+    out_row_reduction,
+):
+    X_shape, Y_shape = test_input_shapes
+    rng = np.random.default_rng(seed=123)
+    X = _random_reshaped(X_shape, dtype, rng)
+    Y = _random_reshaped(Y_shape, dtype, rng)
+    column_bias = rng.random(Y_shape[1], dtype=dtype)
+
+    X_n_rows, n_cols = X_shape
+    Y_t_n_rows = Y_shape[1]
+
+    expected_result = np.matmul(X, Y)
+    if with_column_bias:
+        expected_result += column_bias
+    reduce_fn = np.argmin if out_row_reduction == "argmin" else np.argmax
+    expected_idx = reduce_fn(expected_result, axis=1)
+    expected_values = np.take_along_axis(
+        expected_result, expected_idx[:, None], axis=1
+    )[:, 0]
+
+    X = dpt.asarray(X, order="C")
+    Y_t = dpt.asarray(Y.T, order="C")
+    device = X.device.sycl_device
+
+    matmul_row_reduction_kernel = make_matmul_2d_kernel(
+        X_n_rows,
+        Y_t_n_rows,
+        n_cols,
+        dtype,
+        device,
+        out_row_reduction=out_row_reduction,
+        with_column_bias=with_column_bias,
+        work_group_size=work_group_size,
+        sub_group_size=sub_group_size,
+    )
+
+    result_values = dpt.empty((X_n_rows,), dtype=dtype, device=device)
+    result_idx = dpt.empty((X_n_rows,), dtype=np.int64, device=device)
+    if with_column_bias:
+        matmul_row_reduction_kernel(
+            X, Y_t, dpt.asarray(column_bias), result_values, result_idx
+        )
+    else:
+        matmul_row_reduction_kernel(X, Y_t, result_values, result_idx)
+
+    assert_array_equal(expected_idx, dpt.asnumpy(result_idx))
+    assert_allclose(expected_values, dpt.asnumpy(result_values))
+
+
 no_error = nullcontext()
 expected_power_of_two = pytest.raises(
     ValueError,
@@ -8,9 +8,17 @@ import pytest
 from sklearn.utils._testing import assert_allclose
 
 from sklearn_numba_dpex.common.random import (
+    _make_fill_random_kernel,
+    _make_permutation_kernel,
     create_xoroshiro128pp_states,
     get_random_raw,
+    integers,
     make_rand_uniform_kernel_func,
+    make_randint_kernel_func,
+    normal,
+    permutation,
+    uniform,
+    weighted_sample_without_replacement,
 )
 from sklearn_numba_dpex.testing.config import float_dtype_params
 
@@ -134,6 +142,130 @@ def test_rng_quality(dtype):
     assert (np.abs(distribution_in_bins - 2e5) < 1e3).all()
 
 
+def test_randint_quality():
+    """Check that the distribution of random integers sampled in [0, high) approximate
+    a uniform distribution"""
+    size = int(1e6)
+    high = 5
+    n_work_items = 1000
+    size_per_work_item = size // n_work_items
+    states = create_xoroshiro128pp_states(n_states=n_work_items, seed=42)
+    random_ints = dpt.empty((size,), dtype=np.int64)
+    _make_randint_kernel(size_per_work_item, high)[n_work_items, 1](states, random_ints)
+    random_ints = dpt.asnumpy(random_ints)
+    assert random_ints.min() == 0
+    assert random_ints.max() == high - 1
+    distribution_in_bins = np.bincount(random_ints, minlength=high)
+    assert (np.abs(distribution_in_bins - 2e5) < 1e3).all()
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_bulk_uniform_and_normal(dtype):
+    size = (1000, 1000)
+    states = create_xoroshiro128pp_states(n_states=1000, seed=42)
+
+    random_floats = dpt.asnumpy(uniform(states, size, dtype=dtype, low=-1, high=3))
+    assert random_floats.shape == size
+    assert random_floats.dtype == dtype
+    distribution_in_bins, _ = np.histogram(random_floats, bins=np.linspace(-1, 3, 6))
+    assert (np.abs(distribution_in_bins - 2e5) < 1e3).all()
+
+    random_floats = dpt.asnumpy(normal(states, size, dtype=dtype, loc=2, scale=3))
+    assert random_floats.shape == size
+    assert random_floats.dtype == dtype
+    assert abs(random_floats.mean() - 2) < 1e-2
+    assert abs(random_floats.std() - 3) < 1e-2
+
+
+def test_bulk_uniform_reproducibility():
+    """Check that the output only depends on the seed and on the number of states,
+    and that the items are drawn in the same order than with one state per item."""
+    size = 100
+    outputs = [
+        dpt.asnumpy(uniform(create_xoroshiro128pp_states(n_states=10, seed=42), size))
+        for _ in range(2)
+    ]
+    np.testing.assert_array_equal(*outputs)
+
+    # The first 10 items are drawn by the first step of each of the 10 states.
+    expected_first_items = dpt.asnumpy(
+        uniform(create_xoroshiro128pp_states(n_states=10, seed=42), 10)
+    )
+    np.testing.assert_array_equal(expected_first_items, outputs[0][:10])
+
+
+def test_bulk_random_kernels_do_not_depend_on_size_and_parameters():
+    states = create_xoroshiro128pp_states(n_states=10, seed=42)
+    uniform(states, 5, low=0, high=1)
+    integers(states, 0, 2, 5)
+    misses = _make_fill_random_kernel.cache_info().misses
+
+    uniform(states, (7, 3), low=-2, high=4)
+    integers(states, -3, 10, 100)
+    uniform(create_xoroshiro128pp_states(n_states=20, seed=0), 11)
+    assert _make_fill_random_kernel.cache_info().misses == misses
+
+
+def test_bulk_integers():
+    states = create_xoroshiro128pp_states(n_states=1000, seed=42)
+    random_ints = dpt.asnumpy(integers(states, -2, 3, int(1e6)))
+    assert random_ints.dtype == np.int64
+    assert random_ints.min() == -2
+    assert random_ints.max() == 2
+    distribution_in_bins = np.bincount(random_ints + 2, minlength=5)
+    assert (np.abs(distribution_in_bins - 2e5) < 1e3).all()
+
+    with pytest.raises(ValueError, match="Expected low < high"):
+        integers(states, 3, 3, 10)
+
+
+@pytest.mark.parametrize("n", [1, 2, 7, 64, 1000, 4097])
+def test_permutation(n):
+    states = create_xoroshiro128pp_states(n_states=10, seed=42)
+    result = dpt.asnumpy(permutation(states, n))
+    assert result.dtype == np.int64
+    np.testing.assert_array_equal(np.sort(result), np.arange(n))
+
+    states = create_xoroshiro128pp_states(n_states=10, seed=42)
+    np.testing.assert_array_equal(result, dpt.asnumpy(permutation(states, n)))
+
+    if n >= 1000:
+        # The permutation is not trivial.
+        assert (result != np.arange(n)).mean() > 0.9
+
+
+def test_permutation_kernel_does_not_depend_on_n():
+    states = create_xoroshiro128pp_states(n_states=10, seed=42)
+    permutation(states, 10)
+    misses = _make_permutation_kernel.cache_info().misses
+
+    for n in (7, 100, 5000):
+        permutation(states, n)
+    assert _make_permutation_kernel.cache_info().misses == misses
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_weighted_sample_without_replacement(dtype):
+    """Check that the indices are distinct, that items with zero weight are never
+    drawn, and that the first draw follows the distribution of the weights."""
+    weights = np.array([0, 1, 2, 0, 3, 4], dtype=dtype)
+    weights_dpt = dpt.asarray(weights)
+
+    n_repeats = 20000
+    rng = np.random.RandomState(42)
+    first_draws = np.zeros(len(weights), dtype=np.int64)
+    for _ in range(n_repeats):
+        draws = dpt.asnumpy(
+            weighted_sample_without_replacement(weights_dpt, 3, seed=rng)
+        )
+        assert len(np.unique(draws)) == 3
+        assert (weights[draws] > 0).all()
+        first_draws[draws[0]] += 1
+
+    expected_first_draws = n_repeats * weights / weights.sum()
+    assert (np.abs(first_draws - expected_first_draws) < 0.03 * n_repeats).all()
+
+
 def _get_single_rand_value(random_state, dtype):
     """Return a single rand value sampled uniformly in [0, 1)"""
     _get_single_rand_value_kernel = _make_get_single_rand_value_kernel(dtype)
@@ -204,3 +336,23 @@ def _make_rand_uniform_kernel(size, dtype, size_per_work_item):
         states[item_idx, 1] = private_states[0, 1]
 
     return _rand_uniform_kernel
+
+
+@lru_cache
+def _make_randint_kernel(size_per_work_item, high):
+    randint_kernel_func = make_randint_kernel_func()
+    high = np.uint64(high)
+
+    @dpex.kernel
+    # fmt: off
+    def _randint_kernel(
+        states,                           # IN               (n_work_items, 2)
+        out,                              # OUT              (n_work_items * size_per_work_item,)  # noqa
+    ):
+        # fmt: on
+        item_idx = dpex.get_global_id(0)
+        out_idx = item_idx * size_per_work_item
+        for i in range(size_per_work_item):
+            out[out_idx + i] = randint_kernel_func(states, item_idx, high)
+
+    return _randint_kernel
@@ -0,0 +1,28 @@
+import dpctl.tensor as dpt
+import numpy as np
+import pytest
+from sklearn.utils._testing import assert_allclose
+
+from sklearn_numba_dpex.common.scan import make_inclusive_scan_1d_kernel
+from sklearn_numba_dpex.testing.config import float_dtype_params
+
+
+@pytest.mark.parametrize("work_group_size", [2, 4, 8, "max"])
+@pytest.mark.parametrize("size", [1, 3, 4, 5, 17, 64, 100])
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_inclusive_scan_1d(size, work_group_size, dtype):
+    rng = np.random.default_rng(0)
+    array_in = rng.random(size).astype(dtype)
+    expected_result = np.cumsum(array_in)
+
+    array_in_dpt = dpt.asarray(array_in)
+    device = array_in_dpt.device.sycl_device
+
+    inclusive_scan = make_inclusive_scan_1d_kernel(
+        size, device, dtype, work_group_size=work_group_size
+    )
+    actual_result = dpt.asnumpy(inclusive_scan(array_in_dpt))
+
+    assert_allclose(expected_result, actual_result, rtol=1e-5)
+    # The input is left unchanged.
+    assert_allclose(array_in, dpt.asnumpy(array_in_dpt))
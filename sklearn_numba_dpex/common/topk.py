@@ -7,12 +7,12 @@
 # (https://dl.acm.org/doi/pdf/10.1145/3458817.3476141)
 
 import math
-from functools import lru_cache
 
 import dpctl.tensor as dpt
 import numba_dpex as dpex
 import numpy as np
 
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
 from sklearn_numba_dpex.common._utils import (
     _enforce_matmul_like_work_group_geometry,
     _get_global_mem_cache_size,
@@ -536,7 +536,7 @@ def _get_n_bits_per_item(dtype):
     return np.dtype(dtype).itemsize * 8
 
 
-@lru_cache
+@kernel_cache
 def _make_create_radix_histogram_kernel(
     n_rows,
     n_cols,
@@ -993,7 +993,7 @@ def _make_create_radix_histogram_kernel(
     )
 
 
-@lru_cache
+@kernel_cache
 def _make_check_radix_histogram_kernel(radix_size, dtype, work_group_size):
     radix_bits = int(math.log2(radix_size))
     lexicographical_unmapping = _make_lexicographical_unmapping_kernel_func(dtype)
@@ -1123,7 +1123,7 @@ def _make_check_radix_histogram_kernel(radix_size, dtype, work_group_size):
     return update_radix_position[1, 1], _check_radix_histogram
 
 
-@lru_cache
+@kernel_cache
 def _make_gather_topk_kernel(
     n_rows,
     n_cols,
@@ -1246,7 +1246,7 @@ def _make_gather_topk_kernel(
     return gather_topk[global_shape, work_group_shape]
 
 
-@lru_cache
+@kernel_cache
 def _make_gather_topk_idx_kernel(
     n_rows,
     n_cols,
@@ -0,0 +1,88 @@
+import contextlib
+import numbers
+
+_kmeans_config = dict(
+    batched_n_init=False, convergence_check_interval=1, fused_fit_transform=False
+)
+
+
+def _check_bool(value, name):
+    if not isinstance(value, bool):
+        raise ValueError(f"Expected {name} to be a boolean, got {value}.")
+    return value
+
+
+def _check_positive_int(value, name):
+    if isinstance(value, bool) or not isinstance(value, numbers.Integral) or value < 1:
+        raise ValueError(f"Expected {name} to be a positive integer, got {value}.")
+    return int(value)
+
+
+_CHECKS = dict(
+    batched_n_init=_check_bool,
+    convergence_check_interval=_check_positive_int,
+    fused_fit_transform=_check_bool,
+)
+
+
+def set_kmeans_config(**config):
+    """Set options of the KMeans engine that are not parameters of
+    `sklearn.cluster.KMeans`.
+
+    Parameters
+    ----------
+    batched_n_init : bool, default=False
+        If True, the `n_init` initializations of a fit with `algorithm="lloyd"` are
+        run at once, in a single batched pass on the data at each iteration, when the
+        buffers of all the runs fit in the memory budget. It saves the cost of reading
+        the data once per run, which only pays off when the data is small enough that
+        the runs are bound by the latency of the kernel launches rather than by the
+        compute (see `benchmark/kmeans_n_init.py`). The batched runs do not support
+        `verbose`.
+
+    convergence_check_interval : int, default=1
+        With `algorithm="lloyd"` on dense data, and unless the `n_init` runs are
+        batched, the convergence criteria of the fit are evaluated, and the empty
+        clusters are relocated, every `convergence_check_interval` iterations only.
+        Each evaluation waits for the device and copies a few values to the host,
+        which can be a significant part of the runtime on small data. In-between, the
+        centroids of the empty clusters keep their previous value. The fit can run up
+        to `2 * convergence_check_interval` more iterations than with the default,
+        which evaluates the criteria at each iteration.
+
+    fused_fit_transform : bool, default=False
+        If True, the euclidean distances of the samples to the centroids are computed
+        in the final pass on the data of each fit with `n_init=1` and
+        `algorithm="lloyd"`, and kept on device until the next `transform` on the same
+        data, e.g. in `fit_transform`, that then does not read the data again. It
+        requires `n_samples * n_clusters` additional device memory, that is only used
+        if it fits in the memory budget, and it is wasted for fits that are not
+        followed by a `transform`.
+    """
+    for name, value in config.items():
+        if name not in _CHECKS:
+            raise ValueError(
+                f"Unknown KMeans engine option {name}, expected one of "
+                f"{tuple(_CHECKS)}."
+            )
+        config[name] = _CHECKS[name](value, name)
+    _kmeans_config.update(config)
+
+
+def get_kmeans_config():
+    """Return the options of the KMeans engine set with `set_kmeans_config`."""
+    return dict(_kmeans_config)
+
+
+@contextlib.contextmanager
+def kmeans_config_context(**config):
+    """Context manager that sets the options of the KMeans engine (see
+    `set_kmeans_config`) within its scope, and restores the previous options on
+    exit."""
+    previous_config = get_kmeans_config()
+    set_kmeans_config(**config)
+    try:
+        yield
+    finally:
+        _kmeans_config.clear()
+        _kmeans_config.update(previous_config)
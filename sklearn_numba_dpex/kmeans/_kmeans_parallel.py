@@ -0,0 +1,90 @@
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.common._utils import _get_input_device_and_dtype, _to_device
+
+
+def kmeans_parallel_init(
+    X,
+    n_clusters,
+    random_state=None,
+    sample_weight=None,
+    oversampling_factor=2.0,
+    n_rounds=5,
+):
+    """Select initial centroids with k-means|| (also known as scalable k-means++).
+
+    Unlike k-means++, that selects the centroids one at a time with a pass on the
+    data for each centroid, k-means|| samples many candidates at once in a few
+    rounds, and then selects the centroids among the candidates with k-means++. It
+    is much faster than k-means++ for large values of `n_clusters`.
+
+    This function can be passed as the `init` parameter of `KMeans`::
+
+        from sklearn_numba_dpex import kmeans_parallel_init
+
+        with config_context(engine_provider="sklearn_numba_dpex"):
+            KMeans(n_clusters=4096, init=kmeans_parallel_init).fit(X)
+
+    k-means|| is only supported for dense data. When `KMeans` is fitted on
+    `scipy.sparse` data with `init=kmeans_parallel_init`, the engine uses k-means++
+    instead, and warns about it.
+
+    Parameters
+    ----------
+    X : array-like of shape (n_samples, n_features)
+        The data. Data that is not already on device is copied to the default
+        device.
+
+    n_clusters : int
+        The number of centroids to select.
+
+    random_state : int, RandomState instance or None
+        Determines the random number generation.
+
+    sample_weight : array-like of shape (n_samples,) or None
+        The weights of the samples.
+
+    oversampling_factor : float
+        Each round samples `oversampling_factor * n_clusters` candidates on average.
+
+    n_rounds : int
+        The number of sampling rounds.
+
+    Returns
+    -------
+    centers : dpctl.tensor.usm_ndarray of shape (n_clusters, n_features)
+        The initial centroids.
+    """
+    # NB: imported lazily so that importing `sklearn_numba_dpex` does not import
+    # `numba_dpex` and `sklearn`.
+    from sklearn.utils import check_random_state
+
+    from sklearn_numba_dpex.kmeans.drivers import kmeans_parallel
+
+    X, device, dtype = _get_input_device_and_dtype(X)
+    X_t = _to_device(X.T, dtype, device)
+
+    n_samples = X_t.shape[1]
+    if sample_weight is None:
+        sample_weight = dpt.ones(n_samples, dtype=dtype, device=device)
+    else:
+        sample_weight = dpt.asarray(
+            np.asarray(
+                dpt.asnumpy(sample_weight)
+                if isinstance(sample_weight, dpt.usm_ndarray)
+                else sample_weight,
+                dtype=dtype,
+            ),
+            device=device,
+        )
+
+    centers_t, _ = kmeans_parallel(
+        X_t,
+        sample_weight,
+        n_clusters,
+        check_random_state(random_state),
+        oversampling_factor,
+        n_rounds,
+    )
+    return centers_t.T
@@ -0,0 +1,519 @@
+import math
+from collections import namedtuple
+
+import dpctl
+import numpy as np
+
+from sklearn_numba_dpex.autotune import get_tuned_parameters
+from sklearn_numba_dpex.common._memory import _check_memory_budget, get_memory_budget
+
+MemoryPlan = namedtuple(
+    "MemoryPlan",
+    [
+        "peak_nbytes",
+        "memory_budget",
+        "buffers",
+        "n_centroids_private_copies",
+        "chunk_size",
+        "centroid_update",
+    ],
+    defaults=(None,),
+)
+MemoryPlan.__doc__ = """Device memory footprint of a fit or predict call.
+
+Attributes
+----------
+peak_nbytes : int
+    The peak amount of device memory that the call allocates, in bytes, including
+    the input data.
+
+memory_budget : int
+    The memory budget the plan was computed for.
+
+buffers : dict
+    Maps the name of each device buffer to its size in bytes. The buffers are all
+    allocated at the same time, so `peak_nbytes` is the sum of the sizes.
+
+n_centroids_private_copies : int or None
+    For a fit, the number of private copies of the centroid updates the kernels
+    should use.
+
+chunk_size : int or None
+    The number of samples that are copied to the device at a time, or None if the
+    data can be copied at once.
+
+centroid_update : {"private_copies", "segmented"} or None
+    For a fit with Lloyd's algorithm, how the centroids are updated at each iteration
+    (see `lloyd`).
+"""
+
+
+# With more clusters, the single lower bound per sample of Hamerly's algorithm is
+# loosened too much by the largest shift among all the centroids to skip many distance
+# computations, and the pairwise distances between the centroids grow quadratically.
+# `algorithm="elkan"` then rather runs Lloyd's algorithm, and the engine warns about it.
+_HAMERLY_MAX_N_CLUSTERS = 128
+
+
+def _get_fit_algorithm(algorithm, n_clusters):
+    """The algorithm that the engine runs for the `algorithm` parameter of the
+    estimator, either `"lloyd"` or `"elkan"` (i.e Hamerly's bounds, see `hamerly`)."""
+    if algorithm == "elkan" and n_clusters <= _HAMERLY_MAX_N_CLUSTERS:
+        return "elkan"
+    return "lloyd"
+
+
+def _get_device_and_budget(device, memory_budget):
+    if device is None:
+        device = dpctl.SyclDevice()
+    elif not isinstance(device, dpctl.SyclDevice):
+        device = dpctl.SyclDevice(device)
+
+    if memory_budget is None:
+        memory_budget = get_memory_budget(device)
+    else:
+        memory_budget = _check_memory_budget(memory_budget)
+
+    return device, memory_budget
+
+
+def _get_max_n_centroids_private_copies(
+    n_samples, n_features, n_clusters, dtype, algorithm, n_runs, device
+):
+    # NB: this mirrors the "auto" setting of the kernel factories, see
+    # `make_lloyd_single_step_fixed_window_kernel`, and the choice of the
+    # `sub_group_size` in the drivers.
+    if algorithm != "elkan" and n_runs == 1:
+        sub_group_size = get_tuned_parameters(
+            "lloyd_single_step", device, dtype, (n_samples, n_features, n_clusters)
+        )["sub_group_size"]
+    else:
+        sub_group_size = 8
+    n_subgroups = math.ceil(n_samples / sub_group_size)
+    return max(int(min(n_subgroups, device.max_compute_units)), 1)
+
+
+def _get_default_n_centroids_private_copies(
+    n_samples, n_features, n_clusters, dtype, algorithm, n_runs, device
+):
+    n_centroids_private_copies = _get_max_n_centroids_private_copies(
+        n_samples, n_features, n_clusters, dtype, algorithm, n_runs, device
+    )
+    if (
+        algorithm != "elkan"
+        and n_runs == 1
+        and n_centroids_private_copies * n_clusters > n_samples
+    ):
+        n_centroids_private_copies = 1
+    return n_centroids_private_copies
+
+
+def _use_segmented_centroid_update(
+    n_samples, n_features, n_clusters, max_n_centroids_private_copies
+):
+    # The private copies of the centroid updates are reset and reduced at each
+    # iteration. When they are about as large as the data, this costs as much as a
+    # pass on the data, and the collisions that they avoid are rare anyway since there
+    # are few samples per cluster. The samples are then rather sorted by cluster and
+    # the centroid updates are computed with a segmented reduction, that only requires
+    # `O(n_samples + n_clusters)` additional memory.
+    # NB: `max_n_centroids_private_copies` is the number of private copies before it
+    # is reduced to one for the few samples per cluster (see
+    # `make_lloyd_single_step_fixed_window_kernel`), which is precisely the case where
+    # the segmented reduction is preferable.
+    return (
+        max_n_centroids_private_copies > 1
+        and 2 * max_n_centroids_private_copies * n_clusters * (n_features + 1)
+        >= n_samples * n_features
+    )
+
+
+def _get_topk_idx_nbytes(n_samples, k, device):
+    # NB: this mirrors the buffers of `topk_idx` for a 1d input with the default group
+    # sizes, see `_get_topk_threshold`: the radix histograms of 16 counts have at most
+    # one private copy per work group of 64 items and per compute unit, and are
+    # reduced before the indices of the top `k` values are gathered.
+    radix_size = 16
+    n_counts_private_copies = max(
+        min(math.ceil(n_samples / 64), device.max_compute_units), 1
+    )
+    return ((n_counts_private_copies + 1) * radix_size + k) * np.dtype(
+        np.int64
+    ).itemsize
+
+
+def _get_fit_buffers(
+    n_samples,
+    n_features,
+    n_clusters,
+    itemsize,
+    algorithm,
+    n_runs,
+    n_centroids_private_copies,
+    device,
+    centroid_update="private_copies",
+):
+    uint32_itemsize = np.dtype(np.uint32).itemsize
+    centroids_nbytes = n_features * n_clusters * itemsize
+    buffers = dict(
+        X_t=n_features * n_samples * itemsize,
+        sample_weight=n_samples * itemsize,
+        # The current and the new centroids.
+        centroids_t=2 * n_runs * centroids_nbytes,
+        # The half l2 norms (or half min distances), sizes and shifts of the clusters,
+        # and the list of empty clusters.
+        per_cluster_buffers=n_runs * n_clusters * (3 * itemsize + uint32_itemsize),
+        per_sample_inertia=n_samples * itemsize,
+    )
+
+    if algorithm == "elkan":
+        buffers["assignments_idx"] = n_samples * uint32_itemsize
+        buffers["hamerly_bounds"] = 2 * n_samples * itemsize
+        # The augmented operands and the squared distances of the pairs of centroids.
+        buffers["centroid_sq_distances"] = (
+            n_clusters * (n_clusters + 2 * (n_features + 2)) * itemsize
+        )
+    else:
+        buffers["assignments_idx"] = 2 * n_runs * n_samples * uint32_itemsize
+
+    # NB: when there are empty clusters, `_relocate_empty_clusters` computes the
+    # distances of the samples to their centroids with unit sample weights, and looks
+    # for the farthest samples with `topk_idx`. The runs are relocated one at a time.
+    buffers["relocate_empty_clusters"] = n_samples * itemsize + _get_topk_idx_nbytes(
+        n_samples, n_clusters, device
+    )
+
+    if centroid_update == "segmented":
+        # The indices of the samples sorted by cluster, and the counts, the ends of
+        # the segments and the cursors of the clusters.
+        buffers["segmented_update"] = (n_samples + 3 * n_clusters) * np.dtype(
+            np.int32
+        ).itemsize
+    # NB: with a single private copy, `lloyd` accumulates the updates directly into
+    # the new centroids.
+    elif n_centroids_private_copies > 1 or algorithm == "elkan" or n_runs > 1:
+        buffers["centroids_private_copies"] = (
+            n_runs
+            * n_centroids_private_copies
+            * (centroids_nbytes + n_clusters * itemsize)
+        )
+
+    return buffers
+
+
+def _get_chunked_fit_buffers(
+    n_samples,
+    n_features,
+    n_clusters,
+    itemsize,
+    n_centroids_private_copies,
+    chunk_size,
+    device,
+):
+    # NB: see `lloyd_chunked`. The next chunk is copied while the current one is
+    # processed, so two chunks are resident at the same time, but the assignments and
+    # the per-sample inertia are stored for all the samples.
+    uint32_itemsize = np.dtype(np.uint32).itemsize
+    centroids_nbytes = n_features * n_clusters * itemsize
+    n_resident_samples = min(2 * chunk_size, n_samples)
+    return dict(
+        X_t=n_features * n_resident_samples * itemsize,
+        sample_weight=n_resident_samples * itemsize,
+        centroids_t=2 * centroids_nbytes,
+        per_cluster_buffers=n_clusters * (3 * itemsize + uint32_itemsize),
+        per_sample_inertia=n_samples * itemsize,
+        assignments_idx=2 * n_samples * uint32_itemsize,
+        centroids_private_copies=n_centroids_private_copies
+        * (centroids_nbytes + n_clusters * itemsize),
+        # The unit sample weights of a chunk, the buffers of `topk_idx`, and the
+        # samples, weights, assignments and inertia of the relocated clusters, see
+        # `_relocate_empty_clusters_from_host`.
+        relocate_empty_clusters=min(chunk_size, n_samples) * itemsize
+        + _get_topk_idx_nbytes(n_samples, n_clusters, device)
+        + n_clusters * ((n_features + 2) * itemsize + uint32_itemsize),
+    )
+
+
+def _plan_kmeans_fit_chunked(
+    n_samples, n_features, n_clusters, dtype, device, memory_budget
+):
+    itemsize = np.dtype(dtype).itemsize
+    # NB: `lloyd_chunked` chooses the number of private copies for the size of the
+    # chunks, which is at most the number for all the samples.
+    n_centroids_private_copies = _get_default_n_centroids_private_copies(
+        n_samples, n_features, n_clusters, dtype, "lloyd", 1, device
+    )
+    fixed_nbytes = sum(
+        _get_chunked_fit_buffers(
+            n_samples,
+            n_features,
+            n_clusters,
+            itemsize,
+            n_centroids_private_copies,
+            0,
+            device,
+        ).values()
+    )
+    # NB: two chunks of samples and of weights, and the unit weights of a chunk.
+    per_sample_nbytes = (2 * (n_features + 1) + 1) * itemsize
+    chunk_size = max(
+        min((memory_budget - fixed_nbytes) // per_sample_nbytes, n_samples), 1
+    )
+    buffers = _get_chunked_fit_buffers(
+        n_samples,
+        n_features,
+        n_clusters,
+        itemsize,
+        n_centroids_private_copies,
+        chunk_size,
+        device,
+    )
+    return MemoryPlan(
+        sum(buffers.values()),
+        memory_budget,
+        buffers,
+        n_centroids_private_copies,
+        chunk_size,
+        "private_copies",
+    )
+
+
+def plan_kmeans_fit(
+    n_samples,
+    n_features,
+    n_clusters,
+    dtype=np.float32,
+    device=None,
+    algorithm="lloyd",
+    n_runs=1,
+    memory_budget=None,
+    allow_streaming=False,
+):
+    """Compute the peak device memory footprint of a KMeans fit, before any
+    allocation.
+
+    For Lloyd's algorithm, if the private copies of the centroid updates would be
+    about as large as the data, or if the footprint with the default number of
+    private copies exceeds the memory budget, the centroids are rather updated with a
+    segmented reduction that does not need private copies (see
+    `plan.centroid_update`). Otherwise, or if it does not fit either, the number of
+    private copies is halved until the footprint fits, which trades some performance
+    for memory.
+
+    If `allow_streaming` is True and the data does not fit even with a single private
+    copy, the plan rather keeps the data in host memory and streams it to the device
+    at each iteration in chunks of samples (see `lloyd_chunked`), of the largest size
+    that fits.
+
+    Parameters
+    ----------
+    n_samples, n_features, n_clusters : int
+        The shape of the problem.
+
+    dtype : dtype
+        The floating point type of the data on device.
+
+    device : dpctl.SyclDevice, str or None
+        The device the fit runs on. If None, the default device is used.
+
+    algorithm : {"lloyd", "elkan"}
+        The `algorithm` parameter of the estimator. With more than 128 clusters,
+        `"elkan"` runs Lloyd's algorithm.
+
+    n_runs : int
+        The number of initializations that are run at once (see `lloyd_batched`).
+
+    memory_budget : int or None
+        The memory budget in bytes. If None, the budget set with
+        `sklearn_numba_dpex.set_memory_budget` is used.
+
+    allow_streaming : bool
+        Whether the data can be streamed to the device in chunks if it does not fit.
+        Only a single initialization can be run on streamed data, and always with
+        Lloyd's algorithm.
+
+    Returns
+    -------
+    plan : MemoryPlan
+        If even a single private copy (or, with `allow_streaming`, a chunk of one
+        sample) does not fit, `plan.peak_nbytes` is larger than `plan.memory_budget`.
+    """
+    device, memory_budget = _get_device_and_budget(device, memory_budget)
+    itemsize = np.dtype(dtype).itemsize
+    algorithm = _get_fit_algorithm(algorithm, n_clusters)
+
+    n_centroids_private_copies = _get_default_n_centroids_private_copies(
+        n_samples, n_features, n_clusters, dtype, algorithm, n_runs, device
+    )
+
+    def _get_plan_buffers(n_centroids_private_copies, centroid_update="private_copies"):
+        return _get_fit_buffers(
+            n_samples,
+            n_features,
+            n_clusters,
+            itemsize,
+            algorithm,
+            n_runs,
+            n_centroids_private_copies,
+            device,
+            centroid_update,
+        )
+
+    if algorithm != "elkan" and n_runs == 1:
+        # NB: rather than trading performance for memory with fewer private copies,
+        # the segmented update is used if the private copies do not fit.
+        max_n_centroids_private_copies = _get_max_n_centroids_private_copies(
+            n_samples, n_features, n_clusters, dtype, algorithm, n_runs, device
+        )
+        use_segmented_update = _use_segmented_centroid_update(
+            n_samples, n_features, n_clusters, max_n_centroids_private_copies
+        ) or (
+            sum(_get_plan_buffers(n_centroids_private_copies).values()) > memory_budget
+        )
+        centroid_update = "segmented" if use_segmented_update else "private_copies"
+    else:
+        centroid_update = None
+
+    if centroid_update == "segmented":
+        buffers = _get_plan_buffers(n_centroids_private_copies, centroid_update)
+        peak_nbytes = sum(buffers.values())
+        if peak_nbytes <= memory_budget:
+            return MemoryPlan(
+                peak_nbytes,
+                memory_budget,
+                buffers,
+                n_centroids_private_copies,
+                None,
+                centroid_update,
+            )
+        # Else, fewer private copies might still fit the budget.
+        centroid_update = "private_copies"
+
+    while True:
+        buffers = _get_plan_buffers(n_centroids_private_copies)
+        peak_nbytes = sum(buffers.values())
+        if peak_nbytes <= memory_budget or n_centroids_private_copies == 1:
+            break
+        n_centroids_private_copies = max(n_centroids_private_copies // 2, 1)
+
+    if allow_streaming and n_runs == 1 and peak_nbytes > memory_budget:
+        return _plan_kmeans_fit_chunked(
+            n_samples, n_features, n_clusters, dtype, device, memory_budget
+        )
+
+    return MemoryPlan(
+        peak_nbytes,
+        memory_budget,
+        buffers,
+        n_centroids_private_copies,
+        None,
+        centroid_update,
+    )
+
+
+def plan_kmeans_predict(
+    n_samples,
+    n_features,
+    n_clusters,
+    dtype=np.float32,
+    device=None,
+    with_inertia=True,
+    with_distances=False,
+    memory_budget=None,
+):
+    """Compute the peak device memory footprint of a KMeans predict or score, before
+    any allocation.
+
+    If the data, copied to the device at once, would exceed the memory budget, the
+    plan rather streams the data to the device in chunks of samples, of the largest
+    size that fits. The labels of all the samples are still stored on the device.
+
+    Parameters
+    ----------
+    n_samples, n_features, n_clusters : int
+        The shape of the problem.
+
+    dtype : dtype
+        The floating point type of the data on device.
+
+    device : dpctl.SyclDevice, str or None
+        The device the predict runs on. If None, the default device is used.
+
+    with_inertia : bool
+        Whether the inertia is computed, as in `score`.
+
+    with_distances : bool
+        Whether the distances of the samples to all the centroids are computed, as in
+        `transform`.
+
+    memory_budget : int or None
+        The memory budget in bytes. If None, the budget set with
+        `sklearn_numba_dpex.set_memory_budget` is used.
+
+    Returns
+    -------
+    plan : MemoryPlan
+        If even a chunk of one sample does not fit, `plan.peak_nbytes` is larger
+        than `plan.memory_budget`.
+    """
+    device, memory_budget = _get_device_and_budget(device, memory_budget)
+    itemsize = np.dtype(dtype).itemsize
+
+    # Buffers that do not depend on the number of samples that are resident on
+    # device at the same time.
+    buffers = dict(
+        centroids_t=n_features * n_clusters * itemsize,
+        centroids_half_l2_norm=n_clusters * itemsize,
+        assignments_idx=n_samples * np.dtype(np.uint32).itemsize,
+    )
+    # Size of the buffers for each sample that is resident on device.
+    per_sample_nbytes = (n_features + 1 + int(with_inertia)) * itemsize
+    if with_distances:
+        per_sample_nbytes += n_clusters * itemsize
+
+    chunk_size = None
+    n_resident_samples = n_samples
+    available_nbytes = memory_budget - sum(buffers.values())
+    if n_samples * per_sample_nbytes > available_nbytes:
+        # NB: the next chunk is copied while the current one is processed, so two
+        # chunks are resident at the same time. The labels of a chunk are computed
+        # in a temporary buffer before being copied to `assignments_idx`.
+        per_sample_nbytes += np.dtype(np.uint32).itemsize
+        chunk_size = max(min(available_nbytes // (2 * per_sample_nbytes), n_samples), 1)
+        n_resident_samples = min(2 * chunk_size, n_samples)
+        buffers["assignments_idx_chunk"] = chunk_size * np.dtype(np.uint32).itemsize
+
+    buffers["X_t"] = n_features * n_resident_samples * itemsize
+    buffers["sample_weight"] = n_resident_samples * itemsize
+    if with_inertia:
+        buffers["per_sample_inertia"] = n_resident_samples * itemsize
+    if with_distances:
+        buffers["euclidean_distances"] = n_resident_samples * n_clusters * itemsize
+
+    return MemoryPlan(sum(buffers.values()), memory_budget, buffers, None, chunk_size)
+
+
+def _format_memory_plan(plan):
+    peak_mib = plan.peak_nbytes / 2**20
+    budget_mib = plan.memory_budget / 2**20
+    message = (
+        f"Planned peak device memory: {peak_mib:.1f} MiB (budget {budget_mib:.1f} MiB)"
+    )
+    if plan.centroid_update == "segmented":
+        message += ", with segmented centroid updates"
+    elif plan.n_centroids_private_copies is not None:
+        message += (
+            f", with {plan.n_centroids_private_copies} private copies of the "
+            "centroid updates"
+        )
+    if plan.chunk_size is not None:
+        message += f", streaming chunks of {plan.chunk_size} samples"
+    return message
+
+
+def _raise_memory_error(plan):
+    raise MemoryError(
+        f"The planned peak device memory of {plan.peak_nbytes} bytes exceeds the "
+        f"memory budget of {plan.memory_budget} bytes. Free some device memory or "
+        "increase the budget with `sklearn_numba_dpex.set_memory_budget`."
+    )
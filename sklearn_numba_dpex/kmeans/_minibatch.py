@@ -0,0 +1,316 @@
+import math
+import numbers
+
+import dpctl.tensor as dpt
+from sklearn.base import BaseEstimator, ClusterMixin
+from sklearn.utils import check_random_state
+
+from sklearn_numba_dpex.common._utils import _get_input_device_and_dtype, _to_device
+
+
+class MiniBatchKMeans(ClusterMixin, BaseEstimator):
+    """Mini-batch k-means on device, with the interface of
+    `sklearn.cluster.MiniBatchKMeans`.
+
+    The engine API of scikit-learn does not support `MiniBatchKMeans` yet. This
+    estimator runs the mini-batch updates of the centroids on device: with `fit`, the
+    batches are drawn on device from data that is resident in device memory, and with
+    `partial_fit`, each call processes one batch, e.g. streamed from the host. The
+    compiled kernels do not depend on the size of the batches.
+
+    Data that is not already on device is copied to the default device. Following the
+    *compute follows data* principle, the fitted attributes and the outputs of the
+    methods are `dpctl.tensor` arrays on the device of the data.
+
+    It is a scikit-learn estimator, that can be cloned, tuned with
+    `sklearn.model_selection.GridSearchCV` or used in a `sklearn.pipeline.Pipeline`.
+
+    Parameters
+    ----------
+    n_clusters : int, default=8
+        The number of clusters.
+
+    init : {"k-means++", "random"}, callable or array-like of shape \
+            (n_clusters, n_features), default="k-means++"
+        The initialization of the centroids, as in `sklearn.cluster.KMeans`. With
+        `partial_fit`, the centroids are initialized on the first batch.
+
+    max_iter : int, default=100
+        The number of passes on the data of `fit`.
+
+    batch_size : int, default=1024
+        The number of samples of each batch drawn by `fit`.
+
+    verbose : int, default=0
+        Verbosity mode.
+
+    tol : float, default=0.0
+        `fit` stops early when the sum of the squared shifts of the centroids after a
+        step is lower than `tol`. Unlike in `sklearn.cluster.MiniBatchKMeans`, `tol`
+        is not normalized by the variance of the data, and there is no early stopping
+        on the lack of improvement of the smoothed inertia (`max_no_improvement`).
+        Checking the convergence requires one host synchronization per step, the
+        default `tol=0.0` disables it.
+
+    reassignment_ratio : float, default=0.01
+        Every `10 * n_clusters` samples, the centroids of the clusters whose sum of
+        weights is lower than `reassignment_ratio` times the largest one are moved to
+        random samples of the current batch, as in `sklearn.cluster.MiniBatchKMeans`
+        (see `reassign_low_count_clusters`). Unlike in scikit-learn, the reassignment
+        is not triggered earlier when a cluster is empty. `reassignment_ratio=0.0`
+        disables the reassignment, which saves a host synchronization.
+
+    random_state : int, RandomState instance or None, default=None
+        Determines the random number generation for the initialization, the
+        sampling of the batches and the reassignment.
+
+    Attributes
+    ----------
+    cluster_centers_ : dpctl.tensor.usm_ndarray of shape (n_clusters, n_features)
+        The centroids.
+
+    labels_ : dpctl.tensor.usm_ndarray of shape (n_samples,)
+        The labels of the samples of `fit`.
+
+    inertia_ : float
+        The inertia of the samples of `fit`.
+
+    n_iter_ : int
+        The number of passes on the data of `fit`.
+
+    n_steps_ : int
+        The number of batches that have been processed.
+
+    n_features_in_ : int
+        The number of features of the data.
+    """
+
+    def __init__(
+        self,
+        n_clusters=8,
+        *,
+        init="k-means++",
+        max_iter=100,
+        batch_size=1024,
+        verbose=0,
+        tol=0.0,
+        reassignment_ratio=0.01,
+        random_state=None,
+    ):
+        self.n_clusters = n_clusters
+        self.init = init
+        self.max_iter = max_iter
+        self.batch_size = batch_size
+        self.verbose = verbose
+        self.tol = tol
+        self.reassignment_ratio = reassignment_ratio
+        self.random_state = random_state
+
+    def fit(self, X, y=None, sample_weight=None):
+        """Compute the centroids with mini-batches of samples of `X`."""
+        # NB: imported lazily so that importing the estimator does not import
+        # `numba_dpex`.
+        from sklearn_numba_dpex.kmeans.drivers import minibatch_kmeans
+
+        self._check_params()
+        X_t, sample_weight = self._check_data(X, sample_weight, reset=True)
+        n_samples = X_t.shape[1]
+
+        self._random_state = check_random_state(self.random_state)
+        centroids_t = self._init_centroids(X_t, sample_weight)
+        cluster_weight_sums = dpt.zeros(
+            self.n_clusters, dtype=X_t.dtype, device=X_t.device
+        )
+
+        labels, inertia, centroids_t, n_steps = minibatch_kmeans(
+            X_t,
+            sample_weight,
+            centroids_t,
+            batch_size=self.batch_size,
+            max_iter=self.max_iter,
+            verbose=self.verbose,
+            tol=self.tol,
+            random_state=self._random_state,
+            reassignment_ratio=self.reassignment_ratio,
+            cluster_weight_sums=cluster_weight_sums,
+        )
+
+        self._set_centroids(centroids_t, cluster_weight_sums)
+        self._n_since_last_reassign = 0
+        self.labels_ = labels
+        self.inertia_ = float(inertia)
+        self.n_steps_ = n_steps
+        self.n_iter_ = math.ceil(n_steps * min(self.batch_size, n_samples) / n_samples)
+        return self
+
+    def partial_fit(self, X, y=None, sample_weight=None):
+        """Update the centroids with a single batch of samples `X`."""
+        from sklearn_numba_dpex.kmeans.drivers import (
+            minibatch_kmeans_partial_fit,
+            reassign_low_count_clusters,
+        )
+
+        is_first_call = not hasattr(self, "cluster_centers_")
+        if is_first_call:
+            self._check_params()
+        X_t, sample_weight = self._check_data(X, sample_weight, reset=is_first_call)
+
+        if is_first_call:
+            self._random_state = check_random_state(self.random_state)
+            centroids_t = self._init_centroids(X_t, sample_weight)
+            cluster_weight_sums = dpt.zeros(
+                self.n_clusters, dtype=X_t.dtype, device=X_t.device
+            )
+            self._n_since_last_reassign = 0
+            self.n_steps_ = 0
+        else:
+            centroids_t, cluster_weight_sums = self._get_centroids(X_t)
+
+        centroids_t, _ = minibatch_kmeans_partial_fit(
+            X_t, sample_weight, centroids_t, cluster_weight_sums
+        )
+
+        if self.reassignment_ratio > 0:
+            self._n_since_last_reassign += X_t.shape[1]
+            if self._n_since_last_reassign >= 10 * self.n_clusters:
+                self._n_since_last_reassign = 0
+                reassign_low_count_clusters(
+                    X_t,
+                    sample_weight,
+                    centroids_t,
+                    cluster_weight_sums,
+                    self.reassignment_ratio,
+                    self._random_state,
+                )
+
+        self._set_centroids(centroids_t, cluster_weight_sums)
+        self.n_steps_ += 1
+        return self
+
+    def predict(self, X, sample_weight=None):
+        """Return the index of the closest centroid of each sample of `X`."""
+        from sklearn_numba_dpex.kmeans.drivers import get_labels_inertia
+
+        X_t, sample_weight = self._check_data(X, sample_weight, reset=False)
+        centroids_t, _ = self._get_centroids(X_t)
+        labels, _ = get_labels_inertia(
+            X_t, centroids_t, sample_weight, with_inertia=False
+        )
+        return labels
+
+    def transform(self, X):
+        """Return the euclidean distances of the samples of `X` to the centroids."""
+        from sklearn_numba_dpex.kmeans.drivers import get_euclidean_distances
+
+        X_t, _ = self._check_data(X, None, reset=False)
+        centroids_t, _ = self._get_centroids(X_t)
+        return get_euclidean_distances(X_t, centroids_t)
+
+    def score(self, X, y=None, sample_weight=None):
+        """Return the opposite of the inertia of `X`."""
+        from sklearn_numba_dpex.kmeans.drivers import get_labels_inertia
+
+        X_t, sample_weight = self._check_data(X, sample_weight, reset=False)
+        centroids_t, _ = self._get_centroids(X_t)
+        _, inertia = get_labels_inertia(
+            X_t, centroids_t, sample_weight, with_inertia=True
+        )
+        return -float(inertia[0])
+
+    def _check_params(self):
+        if not isinstance(self.n_clusters, numbers.Integral) or self.n_clusters < 1:
+            raise ValueError(
+                f"Expected n_clusters to be a positive integer, got {self.n_clusters}."
+            )
+        if not isinstance(self.batch_size, numbers.Integral) or self.batch_size < 1:
+            raise ValueError(
+                f"Expected batch_size to be a positive integer, got {self.batch_size}."
+            )
+        if self.reassignment_ratio < 0:
+            raise ValueError(
+                "Expected reassignment_ratio to be non-negative, got "
+                f"{self.reassignment_ratio}."
+            )
+
+    def _check_data(self, X, sample_weight, reset):
+        X, device, dtype = _get_input_device_and_dtype(X)
+        if X.ndim != 2:
+            raise ValueError(f"Expected a 2D array X, got shape {X.shape}.")
+
+        n_samples, n_features = X.shape
+        if reset:
+            if n_samples < self.n_clusters:
+                raise ValueError(
+                    f"n_samples={n_samples} should be >= n_clusters={self.n_clusters}."
+                )
+            self.n_features_in_ = n_features
+        elif n_features != self.n_features_in_:
+            raise ValueError(
+                f"X has {n_features} features, but MiniBatchKMeans is expecting "
+                f"{self.n_features_in_} features as input."
+            )
+
+        X_t = _to_device(X.T, dtype, device)
+
+        if sample_weight is None:
+            sample_weight = dpt.ones(n_samples, dtype=dtype, device=device)
+        else:
+            sample_weight = _to_device(sample_weight, dtype, device)
+            if sample_weight.shape != (n_samples,):
+                raise ValueError(
+                    f"sample_weight.shape == {sample_weight.shape}, expected "
+                    f"{(n_samples,)}!"
+                )
+
+        return X_t, sample_weight
+
+    def _init_centroids(self, X_t, sample_weight):
+        from sklearn_numba_dpex.common.random import weighted_sample_without_replacement
+        from sklearn_numba_dpex.kmeans.drivers import kmeans_plusplus
+
+        init = self.init
+        n_clusters = self.n_clusters
+        dtype, device = X_t.dtype, X_t.device.sycl_device
+
+        if isinstance(init, str) and init == "k-means++":
+            centroids_t, _ = kmeans_plusplus(
+                X_t, sample_weight, n_clusters, self._random_state
+            )
+            return centroids_t
+
+        if isinstance(init, str) and init == "random":
+            centers_idx = weighted_sample_without_replacement(
+                sample_weight, n_clusters, seed=self._random_state
+            )
+            return dpt.take(X_t, centers_idx, axis=1)
+
+        if callable(init):
+            init = init(X_t.T, n_clusters, random_state=self._random_state)
+        elif isinstance(init, str):
+            raise ValueError(
+                "Expected init to be 'k-means++', 'random', a callable or an array, "
+                f"got {init}."
+            )
+
+        init, *_ = _get_input_device_and_dtype(init)
+        if init.shape != (n_clusters, X_t.shape[0]):
+            raise ValueError(
+                f"Expected init of shape {(n_clusters, X_t.shape[0])}, got "
+                f"{init.shape}."
+            )
+        # NB: `_to_device` copies the array, that is then modified inplace.
+        return _to_device(init.T, dtype, device)
+
+    def _set_centroids(self, centroids_t, cluster_weight_sums):
+        self._centroids_t = centroids_t
+        self._cluster_weight_sums = cluster_weight_sums
+        self.cluster_centers_ = centroids_t.T
+
+    def _get_centroids(self, X_t):
+        """The centroids and their sums of weights, on the device and with the dtype
+        of `X_t`."""
+        dtype, device = X_t.dtype, X_t.device.sycl_device
+        return (
+            _to_device(self._centroids_t, dtype, device),
+            _to_device(self._cluster_weight_sums, dtype, device),
+        )
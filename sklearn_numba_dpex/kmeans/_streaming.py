@@ -0,0 +1,144 @@
+import dpctl
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.common._utils import _get_compute_dtype
+from sklearn_numba_dpex.kmeans._memory import _raise_memory_error, plan_kmeans_predict
+
+_OUTPUTS = ("labels", "distances", "nearest")
+
+
+def iter_kmeans_predict(
+    cluster_centers,
+    X,
+    output="labels",
+    n_nearest=1,
+    chunk_size=None,
+    device=None,
+    memory_budget=None,
+):
+    """Predict the clusters of a large amount of host data, with bounded device
+    memory.
+
+    The data is copied to the device by chunks of samples, and the predictions are
+    yielded for each chunk. The centroids and their half l2 norms stay on device for
+    all the chunks, and the next chunk is copied to the device while the current
+    chunk is processed.
+
+    Parameters
+    ----------
+    cluster_centers : array-like of shape (n_clusters, n_features) or KMeans
+        The centroids, or a fitted `KMeans` estimator.
+
+    X : array-like of shape (n_samples, n_features) or iterable of array-like
+        The host data, e.g. a numpy array or a `numpy.memmap`, or an iterable (e.g. a
+        generator) of 2D host chunks of samples, that are processed in turn.
+
+    output : {"labels", "distances", "nearest"}
+        What is yielded for each chunk:
+
+        - `"labels"`: the labels of the samples in the chunk, as an int32 array of
+          shape (n_samples_in_chunk,),
+        - `"distances"`: the euclidean distances of the samples to all the
+          centroids, with shape (n_samples_in_chunk, n_clusters), as in `transform`,
+        - `"nearest"`: a tuple `(distances, labels)` of arrays of shape
+          (n_samples_in_chunk, n_nearest), that contains the euclidean distances to
+          the `n_nearest` closest centroids of each sample and their labels, sorted
+          by increasing distance.
+
+    n_nearest : int
+        The number of closest centroids of each sample, if `output="nearest"`.
+
+    chunk_size : int or None
+        The number of samples in each chunk, if `X` is an array. If None, the largest
+        chunk size that fits in the memory budget is used.
+
+    device : dpctl.SyclDevice, str or None
+        The device the predictions are computed on. If None, the default device is
+        used.
+
+    memory_budget : int or None
+        The memory budget in bytes that is used to choose `chunk_size`. If None, the
+        budget set with `sklearn_numba_dpex.set_memory_budget` is used.
+
+    Yields
+    ------
+    result : numpy.ndarray or tuple of numpy.ndarray
+        The predictions for the next chunk of samples, copied to host (see `output`).
+    """
+    # NB: imported lazily so that importing `sklearn_numba_dpex` does not import
+    # `numba_dpex`.
+    from sklearn_numba_dpex.kmeans.drivers import iter_predict_chunked
+
+    if output not in _OUTPUTS:
+        raise ValueError(f"Expected output to be one of {_OUTPUTS}, got {output}.")
+
+    if device is None:
+        device = dpctl.SyclDevice()
+    elif not isinstance(device, dpctl.SyclDevice):
+        device = dpctl.SyclDevice(device)
+
+    cluster_centers = np.asarray(
+        getattr(cluster_centers, "cluster_centers_", cluster_centers)
+    )
+    n_clusters, n_features = cluster_centers.shape
+    dtype = _get_compute_dtype(cluster_centers.dtype, device)
+
+    if output == "nearest" and not 1 <= n_nearest <= n_clusters:
+        raise ValueError(
+            f"Expected n_nearest to be between 1 and n_clusters={n_clusters}, got "
+            f"{n_nearest}."
+        )
+
+    if hasattr(X, "shape"):
+        n_samples = X.shape[0]
+        if X.ndim != 2 or X.shape[1] != n_features:
+            raise ValueError(
+                f"Expected X of shape (n_samples, {n_features}), got {X.shape}."
+            )
+
+        if chunk_size is None:
+            memory_plan = plan_kmeans_predict(
+                n_samples,
+                n_features,
+                n_clusters,
+                dtype,
+                device,
+                with_inertia=False,
+                with_distances=output != "labels",
+                memory_budget=memory_budget,
+            )
+            if memory_plan.peak_nbytes > memory_plan.memory_budget:
+                _raise_memory_error(memory_plan)
+            chunk_size = memory_plan.chunk_size or n_samples
+
+    centroids_t = dpt.asarray(
+        np.ascontiguousarray(cluster_centers.T, dtype=dtype), device=device
+    )
+
+    for _, _, result in iter_predict_chunked(
+        X, centroids_t, output, n_nearest, chunk_size
+    ):
+        if output == "labels":
+            yield dpt.asnumpy(result).astype(np.int32)
+            continue
+
+        if output == "distances":
+            yield dpt.asnumpy(result)
+            continue
+
+        # NB: unless all the centroids are requested, only the distances to the
+        # `n_nearest` closest centroids are copied to the host, where they are sorted.
+        nearest_distances, nearest_idx = result
+        nearest_distances = dpt.asnumpy(nearest_distances)
+        if nearest_idx is None:
+            nearest_idx = np.broadcast_to(
+                np.arange(n_clusters), nearest_distances.shape
+            )
+        else:
+            nearest_idx = dpt.asnumpy(nearest_idx)
+        order = np.argsort(nearest_distances, axis=1, kind="stable")
+        yield (
+            np.take_along_axis(nearest_distances, order, axis=1),
+            np.take_along_axis(nearest_idx, order, axis=1).astype(np.int32),
+        )
@@ -0,0 +1,60 @@
+from .chunked import (
+    get_labels_inertia_chunked,
+    iter_predict_chunked,
+    lloyd_chunked,
+    prepare_data_for_lloyd_chunked,
+)
+from .csr import (
+    get_csr_rows_t,
+    get_euclidean_distances_csr,
+    get_labels_inertia_csr,
+    kmeans_plusplus_csr,
+    lloyd_csr,
+    prepare_data_for_lloyd_csr,
+)
+from .hamerly import hamerly
+from .kmeans_plusplus import kmeans_parallel, kmeans_plusplus
+from .lloyd import lloyd
+from .lloyd_batched import lloyd_batched
+from .minibatch import (
+    minibatch_kmeans,
+    minibatch_kmeans_partial_fit,
+    reassign_low_count_clusters,
+)
+from .utils import (
+    get_euclidean_distances,
+    get_half_l2_norm,
+    get_labels_inertia,
+    get_nb_distinct_clusters,
+    is_same_clustering,
+    prepare_data_for_lloyd,
+    restore_data_after_lloyd,
+)
+
+__all__ = (
+    "lloyd",
+    "lloyd_batched",
+    "lloyd_chunked",
+    "hamerly",
+    "minibatch_kmeans",
+    "minibatch_kmeans_partial_fit",
+    "reassign_low_count_clusters",
+    "lloyd_csr",
+    "prepare_data_for_lloyd",
+    "restore_data_after_lloyd",
+    "prepare_data_for_lloyd_csr",
+    "prepare_data_for_lloyd_chunked",
+    "is_same_clustering",
+    "get_nb_distinct_clusters",
+    "get_labels_inertia",
+    "get_labels_inertia_chunked",
+    "get_labels_inertia_csr",
+    "iter_predict_chunked",
+    "get_euclidean_distances",
+    "get_euclidean_distances_csr",
+    "get_half_l2_norm",
+    "get_csr_rows_t",
+    "kmeans_plusplus",
+    "kmeans_plusplus_csr",
+    "kmeans_parallel",
+)
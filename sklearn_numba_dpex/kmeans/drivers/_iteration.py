@@ -0,0 +1,304 @@
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.common.kernels import make_initialize_to_zeros_kernel
+from sklearn_numba_dpex.common.reductions import make_sum_reduction_2d_kernel
+from sklearn_numba_dpex.common.topk import topk_idx
+from sklearn_numba_dpex.kmeans.kernels import (
+    make_centroid_shifts_kernel,
+    make_compute_inertia_kernel,
+    make_reduce_centroid_data_kernel,
+    make_relocate_empty_clusters_kernel,
+)
+
+# NB: this module gathers the parts of the main loop of Lloyd's algorithm that are
+# shared by the k-means drivers: the bookkeeping of the convergence criteria, the
+# private copies of the centroid updates, and the relocation of the empty clusters.
+# See `lloyd` for the overall structure of an iteration.
+
+
+class _ConvergenceMonitor:
+    """Track the convergence criteria of the iterations of Lloyd's algorithm.
+
+    The iterations stop after `max_iter` iterations, when the sum of the squared
+    shifts of the centroids is lower than `tol`, or at strict convergence, i.e when an
+    iteration did not change the assignments of the samples. The kernels that compute
+    the assignments are expected to write 0 in `strict_convergence_status` when the
+    assignment of a sample changes.
+
+    The convergence criteria are evaluated on host, which requires waiting for the
+    device to complete the iteration and copying the status back to the host. On small
+    datasets the latency of those synchronizations can be a significant part of the
+    runtime. With `convergence_check_interval > 1`, the convergence is checked only
+    every `convergence_check_interval` iterations, at the cost of running a few more
+    iterations than needed (less than `2 * convergence_check_interval`).
+    """
+
+    def __init__(
+        self,
+        n_features,
+        n_clusters,
+        max_iter,
+        tol,
+        verbose,
+        device,
+        dtype,
+        convergence_check_interval=1,
+        strict_convergence_status=None,
+    ):
+        if convergence_check_interval < 1:
+            raise ValueError(
+                "convergence_check_interval is expected to be a positive integer, got "
+                f"{convergence_check_interval} instead."
+            )
+
+        work_group_size = device.max_work_group_size
+
+        self._compute_centroid_shifts_kernel = make_centroid_shifts_kernel(
+            n_clusters=n_clusters,
+            n_features=n_features,
+            work_group_size=work_group_size,
+            dtype=dtype,
+        )
+
+        self._reduce_centroid_shifts_kernel = make_sum_reduction_2d_kernel(
+            shape=(n_clusters,),
+            work_group_size="max",
+            device=device,
+            dtype=dtype,
+        )
+
+        self.centroid_shifts = dpt.empty(n_clusters, dtype=dtype, device=device)
+
+        # NB: the status can be a view on a larger array, e.g. when several runs are
+        # computed in the same kernel (see `lloyd_batched`).
+        if strict_convergence_status is None:
+            # allocation of one scalar where we store the result of strict convergence
+            # check
+            strict_convergence_status = dpt.empty(1, dtype=np.uint32, device=device)
+        self.strict_convergence_status = strict_convergence_status
+
+        self.max_iter = max_iter
+        self.tol = tol
+        self.verbose = bool(verbose)
+        self.dtype = dtype
+        self.convergence_check_interval = convergence_check_interval
+
+        self.n_iteration = 0
+        self.strict_convergence = False
+        self.centroid_shifts_sum = np.inf
+
+    def keep_iterating(self):
+        return (
+            not self.strict_convergence
+            and (self.n_iteration < self.max_iter)
+            and (self.centroid_shifts_sum > self.tol)
+        )
+
+    def is_convergence_check_iteration(self):
+        """Whether the convergence criteria are evaluated at the end of the current
+        iteration."""
+        return ((self.n_iteration + 1) % self.convergence_check_interval) == 0
+
+    def end_iteration(self, centroids_t, previous_centroids_t, strict_convergence=None):
+        """Update the convergence criteria after an iteration that moved the centroids
+        from `previous_centroids_t` to `centroids_t`.
+
+        `strict_convergence` is the value of the strict convergence status if it has
+        already been copied to the host, e.g. along with the status of other runs.
+        """
+        is_convergence_check = self.is_convergence_check_iteration()
+        self.n_iteration += 1
+
+        # NB: when convergence is checked every `convergence_check_interval`
+        # iterations, the strict convergence status is not reset in-between checks,
+        # so it reports whether the assignments have not changed at all since the last
+        # check. The status of the first iteration is never checked, since the
+        # assignments of the previous iteration are not defined. With the default
+        # `convergence_check_interval=1`, the status is reset after each check only.
+
+        if is_convergence_check and self.n_iteration > 1:
+            if strict_convergence is None:
+                strict_convergence, *_ = self.strict_convergence_status
+            self.strict_convergence = bool(strict_convergence)
+            if self.strict_convergence:
+                return
+            self.strict_convergence_status[0] = np.uint32(1)
+
+        elif self.n_iteration == 1 and self.convergence_check_interval > 1:
+            # The status is reset at the start of the first interval between two
+            # checks, since the first iteration is never checked.
+            self.strict_convergence_status[0] = np.uint32(1)
+
+        if not is_convergence_check:
+            return
+
+        self._compute_centroid_shifts_kernel(
+            centroids_t,
+            previous_centroids_t,
+            # OUT:
+            self.centroid_shifts,
+        )
+
+        centroid_shifts_sum, *_ = self._reduce_centroid_shifts_kernel(
+            self.centroid_shifts
+        )
+        # Use numpy type to work around https://github.com/IntelPython/dpnp/issues/1238
+        self.centroid_shifts_sum = self.dtype(centroid_shifts_sum)
+
+    def print_convergence(self):
+        if not self.verbose:
+            return
+
+        converged_at = self.n_iteration - 1
+        # NB: a null shift is possible if tol = 0
+        if self.strict_convergence or (self.centroid_shifts_sum == 0):
+            print(f"Converged at iteration {converged_at}: strict convergence.")
+
+        elif self.centroid_shifts_sum <= self.tol:
+            print(
+                f"Converged at iteration {converged_at}: center shift "
+                f"{self.centroid_shifts_sum} within tolerance {self.tol}."
+            )
+
+
+class _CentroidsPrivateCopies:
+    """Buffers where the centroid updates of an iteration are accumulated in
+    `n_copies` private copies, to limit the conflicts between the atomic updates, along
+    with the kernels that reset and reduce them.
+
+    If `n_runs` is not None, there is one set of private copies for each of the
+    `n_runs` runs of `lloyd_batched`.
+    """
+
+    def __init__(self, n_copies, n_features, n_clusters, device, dtype, n_runs=None):
+        work_group_size = device.max_work_group_size
+        runs_shape = () if n_runs is None else (n_runs,)
+
+        self.centroids_t = dpt.empty(
+            (*runs_shape, n_copies, n_features, n_clusters),
+            dtype=dtype,
+            device=device,
+        )
+        self.cluster_sizes = dpt.empty(
+            (*runs_shape, n_copies, n_clusters), dtype=dtype, device=device
+        )
+
+        self._reset_centroids_kernel = make_initialize_to_zeros_kernel(
+            shape=self.centroids_t.shape,
+            work_group_size=work_group_size,
+            dtype=dtype,
+        )
+
+        self._reset_cluster_sizes_kernel = make_initialize_to_zeros_kernel(
+            shape=self.cluster_sizes.shape,
+            work_group_size=work_group_size,
+            dtype=dtype,
+        )
+
+        self._reduce_centroid_data_kernel = make_reduce_centroid_data_kernel(
+            n_centroids_private_copies=n_copies,
+            n_features=n_features,
+            n_clusters=n_clusters,
+            work_group_size=work_group_size,
+            dtype=dtype,
+        )
+
+    def reset(self):
+        self._reset_cluster_sizes_kernel(self.cluster_sizes)
+        self._reset_centroids_kernel(self.centroids_t)
+
+    def reduce(
+        self,
+        centroids_t,
+        cluster_sizes,
+        empty_clusters_list,
+        n_empty_clusters,
+        run_idx=None,
+    ):
+        """Sum the private copies into `centroids_t` and `cluster_sizes`, and register
+        the empty clusters in `empty_clusters_list` and `n_empty_clusters`."""
+        centroids_t_private_copies = self.centroids_t
+        cluster_sizes_private_copies = self.cluster_sizes
+        if run_idx is not None:
+            centroids_t_private_copies = centroids_t_private_copies[run_idx]
+            cluster_sizes_private_copies = cluster_sizes_private_copies[run_idx]
+
+        self._reduce_centroid_data_kernel(
+            cluster_sizes_private_copies,
+            centroids_t_private_copies,
+            # OUT:
+            cluster_sizes,
+            centroids_t,
+            empty_clusters_list,
+            n_empty_clusters,
+        )
+
+
+def _relocate_empty_clusters(
+    n_empty_clusters,
+    X_t,
+    sample_weight,
+    centroids_t,
+    cluster_sizes,
+    assignments_idx,
+    empty_clusters_list,
+    sq_dist_to_nearest_centroid,
+    work_group_size,
+    compute_sq_dist=True,
+):
+    """Relocate the centroids of the `n_empty_clusters` clusters listed in
+    `empty_clusters_list` to the samples in `X_t` that are the farthest from the
+    centroids they are assigned to. `centroids_t` and `cluster_sizes` contain the
+    unnormalized sums of the samples of each cluster, and are updated accordingly.
+
+    If `compute_sq_dist` is True, the squared distances of the samples to the centroids
+    they are assigned to are first computed in `sq_dist_to_nearest_centroid`. Else, it
+    is expected to already contain those distances, up to a constant factor.
+    """
+    compute_dtype = X_t.dtype.type
+    n_features = X_t.shape[0]
+
+    # NB: empty cluster very rarely occurs, and it's more efficient to compute the
+    # distances to the closest centroids only after occurrences have been detected at
+    # the cost of an additional pass on data, rather than computing it by default
+    # during the first pass on data in case there's an empty cluster.
+    if compute_sq_dist:
+        compute_inertia_kernel = make_compute_inertia_kernel(
+            n_features, work_group_size, compute_dtype
+        )
+        # Note that we intentionally pass unit weights instead of sample_weight so
+        # that the inertia is the (unweighted) squared distance to the nearest
+        # centroid.
+        compute_inertia_kernel(
+            X_t,
+            dpt.ones_like(sample_weight),
+            centroids_t,
+            assignments_idx,
+            # OUT:
+            sq_dist_to_nearest_centroid,
+        )
+
+    samples_far_from_center = topk_idx(sq_dist_to_nearest_centroid, n_empty_clusters)
+
+    # Centroids of empty clusters are relocated to samples in X that are the
+    # farthest from their respective centroids. new_centroids_t is updated
+    # accordingly.
+    relocate_empty_clusters_kernel = make_relocate_empty_clusters_kernel(
+        n_empty_clusters,
+        n_features,
+        work_group_size,
+        compute_dtype,
+    )
+
+    relocate_empty_clusters_kernel(
+        X_t,
+        sample_weight,
+        assignments_idx,
+        samples_far_from_center,
+        empty_clusters_list,
+        # OUT
+        sq_dist_to_nearest_centroid,
+        centroids_t,
+        cluster_sizes,
+    )
@@ -0,0 +1,478 @@
+import math
+
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.autotune import get_tuned_parameters
+from sklearn_numba_dpex.common._streaming import iter_device_chunks
+from sklearn_numba_dpex.common._utils import _negative
+from sklearn_numba_dpex.common.kernels import (
+    make_apply_elementwise_func,
+    make_broadcast_division_1d_2d_axis0_kernel,
+    make_half_l2_norm_2d_axis0_kernel,
+)
+from sklearn_numba_dpex.common.reductions import make_sum_reduction_2d_kernel
+from sklearn_numba_dpex.common.topk import topk_idx
+from sklearn_numba_dpex.kmeans.kernels import (
+    make_compute_inertia_kernel,
+    make_gather_nearest_centroids_kernel,
+    make_label_assignment_fixed_window_kernel,
+    make_lloyd_single_step_fixed_window_kernel,
+    make_relocate_empty_clusters_kernel,
+)
+
+from ._iteration import _CentroidsPrivateCopies, _ConvergenceMonitor
+from .utils import get_euclidean_distances, get_half_l2_norm, get_labels_inertia
+
+
+def lloyd_chunked(
+    X,
+    sample_weight,
+    centroids_t,
+    use_uniform_weights,
+    max_iter=300,
+    verbose=False,
+    tol=1e-4,
+    chunk_size=2**20,
+):
+    """Lloyd's k-means for data that stays in host memory.
+
+    Same as `lloyd`, except that `X`, with shape (n_samples, n_features), and
+    `sample_weight` are host arrays (e.g. numpy arrays or `numpy.memmap`) that are
+    streamed to the device in chunks of `chunk_size` samples at each iteration. The
+    private copies of the centroid updates are accumulated accross all the chunks
+    before being reduced, so that the result is the same than `lloyd`'s.
+
+    Only one or two chunks of `X` are resident on device at any time (the next chunk
+    is copied while the current one is processed), along with arrays of shape
+    `(n_samples,)` that store the assignments of the samples.
+
+    Unlike the engine, this driver does not center the data: it is left to the caller.
+    """
+    n_samples, n_features = X.shape
+    n_clusters = centroids_t.shape[1]
+    compute_dtype = centroids_t.dtype.type
+
+    device = centroids_t.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+    # NB: the geometry of the kernels can be tuned for the device, see
+    # `sklearn_numba_dpex.autotune`.
+    lloyd_geometry = get_tuned_parameters(
+        "lloyd_single_step", device, compute_dtype, (n_samples, n_features, n_clusters)
+    )
+    label_assignment_geometry = get_tuned_parameters(
+        "label_assignment", device, compute_dtype, (n_samples, n_features, n_clusters)
+    )
+
+    if sample_weight is None:
+        sample_weight = np.ones(n_samples, dtype=compute_dtype)
+
+    chunk_size = max(min(chunk_size, n_samples), 1)
+    last_chunk_size = n_samples - (math.ceil(n_samples / chunk_size) - 1) * chunk_size
+
+    def make_fused_lloyd_kernel(n_samples_in_chunk, n_centroids_private_copies):
+        return make_lloyd_single_step_fixed_window_kernel(
+            n_samples_in_chunk,
+            n_features,
+            n_clusters,
+            return_assignments=True,
+            check_strict_convergence=True,
+            dtype=compute_dtype,
+            device=device,
+            n_centroids_private_copies=n_centroids_private_copies,
+            **lloyd_geometry,
+        )
+
+    # NB: the last chunk can be smaller and require a different kernel. It is set to
+    # use the same private copies than the full chunk kernel.
+    n_centroids_private_copies, fused_lloyd_kernel = make_fused_lloyd_kernel(
+        chunk_size, "auto"
+    )
+    _, fused_lloyd_last_chunk_kernel = make_fused_lloyd_kernel(
+        last_chunk_size, n_centroids_private_copies
+    )
+
+    assignment_fixed_window_kernel = make_label_assignment_fixed_window_kernel(
+        n_features,
+        n_clusters,
+        dtype=compute_dtype,
+        device=device,
+        **label_assignment_geometry,
+    )
+
+    compute_inertia_kernel = make_compute_inertia_kernel(
+        n_features, max_work_group_size, compute_dtype
+    )
+
+    broadcast_division_kernel = make_broadcast_division_1d_2d_axis0_kernel(
+        shape=(n_features, n_clusters),
+        work_group_size=max_work_group_size,
+    )
+
+    half_l2_norm_kernel = make_half_l2_norm_2d_axis0_kernel(
+        (n_features, n_clusters),
+        work_group_size=max_work_group_size,
+        dtype=compute_dtype,
+    )
+
+    reduce_inertia_kernels = {
+        n_samples_in_chunk: make_sum_reduction_2d_kernel(
+            shape=(n_samples_in_chunk,),
+            work_group_size="max",
+            device=device,
+            dtype=compute_dtype,
+        )
+        for n_samples_in_chunk in {chunk_size, last_chunk_size}
+    }
+
+    private_copies = _CentroidsPrivateCopies(
+        n_centroids_private_copies, n_features, n_clusters, device, compute_dtype
+    )
+
+    def compute_inertia(centroids_t, assignments_idx, with_sample_weight=True):
+        # Compute the per-sample inertia for all chunks, return the sum of the
+        # inertia, and write the per-sample inertia in `per_sample_inertia`.
+        inertia = compute_dtype(0.0)
+        for start, stop, X_t_chunk, sample_weight_chunk in iter_device_chunks(
+            X, sample_weight, chunk_size, device, compute_dtype
+        ):
+            if not with_sample_weight:
+                sample_weight_chunk = dpt.ones_like(sample_weight_chunk)
+            per_sample_inertia_chunk = per_sample_inertia[start:stop]
+            compute_inertia_kernel(
+                X_t_chunk,
+                sample_weight_chunk,
+                centroids_t,
+                assignments_idx[start:stop],
+                # OUT:
+                per_sample_inertia_chunk,
+            )
+            reduce_inertia_kernel = reduce_inertia_kernels[stop - start]
+            inertia += dpt.asnumpy(reduce_inertia_kernel(per_sample_inertia_chunk))[0]
+        return inertia
+
+    # Allocate the necessary memory in the device global memory
+    new_centroids_t = dpt.empty_like(centroids_t, device=device)
+    centroids_half_l2_norm = dpt.empty(n_clusters, dtype=compute_dtype, device=device)
+    cluster_sizes = dpt.empty(n_clusters, dtype=compute_dtype, device=device)
+    sq_dist_to_nearest_centroid = per_sample_inertia = dpt.empty(
+        n_samples, dtype=compute_dtype, device=device
+    )
+
+    new_assignments_idx = dpt.empty(n_samples, dtype=np.uint32, device=device)
+    assignments_idx = dpt.empty(n_samples, dtype=np.uint32, device=device)
+
+    empty_clusters_list = dpt.empty(n_clusters, dtype=np.uint32, device=device)
+    n_empty_clusters = dpt.empty(1, dtype=np.int32, device=device)
+
+    convergence_monitor = _ConvergenceMonitor(
+        n_features, n_clusters, max_iter, tol, verbose, device, compute_dtype
+    )
+
+    verbose = bool(verbose)
+
+    # NB: the iterations have the same structure than in `lloyd`, except that the
+    # fused kernel is called on each chunk of the data.
+    while convergence_monitor.keep_iterating():
+        half_l2_norm_kernel(
+            centroids_t,
+            # OUT:
+            centroids_half_l2_norm,
+        )
+
+        private_copies.reset()
+        n_empty_clusters[0] = np.int32(0)
+
+        for start, stop, X_t_chunk, sample_weight_chunk in iter_device_chunks(
+            X, sample_weight, chunk_size, device, compute_dtype
+        ):
+            kernel = (
+                fused_lloyd_kernel
+                if (stop - start) == chunk_size
+                else fused_lloyd_last_chunk_kernel
+            )
+            kernel(
+                X_t_chunk,
+                sample_weight_chunk,
+                centroids_t,
+                centroids_half_l2_norm,
+                assignments_idx[start:stop],
+                # OUT:
+                new_assignments_idx[start:stop],
+                convergence_monitor.strict_convergence_status,
+                private_copies.centroids_t,
+                private_copies.cluster_sizes,
+            )
+
+        private_copies.reduce(
+            # OUT:
+            new_centroids_t,
+            cluster_sizes,
+            empty_clusters_list,
+            n_empty_clusters,
+        )
+
+        if verbose:
+            inertia = compute_inertia(new_centroids_t, new_assignments_idx)
+            print(
+                f"Iteration {convergence_monitor.n_iteration}, inertia {inertia:5.3e}"
+            )
+
+        n_empty_clusters_ = int(n_empty_clusters[0])
+        if n_empty_clusters_ > 0:
+            if not verbose or not use_uniform_weights:
+                compute_inertia(
+                    new_centroids_t, new_assignments_idx, with_sample_weight=False
+                )
+
+            _relocate_empty_clusters_from_host(
+                n_empty_clusters_,
+                X,
+                sample_weight,
+                new_centroids_t,
+                cluster_sizes,
+                new_assignments_idx,
+                empty_clusters_list,
+                sq_dist_to_nearest_centroid,
+                max_work_group_size,
+            )
+
+        # Change `new_centroids_t` inplace
+        broadcast_division_kernel(new_centroids_t, cluster_sizes)
+
+        centroids_t, new_centroids_t = (new_centroids_t, centroids_t)
+        assignments_idx, new_assignments_idx = (
+            new_assignments_idx,
+            assignments_idx,
+        )
+
+        convergence_monitor.end_iteration(centroids_t, new_centroids_t)
+
+    convergence_monitor.print_convergence()
+
+    # Finally, run an assignment kernel to compute the assignments to the best
+    # centroids found, along with the exact inertia.
+    half_l2_norm_kernel(
+        centroids_t,
+        # OUT:
+        centroids_half_l2_norm,
+    )
+
+    for start, stop, X_t_chunk, _ in iter_device_chunks(
+        X, None, chunk_size, device, compute_dtype
+    ):
+        assignment_fixed_window_kernel(
+            X_t_chunk,
+            centroids_t,
+            centroids_half_l2_norm,
+            # OUT:
+            assignments_idx[start:stop],
+        )
+
+    inertia = compute_inertia(centroids_t, assignments_idx)
+
+    return assignments_idx, inertia, centroids_t, convergence_monitor.n_iteration
+
+
+def prepare_data_for_lloyd_chunked(X, tol, sample_weight, chunk_size):
+    """Same as `prepare_data_for_lloyd` for host data `X` with shape (n_samples,
+    n_features), that is read by chunks of `chunk_size` samples so that no copy of
+    the whole data is made. The data is not centered, since it would require either
+    a copy or modifying the data of the caller (see `lloyd_chunked`)."""
+    n_samples, n_features = X.shape
+    sample_weight = np.asarray(sample_weight)
+
+    X_sum = np.zeros(n_features, dtype=np.float64)
+    for start in range(0, n_samples, chunk_size):
+        X_sum += np.asarray(X[start : start + chunk_size]).sum(axis=0, dtype=np.float64)
+    X_mean = X_sum / n_samples
+
+    sum_of_squared_deviations = 0.0
+    for start in range(0, n_samples, chunk_size):
+        sum_of_squared_deviations += np.square(
+            np.asarray(X[start : start + chunk_size], dtype=np.float64) - X_mean
+        ).sum()
+    tol = (sum_of_squared_deviations / (n_features * n_samples)) * tol
+
+    sample_weight_is_uniform = bool(np.all(sample_weight == sample_weight[0]))
+
+    return tol, sample_weight_is_uniform
+
+
+def _relocate_empty_clusters_from_host(
+    n_empty_clusters,
+    X,
+    sample_weight,
+    centroids_t,
+    cluster_sizes,
+    assignments_idx,
+    empty_clusters_list,
+    sq_dist_to_nearest_centroid,
+    work_group_size,
+):
+    """Same as `_relocate_empty_clusters`, but `X` and `sample_weight` are host arrays
+    of which only the samples the empty clusters are relocated to are copied to
+    device."""
+    compute_dtype = centroids_t.dtype.type
+    n_features = centroids_t.shape[0]
+    device = centroids_t.device.sycl_device
+
+    samples_far_from_center = topk_idx(sq_dist_to_nearest_centroid, n_empty_clusters)
+    samples_far_from_center_ = np.sort(dpt.asnumpy(samples_far_from_center))
+    samples_far_from_center = dpt.asarray(samples_far_from_center_, device=device)
+
+    X_t_far_from_center = dpt.asarray(
+        np.ascontiguousarray(
+            np.asarray(X[samples_far_from_center_], dtype=compute_dtype).T
+        ),
+        device=device,
+    )
+    sample_weight_far_from_center = dpt.asarray(
+        np.asarray(sample_weight[samples_far_from_center_], dtype=compute_dtype),
+        device=device,
+    )
+    assignments_idx_far_from_center = dpt.take(assignments_idx, samples_far_from_center)
+    per_sample_inertia_far_from_center = dpt.empty(
+        n_empty_clusters, dtype=compute_dtype, device=device
+    )
+
+    relocate_empty_clusters_kernel = make_relocate_empty_clusters_kernel(
+        n_empty_clusters,
+        n_features,
+        work_group_size,
+        compute_dtype,
+    )
+
+    # NB: the relocation kernel is called on the arrays restricted to the samples the
+    # clusters are relocated to, which are re-indexed from 0 to n_empty_clusters.
+    relocate_empty_clusters_kernel(
+        X_t_far_from_center,
+        sample_weight_far_from_center,
+        assignments_idx_far_from_center,
+        dpt.arange(n_empty_clusters, dtype=np.int64, device=device),
+        empty_clusters_list,
+        # OUT
+        per_sample_inertia_far_from_center,
+        centroids_t,
+        cluster_sizes,
+    )
+
+
+def get_labels_inertia_chunked(
+    X, centroids_t, sample_weight, with_inertia, chunk_size, centroids_half_l2_norm=None
+):
+    """Same as `get_labels_inertia` for host data `X` with shape (n_samples,
+    n_features), that is streamed to the device in chunks of `chunk_size` samples.
+
+    The labels of all the samples are stored on device.
+    """
+    n_samples = X.shape[0]
+    compute_dtype = centroids_t.dtype.type
+    device = centroids_t.device.sycl_device
+
+    assignments_idx = dpt.empty(n_samples, dtype=np.uint32, device=device)
+    inertia = np.zeros(1, dtype=compute_dtype) if with_inertia else None
+    # NB: the half l2 norms of the centroids are computed once for all the chunks.
+    if centroids_half_l2_norm is None:
+        centroids_half_l2_norm = get_half_l2_norm(centroids_t)
+
+    for start, stop, X_t_chunk, sample_weight_chunk in iter_device_chunks(
+        X,
+        sample_weight if with_inertia else None,
+        chunk_size,
+        device,
+        compute_dtype,
+    ):
+        assignments_idx_chunk, inertia_chunk = get_labels_inertia(
+            X_t_chunk,
+            centroids_t,
+            sample_weight_chunk,
+            with_inertia,
+            centroids_half_l2_norm,
+        )
+        assignments_idx[start:stop] = assignments_idx_chunk
+        if with_inertia:
+            inertia += inertia_chunk
+
+    return assignments_idx, inertia
+
+
+def iter_predict_chunked(X, centroids_t, output, n_nearest, chunk_size):
+    """Stream host data `X` to the device by chunks of samples, and yield the
+    predictions for each chunk.
+
+    `X` is either an array of shape (n_samples, n_features), that is cut in chunks of
+    `chunk_size` samples, or an iterable of such arrays. The centroids and their half
+    l2 norms stay on device for all the chunks, and the next chunk is copied to the
+    device while the current chunk is processed.
+
+    Yields `(start, stop, result)`, where `result` depends on `output`:
+
+    - `"labels"`: the labels of the samples in the chunk,
+    - `"distances"`: the distances of the samples to all the centroids, with shape
+      (stop - start, n_clusters),
+    - `"nearest"`: a tuple `(distances, nearest_idx)` where `nearest_idx`, with
+      shape (stop - start, n_nearest), contains the indices of the `n_nearest`
+      closest centroids to each sample, in no particular order, and `distances`, with
+      the same shape, the distances to those centroids. If `n_nearest` is
+      `n_clusters`, `nearest_idx` is None and `distances` contains the distances to
+      all the centroids.
+    """
+    compute_dtype = centroids_t.dtype.type
+    device = centroids_t.device.sycl_device
+    n_clusters = centroids_t.shape[1]
+
+    if output == "labels":
+        centroids_half_l2_norm = get_half_l2_norm(centroids_t)
+
+    elif output == "nearest" and n_nearest < n_clusters:
+        gather_nearest_centroids_kernel = make_gather_nearest_centroids_kernel(
+            n_nearest, device.max_work_group_size, compute_dtype
+        )
+
+    for start, stop, X_t_chunk, _ in iter_device_chunks(
+        X, None, chunk_size, device, compute_dtype
+    ):
+        if output == "labels":
+            assignments_idx, _ = get_labels_inertia(
+                X_t_chunk,
+                centroids_t,
+                None,
+                with_inertia=False,
+                centroids_half_l2_norm=centroids_half_l2_norm,
+            )
+            yield start, stop, assignments_idx
+            continue
+
+        euclidean_distances = get_euclidean_distances(X_t_chunk, centroids_t)
+        if output == "distances":
+            yield start, stop, euclidean_distances
+            continue
+
+        if n_nearest >= n_clusters:
+            yield start, stop, (euclidean_distances, None)
+            continue
+
+        # NB: the nearest centroids are the top k of the opposite distances, that
+        # are computed on a C-contiguous copy of the distances. The distances to the
+        # nearest centroids are then gathered from the distances, that are left
+        # unchanged, so that only `n_nearest` distances per sample are copied to the
+        # host.
+        scores = dpt.asarray(euclidean_distances, order="C")
+        negate_kernel = make_apply_elementwise_func(
+            scores.shape, _negative, device.max_work_group_size
+        )
+        negate_kernel(scores)
+        nearest_idx = topk_idx(scores, n_nearest)
+        del scores
+
+        nearest_distances = dpt.empty(
+            nearest_idx.shape, dtype=compute_dtype, device=device
+        )
+        gather_nearest_centroids_kernel(
+            euclidean_distances.T,
+            nearest_idx,
+            # OUT
+            nearest_distances,
+        )
+        yield start, stop, (nearest_distances, nearest_idx)
@@ -0,0 +1,599 @@
+import math
+
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.common._utils import _divide_by, _square
+from sklearn_numba_dpex.common.kernels import (
+    make_apply_elementwise_func,
+    make_broadcast_division_1d_2d_axis0_kernel,
+    make_half_l2_norm_2d_axis0_kernel,
+)
+from sklearn_numba_dpex.common.random import (
+    create_xoroshiro128pp_states,
+    get_random_raw,
+)
+from sklearn_numba_dpex.common.reductions import (
+    make_argmin_reduction_1d_kernel,
+    make_sum_reduction_2d_kernel,
+)
+from sklearn_numba_dpex.common.scan import make_inclusive_scan_1d_kernel
+from sklearn_numba_dpex.common.topk import topk_idx
+from sklearn_numba_dpex.kmeans.kernels import (
+    make_compute_euclidean_distances_csr_kernel,
+    make_compute_inertia_csr_kernel,
+    make_csr_column_sums_kernel,
+    make_csr_rows_to_dense_t_kernel,
+    make_kmeansplusplus_single_step_csr_kernel,
+    make_label_assignment_csr_kernel,
+    make_lloyd_single_step_csr_kernel,
+    make_relocate_empty_clusters_kernel,
+    make_sample_center_candidates_kernel,
+)
+
+from ._iteration import _CentroidsPrivateCopies, _ConvergenceMonitor
+from .utils import get_half_l2_norm
+
+
+def prepare_data_for_lloyd_csr(X, tol, sample_weight):
+    """Same as `prepare_data_for_lloyd` for a `DeviceCSRMatrix` `X`. The data is not
+    centered, since it would make it dense."""
+    n_samples, n_features = X.shape
+    compute_dtype = X.dtype.type
+    device = X.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+
+    csr_column_sums_kernel = make_csr_column_sums_kernel(
+        n_samples, max_work_group_size, compute_dtype
+    )
+
+    divide_by_n_samples_kernel = make_apply_elementwise_func(
+        (n_features,),
+        _divide_by(compute_dtype(n_samples)),
+        max_work_group_size,
+    )
+
+    sum_of_squares_kernel = make_sum_reduction_2d_kernel(
+        shape=(n_features,),
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+        fused_elementwise_func=_square,
+    )
+
+    sum_1d_kernel = make_sum_reduction_2d_kernel(
+        shape=(n_samples,),
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    # The variance is computed as E[X**2] - E[X]**2, where E[X**2] is derived from the
+    # precomputed squared norms of the samples.
+    X_mean = dpt.zeros(n_features, dtype=compute_dtype, device=device)
+    csr_column_sums_kernel(X.data, X.indices, X.indptr, X_mean)
+    # Change `X_mean` inplace
+    divide_by_n_samples_kernel(X_mean)
+
+    X_mean_sq_norm = dpt.asnumpy(sum_of_squares_kernel(X_mean))[0]
+    X_sq_norms_sum = dpt.asnumpy(sum_1d_kernel(X.row_sq_norms))[0]
+
+    variance = X_sq_norms_sum / n_samples - X_mean_sq_norm
+    tol = (variance / n_features) * tol
+
+    sample_weight_sum = compute_dtype(sum_1d_kernel(sample_weight)[0])
+    sample_weight_is_uniform = sample_weight_sum == (
+        compute_dtype(sample_weight[0]) * n_samples
+    )
+
+    return tol, sample_weight_is_uniform
+
+
+def lloyd_csr(
+    X,
+    sample_weight,
+    centroids_t,
+    max_iter=300,
+    verbose=False,
+    tol=1e-4,
+):
+    """Same as `lloyd` for a `DeviceCSRMatrix` `X` of shape (n_samples, n_features).
+
+    The centroids remain dense, with shape (n_features, n_clusters).
+    """
+    n_samples, n_features = X.shape
+    n_clusters = centroids_t.shape[1]
+    compute_dtype = X.dtype.type
+
+    device = X.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+    sub_group_size = 8
+
+    # NB: for sparse data, the centroids can be much larger than the data itself
+    # (`n_features` is typically large). The number of private copies is bounded
+    # such that the private copies are not larger than the data, which also
+    # reflects that the collisions are less likely since each sample only updates
+    # the features of its non-zero values.
+    n_centroids_private_copies = int(
+        max(
+            min(
+                math.ceil(n_samples / sub_group_size),
+                device.max_compute_units,
+                X.nnz // (n_features * n_clusters),
+            ),
+            1,
+        )
+    )
+
+    # Create a set of kernels
+    lloyd_single_step_csr_kernel = make_lloyd_single_step_csr_kernel(
+        n_samples,
+        n_clusters,
+        n_centroids_private_copies,
+        sub_group_size,
+        max_work_group_size,
+        compute_dtype,
+    )
+
+    compute_inertia_csr_kernel = make_compute_inertia_csr_kernel(
+        max_work_group_size, compute_dtype
+    )
+
+    broadcast_division_kernel = make_broadcast_division_1d_2d_axis0_kernel(
+        shape=(n_features, n_clusters),
+        work_group_size=max_work_group_size,
+    )
+
+    half_l2_norm_kernel = make_half_l2_norm_2d_axis0_kernel(
+        (n_features, n_clusters),
+        work_group_size=max_work_group_size,
+        dtype=compute_dtype,
+    )
+
+    reduce_inertia_kernel = make_sum_reduction_2d_kernel(
+        shape=(n_samples,),
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    private_copies = _CentroidsPrivateCopies(
+        n_centroids_private_copies, n_features, n_clusters, device, compute_dtype
+    )
+
+    # Allocate the necessary memory in the device global memory
+    centroids_t = dpt.asarray(centroids_t, copy=True)
+    new_centroids_t = dpt.empty_like(centroids_t, device=device)
+    centroids_half_l2_norm = dpt.empty(n_clusters, dtype=compute_dtype, device=device)
+    cluster_sizes = dpt.empty(n_clusters, dtype=compute_dtype, device=device)
+    sq_dist_to_nearest_centroid = per_sample_inertia = dpt.empty(
+        n_samples, dtype=compute_dtype, device=device
+    )
+    unit_sample_weight = dpt.ones_like(sample_weight)
+
+    new_assignments_idx = dpt.empty(n_samples, dtype=np.uint32, device=device)
+    assignments_idx = dpt.empty(n_samples, dtype=np.uint32, device=device)
+
+    empty_clusters_list = dpt.empty(n_clusters, dtype=np.uint32, device=device)
+    n_empty_clusters = dpt.empty(1, dtype=np.int32, device=device)
+
+    convergence_monitor = _ConvergenceMonitor(
+        n_features, n_clusters, max_iter, tol, verbose, device, compute_dtype
+    )
+
+    def compute_inertia(sample_weight, centroids_t, assignments_idx):
+        half_l2_norm_kernel(centroids_t, centroids_half_l2_norm)
+        compute_inertia_csr_kernel(
+            X.data,
+            X.indices,
+            X.indptr,
+            X.row_sq_norms,
+            sample_weight,
+            centroids_t,
+            centroids_half_l2_norm,
+            assignments_idx,
+            # OUT:
+            per_sample_inertia,
+        )
+
+    verbose = bool(verbose)
+
+    # NB: see `lloyd` for comments on the main loop.
+    while convergence_monitor.keep_iterating():
+        half_l2_norm_kernel(
+            centroids_t,
+            # OUT:
+            centroids_half_l2_norm,
+        )
+
+        private_copies.reset()
+        n_empty_clusters[0] = np.int32(0)
+
+        lloyd_single_step_csr_kernel(
+            X.data,
+            X.indices,
+            X.indptr,
+            sample_weight,
+            centroids_t,
+            centroids_half_l2_norm,
+            assignments_idx,
+            # OUT:
+            new_assignments_idx,
+            convergence_monitor.strict_convergence_status,
+            private_copies.centroids_t,
+            private_copies.cluster_sizes,
+        )
+
+        private_copies.reduce(
+            # OUT:
+            cluster_sizes,
+            new_centroids_t,
+            empty_clusters_list,
+            n_empty_clusters,
+        )
+
+        n_empty_clusters_ = int(n_empty_clusters[0])
+        if n_empty_clusters_ > 0:
+            # NB: the distances of the samples to the centroids they have been
+            # assigned to in this iteration are used to choose the samples the empty
+            # clusters are relocated to, like in scikit-learn.
+            compute_inertia(unit_sample_weight, centroids_t, new_assignments_idx)
+
+            _relocate_empty_clusters_csr(
+                n_empty_clusters_,
+                X,
+                sample_weight,
+                new_centroids_t,
+                cluster_sizes,
+                new_assignments_idx,
+                empty_clusters_list,
+                sq_dist_to_nearest_centroid,
+                max_work_group_size,
+            )
+
+        # Change `new_centroids_t` inplace
+        broadcast_division_kernel(new_centroids_t, cluster_sizes)
+
+        if verbose:
+            compute_inertia(sample_weight, new_centroids_t, new_assignments_idx)
+            inertia, *_ = dpt.asnumpy(reduce_inertia_kernel(per_sample_inertia))
+            print(
+                f"Iteration {convergence_monitor.n_iteration}, inertia {inertia:5.3e}"
+            )
+
+        centroids_t, new_centroids_t = (new_centroids_t, centroids_t)
+        assignments_idx, new_assignments_idx = (
+            new_assignments_idx,
+            assignments_idx,
+        )
+
+        convergence_monitor.end_iteration(centroids_t, new_centroids_t)
+
+    convergence_monitor.print_convergence()
+
+    assignments_idx, inertia = get_labels_inertia_csr(
+        X, centroids_t, sample_weight, with_inertia=True
+    )
+
+    return (
+        assignments_idx,
+        inertia[0],
+        centroids_t,
+        convergence_monitor.n_iteration,
+    )
+
+
+def _relocate_empty_clusters_csr(
+    n_empty_clusters,
+    X,
+    sample_weight,
+    centroids_t,
+    cluster_sizes,
+    assignments_idx,
+    empty_clusters_list,
+    sq_dist_to_nearest_centroid,
+    work_group_size,
+):
+    """Same as `_relocate_empty_clusters` for a `DeviceCSRMatrix` `X`. Only the
+    samples the empty clusters are relocated to are densified."""
+    compute_dtype = centroids_t.dtype.type
+    n_features = centroids_t.shape[0]
+    device = centroids_t.device.sycl_device
+
+    samples_far_from_center = topk_idx(sq_dist_to_nearest_centroid, n_empty_clusters)
+
+    csr_rows_to_dense_t_kernel = make_csr_rows_to_dense_t_kernel(
+        n_features, work_group_size, compute_dtype
+    )
+    X_t_far_from_center = csr_rows_to_dense_t_kernel(
+        X.data, X.indices, X.indptr, samples_far_from_center
+    )
+    sample_weight_far_from_center = dpt.take(sample_weight, samples_far_from_center)
+    assignments_idx_far_from_center = dpt.take(assignments_idx, samples_far_from_center)
+    per_sample_inertia_far_from_center = dpt.empty(
+        n_empty_clusters, dtype=compute_dtype, device=device
+    )
+
+    relocate_empty_clusters_kernel = make_relocate_empty_clusters_kernel(
+        n_empty_clusters,
+        n_features,
+        work_group_size,
+        compute_dtype,
+    )
+
+    # NB: see `_relocate_empty_clusters_from_host`.
+    relocate_empty_clusters_kernel(
+        X_t_far_from_center,
+        sample_weight_far_from_center,
+        assignments_idx_far_from_center,
+        dpt.arange(n_empty_clusters, dtype=np.int64, device=device),
+        empty_clusters_list,
+        # OUT
+        per_sample_inertia_far_from_center,
+        centroids_t,
+        cluster_sizes,
+    )
+
+
+def get_labels_inertia_csr(
+    X, centroids_t, sample_weight, with_inertia, centroids_half_l2_norm=None
+):
+    """Same as `get_labels_inertia` for a `DeviceCSRMatrix` `X`."""
+    compute_dtype = X.dtype.type
+    n_samples, n_features = X.shape
+    n_clusters = centroids_t.shape[1]
+    device = X.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+    sub_group_size = 8
+
+    label_assignment_csr_kernel = make_label_assignment_csr_kernel(
+        n_clusters, sub_group_size, max_work_group_size, compute_dtype
+    )
+
+    if centroids_half_l2_norm is None:
+        centroids_half_l2_norm = get_half_l2_norm(centroids_t)
+
+    assignments_idx = dpt.empty(n_samples, dtype=np.uint32, device=device)
+
+    label_assignment_csr_kernel(
+        X.data,
+        X.indices,
+        X.indptr,
+        centroids_t,
+        centroids_half_l2_norm,
+        # OUT
+        assignments_idx,
+    )
+
+    if not with_inertia:
+        return assignments_idx, None
+
+    compute_inertia_csr_kernel = make_compute_inertia_csr_kernel(
+        max_work_group_size, compute_dtype
+    )
+
+    reduce_inertia_kernel = make_sum_reduction_2d_kernel(
+        shape=(n_samples,),
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    per_sample_inertia = dpt.empty(n_samples, dtype=compute_dtype, device=device)
+
+    compute_inertia_csr_kernel(
+        X.data,
+        X.indices,
+        X.indptr,
+        X.row_sq_norms,
+        sample_weight,
+        centroids_t,
+        centroids_half_l2_norm,
+        assignments_idx,
+        # OUT
+        per_sample_inertia,
+    )
+
+    # inertia = per_sample_inertia.sum()
+    inertia = dpt.asnumpy(reduce_inertia_kernel(per_sample_inertia))
+
+    return assignments_idx, inertia
+
+
+def get_euclidean_distances_csr(X, Y_t):
+    """Same as `get_euclidean_distances` for a `DeviceCSRMatrix` `X`."""
+    compute_dtype = X.dtype.type
+    n_samples, n_features = X.shape
+    n_clusters = Y_t.shape[1]
+    device = X.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+    sub_group_size = 8
+
+    euclidean_distances_csr_kernel = make_compute_euclidean_distances_csr_kernel(
+        n_clusters, sub_group_size, max_work_group_size, compute_dtype
+    )
+
+    half_l2_norm_kernel = make_half_l2_norm_2d_axis0_kernel(
+        (n_features, n_clusters),
+        work_group_size=max_work_group_size,
+        dtype=compute_dtype,
+    )
+
+    Y_half_l2_norm = dpt.empty(n_clusters, dtype=compute_dtype, device=device)
+    half_l2_norm_kernel(Y_t, Y_half_l2_norm)
+
+    euclidean_distances_t = dpt.empty(
+        (n_clusters, n_samples), dtype=compute_dtype, device=device
+    )
+
+    euclidean_distances_csr_kernel(
+        X.data,
+        X.indices,
+        X.indptr,
+        X.row_sq_norms,
+        Y_t,
+        Y_half_l2_norm,
+        # OUT
+        euclidean_distances_t,
+    )
+
+    return euclidean_distances_t.T
+
+
+def get_csr_rows_t(X, row_ids):
+    """Gather the rows `row_ids` of a `DeviceCSRMatrix` `X` into a dense array of shape
+    (n_features, len(row_ids))."""
+    device = X.device.sycl_device
+    csr_rows_to_dense_t_kernel = make_csr_rows_to_dense_t_kernel(
+        X.shape[1], device.max_work_group_size, X.dtype.type
+    )
+    return csr_rows_to_dense_t_kernel(
+        X.data, X.indices, X.indptr, dpt.asarray(row_ids, device=device)
+    )
+
+
+def kmeans_plusplus_csr(
+    X,
+    sample_weight,
+    n_clusters,
+    random_state,
+):
+    """Same as `kmeans_plusplus` for a `DeviceCSRMatrix` `X`. The centers are
+    returned as a dense array of shape (n_features, n_clusters)."""
+    compute_dtype = X.dtype.type
+    n_samples, n_features = X.shape
+    device = X.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+    sub_group_size = 8
+
+    # Same retrial heuristic as scikit-learn (at least until <1.2)
+    n_local_trials = 2 + int(np.log(n_clusters))
+
+    # NB: the initialization step is the single step with one candidate, the first
+    # center, and an infinite `closest_dist_sq`.
+    kmeansplusplus_init_csr_kernel = make_kmeansplusplus_single_step_csr_kernel(
+        n_samples, 1, sub_group_size, max_work_group_size, compute_dtype
+    )
+
+    kmeansplusplus_single_step_csr_kernel = make_kmeansplusplus_single_step_csr_kernel(
+        n_samples, n_local_trials, sub_group_size, max_work_group_size, compute_dtype
+    )
+
+    csr_rows_to_dense_t_kernel = make_csr_rows_to_dense_t_kernel(
+        n_features, max_work_group_size, compute_dtype
+    )
+
+    select_best_candidate_kernel = make_argmin_reduction_1d_kernel(
+        n_local_trials,
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    inclusive_scan_kernel = make_inclusive_scan_1d_kernel(
+        n_samples,
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    reduce_potential_2d_kernel = make_sum_reduction_2d_kernel(
+        shape=(n_local_trials, n_samples),
+        axis=1,
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    random_state = create_xoroshiro128pp_states(
+        n_local_trials,
+        seed=random_state,
+        device=device,
+    )
+
+    sample_center_candidates_kernel = make_sample_center_candidates_kernel(
+        n_samples,
+        n_local_trials,
+        max_work_group_size,
+        compute_dtype,
+    )
+
+    centers_t = dpt.empty((n_features, n_clusters), dtype=compute_dtype, device=device)
+
+    center_indices = dpt.full((n_clusters,), -1, dtype=np.int32, device=device)
+
+    sq_distances_t = dpt.empty(
+        (n_local_trials, n_samples), dtype=compute_dtype, device=device
+    )
+
+    candidate_ids = dpt.empty((n_local_trials,), dtype=np.int32, device=device)
+
+    # Pick first center randomly
+    # Use numpy type to work around https://github.com/IntelPython/dpnp/issues/1238
+    random_uint64 = dpt.asnumpy(get_random_raw(random_state))[0]
+    starting_center_id = random_uint64 % np.uint64(n_samples)
+    center_indices[0] = np.int32(starting_center_id)
+
+    starting_center_t = csr_rows_to_dense_t_kernel(
+        X.data, X.indices, X.indptr, center_indices[0:1]
+    )
+    centers_t[:, 0] = starting_center_t[:, 0]
+
+    closest_dist_sq = dpt.empty((1, n_samples), dtype=compute_dtype, device=device)
+    kmeansplusplus_init_csr_kernel(
+        X.data,
+        X.indices,
+        X.indptr,
+        X.row_sq_norms,
+        sample_weight,
+        center_indices[0:1],
+        starting_center_t,
+        dpt.full(n_samples, np.inf, dtype=compute_dtype, device=device),
+        # OUT
+        closest_dist_sq,
+    )
+    closest_dist_sq = closest_dist_sq[0]
+
+    # Pick the remaining n_clusters-1 points
+    for c in range(1, n_clusters):
+        # NB: see `kmeans_plusplus` for comments on the sampling of the candidates.
+        cumulative_potential = inclusive_scan_kernel(closest_dist_sq)
+        sample_center_candidates_kernel(
+            cumulative_potential,
+            # OUT
+            random_state,
+            candidate_ids,
+        )
+
+        candidates_t = csr_rows_to_dense_t_kernel(
+            X.data, X.indices, X.indptr, candidate_ids
+        )
+
+        kmeansplusplus_single_step_csr_kernel(
+            X.data,
+            X.indices,
+            X.indptr,
+            X.row_sq_norms,
+            sample_weight,
+            candidate_ids,
+            candidates_t,
+            closest_dist_sq,
+            # OUT
+            sq_distances_t,
+        )
+
+        candidate_potentials = reduce_potential_2d_kernel(sq_distances_t)[:, 0]
+        # Use numpy type to work around https://github.com/IntelPython/dpnp/issues/1238
+        best_candidate = dpt.asnumpy(
+            select_best_candidate_kernel(candidate_potentials)
+        )[0]
+
+        # Pick the c-th centroid and update the distance
+        # to the closest centroid for each sample.
+        # NB: `closest_dist_sq` is a view on `sq_distances_t`, which is overwritten
+        # at the next iteration. It is safe because each work item of the single step
+        # kernel reads its value before writing the new distances.
+        closest_dist_sq = sq_distances_t[best_candidate, :]
+        centers_t[:, c] = candidates_t[:, best_candidate]
+        center_indices[c] = candidate_ids[best_candidate]
+
+    return centers_t, center_indices
@@ -0,0 +1,280 @@
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.common._utils import (
+    _positive_part,
+    get_maximum_power_of_2_smaller_than,
+)
+from sklearn_numba_dpex.common.kernels import (
+    make_broadcast_division_1d_2d_axis0_kernel,
+    make_sq_distances_operands_kernel,
+)
+from sklearn_numba_dpex.common.matmul import make_matmul_2d_kernel
+from sklearn_numba_dpex.common.reductions import make_sum_reduction_2d_kernel
+from sklearn_numba_dpex.kmeans.kernels import (
+    make_compute_inertia_kernel,
+    make_half_min_centroid_distances_kernel,
+    make_hamerly_single_step_kernel,
+    make_max_centroid_shifts_kernel,
+    make_update_hamerly_bounds_kernel,
+)
+
+from ._iteration import (
+    _CentroidsPrivateCopies,
+    _ConvergenceMonitor,
+    _relocate_empty_clusters,
+)
+from .utils import get_labels_inertia
+
+
+def hamerly(
+    X_t,
+    sample_weight,
+    centroids_t,
+    use_uniform_weights,
+    max_iter=300,
+    verbose=False,
+    tol=1e-4,
+    n_centroids_private_copies="auto",
+):
+    """Lloyd's k-means that skips distance computations using Hamerly's bounds.
+
+    It has the same outputs and convergence criteria than `lloyd`. The results are
+    expected to be equal, up to rounding errors.
+
+    See `sklearn_numba_dpex.kmeans.kernels.hamerly` for more details.
+    """
+    n_features, n_samples = X_t.shape
+    n_clusters = centroids_t.shape[1]
+    compute_dtype = X_t.dtype.type
+
+    device = X_t.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+    sub_group_size = 8
+
+    # Create a set of kernels
+    (
+        n_centroids_private_copies,
+        hamerly_single_step_kernel,
+    ) = make_hamerly_single_step_kernel(
+        n_samples,
+        n_features,
+        n_clusters,
+        check_strict_convergence=True,
+        sub_group_size=sub_group_size,
+        work_group_size=max_work_group_size,
+        dtype=compute_dtype,
+        device=device,
+        n_centroids_private_copies=n_centroids_private_copies,
+    )
+
+    # NB: the squared distances between all the pairs of centroids are computed in
+    # parallel with the matmul kernel, on operands augmented with the squared norms
+    # of the centroids (see `iter_pairwise_distances`).
+    left_operands_kernel = make_sq_distances_operands_kernel(
+        n_features, True, max_work_group_size, compute_dtype
+    )
+    right_operands_kernel = make_sq_distances_operands_kernel(
+        n_features, False, max_work_group_size, compute_dtype
+    )
+    centroid_sq_distances_kernel = make_matmul_2d_kernel(
+        n_clusters,
+        n_clusters,
+        n_features + 2,
+        compute_dtype,
+        device,
+        out_fused_elementwise_fn=_positive_part,
+    )
+
+    half_min_centroid_distances_kernel = make_half_min_centroid_distances_kernel(
+        n_clusters, max_work_group_size, compute_dtype
+    )
+
+    max_centroid_shifts_kernel = make_max_centroid_shifts_kernel(
+        n_clusters,
+        get_maximum_power_of_2_smaller_than(min(max_work_group_size, n_clusters)),
+        compute_dtype,
+    )
+
+    update_hamerly_bounds_kernel = make_update_hamerly_bounds_kernel(
+        n_samples, max_work_group_size, compute_dtype
+    )
+
+    compute_inertia_kernel = make_compute_inertia_kernel(
+        n_features, max_work_group_size, compute_dtype
+    )
+
+    broadcast_division_kernel = make_broadcast_division_1d_2d_axis0_kernel(
+        shape=(n_features, n_clusters),
+        work_group_size=max_work_group_size,
+    )
+
+    reduce_inertia_kernel = make_sum_reduction_2d_kernel(
+        shape=(n_samples,),
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    private_copies = _CentroidsPrivateCopies(
+        n_centroids_private_copies, n_features, n_clusters, device, compute_dtype
+    )
+
+    # Allocate the necessary memory in the device global memory
+    new_centroids_t = dpt.empty_like(centroids_t, device=device)
+    left_operands = dpt.empty(
+        (n_clusters, n_features + 2), dtype=compute_dtype, device=device
+    )
+    right_operands = dpt.empty_like(left_operands)
+    centroid_sq_distances = dpt.empty(
+        (n_clusters, n_clusters), dtype=compute_dtype, device=device
+    )
+    half_min_centroid_distances = dpt.empty(
+        n_clusters, dtype=compute_dtype, device=device
+    )
+    max_centroid_shifts = dpt.empty(2, dtype=compute_dtype, device=device)
+    cluster_sizes = dpt.empty(n_clusters, dtype=compute_dtype, device=device)
+    sq_dist_to_nearest_centroid = per_sample_inertia = dpt.empty(
+        n_samples, dtype=compute_dtype, device=device
+    )
+
+    # NB: the initial values of the bounds and of the assignments force the
+    # computation of all the distances during the first iteration.
+    assignments_idx = dpt.zeros(n_samples, dtype=np.uint32, device=device)
+    upper_bounds = dpt.full(n_samples, np.inf, dtype=compute_dtype, device=device)
+    lower_bounds = dpt.zeros(n_samples, dtype=compute_dtype, device=device)
+
+    empty_clusters_list = dpt.empty(n_clusters, dtype=np.uint32, device=device)
+    n_empty_clusters = dpt.empty(1, dtype=np.int32, device=device)
+
+    convergence_monitor = _ConvergenceMonitor(
+        n_features, n_clusters, max_iter, tol, verbose, device, compute_dtype
+    )
+    centroid_shifts = convergence_monitor.centroid_shifts
+
+    verbose = bool(verbose)
+
+    # NB: the iterations have the same structure than in `lloyd`, except that the
+    # bounds are updated at the end of each iteration.
+    while convergence_monitor.keep_iterating():
+        # NB: the operands kernel expects C-contiguous rows of centroids.
+        centroids = dpt.asarray(centroids_t.T, order="C")
+        left_operands_kernel(
+            centroids,
+            # OUT
+            left_operands,
+        )
+        right_operands_kernel(
+            centroids,
+            # OUT
+            right_operands,
+        )
+        centroid_sq_distances_kernel(
+            left_operands,
+            right_operands,
+            # OUT
+            centroid_sq_distances,
+        )
+        half_min_centroid_distances_kernel(
+            centroid_sq_distances,
+            # OUT:
+            half_min_centroid_distances,
+        )
+
+        private_copies.reset()
+        n_empty_clusters[0] = np.int32(0)
+
+        hamerly_single_step_kernel(
+            X_t,
+            sample_weight,
+            centroids_t,
+            half_min_centroid_distances,
+            # INOUT:
+            assignments_idx,
+            upper_bounds,
+            lower_bounds,
+            # OUT:
+            convergence_monitor.strict_convergence_status,
+            private_copies.centroids_t,
+            private_copies.cluster_sizes,
+        )
+
+        private_copies.reduce(
+            # OUT:
+            new_centroids_t,
+            cluster_sizes,
+            empty_clusters_list,
+            n_empty_clusters,
+        )
+
+        if verbose:
+            compute_inertia_kernel(
+                X_t,
+                sample_weight,
+                new_centroids_t,
+                assignments_idx,
+                # OUT:
+                per_sample_inertia,
+            )
+            inertia, *_ = dpt.asnumpy(reduce_inertia_kernel(per_sample_inertia))
+            print(
+                f"Iteration {convergence_monitor.n_iteration}, inertia {inertia:5.3e}"
+            )
+
+        n_empty_clusters_ = int(n_empty_clusters[0])
+        if n_empty_clusters_ > 0:
+            # NB: the assignments of the samples the empty clusters are relocated to
+            # are not changed, but since the relocated centroids are then at a null
+            # distance of those samples, their lower bounds will be loosened enough to
+            # force re-computing their assignment at the next iteration.
+            _relocate_empty_clusters(
+                n_empty_clusters_,
+                X_t,
+                sample_weight,
+                new_centroids_t,
+                cluster_sizes,
+                assignments_idx,
+                empty_clusters_list,
+                sq_dist_to_nearest_centroid,
+                max_work_group_size,
+                compute_sq_dist=not verbose or not use_uniform_weights,
+            )
+
+        # Change `new_centroids_t` inplace
+        broadcast_division_kernel(new_centroids_t, cluster_sizes)
+
+        centroids_t, new_centroids_t = (new_centroids_t, centroids_t)
+
+        convergence_monitor.end_iteration(centroids_t, new_centroids_t)
+        if not convergence_monitor.keep_iterating():
+            break
+
+        # The two largest shifts are needed to update the lower bounds. They are
+        # reduced on device, so that the bounds are updated without waiting for the
+        # device.
+        max_centroid_shifts_kernel(
+            centroid_shifts,
+            # OUT:
+            max_centroid_shifts,
+        )
+
+        update_hamerly_bounds_kernel(
+            assignments_idx,
+            centroid_shifts,
+            max_centroid_shifts,
+            # INOUT:
+            upper_bounds,
+            lower_bounds,
+        )
+
+    convergence_monitor.print_convergence()
+
+    # Finally, compute the assignments to the best centroids found, along with the
+    # exact inertia.
+    assignments_idx, inertia = get_labels_inertia(
+        X_t, centroids_t, sample_weight, with_inertia=True
+    )
+    # inertia is a 1-sized numpy array, we transform it into a scalar:
+    inertia = inertia[0]
+
+    return assignments_idx, inertia, centroids_t, convergence_monitor.n_iteration
@@ -0,0 +1,382 @@
+import math
+
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.autotune import get_tuned_parameters
+from sklearn_numba_dpex.common.random import (
+    create_xoroshiro128pp_states,
+    get_random_raw,
+)
+from sklearn_numba_dpex.common.reductions import (
+    make_argmin_reduction_1d_kernel,
+    make_sum_reduction_2d_kernel,
+)
+from sklearn_numba_dpex.common.scan import make_inclusive_scan_1d_kernel
+from sklearn_numba_dpex.kmeans.kernels import (
+    make_candidate_weights_kernel,
+    make_kmeans_parallel_sample_kernel,
+    make_kmeansplusplus_init_kernel,
+    make_kmeansplusplus_single_step_fixed_window_kernel,
+    make_label_assignment_fixed_window_kernel,
+    make_sample_center_candidates_kernel,
+    make_update_closest_dist_sq_kernel,
+)
+
+from .utils import get_half_l2_norm, get_labels_inertia
+
+
+def kmeans_plusplus(
+    X_t,
+    sample_weight,
+    n_clusters,
+    random_state,
+):
+    compute_dtype = X_t.dtype.type
+    n_features, n_samples = X_t.shape
+    device = X_t.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+    sub_group_size = 8
+
+    # TODO: check that this implementation is correct when samples weights aren't
+    # uniform.
+
+    # Same retrial heuristic as scikit-learn (at least until <1.2)
+    n_local_trials = 2 + int(np.log(n_clusters))
+
+    kmeansplusplus_init_kernel = make_kmeansplusplus_init_kernel(
+        n_samples,
+        n_features,
+        max_work_group_size,
+        compute_dtype,
+    )
+
+    (
+        kmeansplusplus_single_step_fixed_window_kernel
+    ) = make_kmeansplusplus_single_step_fixed_window_kernel(
+        n_samples,
+        n_features,
+        n_local_trials,
+        sub_group_size,
+        work_group_size="max",
+        dtype=compute_dtype,
+        device=device,
+    )
+
+    select_best_candidate_kernel = make_argmin_reduction_1d_kernel(
+        n_local_trials,
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    inclusive_scan_kernel = make_inclusive_scan_1d_kernel(
+        n_samples,
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    reduce_potential_2d_kernel = make_sum_reduction_2d_kernel(
+        shape=(n_local_trials, n_samples),
+        axis=1,
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    random_state = create_xoroshiro128pp_states(
+        n_local_trials,
+        seed=random_state,
+        device=device,
+    )
+
+    sample_center_candidates_kernel = make_sample_center_candidates_kernel(
+        n_samples,
+        n_local_trials,
+        max_work_group_size,
+        compute_dtype,
+    )
+
+    centers_t = dpt.empty((n_features, n_clusters), dtype=compute_dtype, device=device)
+
+    center_indices = dpt.full((n_clusters,), -1, dtype=np.int32, device=device)
+
+    sq_distances_t = dpt.empty(
+        (n_local_trials, n_samples), dtype=compute_dtype, device=device
+    )
+
+    closest_dist_sq = dpt.empty((n_samples,), dtype=compute_dtype, device=device)
+
+    candidate_ids = dpt.empty((n_local_trials,), dtype=np.int32, device=device)
+
+    # Pick first center randomly
+    # Use numpy type to work around https://github.com/IntelPython/dpnp/issues/1238
+    random_uint64 = dpt.asnumpy(get_random_raw(random_state))[0]
+    starting_center_id = random_uint64 % np.uint64(n_samples)
+    center_indices[0] = np.int32(starting_center_id)
+
+    # track index of point, initialize list of closest distances and calculate
+    # current potential
+    kmeansplusplus_init_kernel(
+        X_t,
+        sample_weight,
+        # OUT
+        centers_t,
+        center_indices,
+        closest_dist_sq,
+    )
+
+    # Pick the remaining n_clusters-1 points
+    for c in range(1, n_clusters):
+        # First, let's sample indices of candidates using a empirical cumulative
+        # density function built using the potential of the samples and squared
+        # distances to each sample's closest centroids.
+
+        # NB: the cumulative density function is computed with a parallel prefix
+        # sum, and each candidate is then found with a binary search, so that the
+        # sampling runs in a logarithmic number of sequential steps and stays on
+        # device.
+        cumulative_potential = inclusive_scan_kernel(closest_dist_sq)
+        sample_center_candidates_kernel(
+            cumulative_potential,
+            # OUT
+            random_state,
+            candidate_ids,
+        )
+
+        # Now, for each (sample, candidate)-pair, compute the minimum between
+        # their distance and the previous minimum.
+
+        # XXX: at the cost of one additional pass on data, we could avoid storing
+        # entirely distance_to_candidates_t in memory, and save
+        # `dtype.nbytes * n_local_trials * n_sample` bytes in memory.
+        # Which is better ?
+        kmeansplusplus_single_step_fixed_window_kernel(
+            X_t,
+            sample_weight,
+            candidate_ids,
+            closest_dist_sq,
+            # OUT
+            sq_distances_t,
+        )
+
+        candidate_potentials = reduce_potential_2d_kernel(sq_distances_t)[:, 0]
+        # Use numpy type to work around https://github.com/IntelPython/dpnp/issues/1238
+        best_candidate = dpt.asnumpy(
+            select_best_candidate_kernel(candidate_potentials)
+        )[0]
+
+        # Pick the c-th centroid and update the distance
+        # to the closest centroid for each sample.
+        closest_dist_sq = sq_distances_t[best_candidate, :]
+        center_index = candidate_ids[best_candidate]
+        centers_t[:, c] = X_t[:, center_index]
+        center_indices[c] = center_index
+
+    return centers_t, center_indices
+
+
+def kmeans_parallel(
+    X_t,
+    sample_weight,
+    n_clusters,
+    random_state,
+    oversampling_factor=2.0,
+    n_rounds=5,
+):
+    """Select initial centers with k-means|| (also known as scalable k-means++).
+
+    Each of the `n_rounds` rounds samples about `oversampling_factor * n_clusters`
+    candidate centers at once, each sample being drawn independently with a
+    probability proportional to its weighted squared distance to the closest
+    candidate. The candidates are weighted with the sum of the weights of the samples
+    they are closest to, and the `n_clusters` centers are selected among the
+    candidates with k-means++. The number of sequential steps on the full data is
+    `n_rounds`, rather than `n_clusters` for k-means++.
+
+    Returns the centers and the indices of the samples that are used as centers, like
+    `kmeans_plusplus`.
+
+    See: Bahmani, B., Moseley, B., Vattani, A., Kumar, R., & Vassilvitskii, S. (2012).
+    Scalable k-means++. Proceedings of the VLDB Endowment, 5(7).
+    """
+    compute_dtype = X_t.dtype.type
+    n_features, n_samples = X_t.shape
+    device = X_t.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+
+    n_oversampled_candidates = oversampling_factor * n_clusters
+    # NB: a round samples `n_oversampled_candidates` candidates on average, the
+    # buffer for the candidates of a round is twice as large so that it very rarely
+    # overflows. The assignment kernel is compiled for this fixed number of
+    # candidates, so that it is not compiled again at each round: the unused slots
+    # are filled with duplicates of the candidates.
+    max_n_round_candidates = min(2 * math.ceil(n_oversampled_candidates), n_samples)
+    # NB: likewise, the candidates are padded to the largest possible number of
+    # candidates with zero-weight copies of the candidates, so that the k-means++
+    # selection among the candidates is not compiled again for each number of
+    # candidates.
+    max_n_candidates = min(1 + n_rounds * max_n_round_candidates, n_samples)
+    # NB: the RNG states are initialized sequentially, so only a limited number of
+    # states is used, and each work item samples several samples.
+    n_states = min(n_samples, 4 * max_work_group_size)
+
+    kmeansplusplus_init_kernel = make_kmeansplusplus_init_kernel(
+        n_samples,
+        n_features,
+        max_work_group_size,
+        compute_dtype,
+    )
+
+    kmeans_parallel_sample_kernel = make_kmeans_parallel_sample_kernel(
+        n_samples,
+        n_states,
+        n_oversampled_candidates,
+        max_work_group_size,
+        compute_dtype,
+    )
+
+    assignment_fixed_window_kernel = make_label_assignment_fixed_window_kernel(
+        n_features,
+        max_n_round_candidates,
+        dtype=compute_dtype,
+        device=device,
+        **get_tuned_parameters(
+            "label_assignment",
+            device,
+            compute_dtype,
+            (n_samples, n_features, max_n_round_candidates),
+        ),
+    )
+
+    update_closest_dist_sq_kernel = make_update_closest_dist_sq_kernel(
+        n_features, max_work_group_size, compute_dtype
+    )
+
+    candidate_weights_kernel = make_candidate_weights_kernel(
+        n_samples, max_work_group_size, compute_dtype
+    )
+
+    reduce_potential_kernel = make_sum_reduction_2d_kernel(
+        shape=(n_samples,),
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    states = create_xoroshiro128pp_states(n_states, seed=random_state, device=device)
+
+    first_center_t = dpt.empty((n_features, 1), dtype=compute_dtype, device=device)
+    first_center_index = dpt.empty((1,), dtype=np.int32, device=device)
+    closest_dist_sq = dpt.empty((n_samples,), dtype=compute_dtype, device=device)
+    n_round_candidates = dpt.empty((1,), dtype=np.int32, device=device)
+    round_candidate_ids = dpt.empty(
+        (max_n_round_candidates,), dtype=np.int32, device=device
+    )
+    assignments_idx = dpt.empty((n_samples,), dtype=np.uint32, device=device)
+
+    # Pick the first candidate randomly
+    # Use numpy type to work around https://github.com/IntelPython/dpnp/issues/1238
+    random_uint64 = dpt.asnumpy(get_random_raw(states))[0]
+    starting_center_id = np.int32(random_uint64 % np.uint64(n_samples))
+    first_center_index[0] = starting_center_id
+
+    kmeansplusplus_init_kernel(
+        X_t,
+        sample_weight,
+        # OUT
+        first_center_t,
+        first_center_index,
+        closest_dist_sq,
+    )
+
+    candidate_ids = [np.array([starting_center_id], dtype=np.int32)]
+    for _ in range(n_rounds):
+        total_potential = reduce_potential_kernel(closest_dist_sq)
+        n_round_candidates[0] = np.int32(0)
+
+        kmeans_parallel_sample_kernel(
+            closest_dist_sq,
+            total_potential,
+            # OUT
+            states,
+            n_round_candidates,
+            round_candidate_ids,
+        )
+
+        n_round_candidates_ = min(int(n_round_candidates[0]), max_n_round_candidates)
+        # NB: no candidate is sampled if all the samples already are candidates.
+        if n_round_candidates_ == 0:
+            break
+
+        round_candidate_ids_ = dpt.asnumpy(round_candidate_ids[:n_round_candidates_])
+        candidate_ids.append(round_candidate_ids_)
+
+        round_centers_t = dpt.take(
+            X_t,
+            dpt.asarray(
+                np.resize(round_candidate_ids_, max_n_round_candidates), device=device
+            ),
+            axis=1,
+        )
+
+        assignment_fixed_window_kernel(
+            X_t,
+            round_centers_t,
+            get_half_l2_norm(round_centers_t),
+            # OUT
+            assignments_idx,
+        )
+
+        update_closest_dist_sq_kernel(
+            X_t,
+            sample_weight,
+            round_centers_t,
+            assignments_idx,
+            # OUT
+            closest_dist_sq,
+        )
+
+    candidate_ids = np.unique(np.concatenate(candidate_ids))
+    n_candidates = len(candidate_ids)
+
+    # NB: this can only happen if the data has less than `n_clusters` distinct
+    # samples, or with very small values of `oversampling_factor * n_rounds`.
+    if n_candidates < n_clusters:
+        return kmeans_plusplus(X_t, sample_weight, n_clusters, random_state)
+
+    if n_candidates == n_clusters:
+        candidate_ids = dpt.asarray(candidate_ids, device=device)
+        return dpt.take(X_t, candidate_ids, axis=1), candidate_ids
+
+    # NB: the candidate `candidate_idx` is a copy of the candidate
+    # `candidate_idx % n_candidates`.
+    candidate_ids = np.resize(candidate_ids, max_n_candidates)
+    candidates_t = dpt.take(X_t, dpt.asarray(candidate_ids, device=device), axis=1)
+
+    # The weight of each candidate is the sum of the weights of the samples it is the
+    # closest candidate to, and the copies have zero weight, so that they are never
+    # selected by k-means++ once their original candidate is selected.
+    candidates_assignments_idx, _ = get_labels_inertia(
+        X_t, candidates_t, None, with_inertia=False
+    )
+    candidate_weights = dpt.zeros(
+        (max_n_candidates,), dtype=compute_dtype, device=device
+    )
+    candidate_weights_kernel(
+        candidates_assignments_idx,
+        sample_weight,
+        np.uint32(n_candidates),
+        # INOUT
+        candidate_weights,
+    )
+
+    centers_t, candidate_center_indices = kmeans_plusplus(
+        candidates_t,
+        candidate_weights,
+        n_clusters,
+        random_state,
+    )
+    center_indices = candidate_ids[dpt.asnumpy(candidate_center_indices)]
+
+    return centers_t, dpt.asarray(center_indices.astype(np.int32), device=device)
@@ -0,0 +1,509 @@
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.autotune import get_tuned_parameters
+from sklearn_numba_dpex.common._utils import get_maximum_power_of_2_smaller_than
+from sklearn_numba_dpex.common.kernels import (
+    make_broadcast_division_1d_2d_axis0_kernel,
+    make_half_l2_norm_2d_axis0_kernel,
+    make_initialize_to_zeros_kernel,
+)
+from sklearn_numba_dpex.common.reductions import make_sum_reduction_2d_kernel
+from sklearn_numba_dpex.common.scan import make_inclusive_scan_1d_kernel
+from sklearn_numba_dpex.kmeans._memory import (
+    _get_max_n_centroids_private_copies,
+    _use_segmented_centroid_update,
+)
+from sklearn_numba_dpex.kmeans.kernels import (
+    make_broadcast_division_keep_empty_clusters_kernel,
+    make_compute_inertia_kernel,
+    make_count_cluster_samples_kernel,
+    make_label_assignment_fixed_window_kernel,
+    make_labels_inertia_from_distances_kernel,
+    make_lloyd_single_step_fixed_window_kernel,
+    make_register_empty_clusters_kernel,
+    make_segmented_centroid_sums_kernel,
+    make_sort_samples_by_cluster_kernel,
+)
+
+from ._iteration import (
+    _CentroidsPrivateCopies,
+    _ConvergenceMonitor,
+    _relocate_empty_clusters,
+)
+from .utils import get_euclidean_distances, get_labels_inertia
+
+
+def lloyd(
+    X_t,
+    sample_weight,
+    centroids_t,
+    use_uniform_weights,
+    max_iter=300,
+    verbose=False,
+    tol=1e-4,
+    convergence_check_interval=1,
+    n_centroids_private_copies="auto",
+    return_distances=False,
+    centroid_update="auto",
+):
+    """Run Lloyd's algorithm on the transposed data `X_t`.
+
+    Returns `(assignments_idx, inertia, centroids_t, n_iteration)`. If
+    `return_distances` is True, the euclidean distances of the samples to the final
+    centroids, with shape (n_samples, n_clusters), are appended to the result: they
+    are computed in the final pass on the data, from which the labels and the
+    inertia are then derived, as in `fit_transform`.
+
+    With `centroid_update="private_copies"`, each iteration is a single fused kernel
+    that accumulates the centroid updates in `n_centroids_private_copies` private
+    copies of the centroids, that are then reduced. With
+    `centroid_update="segmented"`, the samples are first assigned to the closest
+    centroids, then sorted by cluster, and the sums of the samples of each cluster are
+    computed with a segmented reduction, that does not need private copies. The
+    latter is preferable when the private copies are about as large as the data,
+    which is what `centroid_update="auto"` selects.
+
+    With `convergence_check_interval > 1`, the convergence criteria are only evaluated
+    every `convergence_check_interval` iterations, see `_ConvergenceMonitor`. The
+    empty clusters are also only relocated at those iterations, since it requires
+    reading the number of empty clusters on host. In-between, the centroids of the
+    empty clusters keep their previous value. With the default
+    `convergence_check_interval=1`, both happen at each iteration.
+    """
+    n_features, n_samples = X_t.shape
+    n_clusters = centroids_t.shape[1]
+    compute_dtype = X_t.dtype.type
+
+    device = X_t.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+    # NB: the geometry of the kernels can be tuned for the device, see
+    # `sklearn_numba_dpex.autotune`.
+    lloyd_geometry = get_tuned_parameters(
+        "lloyd_single_step", device, compute_dtype, (n_samples, n_features, n_clusters)
+    )
+
+    if centroid_update == "auto":
+        max_n_centroids_private_copies = (
+            _get_max_n_centroids_private_copies(
+                n_samples, n_features, n_clusters, compute_dtype, "lloyd", 1, device
+            )
+            if n_centroids_private_copies == "auto"
+            else n_centroids_private_copies
+        )
+        centroid_update = (
+            "segmented"
+            if _use_segmented_centroid_update(
+                n_samples, n_features, n_clusters, max_n_centroids_private_copies
+            )
+            else "private_copies"
+        )
+    elif centroid_update not in ("private_copies", "segmented"):
+        raise ValueError(
+            "Expected centroid_update to be 'auto', 'private_copies' or 'segmented', "
+            f"got {centroid_update}."
+        )
+    use_segmented_update = centroid_update == "segmented"
+
+    # Create a set of kernels
+    if not use_segmented_update:
+        (
+            n_centroids_private_copies,
+            fused_lloyd_fixed_window_single_step_kernel,
+        ) = make_lloyd_single_step_fixed_window_kernel(
+            n_samples,
+            n_features,
+            n_clusters,
+            # NB: the assignments are needed if verbose=True, and for strict
+            # convergence checking. If systematic strict convergence checking is
+            # disabled in the future, if could be set to False when verbose=False
+            # (thus marginally improving performance).
+            return_assignments=True,
+            check_strict_convergence=True,
+            dtype=compute_dtype,
+            device=device,
+            n_centroids_private_copies=n_centroids_private_copies,
+            **lloyd_geometry,
+        )
+
+    compute_inertia_kernel = make_compute_inertia_kernel(
+        n_features, max_work_group_size, compute_dtype
+    )
+
+    broadcast_division_kernel = make_broadcast_division_1d_2d_axis0_kernel(
+        shape=(n_features, n_clusters),
+        work_group_size=max_work_group_size,
+    )
+
+    broadcast_division_keep_empty_clusters_kernel = (
+        make_broadcast_division_keep_empty_clusters_kernel(
+            n_clusters, n_features, max_work_group_size, compute_dtype
+        )
+    )
+
+    reset_n_empty_clusters_kernel = make_initialize_to_zeros_kernel(
+        shape=(1,),
+        work_group_size=max_work_group_size,
+        dtype=np.int32,
+    )
+
+    half_l2_norm_kernel = make_half_l2_norm_2d_axis0_kernel(
+        (n_features, n_clusters),
+        work_group_size=max_work_group_size,
+        dtype=compute_dtype,
+    )
+
+    reduce_inertia_kernel = make_sum_reduction_2d_kernel(
+        shape=(n_samples,),
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    # When the kernel uses a single private copy, the centroid updates are accumulated
+    # directly into `new_centroids_t` and `cluster_sizes` and there is nothing to
+    # reduce, only the empty clusters need to be registered. It is the same for the
+    # segmented updates.
+    use_single_private_copy = (
+        not use_segmented_update and n_centroids_private_copies == 1
+    )
+
+    if use_segmented_update:
+        assignment_fixed_window_kernel = make_label_assignment_fixed_window_kernel(
+            n_features,
+            n_clusters,
+            dtype=compute_dtype,
+            device=device,
+            **get_tuned_parameters(
+                "label_assignment",
+                device,
+                compute_dtype,
+                (n_samples, n_features, n_clusters),
+            ),
+        )
+        reset_cluster_segments_kernel = make_initialize_to_zeros_kernel(
+            shape=(2, n_clusters),
+            work_group_size=max_work_group_size,
+            dtype=np.int32,
+        )
+        count_cluster_samples_kernel = make_count_cluster_samples_kernel(
+            n_samples, max_work_group_size
+        )
+        inclusive_scan_kernel = make_inclusive_scan_1d_kernel(
+            n_clusters, device=device, dtype=np.int32
+        )
+        sort_samples_by_cluster_kernel = make_sort_samples_by_cluster_kernel(
+            n_samples, max_work_group_size
+        )
+        segmented_centroid_sums_kernel = make_segmented_centroid_sums_kernel(
+            n_features,
+            n_clusters,
+            get_maximum_power_of_2_smaller_than(max_work_group_size),
+            compute_dtype,
+        )
+
+    elif use_single_private_copy:
+        reset_cluster_sizes_kernel = make_initialize_to_zeros_kernel(
+            shape=(1, n_clusters),
+            work_group_size=max_work_group_size,
+            dtype=compute_dtype,
+        )
+        reset_centroids_kernel = make_initialize_to_zeros_kernel(
+            shape=(1, n_features, n_clusters),
+            work_group_size=max_work_group_size,
+            dtype=compute_dtype,
+        )
+
+    else:
+        private_copies = _CentroidsPrivateCopies(
+            n_centroids_private_copies, n_features, n_clusters, device, compute_dtype
+        )
+
+    if use_single_private_copy or use_segmented_update:
+        register_empty_clusters_kernel = make_register_empty_clusters_kernel(
+            n_clusters, max_work_group_size, compute_dtype
+        )
+
+    # Allocate the necessary memory in the device global memory
+    new_centroids_t = dpt.empty_like(centroids_t, device=device)
+    centroids_half_l2_norm = dpt.empty(n_clusters, dtype=compute_dtype, device=device)
+    cluster_sizes = dpt.empty(n_clusters, dtype=compute_dtype, device=device)
+    # NB: the same buffer is used for those two arrays because it is never needed
+    # to store those simultaneously in memory.
+    sq_dist_to_nearest_centroid = per_sample_inertia = dpt.empty(
+        n_samples, dtype=compute_dtype, device=device
+    )
+
+    new_assignments_idx = dpt.empty(n_samples, dtype=np.uint32, device=device)
+    assignments_idx = dpt.empty(n_samples, dtype=np.uint32, device=device)
+
+    if use_segmented_update:
+        # NB: the counts of samples and the cursors of the clusters are stored in the
+        # same buffer, so that they are reset at once.
+        cluster_segments_buffer = dpt.empty(
+            (2, n_clusters), dtype=np.int32, device=device
+        )
+        cluster_n_samples = cluster_segments_buffer[0]
+        cluster_cursors = cluster_segments_buffer[1]
+        sorted_samples_idx = dpt.empty(n_samples, dtype=np.int32, device=device)
+
+    empty_clusters_list = dpt.empty(n_clusters, dtype=np.uint32, device=device)
+
+    # n_empty_clusters_ is a scalar handled in kernels via a one-element array.
+    n_empty_clusters = dpt.empty(1, dtype=np.int32, device=device)
+
+    convergence_monitor = _ConvergenceMonitor(
+        n_features,
+        n_clusters,
+        max_iter,
+        tol,
+        verbose,
+        device,
+        compute_dtype,
+        convergence_check_interval,
+    )
+    strict_convergence_status = convergence_monitor.strict_convergence_status
+
+    verbose = bool(verbose)
+
+    # TODO: Investigate possible speedup with a custom dpctl queue with a custom
+    # DAG of events and a final single "wait", when numba_dpex supports submitting
+    # kernels asynchronously.
+    while convergence_monitor.keep_iterating():
+        half_l2_norm_kernel(
+            centroids_t,
+            # OUT:
+            centroids_half_l2_norm,
+        )
+
+        # NB: the counter is reset on device, so that it does not require a
+        # synchronization in the iterations where it is not read.
+        reset_n_empty_clusters_kernel(n_empty_clusters)
+
+        if use_segmented_update:
+            assignment_fixed_window_kernel(
+                X_t,
+                centroids_t,
+                centroids_half_l2_norm,
+                # OUT:
+                new_assignments_idx,
+            )
+
+            reset_cluster_segments_kernel(cluster_segments_buffer)
+            count_cluster_samples_kernel(
+                assignments_idx,
+                new_assignments_idx,
+                # OUT:
+                cluster_n_samples,
+                strict_convergence_status,
+            )
+            cluster_segment_ends = inclusive_scan_kernel(cluster_n_samples)
+
+            sort_samples_by_cluster_kernel(
+                new_assignments_idx,
+                cluster_n_samples,
+                cluster_segment_ends,
+                # OUT:
+                cluster_cursors,
+                sorted_samples_idx,
+            )
+
+            segmented_centroid_sums_kernel(
+                X_t,
+                sample_weight,
+                sorted_samples_idx,
+                cluster_n_samples,
+                cluster_segment_ends,
+                # OUT:
+                new_centroids_t,
+                cluster_sizes,
+            )
+
+        else:
+            if use_single_private_copy:
+                # NB: `new_centroids_t` is swapped with `centroids_t` at each
+                # iteration, so the views must be updated accordingly.
+                cluster_sizes_private_copies = dpt.reshape(
+                    cluster_sizes, (1, n_clusters)
+                )
+                new_centroids_t_private_copies = dpt.reshape(
+                    new_centroids_t, (1, n_features, n_clusters)
+                )
+                reset_cluster_sizes_kernel(cluster_sizes_private_copies)
+                reset_centroids_kernel(new_centroids_t_private_copies)
+            else:
+                private_copies.reset()
+                cluster_sizes_private_copies = private_copies.cluster_sizes
+                new_centroids_t_private_copies = private_copies.centroids_t
+
+            fused_lloyd_fixed_window_single_step_kernel(
+                X_t,
+                sample_weight,
+                centroids_t,
+                centroids_half_l2_norm,
+                assignments_idx,
+                # OUT:
+                new_assignments_idx,
+                strict_convergence_status,
+                new_centroids_t_private_copies,
+                cluster_sizes_private_copies,
+            )
+
+        if use_single_private_copy or use_segmented_update:
+            register_empty_clusters_kernel(
+                cluster_sizes,
+                # OUT:
+                empty_clusters_list,
+                n_empty_clusters,
+            )
+        else:
+            private_copies.reduce(
+                # OUT:
+                new_centroids_t,
+                cluster_sizes,
+                empty_clusters_list,
+                n_empty_clusters,
+            )
+
+        if verbose:
+            # ???: verbosity comes at the cost of performance since it triggers
+            # computing exact inertia at each iteration. Shouldn't this be
+            # documented ?
+            compute_inertia_kernel(
+                X_t,
+                sample_weight,
+                new_centroids_t,
+                new_assignments_idx,
+                # OUT:
+                per_sample_inertia,
+            )
+            inertia, *_ = dpt.asnumpy(reduce_inertia_kernel(per_sample_inertia))
+            print(
+                f"Iteration {convergence_monitor.n_iteration}, inertia {inertia:5.3e}"
+            )
+
+        if convergence_monitor.is_convergence_check_iteration():
+            n_empty_clusters_ = int(n_empty_clusters[0])
+            if n_empty_clusters_ > 0:
+                _relocate_empty_clusters(
+                    n_empty_clusters_,
+                    X_t,
+                    sample_weight,
+                    new_centroids_t,
+                    cluster_sizes,
+                    new_assignments_idx,
+                    empty_clusters_list,
+                    sq_dist_to_nearest_centroid,
+                    max_work_group_size,
+                    # if verbose is True and if sample_weight is uniform, distances to
+                    # closest centroids already have been computed
+                    compute_sq_dist=not verbose or not use_uniform_weights,
+                )
+
+            # Change `new_centroids_t` inplace
+            broadcast_division_kernel(new_centroids_t, cluster_sizes)
+        else:
+            # Change `new_centroids_t` inplace
+            broadcast_division_keep_empty_clusters_kernel(
+                new_centroids_t, cluster_sizes, centroids_t
+            )
+
+        # ???: unlike sklearn, sklearn_intelex checks that pseudo_inertia decreases
+        # and keep an additional copy of centroids that is updated only if the
+        # value of the pseudo_inertia is smaller than all the past values.
+        #
+        # (the check should not be needed because we have theoritical guarantee
+        # that inertia decreases, if it doesn't it should only be because of
+        # rounding errors ?)
+        #
+        # To this purpose this code could be inserted here:
+        #
+        # if pseudo_inertia < best_pseudo_inertia:
+        #     best_pseudo_inertia = pseudo_inertia
+        #     copyto_kernel(centroids_t, best_centroids_t)
+        #
+        # Note that what that is saved as "best centroid" is the array before the
+        # update, to which the pseudo inertia that is computed at this iteration
+        # refers. For this reason, this strategy is not compatible with sklearn
+        # unit tests, that consider new_centroids_t (the array after the update)
+        # to be the best centroids at each iteration.
+        centroids_t, new_centroids_t = (new_centroids_t, centroids_t)
+
+        # ???: if two successive assignations have been computed equal, it's called
+        # "strict convergence" and means that the algorithm has converged and can't get
+        # better (since same assignments will produce the same centroid updates, which
+        # will produce the same assignments, and so on..). scikit-learn decides to
+        # check for strict convergence at each iteration, but that sounds expensive
+        # since for each iteration it requires writing assignments in memory and
+        # comparing it to the previous assignments.
+
+        # Providing the user chooses a sensible value for `tol`, wouldn't the cost of
+        # this check be in general greater than what the benefits ?
+
+        # When `tol == 0` it is easy to see that lloyd can indeed fail to stop at the
+        # right time due to numerical errors, and that strict convergence checking is
+        # good. For the general case, it seems detrimental to performance, for little
+        # gain except in case of, maybe, extremely imbalanced input data distribution.
+        # Thus, shouldnt strict convergence checking be enabled only if `tol == 0` ?
+        # (which is, moreover, the only case where strict convergence really is tested
+        # in scikit learn)
+
+        # For now the exact same behavior than scikit-learn's is mimicked.
+
+        # See: https://github.com/scikit-learn/scikit-learn/issues/25716
+
+        assignments_idx, new_assignments_idx = (
+            new_assignments_idx,
+            assignments_idx,
+        )
+
+        convergence_monitor.end_iteration(centroids_t, new_centroids_t)
+
+    convergence_monitor.print_convergence()
+    n_iteration = convergence_monitor.n_iteration
+
+    if return_distances:
+        # NB: the distances are computed with the stable expression |x-c|^2, so the
+        # labels and the inertia can be derived from the distances without another
+        # pass on the data.
+        euclidean_distances_t = get_euclidean_distances(X_t, centroids_t).T
+
+        labels_inertia_from_distances_kernel = (
+            make_labels_inertia_from_distances_kernel(
+                n_clusters, max_work_group_size, compute_dtype
+            )
+        )
+        labels_inertia_from_distances_kernel(
+            euclidean_distances_t,
+            sample_weight,
+            # OUT:
+            assignments_idx,
+            per_sample_inertia,
+        )
+
+        inertia = dpt.asnumpy(reduce_inertia_kernel(per_sample_inertia))[0]
+
+        return (
+            assignments_idx,
+            inertia,
+            centroids_t,
+            n_iteration,
+            euclidean_distances_t.T,
+        )
+
+    # Finally, run an assignment kernel to compute the assignments to the best
+    # centroids found, along with the exact inertia.
+    # NB: inertia and labels could be computed in a single fused kernel, however,
+    # re-using the quantity Q = ((1/2)c^2 - <x.c>) that is computed in the
+    # assignment kernel to compute distances to closest centroids to evaluate
+    # |x|^2 - 2 * Q leads to numerical instability, we prefer evaluating the
+    # expression |x-c|^2 which is stable but requires an additional pass on the
+    # data.
+    # See https://github.com/soda-inria/sklearn-numba-dpex/issues/28
+    assignments_idx, inertia = get_labels_inertia(
+        X_t, centroids_t, sample_weight, with_inertia=True
+    )
+    # inertia is a 1-sized numpy array, we transform it into a scalar:
+    inertia = inertia[0]
+
+    return assignments_idx, inertia, centroids_t, n_iteration
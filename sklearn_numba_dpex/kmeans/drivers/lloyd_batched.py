@@ -0,0 +1,228 @@
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.common.kernels import (
+    make_broadcast_division_1d_2d_axis0_kernel,
+    make_half_l2_norm_2d_axis0_kernel,
+)
+from sklearn_numba_dpex.kmeans.kernels import make_lloyd_batched_single_step_kernel
+
+from ._iteration import (
+    _CentroidsPrivateCopies,
+    _ConvergenceMonitor,
+    _relocate_empty_clusters,
+)
+from .utils import get_labels_inertia
+
+
+def lloyd_batched(
+    X_t,
+    sample_weight,
+    centroids_t_batch,
+    max_iter=300,
+    tol=1e-4,
+    n_centroids_private_copies="auto",
+):
+    """Run Lloyd's k-means for several initializations in a single batched pass.
+
+    `centroids_t_batch` is of shape (n_runs, n_features, n_clusters) and contains one
+    set of initial centroids for each run. At each iteration, the assignments and the
+    centroid updates of all the runs that have not converged yet are computed in a
+    single pass on `X_t`, so that the cost of reading the data is shared between the
+    runs. The convergence criteria are the same than for `lloyd`, and are evaluated
+    independently for each run.
+
+    Returns a list with, for each run, the same tuple
+    `(assignments_idx, inertia, centroids_t, n_iteration)` than `lloyd` would return.
+    """
+    n_features, n_samples = X_t.shape
+    n_runs, _, n_clusters = centroids_t_batch.shape
+    compute_dtype = X_t.dtype.type
+
+    device = X_t.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+    sub_group_size = 8
+
+    # Create a set of kernels
+    (
+        n_centroids_private_copies,
+        lloyd_batched_single_step_kernel,
+    ) = make_lloyd_batched_single_step_kernel(
+        n_samples,
+        n_features,
+        n_clusters,
+        n_runs,
+        sub_group_size=sub_group_size,
+        work_group_size="max",
+        dtype=compute_dtype,
+        device=device,
+        n_centroids_private_copies=n_centroids_private_copies,
+    )
+
+    broadcast_division_kernel = make_broadcast_division_1d_2d_axis0_kernel(
+        shape=(n_features, n_clusters),
+        work_group_size=max_work_group_size,
+    )
+
+    half_l2_norm_kernel = make_half_l2_norm_2d_axis0_kernel(
+        (n_features, n_clusters),
+        work_group_size=max_work_group_size,
+        dtype=compute_dtype,
+    )
+
+    private_copies = _CentroidsPrivateCopies(
+        n_centroids_private_copies,
+        n_features,
+        n_clusters,
+        device,
+        compute_dtype,
+        n_runs=n_runs,
+    )
+
+    # Allocate the necessary memory in the device global memory
+    centroids_t_batch = dpt.asarray(centroids_t_batch, copy=True, device=device)
+    new_centroids_t_batch = dpt.empty_like(centroids_t_batch, device=device)
+    centroids_half_l2_norm = dpt.empty(
+        (n_runs, n_clusters), dtype=compute_dtype, device=device
+    )
+    cluster_sizes = dpt.empty((n_runs, n_clusters), dtype=compute_dtype, device=device)
+    sq_dist_to_nearest_centroid = dpt.empty(
+        n_samples, dtype=compute_dtype, device=device
+    )
+
+    new_assignments_idx = dpt.empty((n_runs, n_samples), dtype=np.uint32, device=device)
+    assignments_idx = dpt.empty((n_runs, n_samples), dtype=np.uint32, device=device)
+
+    empty_clusters_list = dpt.empty(
+        (n_runs, n_clusters), dtype=np.uint32, device=device
+    )
+    n_empty_clusters = dpt.empty(n_runs, dtype=np.int32, device=device)
+
+    # NB: the strict convergence status of all the runs are stored in the same array,
+    # so that they are copied to the host at once.
+    strict_convergence_status = dpt.empty(n_runs, dtype=np.uint32, device=device)
+    convergence_monitors = [
+        _ConvergenceMonitor(
+            n_features,
+            n_clusters,
+            max_iter,
+            tol,
+            False,
+            device,
+            compute_dtype,
+            strict_convergence_status=strict_convergence_status[run_idx : run_idx + 1],
+        )
+        for run_idx in range(n_runs)
+    ]
+
+    is_active_ = np.array(
+        [monitor.keep_iterating() for monitor in convergence_monitors],
+        dtype=np.uint32,
+    )
+    best_centroids_t = [
+        None if is_active_[run_idx] else dpt.copy(centroids_t_batch[run_idx])
+        for run_idx in range(n_runs)
+    ]
+
+    while is_active_.any():
+        active_runs = np.flatnonzero(is_active_)
+        is_active = dpt.asarray(is_active_, device=device)
+
+        for run_idx in active_runs:
+            half_l2_norm_kernel(
+                centroids_t_batch[run_idx],
+                # OUT:
+                centroids_half_l2_norm[run_idx],
+            )
+
+        private_copies.reset()
+        n_empty_clusters[:] = np.int32(0)
+
+        lloyd_batched_single_step_kernel(
+            X_t,
+            sample_weight,
+            centroids_t_batch,
+            centroids_half_l2_norm,
+            is_active,
+            assignments_idx,
+            # OUT:
+            new_assignments_idx,
+            strict_convergence_status,
+            private_copies.centroids_t,
+            private_copies.cluster_sizes,
+        )
+
+        for run_idx in active_runs:
+            private_copies.reduce(
+                # OUT:
+                new_centroids_t_batch[run_idx],
+                cluster_sizes[run_idx],
+                empty_clusters_list[run_idx],
+                n_empty_clusters[run_idx : run_idx + 1],
+                run_idx=run_idx,
+            )
+
+        n_empty_clusters_ = dpt.asnumpy(n_empty_clusters)
+
+        for run_idx in active_runs:
+            if (n_empty_clusters_run := int(n_empty_clusters_[run_idx])) > 0:
+                _relocate_empty_clusters(
+                    n_empty_clusters_run,
+                    X_t,
+                    sample_weight,
+                    new_centroids_t_batch[run_idx],
+                    cluster_sizes[run_idx],
+                    new_assignments_idx[run_idx],
+                    empty_clusters_list[run_idx],
+                    sq_dist_to_nearest_centroid,
+                    max_work_group_size,
+                )
+
+            # Change `new_centroids_t_batch[run_idx]` inplace
+            broadcast_division_kernel(
+                new_centroids_t_batch[run_idx], cluster_sizes[run_idx]
+            )
+
+        centroids_t_batch, new_centroids_t_batch = (
+            new_centroids_t_batch,
+            centroids_t_batch,
+        )
+        assignments_idx, new_assignments_idx = (
+            new_assignments_idx,
+            assignments_idx,
+        )
+
+        strict_convergence_status_ = dpt.asnumpy(strict_convergence_status)
+
+        for run_idx in active_runs:
+            convergence_monitor = convergence_monitors[run_idx]
+            convergence_monitor.end_iteration(
+                centroids_t_batch[run_idx],
+                new_centroids_t_batch[run_idx],
+                strict_convergence=strict_convergence_status_[run_idx],
+            )
+
+            if not convergence_monitor.keep_iterating():
+                # NB: the buffers are swapped at each iteration, the centroids of the
+                # run are copied before they are overwritten in the next iterations.
+                best_centroids_t[run_idx] = dpt.copy(centroids_t_batch[run_idx])
+                is_active_[run_idx] = 0
+
+    # Finally, compute the assignments to the best centroids found, along with the
+    # exact inertia, for each run.
+    results = []
+    for run_idx in range(n_runs):
+        run_assignments_idx, inertia = get_labels_inertia(
+            X_t, best_centroids_t[run_idx], sample_weight, with_inertia=True
+        )
+        results.append(
+            (
+                run_assignments_idx,
+                # inertia is a 1-sized numpy array, we transform it into a scalar:
+                inertia[0],
+                best_centroids_t[run_idx],
+                convergence_monitors[run_idx].n_iteration,
+            )
+        )
+
+    return results
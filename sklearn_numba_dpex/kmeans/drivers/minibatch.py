@@ -0,0 +1,359 @@
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.common.kernels import make_half_l2_norm_2d_axis0_kernel
+from sklearn_numba_dpex.common.random import (
+    create_xoroshiro128pp_states,
+    weighted_sample_without_replacement,
+)
+from sklearn_numba_dpex.common.reductions import (
+    make_argmin_reduction_1d_kernel,
+    make_sum_reduction_2d_kernel,
+)
+from sklearn_numba_dpex.common.topk import topk, topk_idx
+from sklearn_numba_dpex.kmeans.kernels import (
+    make_accumulate_batch_centroid_data_kernel,
+    make_centroid_shifts_kernel,
+    make_count_positive_weights_kernel,
+    make_label_assignment_fixed_window_kernel,
+    make_low_count_clusters_kernel,
+    make_minibatch_centroids_update_kernel,
+    make_reassign_clusters_kernel,
+    make_reset_reassigned_weight_sums_kernel,
+    make_sample_batch_indices_kernel,
+)
+
+from .utils import get_labels_inertia
+
+
+def minibatch_kmeans_partial_fit(X_t, sample_weight, centroids_t, cluster_weight_sums):
+    """Update the centroids with one batch of data.
+
+    The centroids are moved to the weighted mean of the samples that have been
+    assigned to them so far, using `cluster_weight_sums`, the sum of the weights of
+    the samples previously assigned to each cluster. `cluster_weight_sums` is
+    updated inplace, and should be initialized to zeros before the first batch.
+
+    The compiled kernels do not depend on the number of samples in `X_t`, so that
+    streams of batches of varying sizes can be processed without re-compilation.
+
+    Returns the updated centroids and the assignments of the samples of the batch.
+    """
+    compute_dtype = X_t.dtype.type
+    n_features, batch_size = X_t.shape
+    n_clusters = centroids_t.shape[1]
+    device = X_t.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+    sub_group_size = 8
+
+    label_assignment_fixed_window_kernel = make_label_assignment_fixed_window_kernel(
+        n_features,
+        n_clusters,
+        sub_group_size=sub_group_size,
+        work_group_size="max",
+        dtype=compute_dtype,
+        device=device,
+    )
+
+    half_l2_norm_kernel = make_half_l2_norm_2d_axis0_kernel(
+        (n_features, n_clusters),
+        work_group_size=max_work_group_size,
+        dtype=compute_dtype,
+    )
+
+    accumulate_batch_centroid_data_kernel = make_accumulate_batch_centroid_data_kernel(
+        n_features, n_clusters, max_work_group_size, compute_dtype
+    )
+
+    minibatch_centroids_update_kernel = make_minibatch_centroids_update_kernel(
+        n_features, n_clusters, max_work_group_size, compute_dtype
+    )
+
+    centroids_half_l2_norm = dpt.empty(n_clusters, dtype=compute_dtype, device=device)
+    assignments_idx = dpt.empty(batch_size, dtype=np.uint32, device=device)
+    batch_centroids_t = dpt.zeros(
+        (n_features, n_clusters), dtype=compute_dtype, device=device
+    )
+    batch_cluster_weights = dpt.zeros(n_clusters, dtype=compute_dtype, device=device)
+    new_centroids_t = dpt.empty_like(centroids_t)
+
+    half_l2_norm_kernel(
+        centroids_t,
+        # OUT
+        centroids_half_l2_norm,
+    )
+
+    label_assignment_fixed_window_kernel(
+        X_t,
+        centroids_t,
+        centroids_half_l2_norm,
+        # OUT
+        assignments_idx,
+    )
+
+    accumulate_batch_centroid_data_kernel(
+        X_t,
+        sample_weight,
+        assignments_idx,
+        # OUT
+        batch_centroids_t,
+        batch_cluster_weights,
+    )
+
+    minibatch_centroids_update_kernel(
+        centroids_t,
+        batch_centroids_t,
+        batch_cluster_weights,
+        # INOUT
+        cluster_weight_sums,
+        # OUT
+        new_centroids_t,
+    )
+
+    return new_centroids_t, assignments_idx
+
+
+def reassign_low_count_clusters(
+    X_t_batch,
+    sample_weight_batch,
+    centroids_t,
+    cluster_weight_sums,
+    reassignment_ratio,
+    random_state,
+):
+    """Move the centroids of the clusters whose sum of weights is lower than
+    `reassignment_ratio` times the largest one to samples of the batch, as in
+    `sklearn.cluster.MiniBatchKMeans`.
+
+    The samples are drawn on device with `weighted_sample_without_replacement`, with
+    probabilities proportional to their weights, and at most half of the samples of
+    the batch with a positive weight are drawn, for the clusters with the lowest sums
+    of weights. The sum of weights of the reassigned clusters is set to the lowest sum
+    of the other clusters, so that they are not reassigned again at the next call.
+    `centroids_t` and `cluster_weight_sums` are modified inplace.
+
+    Only the number of clusters to reassign and the number of samples with a positive
+    weight are read on host. Returns the number of reassigned clusters.
+    """
+    compute_dtype = X_t_batch.dtype.type
+    n_features = X_t_batch.shape[0]
+    n_clusters = centroids_t.shape[1]
+    device = centroids_t.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+
+    low_count_clusters_kernel = make_low_count_clusters_kernel(
+        n_clusters, max_work_group_size, compute_dtype
+    )
+    count_positive_weights_kernel = make_count_positive_weights_kernel(
+        max_work_group_size, compute_dtype
+    )
+
+    max_weight_sum = topk(cluster_weight_sums, 1)
+    low_count_keys = dpt.empty(n_clusters, dtype=compute_dtype, device=device)
+    # NB: the number of clusters to reassign and the number of samples with a positive
+    # weight are stored in the same buffer, so that they are read at once.
+    counts = dpt.zeros(2, dtype=np.int32, device=device)
+
+    low_count_clusters_kernel(
+        cluster_weight_sums,
+        max_weight_sum,
+        compute_dtype(reassignment_ratio),
+        # OUT
+        low_count_keys,
+        counts,
+    )
+    count_positive_weights_kernel(
+        sample_weight_batch,
+        # OUT
+        counts,
+    )
+
+    n_low_count_clusters, n_positive_weights = (int(c) for c in dpt.asnumpy(counts))
+    n_reassigns = min(n_low_count_clusters, int(0.5 * n_positive_weights))
+    if n_reassigns == 0:
+        return 0
+
+    reassign_clusters_kernel = make_reassign_clusters_kernel(
+        n_features, max_work_group_size, compute_dtype
+    )
+    reset_reassigned_weight_sums_kernel = make_reset_reassigned_weight_sums_kernel(
+        max_work_group_size, compute_dtype
+    )
+
+    # The clusters with the greatest keys are the flagged clusters with the lowest
+    # sums of weights.
+    reassigned_clusters_idx = topk_idx(low_count_keys, n_reassigns)
+    new_centers_idx = weighted_sample_without_replacement(
+        sample_weight_batch, n_reassigns, seed=random_state
+    )
+
+    reassign_clusters_kernel(
+        X_t_batch,
+        new_centers_idx,
+        reassigned_clusters_idx,
+        # OUT
+        centroids_t,
+        cluster_weight_sums,
+    )
+
+    if n_reassigns < n_clusters:
+        argmin_reduction_kernel = make_argmin_reduction_1d_kernel(
+            n_clusters, device, compute_dtype
+        )
+        min_weight_sum_idx = argmin_reduction_kernel(cluster_weight_sums)
+    else:
+        # NB: all the sums of weights are `inf`, see
+        # `make_reset_reassigned_weight_sums_kernel`.
+        min_weight_sum_idx = dpt.zeros(1, dtype=np.int32, device=device)
+    reset_reassigned_weight_sums_kernel(
+        reassigned_clusters_idx,
+        min_weight_sum_idx,
+        max_weight_sum,
+        # OUT
+        cluster_weight_sums,
+    )
+
+    return n_reassigns
+
+
+def minibatch_kmeans(
+    X_t,
+    sample_weight,
+    centroids_t,
+    batch_size=1024,
+    max_iter=100,
+    verbose=False,
+    tol=0.0,
+    random_state=None,
+    reassignment_ratio=0.0,
+    cluster_weight_sums=None,
+):
+    """Mini-batch k-means on data that is resident in device memory.
+
+    At each step, `batch_size` samples are drawn uniformly with replacement on device
+    and used to update the centroids with `minibatch_kmeans_partial_fit`. `max_iter`
+    is the number of passes on the data, i.e the number of steps is
+    `(max_iter * n_samples) // batch_size`. The iterations stop early when the sum of
+    the squared shifts of the centroids after a step is lower than `tol`; the default
+    `tol=0.0` disables this check, which saves one host synchronization per step.
+
+    If `reassignment_ratio` is positive, the clusters with a low sum of weights are
+    reassigned to samples of the batch with `reassign_low_count_clusters` every
+    `10 * n_clusters` samples, which requires one host synchronization.
+
+    `cluster_weight_sums`, if not None, is used and updated inplace instead of an
+    array of zeros, e.g. to continue the fit with `minibatch_kmeans_partial_fit`.
+
+    Returns the labels and the inertia of the data for the final centroids, the final
+    centroids, and the number of steps.
+    """
+    compute_dtype = X_t.dtype.type
+    n_features, n_samples = X_t.shape
+    n_clusters = centroids_t.shape[1]
+    device = X_t.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+
+    batch_size = min(batch_size, n_samples)
+    n_steps = (max_iter * n_samples) // batch_size
+
+    # NB: the number of RNG states is capped, each state draws several indices for
+    # large batches.
+    n_states = min(batch_size, 4 * max_work_group_size)
+    sample_batch_indices_kernel = make_sample_batch_indices_kernel(
+        n_samples, batch_size, n_states, max_work_group_size
+    )
+
+    compute_centroid_shifts_kernel = make_centroid_shifts_kernel(
+        n_clusters=n_clusters,
+        n_features=n_features,
+        work_group_size=max_work_group_size,
+        dtype=compute_dtype,
+    )
+
+    reduce_centroid_shifts_kernel = make_sum_reduction_2d_kernel(
+        shape=(n_clusters,),
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    if not isinstance(random_state, np.random.RandomState):
+        random_state = np.random.RandomState(random_state)
+
+    rng_states = create_xoroshiro128pp_states(
+        n_states=n_states, seed=random_state, device=device
+    )
+
+    batch_indices = dpt.empty(batch_size, dtype=np.int64, device=device)
+    if cluster_weight_sums is None:
+        cluster_weight_sums = dpt.zeros(n_clusters, dtype=compute_dtype, device=device)
+    centroid_shifts = dpt.empty(n_clusters, dtype=compute_dtype, device=device)
+
+    verbose = bool(verbose)
+    check_convergence = tol > 0
+    n_since_last_reassign = 0
+
+    step = 0
+    while step < n_steps:
+        sample_batch_indices_kernel(
+            rng_states,
+            # OUT
+            batch_indices,
+        )
+
+        X_t_batch = dpt.take(X_t, batch_indices, axis=1)
+        sample_weight_batch = dpt.take(sample_weight, batch_indices)
+
+        new_centroids_t, _ = minibatch_kmeans_partial_fit(
+            X_t_batch, sample_weight_batch, centroids_t, cluster_weight_sums
+        )
+
+        centroids_t, new_centroids_t = new_centroids_t, centroids_t
+        step += 1
+
+        if reassignment_ratio > 0:
+            n_since_last_reassign += batch_size
+            if n_since_last_reassign >= 10 * n_clusters:
+                n_since_last_reassign = 0
+                reassign_low_count_clusters(
+                    X_t_batch,
+                    sample_weight_batch,
+                    centroids_t,
+                    cluster_weight_sums,
+                    reassignment_ratio,
+                    random_state,
+                )
+
+        if not (check_convergence or verbose):
+            continue
+
+        compute_centroid_shifts_kernel(
+            centroids_t,
+            new_centroids_t,
+            # OUT:
+            centroid_shifts,
+        )
+        centroid_shifts_sum, *_ = reduce_centroid_shifts_kernel(centroid_shifts)
+        # Use numpy type to work around https://github.com/IntelPython/dpnp/issues/1238
+        centroid_shifts_sum = compute_dtype(centroid_shifts_sum)
+
+        if verbose:
+            print(
+                f"Minibatch step {step}/{n_steps}: center shift {centroid_shifts_sum}"
+            )
+
+        if check_convergence and (centroid_shifts_sum <= tol):
+            if verbose:
+                print(
+                    f"Converged at step {step}: center shift {centroid_shifts_sum} "
+                    f"within tolerance {tol}."
+                )
+            break
+
+    assignments_idx, inertia = get_labels_inertia(
+        X_t, centroids_t, sample_weight, with_inertia=True
+    )
+    # inertia is a 1-sized numpy array, we transform it into a scalar:
+    inertia = inertia[0]
+
+    return assignments_idx, inertia, centroids_t, step
@@ -0,0 +1,332 @@
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.autotune import get_tuned_parameters
+from sklearn_numba_dpex.common._utils import _divide_by, _minus, _plus, _square
+from sklearn_numba_dpex.common.kernels import (
+    make_apply_elementwise_func,
+    make_broadcast_ops_1d_2d_axis1_kernel,
+    make_half_l2_norm_2d_axis0_kernel,
+)
+from sklearn_numba_dpex.common.reductions import make_sum_reduction_2d_kernel
+from sklearn_numba_dpex.kmeans.kernels import (
+    make_compute_euclidean_distances_fixed_window_kernel,
+    make_compute_inertia_kernel,
+    make_get_nb_distinct_clusters_kernel,
+    make_is_same_clustering_kernel,
+    make_label_assignment_fixed_window_kernel,
+)
+
+
+def prepare_data_for_lloyd(X_t, init, tol, sample_weight, copy_x):
+    """It can be more numerically accurate to center the data first. If copy_x is True,
+    then the original data is not modified. If False, the original data is modified,
+    and put back later on (see `restore_data_after_lloyd`), but small numerical
+    differences may be introduced by subtracting and then adding the data mean. Note
+    that if the original data is not C-contiguous, a copy will be made even if copy_x
+    is False."""
+
+    n_features, n_samples = X_t.shape
+    compute_dtype = X_t.dtype.type
+
+    device = X_t.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+
+    sum_axis1_kernel = make_sum_reduction_2d_kernel(
+        X_t.shape,
+        axis=1,
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    elementwise_divide_by_n_samples_fn = _divide_by(compute_dtype(n_samples))
+
+    divide_by_n_samples_kernel = make_apply_elementwise_func(
+        (n_features,),
+        elementwise_divide_by_n_samples_fn,
+        max_work_group_size,
+    )
+
+    # At the time of writing this code, dpnp does not support functions (like `==`
+    # operator) that would help computing `X_mean_is_zeroed` in a simpler
+    # manner.
+    # TODO: if dpnp support extends to relevant features, use it instead ?
+    sum_of_squares_kernel = make_sum_reduction_2d_kernel(
+        shape=(n_features,),
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+        fused_elementwise_func=_square,
+    )
+
+    X_mean = sum_axis1_kernel(X_t)[:, 0]
+
+    # Change `X_mean` inplace
+    divide_by_n_samples_kernel(X_mean)
+
+    X_sum_squared = sum_of_squares_kernel(X_mean)[0]
+    X_mean_is_zeroed = float(X_sum_squared) == 0.0
+
+    if X_mean_is_zeroed:
+        # If the data is already centered, there's no need to perform shift/unshift
+        # steps. In this case, X_mean is set to None, thus carrying the information
+        # that the data was already centered, and the shift/unshift steps will be
+        # skipped.
+        X_mean = None
+    else:
+        # subtract the mean of x for more accurate distance computations
+        X_t = dpt.asarray(X_t, copy=copy_x)
+        broadcast_X_minus_X_mean = make_broadcast_ops_1d_2d_axis1_kernel(
+            (n_features, n_samples),
+            ops=_minus,
+            work_group_size=max_work_group_size,
+        )
+
+        # Change `X_t` inplace
+        broadcast_X_minus_X_mean(X_t, X_mean)
+
+        if isinstance(init, dpt.usm_ndarray):
+            n_clusters = init.shape[1]
+            broadcast_init_minus_X_mean = make_broadcast_ops_1d_2d_axis1_kernel(
+                (n_features, n_clusters),
+                ops=_minus,
+                work_group_size=max_work_group_size,
+            )
+            # Change `init` inplace
+            broadcast_init_minus_X_mean(init, X_mean)
+
+    n_items = n_features * n_samples
+
+    variance_kernel = make_sum_reduction_2d_kernel(
+        shape=(n_items,),
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+        fused_elementwise_func=_square,
+    )
+
+    variance = variance_kernel(dpt.reshape(X_t, -1))
+    # Use numpy type to work around https://github.com/IntelPython/dpnp/issues/1238
+    tol = (dpt.asnumpy(variance)[0] / (n_features * n_samples)) * tol
+
+    # check if sample_weight is uniform
+    # At the time of writing this code, dpnp does not support functions (like `==`
+    # operator) that would help computing `sample_weight_is_uniform` in a simpler
+    # manner.
+    # TODO: if dpnp support extends to relevant features, use it instead ?
+    sum_sample_weight_kernel = make_sum_reduction_2d_kernel(
+        shape=(n_samples,),
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    sample_weight_sum = compute_dtype(sum_sample_weight_kernel(sample_weight)[0])
+    sample_weight_is_uniform = sample_weight_sum == (
+        compute_dtype(sample_weight[0]) * n_samples
+    )
+
+    return X_t, X_mean, init, tol, sample_weight_is_uniform
+
+
+def restore_data_after_lloyd(X_t, best_centers_t, X_mean, copy_x):
+    """X_mean, the feature wise mean of X prior to the centerings of X and centers in
+    `prepare_data_for_lloyd`, is re-added to X and centers.
+    """
+    if X_mean is None:
+        # X and best_centers_t aren't translated back.
+        return
+
+    n_features, n_samples = X_t.shape
+    n_clusters = best_centers_t.shape[1]
+
+    device = X_t.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+
+    best_centers_t = dpt.asarray(best_centers_t, copy=False)
+    broadcast_init_plus_X_mean = make_broadcast_ops_1d_2d_axis1_kernel(
+        (n_features, n_clusters),
+        ops=_plus,
+        work_group_size=max_work_group_size,
+    )
+    # Change `best_centers_t` inplace
+    broadcast_init_plus_X_mean(best_centers_t, X_mean)
+
+    # NB: copy_x being set to False does not mean that no copy actually happened, only
+    # that no copy was forced if it was not necessary with respect to what device,
+    # dtype and order that are required at compute time. Nevertheless, there's no
+    # simple way to check if a copy happened without assumptions on the type of the raw
+    # input submitted by the user, but at the moment it is unknown what those
+    # assumptions could be. As a result, the following instructions are ran every time,
+    # even if it isn't useful when a copy has been made.
+    # TODO: is there a set of assumptions that exhaustively describes the set of
+    # accepted inputs, and also enables checking if a copy happened or not in a simple
+    # way ?
+    if not copy_x:
+        X_t = dpt.asarray(X_t, copy=False)
+        broadcast_X_plus_X_mean = make_broadcast_ops_1d_2d_axis1_kernel(
+            (n_features, n_samples),
+            ops=_plus,
+            work_group_size=max_work_group_size,
+        )
+        # Change X_t inplace
+        broadcast_X_plus_X_mean(X_t, X_mean)
+
+
+def is_same_clustering(labels1, labels2, n_clusters):
+    """Check if two arrays of labels are the same up to a permutation of the labels"""
+    device = labels1.device.sycl_device
+
+    is_same_clustering_kernel = make_is_same_clustering_kernel(
+        n_samples=labels1.shape[0],
+        n_clusters=n_clusters,
+        work_group_size=device.max_work_group_size,
+        device=device,
+    )
+    return is_same_clustering_kernel(labels1, labels2)
+
+
+def get_nb_distinct_clusters(labels, n_clusters):
+    device = labels.device.sycl_device
+
+    get_nb_distinct_clusters_kernel = make_get_nb_distinct_clusters_kernel(
+        n_samples=labels.shape[0],
+        n_clusters=n_clusters,
+        work_group_size=device.max_work_group_size,
+        device=device,
+    )
+
+    clusters_seen = dpt.zeros((n_clusters,), dtype=np.int32, device=device)
+
+    nb_distinct_clusters = dpt.zeros((1,), dtype=np.int32, device=device)
+
+    get_nb_distinct_clusters_kernel(
+        labels,
+        clusters_seen,
+        # OUT
+        nb_distinct_clusters,
+    )
+
+    # Use numpy type to work around https://github.com/IntelPython/dpnp/issues/1238
+    return dpt.asnumpy(nb_distinct_clusters[0])
+
+
+def get_labels_inertia(
+    X_t, centroids_t, sample_weight, with_inertia, centroids_half_l2_norm=None
+):
+    compute_dtype = X_t.dtype.type
+    n_features, n_samples = X_t.shape
+    n_clusters = centroids_t.shape[1]
+    device = X_t.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+
+    label_assignment_fixed_window_kernel = make_label_assignment_fixed_window_kernel(
+        n_features,
+        n_clusters,
+        dtype=compute_dtype,
+        device=device,
+        **get_tuned_parameters(
+            "label_assignment",
+            device,
+            compute_dtype,
+            (n_samples, n_features, n_clusters),
+        ),
+    )
+
+    if centroids_half_l2_norm is None:
+        centroids_half_l2_norm = get_half_l2_norm(centroids_t)
+
+    assignments_idx = dpt.empty(n_samples, dtype=np.uint32, device=device)
+
+    label_assignment_fixed_window_kernel(
+        X_t,
+        centroids_t,
+        centroids_half_l2_norm,
+        # OUT
+        assignments_idx,
+    )
+
+    if not with_inertia:
+        return assignments_idx, None
+
+    compute_inertia_kernel = make_compute_inertia_kernel(
+        n_features, max_work_group_size, compute_dtype
+    )
+
+    reduce_inertia_kernel = make_sum_reduction_2d_kernel(
+        shape=(n_samples,),
+        work_group_size="max",
+        device=device,
+        dtype=compute_dtype,
+    )
+
+    per_sample_inertia = dpt.empty(n_samples, dtype=compute_dtype, device=device)
+
+    compute_inertia_kernel(
+        X_t,
+        sample_weight,
+        centroids_t,
+        assignments_idx,
+        # OUT
+        per_sample_inertia,
+    )
+
+    # inertia = per_sample_inertia.sum()
+    inertia = dpt.asnumpy(reduce_inertia_kernel(per_sample_inertia))
+
+    return assignments_idx, inertia
+
+
+def get_euclidean_distances(X_t, Y_t):
+    compute_dtype = X_t.dtype.type
+    n_features, n_samples = X_t.shape
+    n_clusters = Y_t.shape[1]
+    device = X_t.device.sycl_device
+    sub_group_size = 8
+
+    euclidean_distances_fixed_window_kernel = (
+        make_compute_euclidean_distances_fixed_window_kernel(
+            n_features,
+            n_clusters,
+            sub_group_size=sub_group_size,
+            work_group_size="max",
+            dtype=compute_dtype,
+            device=device,
+        )
+    )
+
+    euclidean_distances_t = dpt.empty(
+        (n_clusters, n_samples), dtype=compute_dtype, device=device
+    )
+
+    euclidean_distances_fixed_window_kernel(
+        X_t,
+        Y_t,
+        # OUT
+        euclidean_distances_t,
+    )
+
+    return euclidean_distances_t.T
+
+
+def get_half_l2_norm(centroids_t):
+    n_features, n_clusters = centroids_t.shape
+    compute_dtype = centroids_t.dtype.type
+    device = centroids_t.device.sycl_device
+
+    half_l2_norm_kernel = make_half_l2_norm_2d_axis0_kernel(
+        (n_features, n_clusters),
+        work_group_size=device.max_work_group_size,
+        dtype=compute_dtype,
+    )
+
+    centroids_half_l2_norm = dpt.empty(n_clusters, dtype=compute_dtype, device=device)
+
+    half_l2_norm_kernel(
+        centroids_t,
+        # OUT
+        centroids_half_l2_norm,
+    )
+
+    return centroids_half_l2_norm
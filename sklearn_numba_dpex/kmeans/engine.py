@@ -1,6 +1,9 @@
 import contextlib
 import numbers
 import os
+import warnings
+import weakref
+from collections import deque, namedtuple
 from typing import Any, Dict
 
 import dpctl
@@ -13,18 +16,48 @@ import sklearn.utils.validation as sklearn_validation
 from sklearn.cluster._kmeans import KMeansCythonEngine
 from sklearn.exceptions import NotSupportedByEngineError
 from sklearn.utils import check_array, check_random_state
+from sklearn.utils.extmath import row_norms
+from sklearn.utils.validation import (
+    _check_sample_weight as _check_sample_weight_on_host,
+)
 from sklearn.utils.validation import _is_arraylike_not_scalar
 
+from sklearn_numba_dpex.common.random import weighted_sample_without_replacement
+from sklearn_numba_dpex.common.sparse import DeviceCSRMatrix
 from sklearn_numba_dpex.testing import override_attr_context
 
+from ._config import get_kmeans_config
+from ._kmeans_parallel import kmeans_parallel_init
+from ._memory import (
+    _HAMERLY_MAX_N_CLUSTERS,
+    _format_memory_plan,
+    _get_fit_algorithm,
+    _raise_memory_error,
+    plan_kmeans_fit,
+    plan_kmeans_predict,
+)
 from .drivers import (
+    get_csr_rows_t,
     get_euclidean_distances,
+    get_euclidean_distances_csr,
+    get_half_l2_norm,
     get_labels_inertia,
+    get_labels_inertia_chunked,
+    get_labels_inertia_csr,
     get_nb_distinct_clusters,
+    hamerly,
     is_same_clustering,
+    iter_predict_chunked,
+    kmeans_parallel,
     kmeans_plusplus,
+    kmeans_plusplus_csr,
     lloyd,
+    lloyd_batched,
+    lloyd_chunked,
+    lloyd_csr,
     prepare_data_for_lloyd,
+    prepare_data_for_lloyd_chunked,
+    prepare_data_for_lloyd_csr,
     restore_data_after_lloyd,
 )
 
@@ -33,6 +66,22 @@ class _DeviceUnset:
     pass
 
 
+_FittedState = namedtuple(
+    "_FittedState",
+    ["cluster_centers", "dtype", "device", "centroids_t", "centroids_half_l2_norm"],
+)
+
+# NB: the states are not set as attributes of the estimators, so that they don't
+# prevent pickling or cloning the estimators, and they are released along with the
+# estimators.
+_fitted_states = weakref.WeakKeyDictionary()
+
+# The distances to the centroids that are computed during the fit when the
+# `fused_fit_transform` option is set (see `set_kmeans_config`), along with a weak
+# reference to the input of the fit.
+_fit_transform_results = weakref.WeakKeyDictionary()
+
+
 class KMeansEngine(KMeansCythonEngine):
     """GPU optimized implementation of Lloyd's k-means.
 
@@ -116,24 +165,39 @@ class KMeansEngine(KMeansCythonEngine):
 
     def accepts(self, X, y, sample_weight):
 
-        if (algorithm := self.estimator.algorithm) not in ("lloyd", "auto", "full"):
+        if (algorithm := self.estimator.algorithm) not in (
+            "lloyd",
+            "auto",
+            "full",
+            "elkan",
+        ):
             if self._is_in_testing_mode:
                 raise NotSupportedByEngineError(
                     "The sklearn_nunmba_dpex engine for KMeans only support the Lloyd"
-                    f" algorithm, {algorithm} is not supported."
+                    f" and Elkan algorithms, {algorithm} is not supported."
                 )
             else:
                 return False
 
-        if sp.issparse(X):
-            return self._is_in_testing_mode
-
+        # NB: sparse data is converted to the CSR format (see `_validate_data`).
         return True
 
     def prepare_fit(self, X, y=None, sample_weight=None):
         estimator = self.estimator
 
-        X = self._validate_data(X)
+        # See `kmeans_single` and `get_euclidean_distances`.
+        # NB: sklearn does not give a hint to the engine that the fit is followed by
+        # a transform on the same data, so computing the distances in the fit is
+        # opt-in.
+        self._fit_input_ref = None
+        if get_kmeans_config()["fused_fit_transform"]:
+            try:
+                self._fit_input_ref = weakref.ref(X)
+            except TypeError:
+                pass
+        _fit_transform_results.pop(estimator, None)
+
+        X = self._validate_data(X, allow_streaming=True)
         estimator._check_params_vs_input(X)
 
         sample_weight = self._check_sample_weight(sample_weight, X)
@@ -143,6 +207,40 @@ class KMeansEngine(KMeansCythonEngine):
         if init_is_array_like:
             init = self._check_init(init, X)
 
+        self.random_state = check_random_state(estimator.random_state)
+
+        if estimator.algorithm == "elkan" and self._get_fit_algorithm() != "elkan":
+            warnings.warn(
+                "algorithm='elkan' is only implemented for n_clusters <= "
+                f"{_HAMERLY_MAX_N_CLUSTERS}, Lloyd's algorithm is used instead for "
+                f"n_clusters={estimator.n_clusters}."
+            )
+
+        # See `init_centroids` and `kmeans_single`
+        self._pending_centers_init_t = deque()
+        self._batched_centers_init_t = None
+        self._batched_results = None
+
+        if isinstance(X, DeviceCSRMatrix):
+            # NB: like in scikit-learn, sparse data is not centered.
+            self.init = init
+            self.X_mean = None
+            self.tol, self.sample_weight_is_uniform = prepare_data_for_lloyd_csr(
+                X, estimator.tol, sample_weight
+            )
+            return X, y, sample_weight
+
+        if isinstance(X, np.ndarray):
+            # NB: see `_validate_data`, the data does not fit in the memory budget and
+            # is streamed to the device at each iteration. It is not centered.
+            self.init = init
+            self.X_mean = None
+            chunk_size = self._streaming_memory_plan.chunk_size
+            self.tol, self.sample_weight_is_uniform = prepare_data_for_lloyd_chunked(
+                X, estimator.tol, sample_weight, chunk_size
+            )
+            return X, y, sample_weight
+
         (
             X_t,
             X_mean,
@@ -158,8 +256,6 @@ class KMeansEngine(KMeansCythonEngine):
 
         self.X_mean = X_mean
 
-        self.random_state = check_random_state(estimator.random_state)
-
         return X_t.T, y, sample_weight
 
     def unshift_centers(self, X, best_centers):
@@ -172,41 +268,282 @@ class KMeansEngine(KMeansCythonEngine):
         restore_data_after_lloyd(X.T, best_centers.T, X_mean, self.estimator.copy_x)
 
     def init_centroids(self, X, sample_weight):
+        # NB: when several initializations are requested, they are all computed at
+        # the first call, so that the subsequent call to `kmeans_single` can run all
+        # of them at once in a single batched pass on the data (see `kmeans_single`).
+        # The random state is consumed in the same order than if the initializations
+        # were computed one at a time.
+        if (n_runs := self._get_n_batched_runs(X)) > 1:
+            if not self._pending_centers_init_t:
+                self._pending_centers_init_t.extend(
+                    self._init_centroids(X, sample_weight) for _ in range(n_runs)
+                )
+                self._batched_centers_init_t = list(self._pending_centers_init_t)
+                self._batched_results = None
+            return self._pending_centers_init_t.popleft()
+
+        return self._init_centroids(X, sample_weight)
+
+    def _init_centroids(self, X, sample_weight):
         init = self.init
         n_clusters = self.estimator.n_clusters
 
+        if isinstance(X, np.ndarray) and not isinstance(init, dpt.usm_ndarray):
+            return self._init_centroids_on_host(X, sample_weight)
+
         if isinstance(init, dpt.usm_ndarray):
             centers_t = init
 
         elif isinstance(init, str) and init == "k-means++":
             centers_t, _ = self._kmeans_plusplus(X, sample_weight)
 
+        elif init is kmeans_parallel_init or (
+            isinstance(init, str) and init == "k-means||"
+        ):
+            # NB: the driver is called directly rather than through the callable, so
+            # that the sample weights are taken into account.
+            centers_t, _ = self._kmeans_parallel(X, sample_weight)
+
         elif callable(init):
             centers = init(X, self.estimator.n_clusters, random_state=self.random_state)
             centers_t = self._check_init(centers, X)
 
         else:
-            # NB: sampling without replacement must be executed sequentially so
-            # it's better done on CPU ?
-            sample_weight_numpy = dpt.asnumpy(sample_weight)
-            p = sample_weight_numpy / sample_weight_numpy.sum()
-            centers_idx = self.random_state.choice(
-                X.shape[0], size=n_clusters, replace=False, p=p
+            centers_idx = weighted_sample_without_replacement(
+                sample_weight, n_clusters, seed=self.random_state
             )
-            centers_t = dpt.take(X.T, dpt.asarray(centers_idx), axis=1)
+            if isinstance(X, DeviceCSRMatrix):
+                centers_t = get_csr_rows_t(X, centers_idx)
+            else:
+                centers_t = dpt.take(X.T, centers_idx, axis=1)
 
         return centers_t
 
+    def _init_centroids_on_host(self, X, sample_weight):
+        """Initialize the centroids of a fit on data that is streamed to the device,
+        on host."""
+        init = self.init
+        if init is kmeans_parallel_init or (
+            isinstance(init, str) and init == "k-means||"
+        ):
+            warnings.warn(
+                "k-means|| is not implemented for data that does not fit in the device "
+                "memory budget, k-means++ is used instead."
+            )
+            init = "k-means++"
+
+        if callable(init):
+            centers = init(X, self.estimator.n_clusters, random_state=self.random_state)
+        else:
+            centers = self.estimator._init_centroids(
+                X,
+                x_squared_norms=row_norms(X, squared=True),
+                init=init,
+                random_state=self.random_state,
+                sample_weight=sample_weight,
+            )
+        return self._check_init(centers, X)
+
     def _kmeans_plusplus(self, X, sample_weight):
         n_clusters = self.estimator.n_clusters
 
+        if isinstance(X, DeviceCSRMatrix):
+            return kmeans_plusplus_csr(X, sample_weight, n_clusters, self.random_state)
+
         centers_t, center_indices = kmeans_plusplus(
             X.T, sample_weight, n_clusters, self.random_state
         )
         return centers_t, center_indices
 
+    def _kmeans_parallel(self, X, sample_weight):
+        if isinstance(X, DeviceCSRMatrix):
+            # NB: the sparse data only supports the k-means++ kernels, see the
+            # documentation of `kmeans_parallel_init`.
+            warnings.warn(
+                "k-means|| is only supported for dense data, k-means++ is used "
+                "instead for sparse data."
+            )
+            return self._kmeans_plusplus(X, sample_weight)
+
+        return kmeans_parallel(
+            X.T, sample_weight, self.estimator.n_clusters, self.random_state
+        )
+
+    def _get_n_batched_runs(self, X):
+        """Number of initializations that are run at once by `lloyd_batched`.
+
+        Returns 1 if the initializations should rather be run sequentially.
+        """
+        estimator = self.estimator
+        n_init = getattr(estimator, "_n_init", estimator.n_init)
+
+        # NB: the batched runs are opt-in, they are only faster on small data, see
+        # `set_kmeans_config`.
+        if (
+            not get_kmeans_config()["batched_n_init"]
+            or not isinstance(n_init, numbers.Integral)
+            or n_init < 2
+            or self._get_fit_algorithm() == "elkan"
+            # NB: `lloyd_batched` does not report the progress of each run.
+            or estimator.verbose
+            or isinstance(X, (DeviceCSRMatrix, np.ndarray))
+        ):
+            return 1
+
+        # The batched kernel needs buffers for each run. Fall back to sequential runs
+        # if those do not fit in the memory budget.
+        memory_plan = self._plan_fit(X, n_runs=n_init)
+        if memory_plan.peak_nbytes > memory_plan.memory_budget:
+            return 1
+
+        return n_init
+
+    def _get_fit_algorithm(self):
+        return _get_fit_algorithm(self.estimator.algorithm, self.estimator.n_clusters)
+
+    def _plan_fit(self, X, n_runs=1):
+        n_samples, n_features = X.shape
+        return plan_kmeans_fit(
+            n_samples,
+            n_features,
+            self.estimator.n_clusters,
+            dtype=X.dtype,
+            device=X.device.sycl_device,
+            algorithm=self.estimator.algorithm,
+            n_runs=n_runs,
+        )
+
     def kmeans_single(self, X, sample_weight, centers_init_t):
-        assignments_idx, inertia, best_centroids_t, n_iteration = lloyd(
+        batched_run_idx = None
+        if self._batched_centers_init_t is not None:
+            batched_run_idx = next(
+                (
+                    run_idx
+                    for run_idx, batched_centers_init_t in enumerate(
+                        self._batched_centers_init_t
+                    )
+                    if batched_centers_init_t is centers_init_t
+                ),
+                None,
+            )
+
+        if batched_run_idx is not None:
+            if self._batched_results is None:
+                centers_init_t_batch = dpt.empty(
+                    (len(self._batched_centers_init_t), *centers_init_t.shape),
+                    dtype=centers_init_t.dtype,
+                    device=centers_init_t.device,
+                )
+                for run_idx, batched_centers_init_t in enumerate(
+                    self._batched_centers_init_t
+                ):
+                    centers_init_t_batch[run_idx] = batched_centers_init_t
+
+                memory_plan = self._plan_fit(X, n_runs=len(centers_init_t_batch))
+                self._batched_results = lloyd_batched(
+                    X.T,
+                    sample_weight,
+                    centers_init_t_batch,
+                    self.estimator.max_iter,
+                    self.tol,
+                    n_centroids_private_copies=(memory_plan.n_centroids_private_copies),
+                )
+            return self._format_kmeans_single_result(
+                *self._batched_results[batched_run_idx]
+            )
+
+        if isinstance(X, np.ndarray):
+            # NB: see `_validate_data`, the data does not fit in the memory budget and
+            # is streamed to the device at each iteration. Only Lloyd's algorithm is
+            # implemented for streamed data, for `algorithm="elkan"` too.
+            memory_plan = self._streaming_memory_plan
+            if self.estimator.verbose:
+                print(_format_memory_plan(memory_plan))
+            return self._format_kmeans_single_result(
+                *lloyd_chunked(
+                    X,
+                    sample_weight,
+                    centers_init_t,
+                    self.sample_weight_is_uniform,
+                    self.estimator.max_iter,
+                    self.estimator.verbose,
+                    self.tol,
+                    chunk_size=memory_plan.chunk_size,
+                )
+            )
+
+        if isinstance(X, DeviceCSRMatrix):
+            # NB: only Lloyd's algorithm is implemented for sparse data.
+            return self._format_kmeans_single_result(
+                *lloyd_csr(
+                    X,
+                    sample_weight,
+                    centers_init_t,
+                    self.estimator.max_iter,
+                    self.estimator.verbose,
+                    self.tol,
+                )
+            )
+
+        # NB: for `algorithm="elkan"`, the bounds on the distances are maintained using
+        # the strategy described by Hamerly rather than Elkan, since it requires
+        # `n_samples` rather than `n_samples * n_clusters` additional memory. With
+        # many clusters, Lloyd's algorithm is used instead (see `_get_fit_algorithm`).
+        kmeans_single_driver = (
+            hamerly if self._get_fit_algorithm() == "elkan" else lloyd
+        )
+
+        # NB: the memory plan is checked before any allocation, rather than letting
+        # the device run out of memory in the middle of the fit.
+        memory_plan = self._plan_fit(X)
+        if self.estimator.verbose:
+            print(_format_memory_plan(memory_plan))
+        if memory_plan.peak_nbytes > memory_plan.memory_budget:
+            _raise_memory_error(memory_plan)
+
+        if self._use_fused_fit_transform(X, memory_plan):
+            (
+                assignments_idx,
+                inertia,
+                best_centroids_t,
+                n_iteration,
+                euclidean_distances,
+            ) = lloyd(
+                X.T,
+                sample_weight,
+                centers_init_t,
+                self.sample_weight_is_uniform,
+                self.estimator.max_iter,
+                self.estimator.verbose,
+                self.tol,
+                convergence_check_interval=get_kmeans_config()[
+                    "convergence_check_interval"
+                ],
+                n_centroids_private_copies=memory_plan.n_centroids_private_copies,
+                return_distances=True,
+                centroid_update=memory_plan.centroid_update,
+            )
+            _fit_transform_results[self.estimator] = (
+                self._fit_input_ref,
+                euclidean_distances,
+            )
+            return self._format_kmeans_single_result(
+                assignments_idx, inertia, best_centroids_t, n_iteration
+            )
+
+        # NB: the choice of the centroid update strategy and the interval between
+        # the convergence checks only apply to Lloyd.
+        driver_kwargs = (
+            dict(
+                centroid_update=memory_plan.centroid_update,
+                convergence_check_interval=get_kmeans_config()[
+                    "convergence_check_interval"
+                ],
+            )
+            if kmeans_single_driver is lloyd
+            else dict()
+        )
+        assignments_idx, inertia, best_centroids_t, n_iteration = kmeans_single_driver(
             X.T,
             sample_weight,
             centers_init_t,
@@ -214,8 +551,33 @@ class KMeansEngine(KMeansCythonEngine):
             self.estimator.max_iter,
             self.estimator.verbose,
             self.tol,
+            n_centroids_private_copies=memory_plan.n_centroids_private_copies,
+            **driver_kwargs,
+        )
+        return self._format_kmeans_single_result(
+            assignments_idx, inertia, best_centroids_t, n_iteration
         )
 
+    def _use_fused_fit_transform(self, X, memory_plan):
+        """Whether the distances to the centroids are computed in the final pass of
+        the fit, so that a following `transform` on the same data, e.g. in
+        `fit_transform`, does not need a second pass on the data."""
+        estimator = self.estimator
+        if self._fit_input_ref is None or self._get_fit_algorithm() == "elkan":
+            return False
+
+        # NB: with several initializations, the distances would be computed for all
+        # the runs but only kept for the best one.
+        if getattr(estimator, "_n_init", estimator.n_init) != 1:
+            return False
+
+        n_samples = X.shape[0]
+        distances_nbytes = n_samples * estimator.n_clusters * X.dtype.itemsize
+        return memory_plan.peak_nbytes + distances_nbytes <= memory_plan.memory_budget
+
+    def _format_kmeans_single_result(
+        self, assignments_idx, inertia, best_centroids_t, n_iteration
+    ):
         if self._is_in_testing_mode:
             # XXX: having a C-contiguous centroid array is expected in sklearn in some
             # unit test and by the cython engine.
@@ -242,7 +604,7 @@ class KMeansEngine(KMeansCythonEngine):
         return get_nb_distinct_clusters(best_labels, self.estimator.n_clusters)
 
     def prepare_prediction(self, X, sample_weight):
-        X = self._validate_data(X, reset=False)
+        X = self._validate_data(X, reset=False, allow_streaming=True)
         sample_weight = self._check_sample_weight(sample_weight, X)
         return X, sample_weight
 
@@ -259,13 +621,33 @@ class KMeansEngine(KMeansCythonEngine):
         return inertia
 
     def _get_labels_inertia(self, X, sample_weight, with_inertia=True):
-        cluster_centers = self._check_init(
-            self.estimator.cluster_centers_, X, copy=False
-        )
+        fitted_state = self._get_fitted_state(X)
+        cluster_centers = fitted_state.centroids_t
+        centroids_half_l2_norm = fitted_state.centroids_half_l2_norm
 
-        assignments_idx, inertia = get_labels_inertia(
-            X.T, cluster_centers, sample_weight, with_inertia
-        )
+        if isinstance(X, DeviceCSRMatrix):
+            assignments_idx, inertia = get_labels_inertia_csr(
+                X, cluster_centers, sample_weight, with_inertia, centroids_half_l2_norm
+            )
+        elif isinstance(X, np.ndarray):
+            # NB: see `_validate_data`, the data did not fit in the memory budget and
+            # is streamed to the device.
+            assignments_idx, inertia = get_labels_inertia_chunked(
+                X,
+                cluster_centers,
+                sample_weight,
+                with_inertia,
+                self._streaming_memory_plan.chunk_size,
+                centroids_half_l2_norm,
+            )
+        else:
+            assignments_idx, inertia = get_labels_inertia(
+                X.T,
+                cluster_centers,
+                sample_weight,
+                with_inertia,
+                centroids_half_l2_norm,
+            )
 
         if with_inertia:
             # inertia is a 1-sized numpy array, we transform it into a scalar:
@@ -279,18 +661,91 @@ class KMeansEngine(KMeansCythonEngine):
         return X
 
     def get_euclidean_distances(self, X):
-        X = self._validate_data(X, reset=False)
-        cluster_centers = self._check_init(
-            self.estimator.cluster_centers_, X, copy=False
+        # NB: in `fit_transform`, the distances have been computed during the fit
+        # (see `kmeans_single`).
+        fit_input_ref, euclidean_distances = _fit_transform_results.pop(
+            self.estimator, (None, None)
+        )
+        if fit_input_ref is not None and fit_input_ref() is X:
+            if self._is_in_testing_mode:
+                euclidean_distances = dpt.asnumpy(euclidean_distances).astype(
+                    self.estimator._output_dtype
+                )
+            return euclidean_distances
+
+        X = self._validate_data(
+            X, reset=False, allow_streaming=True, with_distances=True
         )
-        euclidean_distances = get_euclidean_distances(X.T, cluster_centers)
+        cluster_centers = self._get_fitted_state(X).centroids_t
+        if isinstance(X, DeviceCSRMatrix):
+            euclidean_distances = get_euclidean_distances_csr(X, cluster_centers)
+        elif isinstance(X, np.ndarray):
+            # NB: see `_validate_data`, the data did not fit in the memory budget and
+            # is streamed to the device. The distances are gathered on host.
+            euclidean_distances = np.empty(
+                (X.shape[0], self.estimator.n_clusters), dtype=X.dtype
+            )
+            for start, stop, euclidean_distances_chunk in iter_predict_chunked(
+                X,
+                cluster_centers,
+                "distances",
+                None,
+                self._streaming_memory_plan.chunk_size,
+            ):
+                euclidean_distances[start:stop] = dpt.asnumpy(euclidean_distances_chunk)
+        else:
+            euclidean_distances = get_euclidean_distances(X.T, cluster_centers)
         if self._is_in_testing_mode:
-            euclidean_distances = dpt.asnumpy(euclidean_distances).astype(
-                self.estimator._output_dtype
+            euclidean_distances = np.asarray(
+                dpt.asnumpy(euclidean_distances)
+                if isinstance(euclidean_distances, dpt.usm_ndarray)
+                else euclidean_distances,
+                dtype=self.estimator._output_dtype,
             )
         return euclidean_distances
 
-    def _validate_data(self, X, reset=True):
+    def _get_fitted_state(self, X):
+        """Return the device data derived from `cluster_centers_` that is used for
+        predicting the labels of `X`.
+
+        The state is cached for the estimator, so that repeated predictions on the
+        same device and with the same dtype don't copy the centroids to the device
+        and compute their half l2 norms again. The cache is invalidated when a new
+        array is assigned to `cluster_centers_` (e.g. by a new fit), but not when the
+        array is modified in place.
+        """
+        cluster_centers = self.estimator.cluster_centers_
+        dtype = np.dtype(X.dtype)
+        if isinstance(X, np.ndarray):
+            device = self._streaming_device
+        else:
+            device = X.device.sycl_device
+
+        fitted_state = _fitted_states.get(self.estimator)
+        if (
+            fitted_state is not None
+            and fitted_state.cluster_centers is cluster_centers
+            and fitted_state.dtype == dtype
+            and fitted_state.device == device
+        ):
+            return fitted_state
+
+        # NB: the centroids are always copied, so that the state does not share
+        # memory with `cluster_centers_`, that could be modified in place.
+        centroids_t = self._check_init(cluster_centers, X, copy=True)
+        fitted_state = _FittedState(
+            cluster_centers,
+            dtype,
+            device,
+            centroids_t,
+            get_half_l2_norm(centroids_t),
+        )
+        _fitted_states[self.estimator] = fitted_state
+        return fitted_state
+
+    def _validate_data(
+        self, X, reset=True, allow_streaming=False, with_distances=False
+    ):
         if isinstance(X, dpnp.ndarray):
             X = X.get_array()
 
@@ -316,6 +771,43 @@ class KMeansEngine(KMeansCythonEngine):
             else:
                 self.estimator._output_dtype = X_dtype
 
+        if sp.issparse(X):
+            # NB: the array API dispatch does not apply to sparse data, which is
+            # validated on host with scipy, before being copied to device.
+            X = self.estimator._validate_data(
+                X,
+                accept_sparse="csr",
+                dtype=accepted_dtypes,
+                copy=False,
+                reset=reset,
+                force_all_finite=True,
+                estimator=self.estimator,
+            )
+            return DeviceCSRMatrix.from_scipy(X, device)
+
+        if allow_streaming and not isinstance(X, dpt.usm_ndarray):
+            if reset:
+                memory_plan = self._plan_streaming_fit(X, device, accepted_dtypes)
+            else:
+                memory_plan = self._plan_predict(
+                    X, device, accepted_dtypes, with_distances
+                )
+            if memory_plan is not None and memory_plan.chunk_size is not None:
+                # NB: the data does not fit in the memory budget, it is validated on
+                # host and it will be streamed to the device by chunks.
+                self._streaming_memory_plan = memory_plan
+                self._streaming_device = device
+                return self.estimator._validate_data(
+                    X,
+                    accept_sparse=False,
+                    dtype=accepted_dtypes,
+                    order="C",
+                    copy=False,
+                    reset=reset,
+                    force_all_finite=True,
+                    estimator=self.estimator,
+                )
+
         with _validate_with_array_api(device):
             try:
                 X = self.estimator._validate_data(
@@ -335,9 +827,57 @@ class KMeansEngine(KMeansCythonEngine):
                 ):
                     raise NotSupportedByEngineError from type_error
 
+    def _plan_streaming_fit(self, X, device, accepted_dtypes):
+        if (shape := getattr(X, "shape", None)) is None or len(shape) != 2:
+            return None
+
+        n_samples, n_features = shape
+        dtype = np.dtype(X.dtype)
+        if dtype not in accepted_dtypes:
+            dtype = accepted_dtypes[0]
+
+        memory_plan = plan_kmeans_fit(
+            n_samples,
+            n_features,
+            self.estimator.n_clusters,
+            dtype,
+            device,
+            algorithm=self.estimator.algorithm,
+            allow_streaming=True,
+        )
+        if memory_plan.peak_nbytes > memory_plan.memory_budget:
+            _raise_memory_error(memory_plan)
+        return memory_plan
+
+    def _plan_predict(self, X, device, accepted_dtypes, with_distances=False):
+        if (shape := getattr(X, "shape", None)) is None or len(shape) != 2:
+            return None
+
+        n_samples, n_features = shape
+        dtype = np.dtype(X.dtype)
+        if dtype not in accepted_dtypes:
+            dtype = accepted_dtypes[0]
+
+        memory_plan = plan_kmeans_predict(
+            n_samples,
+            n_features,
+            self.estimator.n_clusters,
+            dtype,
+            device,
+            with_inertia=not with_distances,
+            with_distances=with_distances,
+        )
+        if memory_plan.peak_nbytes > memory_plan.memory_budget:
+            _raise_memory_error(memory_plan)
+        return memory_plan
+
     def _check_sample_weight(self, sample_weight, X):
         """Adapted from sklearn.utils.validation._check_sample_weight to be compatible
         with Array API dispatch"""
+        if isinstance(X, np.ndarray):
+            # NB: the data is streamed to the device by chunks, see `_validate_data`.
+            return _check_sample_weight_on_host(sample_weight, X, dtype=X.dtype)
+
         n_samples = X.shape[0]
         dtype = np.dtype(X.dtype)
         device = X.device.sycl_device
@@ -373,14 +913,17 @@ class KMeansEngine(KMeansCythonEngine):
 
         return sample_weight
 
-    def _check_init(self, init, X, copy=False):
-        device = X.device.sycl_device
+    def _check_init(self, init, X, copy=True):
+        if isinstance(X, np.ndarray):
+            device = self._streaming_device
+        else:
+            device = X.device.sycl_device
         with _validate_with_array_api(device):
             init = check_array(
                 init,
                 dtype=np.dtype(X.dtype),
                 accept_sparse=False,
-                copy=True,
+                copy=copy,
                 order=self.order,
                 force_all_finite=True,
                 ensure_2d=True,
@@ -388,7 +931,7 @@ class KMeansEngine(KMeansCythonEngine):
                 input_name="init",
             )
             self.estimator._validate_center_shape(X, init)
-            init_t = dpt.asarray(init.T, order="C", copy=False, device=device)
+            init_t = dpt.asarray(init.T, order="C", copy=None, device=device)
             return init_t
 
 
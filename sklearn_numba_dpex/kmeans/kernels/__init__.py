@@ -2,32 +2,100 @@ from .compute_euclidean_distances import (
     make_compute_euclidean_distances_fixed_window_kernel,
 )
 from .compute_inertia import make_compute_inertia_kernel
-from .compute_labels import make_label_assignment_fixed_window_kernel
+from .compute_labels import (
+    make_gather_nearest_centroids_kernel,
+    make_label_assignment_fixed_window_kernel,
+    make_labels_inertia_from_distances_kernel,
+)
+from .csr import (
+    make_compute_euclidean_distances_csr_kernel,
+    make_compute_inertia_csr_kernel,
+    make_csr_column_sums_kernel,
+    make_csr_rows_to_dense_t_kernel,
+    make_kmeansplusplus_single_step_csr_kernel,
+    make_label_assignment_csr_kernel,
+    make_lloyd_single_step_csr_kernel,
+)
+from .hamerly import (
+    make_half_min_centroid_distances_kernel,
+    make_hamerly_single_step_kernel,
+    make_max_centroid_shifts_kernel,
+    make_update_hamerly_bounds_kernel,
+)
 from .kmeans_plusplus import (
+    make_candidate_weights_kernel,
+    make_kmeans_parallel_sample_kernel,
     make_kmeansplusplus_init_kernel,
     make_kmeansplusplus_single_step_fixed_window_kernel,
     make_sample_center_candidates_kernel,
+    make_update_closest_dist_sq_kernel,
+)
+from .lloyd_batched import make_lloyd_batched_single_step_kernel
+from .lloyd_segmented import (
+    make_count_cluster_samples_kernel,
+    make_segmented_centroid_sums_kernel,
+    make_sort_samples_by_cluster_kernel,
 )
 from .lloyd_single_step import make_lloyd_single_step_fixed_window_kernel
+from .minibatch import (
+    make_accumulate_batch_centroid_data_kernel,
+    make_count_positive_weights_kernel,
+    make_low_count_clusters_kernel,
+    make_minibatch_centroids_update_kernel,
+    make_reassign_clusters_kernel,
+    make_reset_reassigned_weight_sums_kernel,
+    make_sample_batch_indices_kernel,
+)
 from .utils import (
+    make_broadcast_division_keep_empty_clusters_kernel,
     make_centroid_shifts_kernel,
     make_get_nb_distinct_clusters_kernel,
     make_is_same_clustering_kernel,
     make_reduce_centroid_data_kernel,
+    make_register_empty_clusters_kernel,
     make_relocate_empty_clusters_kernel,
 )
 
 __all__ = (
     "make_lloyd_single_step_fixed_window_kernel",
+    "make_lloyd_batched_single_step_kernel",
+    "make_count_cluster_samples_kernel",
+    "make_sort_samples_by_cluster_kernel",
+    "make_segmented_centroid_sums_kernel",
     "make_compute_euclidean_distances_fixed_window_kernel",
     "make_label_assignment_fixed_window_kernel",
+    "make_labels_inertia_from_distances_kernel",
+    "make_gather_nearest_centroids_kernel",
     "make_compute_inertia_kernel",
     "make_kmeansplusplus_init_kernel",
     "make_sample_center_candidates_kernel",
     "make_kmeansplusplus_single_step_fixed_window_kernel",
+    "make_kmeans_parallel_sample_kernel",
+    "make_candidate_weights_kernel",
+    "make_update_closest_dist_sq_kernel",
     "make_relocate_empty_clusters_kernel",
     "make_centroid_shifts_kernel",
+    "make_broadcast_division_keep_empty_clusters_kernel",
     "make_reduce_centroid_data_kernel",
+    "make_register_empty_clusters_kernel",
     "make_is_same_clustering_kernel",
     "make_get_nb_distinct_clusters_kernel",
+    "make_half_min_centroid_distances_kernel",
+    "make_hamerly_single_step_kernel",
+    "make_max_centroid_shifts_kernel",
+    "make_update_hamerly_bounds_kernel",
+    "make_sample_batch_indices_kernel",
+    "make_accumulate_batch_centroid_data_kernel",
+    "make_minibatch_centroids_update_kernel",
+    "make_low_count_clusters_kernel",
+    "make_count_positive_weights_kernel",
+    "make_reassign_clusters_kernel",
+    "make_reset_reassigned_weight_sums_kernel",
+    "make_lloyd_single_step_csr_kernel",
+    "make_label_assignment_csr_kernel",
+    "make_compute_inertia_csr_kernel",
+    "make_compute_euclidean_distances_csr_kernel",
+    "make_kmeansplusplus_single_step_csr_kernel",
+    "make_csr_rows_to_dense_t_kernel",
+    "make_csr_column_sums_kernel",
 )
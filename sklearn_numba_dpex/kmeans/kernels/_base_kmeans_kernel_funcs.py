@@ -2,10 +2,10 @@ import numba_dpex as dpex
 import numpy as np
 
 zero_as_a_long = np.int64(0)
+one_as_a_long = np.int64(1)
 
 
 def make_pairwise_ops_base_kernel_funcs(
-    n_samples,
     n_features,
     n_clusters,
     window_n_features,
@@ -39,7 +39,6 @@ def make_pairwise_ops_base_kernel_funcs(
     # (`is_last_centroid_window`, `is_last_feature_window`)
 
     kmeans_kernel_func_factory = _KMeansKernelFuncFactory(
-        n_samples,
         n_features,
         n_clusters,
         ops,
@@ -167,8 +166,7 @@ def make_pairwise_ops_base_kernel_funcs(
 
 
 class _KMeansKernelFuncFactory:
-    def __init__(self, n_samples, n_features, n_clusters, ops, dtype):
-        self.n_samples = n_samples
+    def __init__(self, n_features, n_clusters, ops, dtype):
         self.n_features = n_features
         self.n_clusters = n_clusters
 
@@ -258,7 +256,6 @@ class _KMeansKernelFuncFactory:
     ):
 
         zero = self.dtype(0.0)
-        n_samples = self.n_samples
         accumulate_dot_product = self.accumulate_dot_product
 
         @dpex.func
@@ -271,6 +268,10 @@ class _KMeansKernelFuncFactory:
             result,              # OUT
         ):
             # fmt: on
+            # NB: `n_samples` is read at runtime rather than being passed as a
+            # compile-time constant, so that the kernels that use this function
+            # can be compiled once and re-used for inputs with any number of samples.
+            n_samples = X_t.shape[one_as_a_long]
             for window_feature_idx in range(window_n_features):
 
                 feature_idx = window_feature_idx + first_feature_idx
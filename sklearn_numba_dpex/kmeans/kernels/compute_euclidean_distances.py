@@ -1,9 +1,9 @@
 import math
-from functools import lru_cache
 
 import numba_dpex as dpex
 import numpy as np
 
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
 from sklearn_numba_dpex.common._utils import _check_max_work_group_size
 
 from ._base_kmeans_kernel_funcs import make_pairwise_ops_base_kernel_funcs
@@ -12,11 +12,18 @@ from ._base_kmeans_kernel_funcs import make_pairwise_ops_base_kernel_funcs
 # inline commenting of the kernel.
 
 
-@lru_cache
+@kernel_cache
 def make_compute_euclidean_distances_fixed_window_kernel(
-    n_samples, n_features, n_clusters, sub_group_size, work_group_size, dtype, device
+    n_features, n_clusters, sub_group_size, work_group_size, dtype, device
 ):
 
+    """Returns a function that computes the euclidean distances between samples and
+    centroids.
+
+    The number of samples is not a parameter of the factory: the returned function
+    accepts inputs with any number of samples, and the underlying kernel is compiled
+    only once for a given set of parameters.
+    """
     window_n_centroids = sub_group_size
 
     input_work_group_size = work_group_size
@@ -40,7 +47,6 @@ def make_compute_euclidean_distances_fixed_window_kernel(
         load_window_of_centroids_and_features,
         accumulate_sq_distances,
     ) = make_pairwise_ops_base_kernel_funcs(
-        n_samples,
         n_features,
         n_clusters,
         centroids_window_height,
@@ -68,6 +74,7 @@ def make_compute_euclidean_distances_fixed_window_kernel(
         euclidean_distances_t,    # OUT            (n_clusters, n_samples)
     ):
         # fmt: on
+        n_samples = X_t.shape[one_idx]
 
         centroids_window = dpex.local.array(shape=centroids_window_shape, dtype=dtype)
 
@@ -120,6 +127,7 @@ def make_compute_euclidean_distances_fixed_window_kernel(
 
             _save_distance(
                 sample_idx,
+                n_samples,
                 first_centroid_idx,
                 sq_distances,
                 # OUT
@@ -135,6 +143,7 @@ def make_compute_euclidean_distances_fixed_window_kernel(
     # fmt: off
     def _save_distance(
         sample_idx,                 # PARAM
+        n_samples,                  # PARAM
         first_centroid_idx,         # PARAM
         sq_distances,               # IN
         euclidean_distances_t       # OUT
@@ -151,11 +160,18 @@ def make_compute_euclidean_distances_fixed_window_kernel(
                     math.sqrt(sq_distances[i])
                 )
 
-    n_windows_for_sample = math.ceil(n_samples / window_n_centroids)
+    def compute_euclidean_distances(X_t, current_centroids_t, euclidean_distances_t):
+        n_samples = X_t.shape[1]
+        n_windows_for_sample = math.ceil(n_samples / window_n_centroids)
 
-    global_size = (
-        window_n_centroids,
-        math.ceil(n_windows_for_sample / centroids_window_height)
-        * centroids_window_height,
-    )
-    return compute_distances[global_size, work_group_shape]
+        global_size = (
+            window_n_centroids,
+            math.ceil(n_windows_for_sample / centroids_window_height)
+            * centroids_window_height,
+        )
+
+        compute_distances[global_size, work_group_shape](
+            X_t, current_centroids_t, euclidean_distances_t
+        )
+
+    return compute_euclidean_distances
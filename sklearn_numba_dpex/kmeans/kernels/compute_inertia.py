@@ -1,14 +1,20 @@
 import math
-from functools import lru_cache
 
 import numba_dpex as dpex
 import numpy as np
 
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
 
-@lru_cache
-def make_compute_inertia_kernel(n_samples, n_features, work_group_size, dtype):
+
+@kernel_cache
+def make_compute_inertia_kernel(n_features, work_group_size, dtype):
+    """Returns a function that computes the weighted inertia of each sample.
+
+    The returned function accepts inputs with any number of samples.
+    """
 
     zero_idx = np.int64(0)
+    one_idx = np.int64(1)
     zero_init = dtype(0.0)
 
     @dpex.kernel
@@ -21,7 +27,7 @@ def make_compute_inertia_kernel(n_samples, n_features, work_group_size, dtype):
         per_sample_inertia,           # OUT            (n_samples,)
     ):
         # fmt: on
-
+        n_samples = X_t.shape[one_idx]
         sample_idx = dpex.get_global_id(zero_idx)
 
         if sample_idx >= n_samples:
@@ -38,5 +44,13 @@ def make_compute_inertia_kernel(n_samples, n_features, work_group_size, dtype):
 
         per_sample_inertia[sample_idx] = inertia * sample_weight[sample_idx]
 
-    global_size = (math.ceil(n_samples / work_group_size)) * (work_group_size)
-    return compute_inertia[global_size, work_group_size]
+    def _compute_inertia(
+        X_t, sample_weight, centroids_t, assignments_idx, per_sample_inertia
+    ):
+        n_samples = X_t.shape[1]
+        global_size = (math.ceil(n_samples / work_group_size)) * (work_group_size)
+        compute_inertia[global_size, work_group_size](
+            X_t, sample_weight, centroids_t, assignments_idx, per_sample_inertia
+        )
+
+    return _compute_inertia
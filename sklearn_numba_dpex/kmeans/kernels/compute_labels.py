@@ -1,9 +1,9 @@
 import math
-from functools import lru_cache
 
 import numba_dpex as dpex
 import numpy as np
 
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
 from sklearn_numba_dpex.common._utils import _check_max_work_group_size
 
 from ._base_kmeans_kernel_funcs import (
@@ -15,10 +15,17 @@ from ._base_kmeans_kernel_funcs import (
 # inline commenting of the kernel.
 
 
-@lru_cache
+@kernel_cache
 def make_label_assignment_fixed_window_kernel(
-    n_samples, n_features, n_clusters, sub_group_size, work_group_size, dtype, device
+    n_features, n_clusters, sub_group_size, work_group_size, dtype, device
 ):
+
+    """Returns a function that assigns each sample to the closest centroid.
+
+    The number of samples is not a parameter of the factory: the returned function
+    accepts inputs with any number of samples, and the underlying kernel is compiled
+    only once for a given set of parameters.
+    """
     window_n_centroids = sub_group_size
 
     dtype_itemsize = np.dtype(dtype).itemsize
@@ -47,7 +54,6 @@ def make_label_assignment_fixed_window_kernel(
         accumulate_dot_products,
         initialize_window_half_l2_norm,
     ) = make_pairwise_ops_base_kernel_funcs(
-        n_samples,
         n_features,
         n_clusters,
         centroids_window_height,
@@ -81,6 +87,7 @@ def make_label_assignment_fixed_window_kernel(
         assignments_idx,          # OUT            (n_samples,)
     ):
         # fmt: on
+        n_samples = X_t.shape[one_idx]
         local_row_idx = dpex.get_local_id(one_idx)
         local_col_idx = dpex.get_local_id(zero_idx)
         sample_idx = (
@@ -174,12 +181,120 @@ def make_label_assignment_fixed_window_kernel(
             array[index] = value
         return condition
 
-    n_windows_for_sample = math.ceil(n_samples / window_n_centroids)
+    def label_assignment(X_t, centroids_t, centroids_half_l2_norm, assignments_idx):
+        n_samples = X_t.shape[1]
+        n_windows_for_sample = math.ceil(n_samples / window_n_centroids)
 
-    global_size = (
-        window_n_centroids,
-        math.ceil(n_windows_for_sample / centroids_window_height)
-        * centroids_window_height,
-    )
+        global_size = (
+            window_n_centroids,
+            math.ceil(n_windows_for_sample / centroids_window_height)
+            * centroids_window_height,
+        )
+
+        assignment[global_size, work_group_shape](
+            X_t, centroids_t, centroids_half_l2_norm, assignments_idx
+        )
+
+    return label_assignment
+
+
+@kernel_cache
+def make_labels_inertia_from_distances_kernel(n_clusters, work_group_size, dtype):
+    """Returns a function that assigns each sample to the closest centroid and
+    computes its weighted inertia, given the euclidean distances of the samples to
+    the centroids.
+
+    The returned function accepts inputs with any number of samples.
+    """
+    zero_idx = np.int64(0)
+    one_idx = np.int64(1)
+
+    @dpex.kernel
+    # fmt: off
+    def labels_inertia_from_distances(
+        euclidean_distances_t,        # IN READ-ONLY   (n_clusters, n_samples)
+        sample_weight,                # IN READ-ONLY   (n_samples,)
+        assignments_idx,              # OUT            (n_samples,)
+        per_sample_inertia,           # OUT            (n_samples,)
+    ):
+        # fmt: on
+        n_samples = euclidean_distances_t.shape[one_idx]
+        sample_idx = dpex.get_global_id(zero_idx)
+
+        if sample_idx >= n_samples:
+            return
+
+        min_idx = zero_idx
+        min_distance = euclidean_distances_t[zero_idx, sample_idx]
+
+        for centroid_idx in range(one_idx, n_clusters):
+            distance = euclidean_distances_t[centroid_idx, sample_idx]
+            if distance < min_distance:
+                min_distance = distance
+                min_idx = centroid_idx
+
+        assignments_idx[sample_idx] = min_idx
+        per_sample_inertia[sample_idx] = (
+            min_distance * min_distance * sample_weight[sample_idx]
+        )
+
+    def _labels_inertia_from_distances(
+        euclidean_distances_t, sample_weight, assignments_idx, per_sample_inertia
+    ):
+        n_samples = euclidean_distances_t.shape[1]
+        global_size = (math.ceil(n_samples / work_group_size)) * (work_group_size)
+        labels_inertia_from_distances[global_size, work_group_size](
+            euclidean_distances_t,
+            sample_weight,
+            assignments_idx,
+            per_sample_inertia,
+        )
+
+    return _labels_inertia_from_distances
+
+
+@kernel_cache
+def make_gather_nearest_centroids_kernel(n_nearest, work_group_size, dtype):
+    """Returns a function that gathers the euclidean distances of each sample to its
+    `n_nearest` closest centroids, given the indices of the closest centroids (e.g.
+    computed with `topk_idx`), so that only those distances are copied to the host.
+
+    The returned function accepts inputs with any number of samples.
+    """
+    zero_idx = np.int64(0)
+    one_idx = np.int64(1)
+    n_nearest = np.int64(n_nearest)
+
+    @dpex.kernel
+    # fmt: off
+    def gather_nearest_centroids(
+        euclidean_distances_t,        # IN READ-ONLY   (n_clusters, n_samples)
+        nearest_idx,                  # IN READ-ONLY   (n_samples, n_nearest)
+        nearest_distances,            # OUT            (n_samples, n_nearest)
+    ):
+        # fmt: on
+        n_samples = euclidean_distances_t.shape[one_idx]
+        item_idx = dpex.get_global_id(zero_idx)
+        sample_idx = item_idx // n_nearest
+        if sample_idx >= n_samples:
+            return
+
+        nearest_col_idx = item_idx % n_nearest
+        nearest_distances[sample_idx, nearest_col_idx] = euclidean_distances_t[
+            nearest_idx[sample_idx, nearest_col_idx], sample_idx
+        ]
+
+    def _gather_nearest_centroids(
+        euclidean_distances_t, nearest_idx, nearest_distances
+    ):
+        n_samples = euclidean_distances_t.shape[1]
+        global_size = (
+            math.ceil(n_samples * n_nearest / work_group_size) * work_group_size
+        )
+        gather_nearest_centroids[global_size, work_group_size](
+            euclidean_distances_t,
+            nearest_idx,
+            nearest_distances,
+        )
 
-    return assignment[global_size, work_group_shape]
+    return _gather_nearest_centroids
@@ -0,0 +1,569 @@
+import math
+
+import dpctl.tensor as dpt
+import numba_dpex as dpex
+import numpy as np
+
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
+
+# Kernels for data in the Compressed Sparse Row (CSR) format, given as the three
+# arrays `X_data`, `X_indices` and `X_indptr` such as defined in `scipy.sparse`, where
+# the row `i` is the sample `i`.
+#
+# The kernels use one work item per sample, that iterates only over the non-zero
+# values of the sample. Because the non-zero values are not at the same positions
+# from one sample to another, the cooperative loading of windows of centroids in
+# shared memory that is used in the dense kernels does not apply. Instead, the
+# centroids are read from global memory with the C-contiguous layout
+# (n_features, n_clusters), such that each non-zero value of the sample reads a
+# contiguous window of `window_n_centroids` centroids values.
+#
+# The distances are computed using the precomputed squared norms of the samples,
+# with the formula |x-c|^2 = |x|^2 - 2<x.c> + |c|^2, where the dot product only
+# requires the non-zero values of x.
+
+zero_idx = np.int64(0)
+one_idx = np.int64(1)
+
+
+def _make_accumulate_dot_products_kernel_func(n_centroids, window_n_centroids, dtype):
+    zero = dtype(0.0)
+
+    @dpex.func
+    # fmt: off
+    def accumulate_dot_products(
+        sample_idx,             # PARAM
+        first_centroid_idx,     # PARAM
+        X_data,                 # IN      (nnz,)
+        X_indices,              # IN      (nnz,)
+        X_indptr,               # IN      (n_samples + 1,)
+        centroids_t,            # IN      (n_features, n_centroids)
+        dot_products,           # OUT     (window_n_centroids,)
+    ):
+        # fmt: on
+        for window_idx in range(window_n_centroids):
+            dot_products[window_idx] = zero
+
+        for nnz_idx in range(X_indptr[sample_idx], X_indptr[sample_idx + one_idx]):
+            feature_idx = X_indices[nnz_idx]
+            X_value = X_data[nnz_idx]
+            for window_idx in range(window_n_centroids):
+                centroid_idx = first_centroid_idx + window_idx
+                if centroid_idx < n_centroids:
+                    dot_products[window_idx] += (
+                        X_value * centroids_t[feature_idx, centroid_idx]
+                    )
+
+    return accumulate_dot_products
+
+
+def _make_closest_centroid_kernel_func(n_clusters, window_n_centroids, dtype):
+    n_windows_for_centroids = math.ceil(n_clusters / window_n_centroids)
+    inf = dtype(math.inf)
+
+    accumulate_dot_products = _make_accumulate_dot_products_kernel_func(
+        n_clusters, window_n_centroids, dtype
+    )
+
+    @dpex.func
+    # fmt: off
+    def closest_centroid(
+        sample_idx,                 # PARAM
+        X_data,                     # IN      (nnz,)
+        X_indices,                  # IN      (nnz,)
+        X_indptr,                   # IN      (n_samples + 1,)
+        centroids_t,                # IN      (n_features, n_clusters)
+        centroids_half_l2_norm,     # IN      (n_clusters,)
+        dot_products,               # BUFFER  (window_n_centroids,)
+    ):
+        # fmt: on
+        # NB: see `lloyd_single_step.py` for the definition of the pseudo inertia.
+        min_idx = zero_idx
+        min_sample_pseudo_inertia = inf
+
+        first_centroid_idx = zero_idx
+        for _ in range(n_windows_for_centroids):
+            accumulate_dot_products(
+                sample_idx,
+                first_centroid_idx,
+                X_data,
+                X_indices,
+                X_indptr,
+                centroids_t,
+                dot_products,
+            )
+            for window_idx in range(window_n_centroids):
+                centroid_idx = first_centroid_idx + window_idx
+                if centroid_idx < n_clusters:
+                    sample_pseudo_inertia = (
+                        centroids_half_l2_norm[centroid_idx] - dot_products[window_idx]
+                    )
+                    if sample_pseudo_inertia < min_sample_pseudo_inertia:
+                        min_sample_pseudo_inertia = sample_pseudo_inertia
+                        min_idx = centroid_idx
+
+            first_centroid_idx += window_n_centroids
+
+        return min_idx, min_sample_pseudo_inertia
+
+    return closest_centroid
+
+
+@kernel_cache
+def make_lloyd_single_step_csr_kernel(
+    n_samples,
+    n_clusters,
+    n_centroids_private_copies,
+    sub_group_size,
+    work_group_size,
+    dtype,
+):
+    """One full iteration of Lloyd's k-means on CSR data.
+
+    The centroid updates are privatized like in
+    `make_lloyd_single_step_fixed_window_kernel`, but the number of private copies is
+    given by the caller, since for sparse data the size of the centroids can be much
+    larger than the size of the data.
+    """
+    window_n_centroids = sub_group_size
+    global_size = math.ceil(n_samples / work_group_size) * work_group_size
+    zero_as_uint32 = np.uint32(0)
+
+    closest_centroid = _make_closest_centroid_kernel_func(
+        n_clusters, window_n_centroids, dtype
+    )
+
+    @dpex.kernel
+    # fmt: off
+    def lloyd_single_step_csr(
+        X_data,                            # IN READ-ONLY   (nnz,)
+        X_indices,                         # IN READ-ONLY   (nnz,)
+        X_indptr,                          # IN READ-ONLY   (n_samples + 1,)
+        sample_weight,                     # IN READ-ONLY   (n_samples,)
+        current_centroids_t,               # IN             (n_features, n_clusters)
+        centroids_half_l2_norm,            # IN             (n_clusters,)
+        previous_assignments_idx,          # IN             (n_samples,)
+        assignments_idx,                   # OUT            (n_samples,)
+        strict_convergence_status,         # OUT            (1,)
+        new_centroids_t_private_copies,    # OUT            (n_private_copies, n_features, n_clusters)  # noqa
+        cluster_sizes_private_copies,      # OUT            (n_private_copies, n_clusters)  # noqa
+    ):
+        # fmt: on
+        sample_idx = dpex.get_global_id(zero_idx)
+
+        if sample_idx >= n_samples:
+            return
+
+        dot_products = dpex.private.array(shape=window_n_centroids, dtype=dtype)
+
+        min_idx, _ = closest_centroid(
+            sample_idx,
+            X_data,
+            X_indices,
+            X_indptr,
+            current_centroids_t,
+            centroids_half_l2_norm,
+            dot_products,
+        )
+
+        assignments_idx[sample_idx] = min_idx
+
+        if strict_convergence_status[zero_idx] != zero_as_uint32:
+            if previous_assignments_idx[sample_idx] != min_idx:
+                strict_convergence_status[zero_idx] = zero_as_uint32
+
+        privatization_idx = (sample_idx // sub_group_size) % n_centroids_private_copies
+        weight = sample_weight[sample_idx]
+
+        dpex.atomic.add(
+            cluster_sizes_private_copies,
+            (privatization_idx, min_idx),
+            weight,
+        )
+
+        # Only the non-zero values contribute to the update of the centroid.
+        for nnz_idx in range(X_indptr[sample_idx], X_indptr[sample_idx + one_idx]):
+            dpex.atomic.add(
+                new_centroids_t_private_copies,
+                (privatization_idx, X_indices[nnz_idx], min_idx),
+                X_data[nnz_idx] * weight,
+            )
+
+    return lloyd_single_step_csr[global_size, work_group_size]
+
+
+@kernel_cache
+def make_label_assignment_csr_kernel(
+    n_clusters, sub_group_size, work_group_size, dtype
+):
+    """Returns a function that assigns each sample of CSR data to its closest
+    centroid.
+
+    The returned function accepts inputs with any number of samples.
+    """
+    window_n_centroids = sub_group_size
+
+    closest_centroid = _make_closest_centroid_kernel_func(
+        n_clusters, window_n_centroids, dtype
+    )
+
+    @dpex.kernel
+    # fmt: off
+    def label_assignment_csr(
+        X_data,                     # IN READ-ONLY   (nnz,)
+        X_indices,                  # IN READ-ONLY   (nnz,)
+        X_indptr,                   # IN READ-ONLY   (n_samples + 1,)
+        centroids_t,                # IN             (n_features, n_clusters)
+        centroids_half_l2_norm,     # IN             (n_clusters,)
+        assignments_idx,            # OUT            (n_samples,)
+    ):
+        # fmt: on
+        n_samples = assignments_idx.shape[zero_idx]
+        sample_idx = dpex.get_global_id(zero_idx)
+
+        if sample_idx >= n_samples:
+            return
+
+        dot_products = dpex.private.array(shape=window_n_centroids, dtype=dtype)
+
+        min_idx, _ = closest_centroid(
+            sample_idx,
+            X_data,
+            X_indices,
+            X_indptr,
+            centroids_t,
+            centroids_half_l2_norm,
+            dot_products,
+        )
+
+        assignments_idx[sample_idx] = min_idx
+
+    def _label_assignment_csr(
+        X_data,
+        X_indices,
+        X_indptr,
+        centroids_t,
+        centroids_half_l2_norm,
+        assignments_idx,
+    ):
+        n_samples = assignments_idx.shape[0]
+        global_size = math.ceil(n_samples / work_group_size) * work_group_size
+        label_assignment_csr[global_size, work_group_size](
+            X_data,
+            X_indices,
+            X_indptr,
+            centroids_t,
+            centroids_half_l2_norm,
+            assignments_idx,
+        )
+
+    return _label_assignment_csr
+
+
+@kernel_cache
+def make_compute_inertia_csr_kernel(work_group_size, dtype):
+    """Returns a function that computes the weighted inertia of each sample of CSR
+    data.
+
+    The returned function accepts inputs with any number of samples.
+    """
+    zero = dtype(0.0)
+    two = dtype(2.0)
+
+    @dpex.kernel
+    # fmt: off
+    def compute_inertia_csr(
+        X_data,                     # IN READ-ONLY   (nnz,)
+        X_indices,                  # IN READ-ONLY   (nnz,)
+        X_indptr,                   # IN READ-ONLY   (n_samples + 1,)
+        X_sq_norms,                 # IN READ-ONLY   (n_samples,)
+        sample_weight,              # IN READ-ONLY   (n_samples,)
+        centroids_t,                # IN READ-ONLY   (n_features, n_clusters)
+        centroids_half_l2_norm,     # IN READ-ONLY   (n_clusters,)
+        assignments_idx,            # IN READ-ONLY   (n_samples,)
+        per_sample_inertia,         # OUT            (n_samples,)
+    ):
+        # fmt: on
+        n_samples = X_sq_norms.shape[zero_idx]
+        sample_idx = dpex.get_global_id(zero_idx)
+
+        if sample_idx >= n_samples:
+            return
+
+        centroid_idx = assignments_idx[sample_idx]
+
+        dot_product = zero
+        for nnz_idx in range(X_indptr[sample_idx], X_indptr[sample_idx + one_idx]):
+            dot_product += (
+                X_data[nnz_idx] * centroids_t[X_indices[nnz_idx], centroid_idx]
+            )
+
+        # NB: the expanded formula can be slightly negative because of rounding
+        # errors.
+        inertia = max(
+            X_sq_norms[sample_idx]
+            + two * (centroids_half_l2_norm[centroid_idx] - dot_product),
+            zero,
+        )
+
+        per_sample_inertia[sample_idx] = inertia * sample_weight[sample_idx]
+
+    def _compute_inertia_csr(
+        X_data,
+        X_indices,
+        X_indptr,
+        X_sq_norms,
+        sample_weight,
+        centroids_t,
+        centroids_half_l2_norm,
+        assignments_idx,
+        per_sample_inertia,
+    ):
+        n_samples = X_sq_norms.shape[0]
+        global_size = math.ceil(n_samples / work_group_size) * work_group_size
+        compute_inertia_csr[global_size, work_group_size](
+            X_data,
+            X_indices,
+            X_indptr,
+            X_sq_norms,
+            sample_weight,
+            centroids_t,
+            centroids_half_l2_norm,
+            assignments_idx,
+            per_sample_inertia,
+        )
+
+    return _compute_inertia_csr
+
+
+@kernel_cache
+def make_compute_euclidean_distances_csr_kernel(
+    n_clusters, sub_group_size, work_group_size, dtype
+):
+    """Returns a function that computes the euclidean distances between each sample
+    of CSR data and each centroid.
+
+    The returned function accepts inputs with any number of samples.
+    """
+    window_n_centroids = sub_group_size
+    n_windows_for_centroids = math.ceil(n_clusters / window_n_centroids)
+
+    zero = dtype(0.0)
+    two = dtype(2.0)
+
+    accumulate_dot_products = _make_accumulate_dot_products_kernel_func(
+        n_clusters, window_n_centroids, dtype
+    )
+
+    @dpex.kernel
+    # fmt: off
+    def compute_euclidean_distances_csr(
+        X_data,                     # IN READ-ONLY   (nnz,)
+        X_indices,                  # IN READ-ONLY   (nnz,)
+        X_indptr,                   # IN READ-ONLY   (n_samples + 1,)
+        X_sq_norms,                 # IN READ-ONLY   (n_samples,)
+        centroids_t,                # IN READ-ONLY   (n_features, n_clusters)
+        centroids_half_l2_norm,     # IN READ-ONLY   (n_clusters,)
+        euclidean_distances_t,      # OUT            (n_clusters, n_samples)
+    ):
+        # fmt: on
+        n_samples = X_sq_norms.shape[zero_idx]
+        sample_idx = dpex.get_global_id(zero_idx)
+
+        if sample_idx >= n_samples:
+            return
+
+        dot_products = dpex.private.array(shape=window_n_centroids, dtype=dtype)
+        X_sq_norm = X_sq_norms[sample_idx]
+
+        first_centroid_idx = zero_idx
+        for _ in range(n_windows_for_centroids):
+            accumulate_dot_products(
+                sample_idx,
+                first_centroid_idx,
+                X_data,
+                X_indices,
+                X_indptr,
+                centroids_t,
+                dot_products,
+            )
+            for window_idx in range(window_n_centroids):
+                centroid_idx = first_centroid_idx + window_idx
+                if centroid_idx < n_clusters:
+                    sq_distance = max(
+                        X_sq_norm
+                        + two
+                        * (
+                            centroids_half_l2_norm[centroid_idx]
+                            - dot_products[window_idx]
+                        ),
+                        zero,
+                    )
+                    euclidean_distances_t[centroid_idx, sample_idx] = math.sqrt(
+                        sq_distance
+                    )
+
+            first_centroid_idx += window_n_centroids
+
+    def _compute_euclidean_distances_csr(
+        X_data,
+        X_indices,
+        X_indptr,
+        X_sq_norms,
+        centroids_t,
+        centroids_half_l2_norm,
+        euclidean_distances_t,
+    ):
+        n_samples = X_sq_norms.shape[0]
+        global_size = math.ceil(n_samples / work_group_size) * work_group_size
+        compute_euclidean_distances_csr[global_size, work_group_size](
+            X_data,
+            X_indices,
+            X_indptr,
+            X_sq_norms,
+            centroids_t,
+            centroids_half_l2_norm,
+            euclidean_distances_t,
+        )
+
+    return _compute_euclidean_distances_csr
+
+
+@kernel_cache
+def make_kmeansplusplus_single_step_csr_kernel(
+    n_samples, n_candidates, sub_group_size, work_group_size, dtype
+):
+    """Same as `make_kmeansplusplus_single_step_fixed_window_kernel` for CSR data.
+
+    The candidates are given as a dense array, see `make_csr_rows_to_dense_t_kernel`.
+    """
+    window_n_candidates = sub_group_size
+    n_windows_for_candidates = math.ceil(n_candidates / window_n_candidates)
+    global_size = math.ceil(n_samples / work_group_size) * work_group_size
+
+    zero = dtype(0.0)
+    two = dtype(2.0)
+
+    accumulate_dot_products = _make_accumulate_dot_products_kernel_func(
+        n_candidates, window_n_candidates, dtype
+    )
+
+    @dpex.kernel
+    # fmt: off
+    def kmeansplusplus_single_step_csr(
+        X_data,                     # IN READ-ONLY   (nnz,)
+        X_indices,                  # IN READ-ONLY   (nnz,)
+        X_indptr,                   # IN READ-ONLY   (n_samples + 1,)
+        X_sq_norms,                 # IN READ-ONLY   (n_samples,)
+        sample_weight,              # IN READ-ONLY   (n_samples,)
+        candidates_ids,             # IN             (n_candidates,)
+        candidates_t,               # IN             (n_features, n_candidates)
+        closest_dist_sq,            # IN             (n_samples,)
+        sq_distances_t,             # OUT            (n_candidates, n_samples)
+    ):
+        # fmt: on
+        sample_idx = dpex.get_global_id(zero_idx)
+
+        if sample_idx >= n_samples:
+            return
+
+        dot_products = dpex.private.array(shape=window_n_candidates, dtype=dtype)
+        X_sq_norm = X_sq_norms[sample_idx]
+        sample_weight_ = sample_weight[sample_idx]
+        closest_dist_sq_ = closest_dist_sq[sample_idx]
+
+        first_candidate_idx = zero_idx
+        for _ in range(n_windows_for_candidates):
+            accumulate_dot_products(
+                sample_idx,
+                first_candidate_idx,
+                X_data,
+                X_indices,
+                X_indptr,
+                candidates_t,
+                dot_products,
+            )
+            for window_idx in range(window_n_candidates):
+                candidate_idx = first_candidate_idx + window_idx
+                if candidate_idx < n_candidates:
+                    sq_distance = max(
+                        X_sq_norm
+                        + X_sq_norms[candidates_ids[candidate_idx]]
+                        - two * dot_products[window_idx],
+                        zero,
+                    )
+                    sq_distances_t[candidate_idx, sample_idx] = min(
+                        sq_distance * sample_weight_, closest_dist_sq_
+                    )
+
+            first_candidate_idx += window_n_candidates
+
+    return kmeansplusplus_single_step_csr[global_size, work_group_size]
+
+
+@kernel_cache
+def make_csr_rows_to_dense_t_kernel(n_features, work_group_size, dtype):
+    """Returns a function that gathers some rows of CSR data into a dense array, with
+    the transposed layout (n_features, n_rows).
+
+    The returned function accepts any number of rows.
+    """
+
+    @dpex.kernel
+    # fmt: off
+    def csr_rows_to_dense_t(
+        X_data,             # IN READ-ONLY   (nnz,)
+        X_indices,          # IN READ-ONLY   (nnz,)
+        X_indptr,           # IN READ-ONLY   (n_samples + 1,)
+        row_ids,            # IN             (n_rows,)
+        rows_t,             # OUT            (n_features, n_rows)
+    ):
+        # fmt: on
+        n_rows = row_ids.shape[zero_idx]
+        row_idx = dpex.get_global_id(zero_idx)
+
+        if row_idx >= n_rows:
+            return
+
+        sample_idx = row_ids[row_idx]
+        for nnz_idx in range(X_indptr[sample_idx], X_indptr[sample_idx + one_idx]):
+            rows_t[X_indices[nnz_idx], row_idx] = X_data[nnz_idx]
+
+    def _csr_rows_to_dense_t(X_data, X_indices, X_indptr, row_ids):
+        n_rows = row_ids.shape[0]
+        rows_t = dpt.zeros(
+            (n_features, n_rows), dtype=dtype, device=X_data.device.sycl_device
+        )
+        global_size = math.ceil(n_rows / work_group_size) * work_group_size
+        csr_rows_to_dense_t[global_size, work_group_size](
+            X_data, X_indices, X_indptr, row_ids, rows_t
+        )
+        return rows_t
+
+    return _csr_rows_to_dense_t
+
+
+@kernel_cache
+def make_csr_column_sums_kernel(n_samples, work_group_size, dtype):
+    """Sum the values of CSR data over the samples, into an array of shape
+    (n_features,) that is expected to be initialized to zero."""
+    global_size = math.ceil(n_samples / work_group_size) * work_group_size
+
+    @dpex.kernel
+    # fmt: off
+    def csr_column_sums(
+        X_data,             # IN READ-ONLY   (nnz,)
+        X_indices,          # IN READ-ONLY   (nnz,)
+        X_indptr,           # IN READ-ONLY   (n_samples + 1,)
+        column_sums,        # INOUT          (n_features,)
+    ):
+        # fmt: on
+        sample_idx = dpex.get_global_id(zero_idx)
+
+        if sample_idx >= n_samples:
+            return
+
+        for nnz_idx in range(X_indptr[sample_idx], X_indptr[sample_idx + one_idx]):
+            dpex.atomic.add(column_sums, X_indices[nnz_idx], X_data[nnz_idx])
+
+    return csr_column_sums[global_size, work_group_size]
@@ -0,0 +1,359 @@
+import math
+
+import numba_dpex as dpex
+import numpy as np
+
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
+
+# Kernels for a variant of Lloyd's k-means that uses the triangle inequality to skip
+# the computation of the distances between a sample and all the centroids when it can
+# be proven that the closest centroid has not changed, following [1]_.
+#
+# For each sample, an upper bound of the distance to the closest centroid and a lower
+# bound of the distance to the second closest centroid are maintained accross
+# iterations. After each update of the centroids, the bounds are loosened by the
+# distance each centroid has moved. If the upper bound is lower than the lower bound,
+# or than half the distance between the closest centroid and its own closest centroid,
+# the assignment can't change and the distances are not computed.
+#
+# Unlike the kernels in `lloyd_single_step.py`, the kernels use one work item per
+# sample without a cooperative sliding window over the centroids, because the work
+# items of a same work group are expected to diverge depending on whether the bounds
+# allow skipping the computation or not.
+#
+# .. [1] Hamerly, G. (2010). Making k-means even faster. In Proceedings of the 2010
+#    SIAM international conference on data mining (pp. 130-140).
+
+zero_idx = np.int64(0)
+
+
+@kernel_cache
+def make_half_min_centroid_distances_kernel(n_clusters, work_group_size, dtype):
+    global_size = math.ceil(n_clusters / work_group_size) * work_group_size
+
+    half = dtype(0.5)
+    inf = dtype(math.inf)
+
+    @dpex.kernel
+    # fmt: off
+    def half_min_centroid_distances(
+        centroid_sq_distances,         # IN READ-ONLY   (n_clusters, n_clusters)
+        half_min_centroid_distances,   # OUT            (n_clusters,)
+    ):
+        # fmt: on
+        """For each centroid, compute half the distance to the closest other
+        centroid, given the matrix of the squared distances between the centroids
+        (e.g. computed with the matmul kernel).
+
+        Since the matrix is symmetric, each work item reads a column rather than a
+        row, so that consecutive work items read contiguous values.
+        """
+        centroid_idx = dpex.get_global_id(zero_idx)
+
+        if centroid_idx >= n_clusters:
+            return
+
+        min_sq_distance = inf
+
+        for other_centroid_idx in range(n_clusters):
+            if other_centroid_idx == centroid_idx:
+                continue
+
+            min_sq_distance = min(
+                min_sq_distance, centroid_sq_distances[other_centroid_idx, centroid_idx]
+            )
+
+        half_min_centroid_distances[centroid_idx] = half * math.sqrt(min_sq_distance)
+
+    return half_min_centroid_distances[global_size, work_group_size]
+
+
+@kernel_cache
+def make_max_centroid_shifts_kernel(n_clusters, work_group_size, dtype):
+    """Returns a kernel that computes the two largest (non-squared) shifts of the
+    centroids on device, with a single work group, so that they don't need to be
+    copied to the host to update the bounds.
+
+    `work_group_size` is expected to be a power of two."""
+    n_local_iterations = np.int64(math.log2(work_group_size))
+    two_as_a_long = np.int64(2)
+    one_idx = np.int64(1)
+    zero = dtype(0.0)
+
+    @dpex.kernel
+    # fmt: off
+    def max_centroid_shifts(
+        centroid_sq_shifts,     # IN    (n_clusters,)
+        max_centroid_shifts,    # OUT   (2,)
+    ):
+        # fmt: on
+        local_work_id = dpex.get_local_id(zero_idx)
+
+        local_max = dpex.local.array(work_group_size, dtype=dtype)
+        local_second_max = dpex.local.array(work_group_size, dtype=dtype)
+
+        _prepare_local_memory(
+            local_work_id,
+            centroid_sq_shifts,
+            # OUT
+            local_max,
+            local_second_max,
+        )
+
+        dpex.barrier(dpex.LOCAL_MEM_FENCE)
+        n_active_work_items = work_group_size
+        for i in range(n_local_iterations):
+            n_active_work_items = n_active_work_items // two_as_a_long
+            _local_iteration(
+                local_work_id,
+                n_active_work_items,
+                # INOUT
+                local_max,
+                local_second_max,
+            )
+            dpex.barrier(dpex.LOCAL_MEM_FENCE)
+
+        _register_result(
+            local_work_id,
+            local_max,
+            local_second_max,
+            # OUT
+            max_centroid_shifts,
+        )
+
+    # HACK 906: see sklearn_numba_dpex.patches.tests.test_patches.test_need_to_workaround_numba_dpex_906  # noqa
+    @dpex.func
+    # fmt: off
+    def _prepare_local_memory(
+        local_work_id,          # PARAM
+        centroid_sq_shifts,     # IN
+        local_max,              # OUT
+        local_second_max,       # OUT
+    ):
+        # fmt: on
+        # Each work item computes the two largest values of a strided subset of the
+        # shifts.
+        max_sq_shift = zero
+        second_max_sq_shift = zero
+        cluster_idx = local_work_id
+        while cluster_idx < n_clusters:
+            sq_shift = centroid_sq_shifts[cluster_idx]
+            if sq_shift > max_sq_shift:
+                second_max_sq_shift = max_sq_shift
+                max_sq_shift = sq_shift
+            elif sq_shift > second_max_sq_shift:
+                second_max_sq_shift = sq_shift
+            cluster_idx += work_group_size
+
+        local_max[local_work_id] = max_sq_shift
+        local_second_max[local_work_id] = second_max_sq_shift
+
+    @dpex.func
+    # fmt: off
+    def _local_iteration(
+        local_work_id,          # PARAM
+        n_active_work_items,    # PARAM
+        local_max,              # INOUT
+        local_second_max,       # INOUT
+    ):
+        # fmt: on
+        if local_work_id >= n_active_work_items:
+            return
+
+        other_work_id = local_work_id + n_active_work_items
+        max_sq_shift = local_max[local_work_id]
+        other_max_sq_shift = local_max[other_work_id]
+        local_max[local_work_id] = max(max_sq_shift, other_max_sq_shift)
+        local_second_max[local_work_id] = max(
+            min(max_sq_shift, other_max_sq_shift),
+            max(local_second_max[local_work_id], local_second_max[other_work_id]),
+        )
+
+    @dpex.func
+    # fmt: off
+    def _register_result(
+        local_work_id,          # PARAM
+        local_max,              # IN
+        local_second_max,       # IN
+        max_centroid_shifts,    # OUT
+    ):
+        # fmt: on
+        if local_work_id == zero_idx:
+            max_centroid_shifts[zero_idx] = math.sqrt(local_max[zero_idx])
+            max_centroid_shifts[one_idx] = math.sqrt(local_second_max[zero_idx])
+
+    return max_centroid_shifts[work_group_size, work_group_size]
+
+
+@kernel_cache
+def make_hamerly_single_step_kernel(
+    n_samples,
+    n_features,
+    n_clusters,
+    check_strict_convergence,
+    sub_group_size,
+    work_group_size,
+    dtype,
+    device,
+    n_centroids_private_copies="auto",
+):
+    # NB: see `make_lloyd_single_step_fixed_window_kernel` for the privatization
+    # strategy.
+    if n_centroids_private_copies == "auto":
+        n_subgroups = math.ceil(n_samples / sub_group_size)
+        n_centroids_private_copies = int(min(n_subgroups, device.max_compute_units))
+    n_centroids_private_copies = max(int(n_centroids_private_copies), 1)
+
+    if work_group_size == "max":
+        work_group_size = device.max_work_group_size
+
+    global_size = math.ceil(n_samples / work_group_size) * work_group_size
+
+    zero = dtype(0.0)
+    inf = dtype(math.inf)
+    zero_as_uint32 = np.uint32(0)
+
+    @dpex.kernel
+    # fmt: off
+    def hamerly_single_step(
+        X_t,                               # IN READ-ONLY   (n_features, n_samples)
+        sample_weight,                     # IN READ-ONLY   (n_samples,)
+        current_centroids_t,               # IN             (n_features, n_clusters)
+        half_min_centroid_distances,       # IN             (n_clusters,)
+        assignments_idx,                   # INOUT          (n_samples,)
+        upper_bounds,                      # INOUT          (n_samples,)
+        lower_bounds,                      # INOUT          (n_samples,)
+        strict_convergence_status,         # OUT            (1,)
+        new_centroids_t_private_copies,    # OUT            (n_private_copies, n_features, n_clusters)  # noqa
+        cluster_sizes_private_copies,      # OUT            (n_private_copies, n_clusters)  # noqa
+    ):
+        # fmt: on
+        """One full iteration of LLoyd's k-means with Hamerly's bounds.
+
+        `upper_bounds` and `lower_bounds` are expected to be valid bounds for
+        `current_centroids_t`, i.e. to have been loosened by the distance each
+        centroid moved during the previous iteration. For the first iteration,
+        setting `upper_bounds` to `inf` and `lower_bounds` to 0 forces the
+        computation of all the distances.
+        """
+        sample_idx = dpex.get_global_id(zero_idx)
+
+        if sample_idx >= n_samples:
+            return
+
+        assignment_idx = assignments_idx[sample_idx]
+        upper_bound = upper_bounds[sample_idx]
+        lower_bound = lower_bounds[sample_idx]
+
+        bound = max(half_min_centroid_distances[assignment_idx], lower_bound)
+
+        if upper_bound > bound:
+            # The bounds are not tight enough to conclude. First, tighten the upper
+            # bound by computing the exact distance to the assigned centroid.
+            upper_bound = _euclidean_distance(
+                sample_idx, assignment_idx, X_t, current_centroids_t
+            )
+
+            if upper_bound > bound:
+                # Still inconclusive, compute the distances to all centroids.
+                closest_distance = inf
+                second_closest_distance = inf
+                closest_centroid_idx = assignment_idx
+                for centroid_idx in range(n_clusters):
+                    distance = _euclidean_distance(
+                        sample_idx, centroid_idx, X_t, current_centroids_t
+                    )
+                    if distance < closest_distance:
+                        second_closest_distance = closest_distance
+                        closest_distance = distance
+                        closest_centroid_idx = centroid_idx
+                    elif distance < second_closest_distance:
+                        second_closest_distance = distance
+
+                if check_strict_convergence and (
+                    closest_centroid_idx != assignment_idx
+                ):
+                    strict_convergence_status[zero_idx] = zero_as_uint32
+
+                assignment_idx = closest_centroid_idx
+                upper_bound = closest_distance
+                lower_bound = second_closest_distance
+
+                assignments_idx[sample_idx] = assignment_idx
+                lower_bounds[sample_idx] = lower_bound
+
+            upper_bounds[sample_idx] = upper_bound
+
+        privatization_idx = (sample_idx // sub_group_size) % n_centroids_private_copies
+        weight = sample_weight[sample_idx]
+
+        dpex.atomic.add(
+            cluster_sizes_private_copies,
+            (privatization_idx, assignment_idx),
+            weight
+        )
+
+        for feature_idx in range(n_features):
+            dpex.atomic.add(
+                new_centroids_t_private_copies,
+                (privatization_idx, feature_idx, assignment_idx),
+                X_t[feature_idx, sample_idx] * weight,
+            )
+
+    @dpex.func
+    def _euclidean_distance(sample_idx, centroid_idx, X_t, centroids_t):
+        sq_distance = zero
+        for feature_idx in range(n_features):
+            diff = X_t[feature_idx, sample_idx] - centroids_t[feature_idx, centroid_idx]
+            sq_distance += diff * diff
+        return math.sqrt(sq_distance)
+
+    return (
+        n_centroids_private_copies,
+        hamerly_single_step[global_size, work_group_size],
+    )
+
+
+@kernel_cache
+def make_update_hamerly_bounds_kernel(n_samples, work_group_size, dtype):
+    global_size = math.ceil(n_samples / work_group_size) * work_group_size
+
+    one_idx = np.int64(1)
+
+    @dpex.kernel
+    # fmt: off
+    def update_hamerly_bounds(
+        assignments_idx,                 # IN      (n_samples,)
+        centroid_sq_shifts,              # IN      (n_clusters,)
+        max_centroid_shifts,             # IN      (2,)
+        upper_bounds,                    # INOUT   (n_samples,)
+        lower_bounds,                    # INOUT   (n_samples,)
+    ):
+        # fmt: on
+        """Loosen the bounds by the distance that each centroid has moved.
+
+        `centroid_sq_shifts` contains the squared distances between the previous and
+        the current position of each centroid. `max_centroid_shifts` contains the two
+        largest (non-squared) shifts, see `make_max_centroid_shifts_kernel`.
+        """
+        sample_idx = dpex.get_global_id(zero_idx)
+
+        if sample_idx >= n_samples:
+            return
+
+        max_centroid_shift = max_centroid_shifts[zero_idx]
+        second_max_centroid_shift = max_centroid_shifts[one_idx]
+
+        assigned_centroid_shift = math.sqrt(
+            centroid_sq_shifts[assignments_idx[sample_idx]]
+        )
+        upper_bounds[sample_idx] += assigned_centroid_shift
+
+        # The lower bound refers to all centroids but the assigned one, so it must be
+        # loosened by the largest shift among the other centroids.
+        if assigned_centroid_shift == max_centroid_shift:
+            lower_bounds[sample_idx] -= second_max_centroid_shift
+        else:
+            lower_bounds[sample_idx] -= max_centroid_shift
+
+    return update_hamerly_bounds[global_size, work_group_size]
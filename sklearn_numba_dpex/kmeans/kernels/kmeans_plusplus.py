@@ -1,9 +1,9 @@
 import math
-from functools import lru_cache
 
 import numba_dpex as dpex
 import numpy as np
 
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
 from sklearn_numba_dpex.common._utils import _check_max_work_group_size
 from sklearn_numba_dpex.common.random import make_rand_uniform_kernel_func
 
@@ -13,7 +13,7 @@ from ._base_kmeans_kernel_funcs import make_pairwise_ops_base_kernel_funcs
 # inline commenting of the kernel.
 
 
-@lru_cache
+@kernel_cache
 def make_kmeansplusplus_init_kernel(
     n_samples,
     n_features,
@@ -58,27 +58,33 @@ def make_kmeansplusplus_init_kernel(
     return kmeansplusplus_init[global_size, work_group_size]
 
 
-@lru_cache
+@kernel_cache
 def make_sample_center_candidates_kernel(
     n_samples,
     n_local_trials,
     work_group_size,
     dtype,
 ):
+    """Sample `n_local_trials` candidates with a probability proportional to their
+    potential, given the inclusive prefix sum of the potentials (see
+    `sklearn_numba_dpex.common.scan`).
+
+    Each work item draws a value uniformly in the range of the total potential and
+    searches the first sample whose cumulative potential is greater with a binary
+    search, in `O(log(n_samples))` steps.
+    """
 
     rand_uniform_kernel_func = make_rand_uniform_kernel_func(np.dtype(dtype))
 
     zero_idx = np.int64(0)
-    one_incr = np.int32(1)
-    one_decr = np.int32(-1)
-    zero_init = dtype(0.0)
-    max_candidate_id = np.int32(n_samples - 1)
+    one_idx = np.int64(1)
+    two_idx = np.int64(2)
+    last_sample_idx = np.int64(n_samples - 1)
 
     @dpex.kernel
     # fmt: off
     def sample_center_candidates(
-        closest_dist_sq,          # IN             (n_features, n_samples)
-        total_potential,          # IN             (1,)
+        cumulative_potential,     # IN             (n_samples,)
         random_state,             # INOUT          (n_local_trials, 2)
         candidates_id,            # OUT            (n_local_trials,)
     ):
@@ -87,23 +93,27 @@ def make_sample_center_candidates_kernel(
         if local_trial_idx >= n_local_trials:
             return
         random_value = (rand_uniform_kernel_func(random_state, local_trial_idx)
-                        * total_potential[zero_idx])
-
-        cumulative_potential = zero_init
-        candidate_id = one_decr
-        while (
-                (random_value > cumulative_potential) and
-                (candidate_id < max_candidate_id)
-        ):
-            candidate_id += one_incr
-            cumulative_potential += closest_dist_sq[candidate_id]
-        candidates_id[local_trial_idx] = candidate_id
+                        * cumulative_potential[last_sample_idx])
+
+        # Search the first sample such that `random_value < cumulative_potential`,
+        # hence samples with zero potential are never selected. NB: the last sample is
+        # returned if rounding errors make `random_value` greater than the total
+        # potential.
+        lower_bound = zero_idx
+        upper_bound = last_sample_idx
+        while lower_bound < upper_bound:
+            middle = (lower_bound + upper_bound) // two_idx
+            if cumulative_potential[middle] <= random_value:
+                lower_bound = middle + one_idx
+            else:
+                upper_bound = middle
+        candidates_id[local_trial_idx] = lower_bound
 
     global_size = (math.ceil(n_local_trials / work_group_size)) * work_group_size
     return sample_center_candidates[global_size, work_group_size]
 
 
-@lru_cache
+@kernel_cache
 def make_kmeansplusplus_single_step_fixed_window_kernel(
     n_samples, n_features, n_candidates, sub_group_size, work_group_size, dtype, device
 ):
@@ -131,7 +141,6 @@ def make_kmeansplusplus_single_step_fixed_window_kernel(
         load_window_of_candidates_and_features,
         accumulate_sq_distances,
     ) = make_pairwise_ops_base_kernel_funcs(
-        n_samples,
         n_features,
         n_samples,
         candidates_window_height,
@@ -260,3 +269,139 @@ def make_kmeansplusplus_single_step_fixed_window_kernel(
         * candidates_window_height,
     )
     return kmeansplusplus_single_step[global_size, work_group_shape]
+
+
+@kernel_cache
+def make_kmeans_parallel_sample_kernel(
+    n_samples, n_states, oversampling_factor, work_group_size, dtype
+):
+    """Returns a kernel that samples each sample independently with probability
+    `oversampling_factor * closest_dist_sq[sample_idx] / total_potential`, as in a
+    round of k-means||.
+
+    Each RNG state in `random_state` is used by one work item, that samples a
+    strided subset of the samples. The ids of the sampled samples are written at
+    the positions of `candidate_ids` given by the atomic counter `n_candidates`,
+    the ids that overflow `candidate_ids` are dropped.
+    """
+    rand_uniform_kernel_func = make_rand_uniform_kernel_func(np.dtype(dtype))
+
+    zero_idx = np.int64(0)
+    one_incr = np.int32(1)
+    oversampling_factor = dtype(oversampling_factor)
+    n_samples_per_state = math.ceil(n_samples / n_states)
+
+    @dpex.kernel
+    # fmt: off
+    def kmeans_parallel_sample(
+        closest_dist_sq,          # IN             (n_samples,)
+        total_potential,          # IN             (1,)
+        random_state,             # INOUT          (n_states, 2)
+        n_candidates,             # INOUT          (1,)
+        candidate_ids,            # OUT            (max_n_candidates,)
+    ):
+        # fmt: on
+        state_idx = dpex.get_global_id(zero_idx)
+        if state_idx >= n_states:
+            return
+
+        max_n_candidates = candidate_ids.shape[zero_idx]
+        scale = oversampling_factor / total_potential[zero_idx]
+
+        # NB: the work items read consecutive samples at each iteration.
+        for iteration_idx in range(n_samples_per_state):
+            sample_idx = iteration_idx * n_states + state_idx
+            if sample_idx < n_samples:
+                probability = closest_dist_sq[sample_idx] * scale
+                if rand_uniform_kernel_func(random_state, state_idx) < probability:
+                    candidate_idx = dpex.atomic.add(n_candidates, zero_idx, one_incr)
+                    if candidate_idx < max_n_candidates:
+                        candidate_ids[candidate_idx] = sample_idx
+
+    global_size = (math.ceil(n_states / work_group_size)) * work_group_size
+    return kmeans_parallel_sample[global_size, work_group_size]
+
+
+@kernel_cache
+def make_update_closest_dist_sq_kernel(n_features, work_group_size, dtype):
+    """Returns a function that updates the weighted squared distance of each sample
+    to its closest center, given new centers and the assignments of the samples to
+    the closest new center.
+
+    The returned function accepts inputs with any number of samples.
+    """
+    zero_idx = np.int64(0)
+    one_idx = np.int64(1)
+    zero_init = dtype(0.0)
+
+    @dpex.kernel
+    # fmt: off
+    def update_closest_dist_sq(
+        X_t,                          # IN READ-ONLY   (n_features, n_samples)
+        sample_weight,                # IN READ-ONLY   (n_samples,)
+        centers_t,                    # IN READ-ONLY   (n_features, n_centers)
+        assignments_idx,              # IN READ-ONLY   (n_samples,)
+        closest_dist_sq,              # INOUT          (n_samples,)
+    ):
+        # fmt: on
+        n_samples = X_t.shape[one_idx]
+        sample_idx = dpex.get_global_id(zero_idx)
+
+        if sample_idx >= n_samples:
+            return
+
+        sq_distance = zero_init
+        center_idx = assignments_idx[sample_idx]
+
+        for feature_idx in range(n_features):
+            diff = X_t[feature_idx, sample_idx] - centers_t[feature_idx, center_idx]
+            sq_distance += diff * diff
+
+        sq_distance *= sample_weight[sample_idx]
+        if sq_distance < closest_dist_sq[sample_idx]:
+            closest_dist_sq[sample_idx] = sq_distance
+
+    def _update_closest_dist_sq(
+        X_t, sample_weight, centers_t, assignments_idx, closest_dist_sq
+    ):
+        n_samples = X_t.shape[1]
+        global_size = (math.ceil(n_samples / work_group_size)) * (work_group_size)
+        update_closest_dist_sq[global_size, work_group_size](
+            X_t, sample_weight, centers_t, assignments_idx, closest_dist_sq
+        )
+
+    return _update_closest_dist_sq
+
+
+@kernel_cache
+def make_candidate_weights_kernel(n_samples, work_group_size, dtype):
+    """Returns a kernel that sums the weights of the samples that are closest to each
+    candidate of k-means||.
+
+    The candidates are padded with copies of the `n_candidates` distinct candidates,
+    such that the candidate `candidate_idx` is a copy of the candidate
+    `candidate_idx % n_candidates`. The weights of the samples that are closest to a
+    copy are added to the original candidate, so that the copies have zero weight.
+    `candidate_weights` is expected to be initialized with zeros.
+    """
+    global_size = math.ceil(n_samples / work_group_size) * work_group_size
+    zero_idx = np.int64(0)
+
+    @dpex.kernel
+    # fmt: off
+    def candidate_weights(
+        assignments_idx,              # IN READ-ONLY   (n_samples,)
+        sample_weight,                # IN READ-ONLY   (n_samples,)
+        n_candidates,                 # PARAM
+        candidate_weights,            # INOUT          (n_padded_candidates,)
+    ):
+        # fmt: on
+        sample_idx = dpex.get_global_id(zero_idx)
+
+        if sample_idx >= n_samples:
+            return
+
+        candidate_idx = assignments_idx[sample_idx] % n_candidates
+        dpex.atomic.add(candidate_weights, candidate_idx, sample_weight[sample_idx])
+
+    return candidate_weights[global_size, work_group_size]
@@ -0,0 +1,141 @@
+import math
+
+import numba_dpex as dpex
+import numpy as np
+
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
+
+zero_idx = np.int64(0)
+
+
+@kernel_cache
+def make_lloyd_batched_single_step_kernel(
+    n_samples,
+    n_features,
+    n_clusters,
+    n_runs,
+    sub_group_size,
+    work_group_size,
+    dtype,
+    device,
+    n_centroids_private_copies="auto",
+):
+    """One iteration of `n_runs` independent instances of Lloyd's k-means.
+
+    Each work item processes one sample for all the runs, so that a single pass on the
+    data produces the centroid updates for all the runs. It is meant to be used when
+    running k-means with several initializations (`n_init > 1`) on datasets that are
+    too small to saturate the device with one run.
+
+    Runs that have converged can be deactivated with the `is_active` array, in which
+    case their assignments and centroid updates are not computed.
+    """
+    # NB: see `make_lloyd_single_step_fixed_window_kernel` for the privatization
+    # strategy. The private copies are allocated for each run.
+    if n_centroids_private_copies == "auto":
+        n_subgroups = math.ceil(n_samples / sub_group_size)
+        n_centroids_private_copies = int(min(n_subgroups, device.max_compute_units))
+    n_centroids_private_copies = max(int(n_centroids_private_copies), 1)
+
+    if work_group_size == "max":
+        work_group_size = device.max_work_group_size
+
+    global_size = math.ceil(n_samples / work_group_size) * work_group_size
+
+    # The dot products are accumulated in private memory for windows of
+    # `window_n_centroids` centroids at a time, so that each value of the sample is
+    # read from global memory once per window rather than once per centroid.
+    window_n_centroids = sub_group_size
+    n_windows_for_centroids = math.ceil(n_clusters / window_n_centroids)
+
+    zero = dtype(0.0)
+    inf = dtype(math.inf)
+    zero_as_uint32 = np.uint32(0)
+
+    @dpex.kernel
+    # fmt: off
+    def lloyd_batched_single_step(
+        X_t,                               # IN READ-ONLY   (n_features, n_samples)
+        sample_weight,                     # IN READ-ONLY   (n_samples,)
+        current_centroids_t,               # IN             (n_runs, n_features, n_clusters)  # noqa
+        centroids_half_l2_norm,            # IN             (n_runs, n_clusters)
+        is_active,                         # IN             (n_runs,)
+        previous_assignments_idx,          # IN             (n_runs, n_samples)
+        assignments_idx,                   # OUT            (n_runs, n_samples)
+        strict_convergence_status,         # OUT            (n_runs,)
+        new_centroids_t_private_copies,    # OUT            (n_runs, n_private_copies, n_features, n_clusters)  # noqa
+        cluster_sizes_private_copies,      # OUT            (n_runs, n_private_copies, n_clusters)  # noqa
+    ):
+        # fmt: on
+        sample_idx = dpex.get_global_id(zero_idx)
+
+        if sample_idx >= n_samples:
+            return
+
+        dot_products = dpex.private.array(shape=window_n_centroids, dtype=dtype)
+
+        privatization_idx = (sample_idx // sub_group_size) % n_centroids_private_copies
+        weight = sample_weight[sample_idx]
+
+        for run_idx in range(n_runs):
+            if is_active[run_idx] == zero_as_uint32:
+                continue
+
+            min_idx = zero_idx
+            min_sample_pseudo_inertia = inf
+
+            first_centroid_idx = zero_idx
+            for _ in range(n_windows_for_centroids):
+                for window_idx in range(window_n_centroids):
+                    dot_products[window_idx] = zero
+
+                for feature_idx in range(n_features):
+                    X_value = X_t[feature_idx, sample_idx]
+                    for window_idx in range(window_n_centroids):
+                        centroid_idx = first_centroid_idx + window_idx
+                        if centroid_idx < n_clusters:
+                            dot_products[window_idx] += (
+                                X_value
+                                * current_centroids_t[
+                                    run_idx, feature_idx, centroid_idx
+                                ]
+                            )
+
+                # NB: see `lloyd_single_step.py` for the definition of the pseudo
+                # inertia.
+                for window_idx in range(window_n_centroids):
+                    centroid_idx = first_centroid_idx + window_idx
+                    if centroid_idx < n_clusters:
+                        sample_pseudo_inertia = (
+                            centroids_half_l2_norm[run_idx, centroid_idx]
+                            - dot_products[window_idx]
+                        )
+                        if sample_pseudo_inertia < min_sample_pseudo_inertia:
+                            min_sample_pseudo_inertia = sample_pseudo_inertia
+                            min_idx = centroid_idx
+
+                first_centroid_idx += window_n_centroids
+
+            assignments_idx[run_idx, sample_idx] = min_idx
+
+            if strict_convergence_status[run_idx] != zero_as_uint32:
+                if previous_assignments_idx[run_idx, sample_idx] != min_idx:
+                    strict_convergence_status[run_idx] = zero_as_uint32
+
+            dpex.atomic.add(
+                cluster_sizes_private_copies,
+                (run_idx, privatization_idx, min_idx),
+                weight,
+            )
+
+            for feature_idx in range(n_features):
+                dpex.atomic.add(
+                    new_centroids_t_private_copies,
+                    (run_idx, privatization_idx, feature_idx, min_idx),
+                    X_t[feature_idx, sample_idx] * weight,
+                )
+
+    return (
+        n_centroids_private_copies,
+        lloyd_batched_single_step[global_size, work_group_size],
+    )
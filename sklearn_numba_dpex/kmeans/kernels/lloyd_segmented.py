@@ -0,0 +1,222 @@
+import math
+
+import numba_dpex as dpex
+import numpy as np
+
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
+
+zero_idx = np.int64(0)
+
+# NB: the kernels in this module implement the centroid update of a Lloyd iteration
+# as a segmented reduction rather than with atomic updates in private copies of the
+# centroids, see `sklearn_numba_dpex.kmeans.drivers.lloyd`. The samples are
+# sorted by cluster with a counting sort (count the samples of each cluster, scan the
+# counts to get the offsets of the segments of each cluster, scatter the samples in
+# the segments), then the weighted sums of the samples of each segment are computed by
+# a single work group, without collisions. The extra memory is
+# `O(n_samples + n_clusters)` regardless of `n_features` and `n_clusters`.
+
+
+@kernel_cache
+def make_count_cluster_samples_kernel(n_samples, work_group_size):
+    """Count the samples assigned to each cluster, and reset the strict convergence
+    status if the new assignments differ from the previous ones."""
+    global_size = math.ceil(n_samples / work_group_size) * work_group_size
+    zero_as_uint32 = np.uint32(0)
+    one_incr = np.int32(1)
+
+    @dpex.kernel
+    # fmt: off
+    def count_cluster_samples(
+        assignments_idx,                # IN      (n_samples,)
+        new_assignments_idx,            # IN      (n_samples,)
+        cluster_n_samples,              # INOUT   (n_clusters,)
+        strict_convergence_status,      # INOUT   (1,)
+    ):
+        # fmt: on
+        sample_idx = dpex.get_global_id(zero_idx)
+        if sample_idx >= n_samples:
+            return
+
+        cluster_idx = new_assignments_idx[sample_idx]
+        if cluster_idx != assignments_idx[sample_idx]:
+            strict_convergence_status[zero_idx] = zero_as_uint32
+
+        dpex.atomic.add(cluster_n_samples, cluster_idx, one_incr)
+
+    return count_cluster_samples[global_size, work_group_size]
+
+
+@kernel_cache
+def make_sort_samples_by_cluster_kernel(n_samples, work_group_size):
+    """Scatter the indices of the samples in the segments of their clusters.
+
+    `cluster_segment_ends` is the inclusive prefix sum of the counts of samples of each
+    cluster. The order of the samples within a segment is not deterministic.
+    """
+    global_size = math.ceil(n_samples / work_group_size) * work_group_size
+    one_incr = np.int32(1)
+
+    @dpex.kernel
+    # fmt: off
+    def sort_samples_by_cluster(
+        assignments_idx,            # IN      (n_samples,)
+        cluster_n_samples,          # IN      (n_clusters,)
+        cluster_segment_ends,       # IN      (n_clusters,)
+        cluster_cursors,            # INOUT   (n_clusters,)
+        sorted_samples_idx,         # OUT     (n_samples,)
+    ):
+        # fmt: on
+        sample_idx = dpex.get_global_id(zero_idx)
+        if sample_idx >= n_samples:
+            return
+
+        cluster_idx = assignments_idx[sample_idx]
+        segment_start = (
+            cluster_segment_ends[cluster_idx] - cluster_n_samples[cluster_idx]
+        )
+        position = dpex.atomic.add(cluster_cursors, cluster_idx, one_incr)
+        sorted_samples_idx[segment_start + position] = sample_idx
+
+    return sort_samples_by_cluster[global_size, work_group_size]
+
+
+@kernel_cache
+def make_segmented_centroid_sums_kernel(n_features, n_clusters, work_group_size, dtype):
+    """Compute the weighted sums of the samples of each cluster, and the sum of their
+    weights, from the samples sorted by cluster.
+
+    Each work group sums the samples of one cluster, so that the work is balanced
+    among the work items even if the sizes of the clusters are not. The work items
+    read the samples of the segment with a stride of `work_group_size`, and their
+    partial sums are reduced in local memory, for one feature at a time. The sum of
+    the weights is computed as an additional feature of index `n_features`.
+
+    `work_group_size` is expected to be a power of two.
+    """
+    global_size = n_clusters * work_group_size
+    n_local_iterations = np.int64(math.log2(work_group_size))
+    n_columns = np.int64(n_features + 1)
+    two_as_a_long = np.int64(2)
+    zero = dtype(0.0)
+
+    @dpex.kernel
+    # fmt: off
+    def segmented_centroid_sums(
+        X_t,                        # IN READ-ONLY   (n_features, n_samples)
+        sample_weight,              # IN READ-ONLY   (n_samples,)
+        sorted_samples_idx,         # IN             (n_samples,)
+        cluster_n_samples,          # IN             (n_clusters,)
+        cluster_segment_ends,       # IN             (n_clusters,)
+        centroids_t,                # OUT            (n_features, n_clusters)
+        cluster_sizes,              # OUT            (n_clusters,)
+    ):
+        # fmt: on
+        cluster_idx = dpex.get_group_id(zero_idx)
+        local_work_id = dpex.get_local_id(zero_idx)
+
+        local_sums = dpex.local.array(work_group_size, dtype=dtype)
+
+        segment_end = cluster_segment_ends[cluster_idx]
+        segment_start = segment_end - cluster_n_samples[cluster_idx]
+
+        for column_idx in range(n_columns):
+            _prepare_local_memory(
+                local_work_id,
+                column_idx,
+                segment_start,
+                segment_end,
+                X_t,
+                sample_weight,
+                sorted_samples_idx,
+                # OUT
+                local_sums,
+            )
+
+            dpex.barrier(dpex.LOCAL_MEM_FENCE)
+            n_active_work_items = work_group_size
+            for i in range(n_local_iterations):
+                n_active_work_items = n_active_work_items // two_as_a_long
+                _local_iteration(
+                    local_work_id,
+                    n_active_work_items,
+                    # INOUT
+                    local_sums,
+                )
+                dpex.barrier(dpex.LOCAL_MEM_FENCE)
+
+            _register_result(
+                local_work_id,
+                column_idx,
+                cluster_idx,
+                local_sums,
+                # OUT
+                centroids_t,
+                cluster_sizes,
+            )
+
+            # NB: `local_sums` is overwritten by the next feature once the result has
+            # been read.
+            dpex.barrier(dpex.LOCAL_MEM_FENCE)
+
+    # HACK 906: see sklearn_numba_dpex.patches.tests.test_patches.test_need_to_workaround_numba_dpex_906  # noqa
+    @dpex.func
+    # fmt: off
+    def _prepare_local_memory(
+        local_work_id,              # PARAM
+        column_idx,                 # PARAM
+        segment_start,              # PARAM
+        segment_end,                # PARAM
+        X_t,                        # IN
+        sample_weight,              # IN
+        sorted_samples_idx,         # IN
+        local_sums,                 # OUT
+    ):
+        # fmt: on
+        is_weight_column = column_idx == n_features
+        partial_sum = zero
+        position = segment_start + local_work_id
+        while position < segment_end:
+            sample_idx = sorted_samples_idx[position]
+            weight = sample_weight[sample_idx]
+            if is_weight_column:
+                partial_sum += weight
+            else:
+                partial_sum += weight * X_t[column_idx, sample_idx]
+            position += work_group_size
+
+        local_sums[local_work_id] = partial_sum
+
+    @dpex.func
+    # fmt: off
+    def _local_iteration(
+        local_work_id,              # PARAM
+        n_active_work_items,        # PARAM
+        local_sums,                 # INOUT
+    ):
+        # fmt: on
+        if local_work_id < n_active_work_items:
+            local_sums[local_work_id] += local_sums[
+                local_work_id + n_active_work_items
+            ]
+
+    @dpex.func
+    # fmt: off
+    def _register_result(
+        local_work_id,              # PARAM
+        column_idx,                 # PARAM
+        cluster_idx,                # PARAM
+        local_sums,                 # IN
+        centroids_t,                # OUT
+        cluster_sizes,              # OUT
+    ):
+        # fmt: on
+        if local_work_id != zero_idx:
+            return
+
+        if column_idx == n_features:
+            cluster_sizes[cluster_idx] = local_sums[zero_idx]
+        else:
+            centroids_t[column_idx, cluster_idx] = local_sums[zero_idx]
+
+    return segmented_centroid_sums[global_size, work_group_size]
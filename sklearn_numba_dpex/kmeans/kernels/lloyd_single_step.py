@@ -1,9 +1,9 @@
 import math
-from functools import lru_cache
 
 import numba_dpex as dpex
 import numpy as np
 
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
 from sklearn_numba_dpex.common._utils import _check_max_work_group_size
 
 from ._base_kmeans_kernel_funcs import (
@@ -31,7 +31,7 @@ from ._base_kmeans_kernel_funcs import (
 # TODO: write unittests for each distinct kernel.
 
 
-@lru_cache
+@kernel_cache
 def make_lloyd_single_step_fixed_window_kernel(
     n_samples,
     n_features,
@@ -42,6 +42,7 @@ def make_lloyd_single_step_fixed_window_kernel(
     work_group_size,
     dtype,
     device,
+    n_centroids_private_copies="auto",
 ):
     # The height of the window on centroids (or, equivalently, the number of features
     # in the window), and the width (number of centroids in the window), are chosen
@@ -86,7 +87,6 @@ def make_lloyd_single_step_fixed_window_kernel(
         accumulate_dot_products,
         initialize_window_half_l2_norm,
     ) = make_pairwise_ops_base_kernel_funcs(
-        n_samples,
         n_features,
         n_clusters,
         centroids_window_height,
@@ -124,11 +124,21 @@ def make_lloyd_single_step_fixed_window_kernel(
     # that highlight complexity of the execution model:
     # - https://github.com/IntelPython/dpctl/issues/1033
     # - https://stackoverflow.com/a/6490897
-    n_centroids_private_copies = int(min(n_subgroups, device.max_compute_units))
+    if n_centroids_private_copies == "auto":
+        n_centroids_private_copies = int(min(n_subgroups, device.max_compute_units))
+
+        # The privatization is detrimental when the probability of collision is low,
+        # i.e. when there are few samples per cluster. The private copies then are
+        # larger than the data itself and the cost of resetting and reducing them at
+        # each iteration outweighs the cost of the collisions. In this case, a single
+        # copy is used, which enables the caller to accumulate the updates directly
+        # into the final array of centroids.
+        if n_centroids_private_copies * n_clusters > n_samples:
+            n_centroids_private_copies = 1
 
     # Safety check for edge case where `n_centroids_private_copies` equals 0 because
     # `n_samples` is null.
-    n_centroids_private_copies = max(n_centroids_private_copies, 1)
+    n_centroids_private_copies = max(int(n_centroids_private_copies), 1)
 
     zero_idx = np.int64(0)
     one_idx = np.int64(1)
@@ -0,0 +1,342 @@
+import math
+
+import numba_dpex as dpex
+import numpy as np
+
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
+from sklearn_numba_dpex.common.random import make_randint_kernel_func
+
+zero_idx = np.int64(0)
+one_idx = np.int64(1)
+
+
+@kernel_cache
+def make_sample_batch_indices_kernel(n_samples, batch_size, n_states, work_group_size):
+    """Returns a kernel that draws `batch_size` indices uniformly in [0, n_samples),
+    with replacement.
+
+    The kernel expects a RNG state array with `n_states` states, such as returned by
+    `create_xoroshiro128pp_states(n_states)`. Each work item uses its own state to
+    draw `ceil(batch_size / n_states)` indices.
+    """
+    global_size = math.ceil(n_states / work_group_size) * work_group_size
+    n_indices_per_state = math.ceil(batch_size / n_states)
+    randint = make_randint_kernel_func()
+    n_samples_as_uint64 = np.uint64(n_samples)
+
+    @dpex.kernel
+    # fmt: off
+    def sample_batch_indices(
+        random_state,               # INOUT     (n_states, 2)
+        batch_indices,              # OUT       (batch_size,)
+    ):
+        # fmt: on
+        state_idx = dpex.get_global_id(zero_idx)
+        if state_idx >= n_states:
+            return
+
+        # NB: the work items write consecutive indices at each iteration.
+        for iteration_idx in range(n_indices_per_state):
+            item_idx = iteration_idx * n_states + state_idx
+            if item_idx < batch_size:
+                batch_indices[item_idx] = randint(
+                    random_state, state_idx, n_samples_as_uint64
+                )
+
+    return sample_batch_indices[global_size, work_group_size]
+
+
+@kernel_cache
+def make_accumulate_batch_centroid_data_kernel(
+    n_features, n_clusters, work_group_size, dtype
+):
+    """Returns a function that sums, for each cluster, the weighted samples of a batch
+    that are assigned to this cluster, along with their weights.
+
+    The returned function accepts batches with any number of samples.
+    """
+
+    # NB: unlike in `lloyd_single_step`, the updates are not privatized. The batches are
+    # expected to be small enough for the cost of the collisions in atomic updates to
+    # remain low.
+    @dpex.kernel
+    # fmt: off
+    def accumulate_batch_centroid_data(
+        X_t,                         # IN READ-ONLY   (n_features, batch_size)
+        sample_weight,               # IN READ-ONLY   (batch_size,)
+        assignments_idx,             # IN             (batch_size,)
+        batch_centroids_t,           # INOUT          (n_features, n_clusters)
+        batch_cluster_weights,       # INOUT          (n_clusters,)
+    ):
+        # fmt: on
+        batch_size = X_t.shape[one_idx]
+        sample_idx = dpex.get_global_id(zero_idx)
+
+        if sample_idx >= batch_size:
+            return
+
+        cluster_idx = assignments_idx[sample_idx]
+        weight = sample_weight[sample_idx]
+
+        dpex.atomic.add(batch_cluster_weights, cluster_idx, weight)
+
+        for feature_idx in range(n_features):
+            dpex.atomic.add(
+                batch_centroids_t,
+                (feature_idx, cluster_idx),
+                X_t[feature_idx, sample_idx] * weight,
+            )
+
+    def _accumulate_batch_centroid_data(
+        X_t,
+        sample_weight,
+        assignments_idx,
+        batch_centroids_t,
+        batch_cluster_weights,
+    ):
+        batch_size = X_t.shape[1]
+        global_size = math.ceil(batch_size / work_group_size) * work_group_size
+        accumulate_batch_centroid_data[global_size, work_group_size](
+            X_t,
+            sample_weight,
+            assignments_idx,
+            batch_centroids_t,
+            batch_cluster_weights,
+        )
+
+    return _accumulate_batch_centroid_data
+
+
+@kernel_cache
+def make_minibatch_centroids_update_kernel(
+    n_features, n_clusters, work_group_size, dtype
+):
+    global_size = math.ceil(n_clusters / work_group_size) * work_group_size
+    zero = dtype(0.0)
+
+    # Optimized for C-contiguous array and for
+    # size1 >> preferred_work_group_size_multiple
+    @dpex.kernel
+    # fmt: off
+    def minibatch_centroids_update(
+        centroids_t,                 # IN             (n_features, n_clusters)
+        batch_centroids_t,           # IN             (n_features, n_clusters)
+        batch_cluster_weights,       # IN             (n_clusters,)
+        cluster_weight_sums,         # INOUT          (n_clusters,)
+        new_centroids_t,             # OUT            (n_features, n_clusters)
+    ):
+        # fmt: on
+        """Streaming update of the centroids with the data of a batch.
+
+        Each centroid is moved to the weighted mean of all the samples that have been
+        assigned to it so far, where the samples seen in previous batches are
+        summarized by the current value of the centroid weighted by the sum of their
+        weights, `cluster_weight_sums`.
+        """
+        cluster_idx = dpex.get_global_id(zero_idx)
+
+        if cluster_idx >= n_clusters:
+            return
+
+        batch_cluster_weight = batch_cluster_weights[cluster_idx]
+
+        if batch_cluster_weight == zero:
+            for feature_idx in range(n_features):
+                new_centroids_t[feature_idx, cluster_idx] = centroids_t[
+                    feature_idx, cluster_idx
+                ]
+            return
+
+        previous_weight_sum = cluster_weight_sums[cluster_idx]
+        new_weight_sum = previous_weight_sum + batch_cluster_weight
+
+        for feature_idx in range(n_features):
+            new_centroids_t[feature_idx, cluster_idx] = (
+                centroids_t[feature_idx, cluster_idx] * previous_weight_sum
+                + batch_centroids_t[feature_idx, cluster_idx]
+            ) / new_weight_sum
+
+        cluster_weight_sums[cluster_idx] = new_weight_sum
+
+    return minibatch_centroids_update[global_size, work_group_size]
+
+
+@kernel_cache
+def make_low_count_clusters_kernel(n_clusters, work_group_size, dtype):
+    """Returns a kernel that flags the clusters whose sum of weights is lower than
+    `reassignment_ratio` times the largest sum `max_weight_sum`.
+
+    The key of a flagged cluster is the opposite of its sum of weights, so that the
+    flagged clusters with the lowest sums have the greatest keys, and the key of the
+    other clusters is `-inf`. The flagged clusters are counted in `counts[0]`.
+    """
+    global_size = math.ceil(n_clusters / work_group_size) * work_group_size
+    minus_inf = dtype(-math.inf)
+    one_incr = np.int32(1)
+
+    @dpex.kernel
+    # fmt: off
+    def low_count_clusters(
+        cluster_weight_sums,         # IN             (n_clusters,)
+        max_weight_sum,              # IN             (1,)
+        reassignment_ratio,          # PARAM          (dtype)
+        low_count_keys,              # OUT            (n_clusters,)
+        counts,                      # INOUT          (2,)
+    ):
+        # fmt: on
+        cluster_idx = dpex.get_global_id(zero_idx)
+        if cluster_idx >= n_clusters:
+            return
+
+        weight_sum = cluster_weight_sums[cluster_idx]
+        if weight_sum < reassignment_ratio * max_weight_sum[zero_idx]:
+            low_count_keys[cluster_idx] = -weight_sum
+            dpex.atomic.add(counts, zero_idx, one_incr)
+        else:
+            low_count_keys[cluster_idx] = minus_inf
+
+    return low_count_clusters[global_size, work_group_size]
+
+
+@kernel_cache
+def make_count_positive_weights_kernel(work_group_size, dtype):
+    """Returns a function that counts the samples of a batch with a positive weight in
+    `counts[1]`.
+
+    The returned function accepts batches with any number of samples.
+    """
+    zero = dtype(0.0)
+    one_incr = np.int32(1)
+
+    # NB: like in `accumulate_batch_centroid_data`, the batches are expected to be
+    # small enough for the atomic updates of a single counter to remain cheap.
+    @dpex.kernel
+    # fmt: off
+    def count_positive_weights(
+        sample_weight,               # IN READ-ONLY   (batch_size,)
+        counts,                      # INOUT          (2,)
+    ):
+        # fmt: on
+        batch_size = sample_weight.shape[zero_idx]
+        sample_idx = dpex.get_global_id(zero_idx)
+        if sample_idx >= batch_size:
+            return
+
+        if sample_weight[sample_idx] > zero:
+            dpex.atomic.add(counts, one_idx, one_incr)
+
+    def _count_positive_weights(sample_weight, counts):
+        batch_size = sample_weight.shape[0]
+        global_size = math.ceil(batch_size / work_group_size) * work_group_size
+        count_positive_weights[global_size, work_group_size](sample_weight, counts)
+
+    return _count_positive_weights
+
+
+@kernel_cache
+def make_reassign_clusters_kernel(n_features, work_group_size, dtype):
+    """Returns a function that moves the centroids of the clusters
+    `reassigned_clusters_idx` to the samples `new_centers_idx` of a batch.
+
+    The sums of weights of the reassigned clusters are set to `inf`, so that the lowest
+    sum of the other clusters can then be found with an argmin, see
+    `make_reset_reassigned_weight_sums_kernel`.
+
+    The returned function accepts any number of samples and of reassigned clusters.
+    """
+    inf = dtype(math.inf)
+
+    @dpex.kernel
+    # fmt: off
+    def reassign_clusters(
+        X_t,                         # IN READ-ONLY   (n_features, batch_size)
+        new_centers_idx,             # IN             (n_reassigns,)
+        reassigned_clusters_idx,     # IN             (n_reassigns,)
+        centroids_t,                 # INOUT          (n_features, n_clusters)
+        cluster_weight_sums,         # INOUT          (n_clusters,)
+    ):
+        # fmt: on
+        n_reassigns = new_centers_idx.shape[zero_idx]
+        item_idx = dpex.get_global_id(zero_idx)
+        if item_idx >= n_reassigns * n_features:
+            return
+
+        feature_idx = item_idx // n_reassigns
+        reassign_idx = item_idx % n_reassigns
+        cluster_idx = reassigned_clusters_idx[reassign_idx]
+
+        centroids_t[feature_idx, cluster_idx] = X_t[
+            feature_idx, new_centers_idx[reassign_idx]
+        ]
+
+        if feature_idx == zero_idx:
+            cluster_weight_sums[cluster_idx] = inf
+
+    def _reassign_clusters(
+        X_t,
+        new_centers_idx,
+        reassigned_clusters_idx,
+        centroids_t,
+        cluster_weight_sums,
+    ):
+        n_reassigns = new_centers_idx.shape[0]
+        global_size = (
+            math.ceil(n_reassigns * n_features / work_group_size) * work_group_size
+        )
+        reassign_clusters[global_size, work_group_size](
+            X_t,
+            new_centers_idx,
+            reassigned_clusters_idx,
+            centroids_t,
+            cluster_weight_sums,
+        )
+
+    return _reassign_clusters
+
+
+@kernel_cache
+def make_reset_reassigned_weight_sums_kernel(work_group_size, dtype):
+    """Returns a function that sets the sums of weights of the reassigned clusters to
+    the lowest sum of the other clusters, or to `max_weight_sum` if all the clusters
+    are reassigned, so that they are not reassigned again right away.
+
+    The returned function accepts any number of reassigned clusters.
+    """
+    inf = dtype(math.inf)
+
+    @dpex.kernel
+    # fmt: off
+    def reset_reassigned_weight_sums(
+        reassigned_clusters_idx,     # IN             (n_reassigns,)
+        min_weight_sum_idx,          # IN             (1,)
+        max_weight_sum,              # IN             (1,)
+        cluster_weight_sums,         # INOUT          (n_clusters,)
+    ):
+        # fmt: on
+        n_reassigns = reassigned_clusters_idx.shape[zero_idx]
+        reassign_idx = dpex.get_global_id(zero_idx)
+        if reassign_idx >= n_reassigns:
+            return
+
+        # NB: the argmin points to a cluster that is not reassigned, unless all the
+        # clusters are. Then it might be concurrently overwritten with
+        # `max_weight_sum`, which gives the same result.
+        min_weight_sum = cluster_weight_sums[min_weight_sum_idx[zero_idx]]
+        if min_weight_sum == inf:
+            min_weight_sum = max_weight_sum[zero_idx]
+
+        cluster_weight_sums[reassigned_clusters_idx[reassign_idx]] = min_weight_sum
+
+    def _reset_reassigned_weight_sums(
+        reassigned_clusters_idx, min_weight_sum_idx, max_weight_sum, cluster_weight_sums
+    ):
+        n_reassigns = reassigned_clusters_idx.shape[0]
+        global_size = math.ceil(n_reassigns / work_group_size) * work_group_size
+        reset_reassigned_weight_sums[global_size, work_group_size](
+            reassigned_clusters_idx,
+            min_weight_sum_idx,
+            max_weight_sum,
+            cluster_weight_sums,
+        )
+
+    return _reset_reassigned_weight_sums
@@ -1,17 +1,19 @@
 import math
-from functools import lru_cache
 
 import dpctl.tensor as dpt
 import numba_dpex as dpex
 import numpy as np
 
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
+
 zero_idx = np.int64(0)
 
 
-@lru_cache
+@kernel_cache
 def make_relocate_empty_clusters_kernel(
     n_relocated_clusters, n_features, work_group_size, dtype
 ):
+
     n_work_groups_for_cluster = math.ceil(n_features / work_group_size)
     n_work_items_for_cluster = n_work_groups_for_cluster * work_group_size
     global_size = n_work_items_for_cluster * n_relocated_clusters
@@ -76,7 +78,7 @@ def make_relocate_empty_clusters_kernel(
     return relocate_empty_clusters[global_size, work_group_size]
 
 
-@lru_cache
+@kernel_cache
 def make_centroid_shifts_kernel(n_clusters, n_features, work_group_size, dtype):
     global_size = math.ceil(n_clusters / work_group_size) * work_group_size
     zero = dtype(0.0)
@@ -110,7 +112,47 @@ def make_centroid_shifts_kernel(n_clusters, n_features, work_group_size, dtype):
     return centroid_shifts[global_size, work_group_size]
 
 
-@lru_cache
+@kernel_cache
+def make_broadcast_division_keep_empty_clusters_kernel(
+    n_clusters, n_features, work_group_size, dtype
+):
+    global_size = math.ceil(n_clusters / work_group_size) * work_group_size
+    zero = dtype(0.0)
+
+    # NB: same as `make_broadcast_division_1d_2d_axis0_kernel`, except that the
+    # centroids of the empty clusters are set to their previous value rather than
+    # divided by zero. It is used in the iterations where the empty clusters are not
+    # relocated, since it requires reading the number of empty clusters on host.
+    @dpex.kernel
+    # fmt: off
+    def broadcast_division_keep_empty_clusters(
+        new_centroids_t,        # INOUT   (n_features, n_clusters)
+        cluster_sizes,          # IN      (n_clusters,)
+        centroids_t,            # IN      (n_features, n_clusters)
+    ):
+        # fmt: on
+        cluster_idx = dpex.get_global_id(zero_idx)
+
+        if cluster_idx >= n_clusters:
+            return
+
+        cluster_size = cluster_sizes[cluster_idx]
+
+        if cluster_size > zero:
+            for feature_idx in range(n_features):
+                new_centroids_t[feature_idx, cluster_idx] = (
+                    new_centroids_t[feature_idx, cluster_idx] / cluster_size
+                )
+        else:
+            for feature_idx in range(n_features):
+                new_centroids_t[feature_idx, cluster_idx] = centroids_t[
+                    feature_idx, cluster_idx
+                ]
+
+    return broadcast_division_keep_empty_clusters[global_size, work_group_size]
+
+
+@kernel_cache
 def make_reduce_centroid_data_kernel(
     n_centroids_private_copies,
     n_features,
@@ -195,7 +237,38 @@ def make_reduce_centroid_data_kernel(
     return reduce_centroid_data
 
 
-@lru_cache
+@kernel_cache
+def make_register_empty_clusters_kernel(n_clusters, work_group_size, dtype):
+    """Register the empty clusters, like `make_reduce_centroid_data_kernel` does, when
+    the centroid data has been accumulated without private copies and does not need
+    to be reduced."""
+    global_size = math.ceil(n_clusters / work_group_size) * work_group_size
+
+    zero = dtype(0.0)
+    one_incr = np.int32(1)
+
+    @dpex.kernel
+    # fmt: off
+    def register_empty_clusters(
+        cluster_sizes,                 # IN      (n_clusters,)
+        empty_clusters_list,           # OUT     (n_clusters,)
+        n_empty_clusters,              # OUT     (1,)
+    ):
+        # fmt: on
+        cluster_idx = dpex.get_global_id(zero_idx)
+        if cluster_idx >= n_clusters:
+            return
+
+        if cluster_sizes[cluster_idx] == zero:
+            current_n_empty_clusters = dpex.atomic.add(
+                n_empty_clusters, zero_idx, one_incr
+            )
+            empty_clusters_list[current_n_empty_clusters] = cluster_idx
+
+    return register_empty_clusters[global_size, work_group_size]
+
+
+@kernel_cache
 def make_is_same_clustering_kernel(n_samples, n_clusters, work_group_size, device):
     # TODO: are there possible optimizations for this kernel ?
     # - fusing the two kernels (It would require a lock ? There's a risk of concurrency
@@ -253,7 +326,7 @@ def make_is_same_clustering_kernel(n_samples, n_clusters, work_group_size, devic
     return is_same_clustering
 
 
-@lru_cache
+@kernel_cache
 def make_get_nb_distinct_clusters_kernel(
     n_samples, n_clusters, work_group_size, device
 ):
@@ -3,6 +3,7 @@ import dpctl.tensor as dpt
 import dpnp
 import numpy as np
 import pytest
+import scipy.sparse as sp
 from dpctl.tensor import asnumpy
 from numpy.random import default_rng
 from numpy.testing import assert_array_equal
@@ -13,18 +14,50 @@ from sklearn.cluster._kmeans import _is_same_clustering
 from sklearn.cluster.tests.test_k_means import X as X_sklearn_test
 from sklearn.cluster.tests.test_k_means import n_clusters as n_clusters_sklearn_test
 from sklearn.datasets import make_blobs
+from sklearn.pipeline import make_pipeline
+from sklearn.preprocessing import StandardScaler
 from sklearn.utils._testing import assert_allclose
 
-from sklearn_numba_dpex.kmeans.drivers import get_nb_distinct_clusters
-from sklearn_numba_dpex.kmeans.engine import KMeansEngine
+from sklearn_numba_dpex import (
+    MiniBatchKMeans,
+    iter_kmeans_predict,
+    kmeans_config_context,
+    kmeans_parallel_init,
+    plan_kmeans_fit,
+    plan_kmeans_predict,
+    profiling,
+    set_memory_budget,
+)
+from sklearn_numba_dpex.common.random import create_xoroshiro128pp_states
+from sklearn_numba_dpex.kmeans.drivers import (
+    get_euclidean_distances,
+    get_labels_inertia,
+    get_nb_distinct_clusters,
+    lloyd,
+    lloyd_batched,
+    lloyd_chunked,
+    minibatch_kmeans,
+    minibatch_kmeans_partial_fit,
+    reassign_low_count_clusters,
+)
+from sklearn_numba_dpex.kmeans.engine import KMeansEngine, _fitted_states
 from sklearn_numba_dpex.kmeans.kernels import (
     make_compute_euclidean_distances_fixed_window_kernel,
+    make_kmeansplusplus_single_step_fixed_window_kernel,
     make_label_assignment_fixed_window_kernel,
     make_lloyd_single_step_fixed_window_kernel,
+    make_sample_batch_indices_kernel,
 )
 from sklearn_numba_dpex.testing.config import float_dtype_params
 
 
+def _host_random_init(X, n_clusters, random_state):
+    centers_idx = random_state.choice(X.shape[0], size=n_clusters, replace=False)
+    if isinstance(X, np.ndarray):
+        return X[centers_idx]
+    return dpt.take(X, dpt.asarray(centers_idx, device=X.device), axis=0)
+
+
 @pytest.mark.parametrize(
     "array_constr,test_attributes_auto_convert",
     [
@@ -42,8 +75,15 @@ def test_kmeans_same_results(dtype, array_constr, test_attributes_auto_convert):
     X = X.astype(dtype)
     X_array = array_constr(X, dtype=dtype)
 
+    # NB: the "random" init samples the initial centers on device with a different
+    # RNG than scikit-learn, the same initial centers are rather computed on host for
+    # both.
     kmeans_truth = KMeans(
-        random_state=random_seed, algorithm="lloyd", max_iter=2, n_init=2, init="random"
+        random_state=random_seed,
+        algorithm="lloyd",
+        max_iter=2,
+        n_init=2,
+        init=_host_random_init,
     )
     kmeans_engine = clone(kmeans_truth)
 
@@ -110,6 +150,669 @@ def test_kmeans_same_results(dtype, array_constr, test_attributes_auto_convert):
     assert_allclose(y_transform, asnumpy(y_transform_engine))
 
 
+@pytest.mark.parametrize("n_clusters", [1, 3, 50])
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_kmeans_elkan_same_results_as_lloyd(dtype, n_clusters):
+    random_seed = 42
+    X, _ = make_blobs(
+        n_samples=1000, n_features=5, centers=10, random_state=random_seed
+    )
+    X = X.astype(dtype)
+
+    kmeans_lloyd = KMeans(
+        n_clusters=n_clusters,
+        random_state=random_seed,
+        algorithm="lloyd",
+        n_init=1,
+        tol=0,
+    )
+    kmeans_elkan = clone(kmeans_lloyd).set_params(algorithm="elkan")
+
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        kmeans_lloyd.fit(X)
+        kmeans_elkan.fit(X)
+
+    assert_array_equal(asnumpy(kmeans_lloyd.labels_), asnumpy(kmeans_elkan.labels_))
+    assert_allclose(
+        asnumpy(kmeans_lloyd.cluster_centers_),
+        asnumpy(kmeans_elkan.cluster_centers_),
+        rtol=1e-4,
+    )
+    assert_allclose(kmeans_lloyd.inertia_, kmeans_elkan.inertia_, rtol=1e-4)
+    assert kmeans_lloyd.n_iter_ == kmeans_elkan.n_iter_
+
+
+@pytest.mark.parametrize("chunk_size", [64, 1000, 5000])
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_lloyd_chunked_same_results_as_lloyd(dtype, chunk_size, tmp_path):
+    random_seed = 42
+    n_clusters = 7
+    X, _ = make_blobs(n_samples=1000, n_features=3, centers=5, random_state=random_seed)
+    X = X.astype(dtype)
+    sample_weight = default_rng(random_seed).random(X.shape[0]).astype(dtype)
+    init_centers, _ = kmeans_plusplus(X, n_clusters, random_state=random_seed)
+
+    X_memmap = np.memmap(tmp_path / "X.mmap", dtype=dtype, mode="w+", shape=X.shape)
+    X_memmap[:] = X
+
+    X_t = dpt.asarray(X.T, order="C")
+    labels, inertia, centers_t, n_iteration = lloyd(
+        X_t,
+        dpt.asarray(sample_weight, device=X_t.device),
+        dpt.asarray(init_centers.T, order="C", device=X_t.device),
+        use_uniform_weights=False,
+        tol=0,
+    )
+
+    (
+        labels_chunked,
+        inertia_chunked,
+        centers_t_chunked,
+        n_iteration_chunked,
+    ) = lloyd_chunked(
+        X_memmap,
+        sample_weight,
+        dpt.asarray(init_centers.T, order="C", device=X_t.device),
+        use_uniform_weights=False,
+        tol=0,
+        chunk_size=chunk_size,
+    )
+
+    assert_array_equal(dpt.asnumpy(labels), dpt.asnumpy(labels_chunked))
+    assert_allclose(dpt.asnumpy(centers_t), dpt.asnumpy(centers_t_chunked), rtol=1e-4)
+    assert_allclose(inertia, inertia_chunked, rtol=1e-4)
+    assert n_iteration == n_iteration_chunked
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_kmeans_fit_streamed_same_results(dtype):
+    # When the data does not fit in the memory budget, the fit streams it to the
+    # device with `lloyd_chunked`, and gives the same results than `lloyd`.
+    random_seed = 42
+    n_samples, n_features, n_clusters = 10_000, 4, 5
+    X, _ = make_blobs(
+        n_samples=n_samples, n_features=n_features, centers=5, random_state=random_seed
+    )
+    X = X.astype(dtype)
+    sample_weight = default_rng(random_seed).random(n_samples).astype(dtype)
+    init, _ = kmeans_plusplus(X, n_clusters, random_state=random_seed)
+    device = dpctl.SyclDevice()
+
+    streamed_plan = plan_kmeans_fit(
+        n_samples,
+        n_features,
+        n_clusters,
+        dtype=dtype,
+        device=device,
+        memory_budget=X.nbytes,
+        allow_streaming=True,
+    )
+    assert streamed_plan.chunk_size is not None
+    assert streamed_plan.chunk_size < n_samples
+    assert streamed_plan.peak_nbytes <= X.nbytes
+
+    X_t = dpt.asarray(X.T, order="C", device=device)
+    labels, inertia, centers_t, _ = lloyd(
+        X_t,
+        dpt.asarray(sample_weight, device=device),
+        dpt.asarray(init.T, order="C", device=device),
+        use_uniform_weights=False,
+        tol=0,
+    )
+
+    kmeans = KMeans(n_clusters=n_clusters, init=init, n_init=1, tol=0)
+    try:
+        set_memory_budget(X.nbytes)
+        with config_context(engine_provider="sklearn_numba_dpex"):
+            kmeans.fit(X, sample_weight=sample_weight)
+    finally:
+        set_memory_budget(None)
+
+    assert_array_equal(asnumpy(kmeans.labels_), dpt.asnumpy(labels))
+    assert_allclose(
+        asnumpy(kmeans.cluster_centers_), dpt.asnumpy(centers_t).T, rtol=1e-4
+    )
+    assert_allclose(kmeans.inertia_, inertia, rtol=1e-4)
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_kmeans_sparse_same_results(dtype):
+    random_seed = 42
+    n_clusters = 5
+    X = sp.random(
+        300, 40, density=0.1, format="csr", dtype=dtype, random_state=random_seed
+    )
+    sample_weight = default_rng(random_seed).random(X.shape[0]).astype(dtype)
+    init = X[:n_clusters].toarray()
+
+    kmeans_truth = KMeans(
+        n_clusters=n_clusters, init=init, n_init=1, max_iter=20, algorithm="lloyd"
+    )
+    kmeans_engine = clone(kmeans_truth)
+
+    kmeans_truth.fit(X, sample_weight=sample_weight)
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        kmeans_engine.fit(X, sample_weight=sample_weight)
+
+    assert_array_equal(kmeans_truth.labels_, asnumpy(kmeans_engine.labels_))
+    assert_allclose(
+        kmeans_truth.cluster_centers_,
+        asnumpy(kmeans_engine.cluster_centers_),
+        rtol=1e-4,
+    )
+    assert_allclose(kmeans_truth.inertia_, kmeans_engine.inertia_, rtol=1e-4)
+    assert kmeans_truth.n_iter_ == kmeans_engine.n_iter_
+
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        y_labels_engine = kmeans_engine.predict(X)
+        y_scores_engine = kmeans_engine.score(X)
+        y_transform_engine = kmeans_engine.transform(X)
+
+    assert_array_equal(kmeans_truth.predict(X), asnumpy(y_labels_engine))
+    assert_allclose(kmeans_truth.score(X), y_scores_engine, rtol=1e-4)
+    assert_allclose(
+        kmeans_truth.transform(X), asnumpy(y_transform_engine), rtol=1e-4, atol=1e-5
+    )
+
+
+def test_kmeans_sparse_unsorted_indices():
+    random_seed = 42
+    n_clusters = 3
+    X = sp.random(
+        100, 20, density=0.3, format="csr", dtype=np.float32, random_state=random_seed
+    )
+    # Reverse the order of the non-zero values of each row.
+    order = np.concatenate(
+        [np.arange(start, end)[::-1] for start, end in zip(X.indptr, X.indptr[1:])]
+    )
+    X_unsorted = sp.csr_matrix((X.data[order], X.indices[order], X.indptr), X.shape)
+    X_unsorted.has_sorted_indices = False
+    indices = X_unsorted.indices.copy()
+
+    kmeans = KMeans(n_clusters=n_clusters, init=X[:n_clusters].toarray(), n_init=1)
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        labels = asnumpy(clone(kmeans).fit(X).labels_)
+        labels_unsorted = asnumpy(clone(kmeans).fit(X_unsorted).labels_)
+
+    assert_array_equal(labels, labels_unsorted)
+    # The matrix of the caller is not modified.
+    assert_array_equal(X_unsorted.indices, indices)
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+@pytest.mark.parametrize("init", ["k-means++", "random"])
+def test_kmeans_sparse_init(dtype, init):
+    random_seed = 42
+    n_clusters = 4
+    X = sp.random(
+        200, 30, density=0.2, format="csr", dtype=dtype, random_state=random_seed
+    )
+
+    kmeans = KMeans(
+        n_clusters=n_clusters,
+        init=init,
+        n_init=1,
+        max_iter=1,
+        random_state=random_seed,
+    )
+    engine = KMeansEngine(kmeans)
+    X_device, _, sample_weight = engine.prepare_fit(X)
+    centers_t = dpt.asnumpy(engine.init_centroids(X_device, sample_weight))
+
+    # The initial centers are distinct samples of X.
+    X_dense = X.toarray()
+    is_sample = (X_dense[:, None, :] == centers_t.T[None, :, :]).all(axis=2)
+    assert is_sample.any(axis=0).all()
+    assert len(np.unique(centers_t.T, axis=0)) == n_clusters
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_kmeans_random_init_sample_weight(dtype):
+    random_seed = 42
+    n_samples, n_features, n_clusters = 200, 3, 8
+    X = default_rng(random_seed).random((n_samples, n_features)).astype(dtype)
+    # Half of the samples have a zero weight.
+    sample_weight = np.zeros(n_samples, dtype=dtype)
+    sample_weight[::2] = default_rng(random_seed).random(n_samples // 2) + 0.5
+
+    def init_centers():
+        kmeans = KMeans(
+            n_clusters=n_clusters, init="random", n_init=1, random_state=random_seed
+        )
+        engine = KMeansEngine(kmeans)
+        X_device, _, sample_weight_device = engine.prepare_fit(
+            X, sample_weight=sample_weight
+        )
+        return dpt.asnumpy(engine.init_centroids(X_device, sample_weight_device)).T
+
+    centers = init_centers()
+
+    # The initial centers are distinct samples of X with a positive weight.
+    is_sample = (X[:, None, :] == centers[None, :, :]).all(axis=2)
+    assert is_sample.any(axis=0).all()
+    assert (sample_weight[is_sample.any(axis=1)] > 0).all()
+    assert len(np.unique(centers, axis=0)) == n_clusters
+
+    # The initialization is reproducible for a fixed random_state.
+    assert_array_equal(init_centers(), centers)
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+@pytest.mark.parametrize("convergence_check_interval", [2, 5])
+def test_lloyd_convergence_check_interval(dtype, convergence_check_interval):
+    random_seed = 42
+    n_clusters = 7
+    X, _ = make_blobs(n_samples=1000, n_features=3, centers=5, random_state=random_seed)
+    X = X.astype(dtype)
+    init_centers, _ = kmeans_plusplus(X, n_clusters, random_state=random_seed)
+
+    X_t = dpt.asarray(X.T, order="C")
+    sample_weight = dpt.ones(X.shape[0], dtype=dtype, device=X_t.device)
+
+    def _lloyd(convergence_check_interval):
+        return lloyd(
+            X_t,
+            sample_weight,
+            dpt.asarray(init_centers.T, order="C", device=X_t.device),
+            use_uniform_weights=True,
+            tol=0,
+            convergence_check_interval=convergence_check_interval,
+        )
+
+    labels, inertia, centers_t, n_iteration = _lloyd(1)
+    (
+        labels_interval,
+        inertia_interval,
+        centers_t_interval,
+        n_iteration_interval,
+    ) = _lloyd(convergence_check_interval)
+
+    # With `tol=0`, the algorithm stops at strict convergence, after which the
+    # additional iterations do not change the result.
+    assert_array_equal(dpt.asnumpy(labels), dpt.asnumpy(labels_interval))
+    assert_allclose(dpt.asnumpy(centers_t), dpt.asnumpy(centers_t_interval), rtol=1e-4)
+    assert_allclose(inertia, inertia_interval, rtol=1e-4)
+    assert (
+        n_iteration
+        <= n_iteration_interval
+        < n_iteration + (2 * convergence_check_interval)
+    )
+    assert n_iteration_interval % convergence_check_interval == 0
+
+
+def test_kmeans_convergence_check_interval():
+    random_seed = 42
+    n_clusters = 7
+    convergence_check_interval = 3
+    X, _ = make_blobs(n_samples=1000, n_features=3, centers=5, random_state=random_seed)
+    X = X.astype(np.float32)
+    init_centers, _ = kmeans_plusplus(X, n_clusters, random_state=random_seed)
+
+    kmeans = KMeans(
+        n_clusters=n_clusters, init=init_centers, n_init=1, tol=0, algorithm="lloyd"
+    )
+
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        kmeans_default = clone(kmeans).fit(X)
+        with kmeans_config_context(
+            convergence_check_interval=convergence_check_interval
+        ):
+            kmeans_interval = clone(kmeans).fit(X)
+
+    assert_array_equal(
+        asnumpy(kmeans_default.labels_), asnumpy(kmeans_interval.labels_)
+    )
+    assert_allclose(
+        asnumpy(kmeans_default.cluster_centers_),
+        asnumpy(kmeans_interval.cluster_centers_),
+        rtol=1e-4,
+    )
+    assert kmeans_default.n_iter_ <= kmeans_interval.n_iter_
+    assert kmeans_interval.n_iter_ % convergence_check_interval == 0
+
+    with pytest.raises(ValueError, match="convergence_check_interval"):
+        with kmeans_config_context(convergence_check_interval=0):
+            pass
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_lloyd_batched_same_results_as_lloyd(dtype):
+    random_seed = 42
+    n_clusters = 7
+    n_runs = 3
+    X, _ = make_blobs(n_samples=1000, n_features=3, centers=5, random_state=random_seed)
+    X = X.astype(dtype)
+    sample_weight = default_rng(random_seed).random(X.shape[0]).astype(dtype)
+
+    X_t = dpt.asarray(X.T, order="C")
+    sample_weight = dpt.asarray(sample_weight, device=X_t.device)
+    init_centers_t = np.stack(
+        [
+            kmeans_plusplus(X, n_clusters, random_state=random_seed + run_idx)[0].T
+            for run_idx in range(n_runs)
+        ]
+    )
+
+    # NB: a small `max_iter` ensures that the runs stop at different iterations.
+    batched_results = lloyd_batched(
+        X_t,
+        sample_weight,
+        dpt.asarray(init_centers_t, order="C", device=X_t.device),
+        max_iter=10,
+        tol=0,
+    )
+    assert len(batched_results) == n_runs
+
+    for run_idx, (
+        labels_batched,
+        inertia_batched,
+        centers_t_batched,
+        n_iteration_batched,
+    ) in enumerate(batched_results):
+        labels, inertia, centers_t, n_iteration = lloyd(
+            X_t,
+            sample_weight,
+            dpt.asarray(init_centers_t[run_idx], order="C", device=X_t.device),
+            use_uniform_weights=False,
+            max_iter=10,
+            tol=0,
+        )
+
+        assert_array_equal(dpt.asnumpy(labels), dpt.asnumpy(labels_batched))
+        assert_allclose(
+            dpt.asnumpy(centers_t), dpt.asnumpy(centers_t_batched), rtol=1e-4
+        )
+        assert_allclose(inertia, inertia_batched, rtol=1e-4)
+        assert n_iteration == n_iteration_batched
+
+
+def test_kmeans_batched_n_init_opt_in():
+    random_seed = 42
+    X, _ = make_blobs(n_samples=500, n_features=3, centers=5, random_state=random_seed)
+    X = X.astype(np.float32)
+
+    kmeans = KMeans(n_clusters=5, n_init=3, random_state=random_seed, tol=0)
+
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        engine = KMeansEngine(kmeans)
+        X_device = dpt.asarray(X)
+        # NB: the batched runs are opt-in.
+        assert engine._get_n_batched_runs(X_device) == 1
+        kmeans_sequential = clone(kmeans).fit(X)
+
+        with kmeans_config_context(batched_n_init=True):
+            assert engine._get_n_batched_runs(X_device) == 3
+            kmeans_batched = clone(kmeans).fit(X)
+
+    assert_array_equal(
+        asnumpy(kmeans_sequential.labels_), asnumpy(kmeans_batched.labels_)
+    )
+    assert_allclose(
+        asnumpy(kmeans_sequential.cluster_centers_),
+        asnumpy(kmeans_batched.cluster_centers_),
+        rtol=1e-4,
+    )
+    assert_allclose(kmeans_sequential.inertia_, kmeans_batched.inertia_, rtol=1e-4)
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_minibatch_kmeans_partial_fit(dtype):
+    rng = default_rng(42)
+    n_features = 4
+    n_clusters = 6
+    centers = rng.random((n_clusters, n_features)).astype(dtype)
+    cluster_weight_sums = np.zeros(n_clusters, dtype=dtype)
+
+    centers_t_device = dpt.asarray(centers.T, order="C")
+    cluster_weight_sums_device = dpt.asarray(cluster_weight_sums)
+
+    # NB: batches of different sizes are streamed from the host.
+    for batch_size in (50, 13, 100):
+        X = rng.random((batch_size, n_features)).astype(dtype)
+        sample_weight = rng.random(batch_size).astype(dtype)
+
+        centers_t_device, labels = minibatch_kmeans_partial_fit(
+            dpt.asarray(X.T, order="C"),
+            dpt.asarray(sample_weight),
+            centers_t_device,
+            cluster_weight_sums_device,
+        )
+
+        # Reference computation on host
+        expected_labels = (
+            ((X[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+        )
+        assert_array_equal(dpt.asnumpy(labels), expected_labels)
+        for cluster_idx in range(n_clusters):
+            mask = expected_labels == cluster_idx
+            batch_weight = sample_weight[mask].sum()
+            if batch_weight == 0:
+                continue
+            centers[cluster_idx] = (
+                centers[cluster_idx] * cluster_weight_sums[cluster_idx]
+                + (X[mask] * sample_weight[mask, None]).sum(axis=0)
+            ) / (cluster_weight_sums[cluster_idx] + batch_weight)
+            cluster_weight_sums[cluster_idx] += batch_weight
+
+        assert_allclose(dpt.asnumpy(centers_t_device).T, centers, rtol=1e-5)
+        assert_allclose(
+            dpt.asnumpy(cluster_weight_sums_device), cluster_weight_sums, rtol=1e-5
+        )
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_minibatch_kmeans_same_quality_as_lloyd(dtype):
+    random_seed = 42
+    n_clusters = 5
+    X, _ = make_blobs(
+        n_samples=5000,
+        n_features=4,
+        centers=n_clusters,
+        cluster_std=0.5,
+        random_state=random_seed,
+    )
+    X = X.astype(dtype)
+
+    kmeans = KMeans(n_clusters=n_clusters, random_state=random_seed, n_init=1)
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        kmeans.fit(X)
+
+    X_t = dpt.asarray(X.T, order="C")
+    sample_weight = dpt.ones(X.shape[0], dtype=dtype, device=X_t.device)
+    init_centers, _ = kmeans_plusplus(X, n_clusters, random_state=random_seed)
+    init_centers_t = dpt.asarray(init_centers.T, order="C")
+
+    labels, inertia, centers_t, n_steps = minibatch_kmeans(
+        X_t,
+        sample_weight,
+        init_centers_t,
+        batch_size=256,
+        max_iter=10,
+        random_state=random_seed,
+    )
+
+    assert n_steps == (10 * X.shape[0]) // 256
+    assert dpt.asnumpy(labels).shape == (X.shape[0],)
+    assert dpt.asnumpy(centers_t).shape == (X.shape[1], n_clusters)
+    assert inertia <= 1.1 * kmeans.inertia_
+
+
+def test_sample_batch_indices_with_fewer_states_than_indices():
+    n_samples, batch_size, n_states = 50, 1000, 7
+    device = dpctl.SyclDevice()
+    sample_batch_indices_kernel = make_sample_batch_indices_kernel(
+        n_samples, batch_size, n_states, device.max_work_group_size
+    )
+    states = create_xoroshiro128pp_states(n_states=n_states, seed=42, device=device)
+    batch_indices = dpt.full(batch_size, -1, dtype=np.int64, device=device)
+
+    sample_batch_indices_kernel(states, batch_indices)
+
+    # Each state draws several indices, and all the indices are drawn.
+    batch_indices = asnumpy(batch_indices)
+    assert batch_indices.min() >= 0
+    assert batch_indices.max() < n_samples
+    assert len(np.unique(batch_indices)) == n_samples
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_minibatch_kmeans_estimator_partial_fit(dtype):
+    rng = default_rng(42)
+    n_features = 4
+    n_clusters = 6
+    centers = rng.random((n_clusters, n_features)).astype(dtype)
+    cluster_weight_sums = np.zeros(n_clusters, dtype=dtype)
+
+    kmeans = MiniBatchKMeans(
+        n_clusters=n_clusters, init=centers, reassignment_ratio=0.0
+    )
+
+    # NB: batches of different sizes are streamed from the host.
+    for batch_size in (50, 13, 100):
+        X = rng.random((batch_size, n_features)).astype(dtype)
+        sample_weight = rng.random(batch_size).astype(dtype)
+
+        kmeans.partial_fit(X, sample_weight=sample_weight)
+
+        # Reference computation on host
+        expected_labels = (
+            ((X[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+        )
+        for cluster_idx in range(n_clusters):
+            mask = expected_labels == cluster_idx
+            batch_weight = sample_weight[mask].sum()
+            if batch_weight == 0:
+                continue
+            centers[cluster_idx] = (
+                centers[cluster_idx] * cluster_weight_sums[cluster_idx]
+                + (X[mask] * sample_weight[mask, None]).sum(axis=0)
+            ) / (cluster_weight_sums[cluster_idx] + batch_weight)
+            cluster_weight_sums[cluster_idx] += batch_weight
+
+        assert_allclose(asnumpy(kmeans.cluster_centers_), centers, rtol=1e-5)
+
+    assert kmeans.n_steps_ == 3
+    expected_labels = (
+        ((X[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2).argmin(axis=1)
+    )
+    assert_array_equal(asnumpy(kmeans.predict(X)), expected_labels)
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_minibatch_kmeans_estimator_fit(dtype):
+    random_seed = 42
+    n_clusters = 5
+    X, _ = make_blobs(
+        n_samples=5000,
+        n_features=4,
+        centers=n_clusters,
+        cluster_std=0.5,
+        random_state=random_seed,
+    )
+    X = X.astype(dtype)
+
+    kmeans_truth = KMeans(n_clusters=n_clusters, random_state=random_seed, n_init=1)
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        kmeans_truth.fit(X)
+
+    kmeans = MiniBatchKMeans(
+        n_clusters=n_clusters, batch_size=256, max_iter=10, random_state=random_seed
+    ).fit(X)
+
+    assert kmeans.n_steps_ == (10 * X.shape[0]) // 256
+    assert kmeans.n_iter_ == 10
+    assert kmeans.cluster_centers_.shape == (n_clusters, X.shape[1])
+    assert kmeans.inertia_ <= 1.1 * kmeans_truth.inertia_
+    assert_array_equal(asnumpy(kmeans.predict(X)), asnumpy(kmeans.labels_))
+    assert_allclose(-kmeans.score(X), kmeans.inertia_, rtol=1e-4)
+    assert kmeans.transform(X).shape == (X.shape[0], n_clusters)
+
+    # The fit is reproducible for a fixed random state.
+    kmeans_again = MiniBatchKMeans(
+        n_clusters=n_clusters, batch_size=256, max_iter=10, random_state=random_seed
+    ).fit(X)
+    assert_allclose(
+        asnumpy(kmeans_again.cluster_centers_), asnumpy(kmeans.cluster_centers_)
+    )
+
+
+def test_minibatch_kmeans_estimator_sklearn_api():
+    random_seed = 42
+    X, _ = make_blobs(n_samples=500, n_features=4, centers=3, random_state=random_seed)
+    X = X.astype(np.float32)
+
+    kmeans = MiniBatchKMeans(n_clusters=3, batch_size=64, random_state=random_seed)
+    cloned_kmeans = clone(kmeans).set_params(batch_size=128)
+    assert cloned_kmeans.get_params()["batch_size"] == 128
+    assert cloned_kmeans.get_params()["n_clusters"] == 3
+
+    labels = kmeans.fit_predict(X)
+    assert_array_equal(asnumpy(labels), asnumpy(kmeans.labels_))
+
+    pipeline = make_pipeline(StandardScaler(), clone(kmeans)).fit(X)
+    assert pipeline.predict(X).shape == (X.shape[0],)
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_minibatch_kmeans_estimator_reassignment(dtype):
+    # The third centroid is too far from the data to be assigned any sample. It is
+    # reassigned to a sample of the batch, unless the reassignment is disabled.
+    random_seed = 42
+    X, _ = make_blobs(n_samples=100, n_features=2, centers=2, random_state=random_seed)
+    X = X.astype(dtype)
+    init = np.array([X[0], X[-1], [1e3, 1e3]], dtype=dtype)
+
+    kmeans = MiniBatchKMeans(
+        n_clusters=3, init=init, reassignment_ratio=0.01, random_state=random_seed
+    ).partial_fit(X)
+    reassigned_center = asnumpy(kmeans.cluster_centers_)[2]
+    assert np.any(np.all(X == reassigned_center, axis=1))
+
+    kmeans = MiniBatchKMeans(
+        n_clusters=3, init=init, reassignment_ratio=0.0, random_state=random_seed
+    ).partial_fit(X)
+    assert_array_equal(asnumpy(kmeans.cluster_centers_)[2], init[2])
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_reassign_low_count_clusters(dtype):
+    rng = default_rng(42)
+    n_features, n_clusters, batch_size = 3, 6, 20
+    X_batch = rng.random((batch_size, n_features)).astype(dtype)
+    sample_weight_batch = rng.random(batch_size).astype(dtype)
+    centers = rng.random((n_clusters, n_features)).astype(dtype)
+    weight_sums = np.array([10, 0.01, 8, 0, 9, 0.02], dtype=dtype)
+    device = dpctl.SyclDevice()
+
+    centroids_t = dpt.asarray(centers.T, order="C", device=device)
+    cluster_weight_sums = dpt.asarray(weight_sums, device=device)
+    n_reassigns = reassign_low_count_clusters(
+        dpt.asarray(X_batch.T, order="C", device=device),
+        dpt.asarray(sample_weight_batch, device=device),
+        centroids_t,
+        cluster_weight_sums,
+        reassignment_ratio=0.01,
+        random_state=np.random.RandomState(42),
+    )
+
+    # The clusters 1, 3 and 5 are below 1% of the largest sum of weights. They are
+    # moved to distinct samples of the batch, and their sums of weights are set to
+    # the lowest sum of the other clusters.
+    assert n_reassigns == 3
+    new_centers = asnumpy(centroids_t).T
+    reassigned = [1, 3, 5]
+    kept = [0, 2, 4]
+    assert_array_equal(new_centers[kept], centers[kept])
+    is_batch_sample = np.all(
+        X_batch[None, :, :] == new_centers[reassigned, None], axis=2
+    )
+    assert np.all(is_batch_sample.sum(axis=1) == 1)
+    assert len(np.unique(is_batch_sample.argmax(axis=1))) == 3
+    expected_weight_sums = weight_sums.copy()
+    expected_weight_sums[reassigned] = 8
+    assert_array_equal(asnumpy(cluster_weight_sums), expected_weight_sums)
+
+
 @pytest.mark.parametrize("dtype", float_dtype_params)
 def test_kmeans_predict_centers(dtype):
     kmeans = KMeans(n_clusters=10)
@@ -408,7 +1111,6 @@ def test_error_raised_on_invalid_group_sizes():
 
     with pytest.raises(ValueError, match=expected_msg):
         make_compute_euclidean_distances_fixed_window_kernel(
-            n_samples,
             n_features,
             n_clusters,
             sub_group_size,
@@ -419,7 +1121,6 @@ def test_error_raised_on_invalid_group_sizes():
 
     with pytest.raises(ValueError, match=expected_msg):
         make_label_assignment_fixed_window_kernel(
-            n_samples,
             n_features,
             n_clusters,
             sub_group_size,
@@ -445,6 +1146,252 @@ def test_error_raised_on_invalid_group_sizes():
         )
 
 
+@pytest.mark.parametrize("dtype", float_dtype_params)
+@pytest.mark.parametrize(
+    "n_samples, n_clusters, use_single_private_copy",
+    [(50, 20, True), (10_000, 3, False)],
+)
+def test_lloyd_single_private_copy(
+    dtype, n_samples, n_clusters, use_single_private_copy
+):
+    random_seed = 42
+    X, _ = make_blobs(
+        n_samples=n_samples, n_features=2, centers=3, random_state=random_seed
+    )
+    X = X.astype(dtype)
+    init_centers, _ = kmeans_plusplus(X, n_clusters, random_state=random_seed)
+    device = dpctl.SyclDevice()
+
+    n_centroids_private_copies, _ = make_lloyd_single_step_fixed_window_kernel(
+        n_samples,
+        n_features=2,
+        n_clusters=n_clusters,
+        return_assignments=True,
+        check_strict_convergence=True,
+        sub_group_size=8,
+        work_group_size="max",
+        dtype=dtype,
+        device=device,
+    )
+    assert (n_centroids_private_copies == 1) == use_single_private_copy
+
+    X_t = dpt.asarray(X.T, order="C", device=device)
+    labels, inertia, centers_t, _ = lloyd(
+        X_t,
+        dpt.ones(n_samples, dtype=dtype, device=device),
+        dpt.asarray(init_centers.T, order="C", device=device),
+        use_uniform_weights=True,
+        tol=0,
+    )
+
+    kmeans = KMeans(
+        n_clusters=n_clusters, init=init_centers, n_init=1, tol=0, algorithm="lloyd"
+    ).fit(X)
+    assert_array_equal(dpt.asnumpy(labels), kmeans.labels_)
+    assert_allclose(dpt.asnumpy(centers_t).T, kmeans.cluster_centers_, rtol=1e-4)
+    assert_allclose(inertia, kmeans.inertia_, rtol=1e-4)
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+@pytest.mark.parametrize("centroid_update", ["private_copies", "segmented"])
+@pytest.mark.parametrize("n_samples, n_clusters", [(50, 20), (10_000, 3)])
+def test_lloyd_centroid_update(dtype, centroid_update, n_samples, n_clusters):
+    random_seed = 42
+    X, _ = make_blobs(
+        n_samples=n_samples, n_features=5, centers=3, random_state=random_seed
+    )
+    X = X.astype(dtype)
+    sample_weight = default_rng(random_seed).random(n_samples, dtype=dtype)
+    init_centers, _ = kmeans_plusplus(X, n_clusters, random_state=random_seed)
+    device = dpctl.SyclDevice()
+
+    labels, inertia, centers_t, _ = lloyd(
+        dpt.asarray(X.T, order="C", device=device),
+        dpt.asarray(sample_weight, device=device),
+        dpt.asarray(init_centers.T, order="C", device=device),
+        use_uniform_weights=False,
+        tol=0,
+        centroid_update=centroid_update,
+    )
+
+    kmeans = KMeans(
+        n_clusters=n_clusters, init=init_centers, n_init=1, tol=0, algorithm="lloyd"
+    ).fit(X, sample_weight=sample_weight)
+    assert_array_equal(dpt.asnumpy(labels), kmeans.labels_)
+    assert_allclose(dpt.asnumpy(centers_t).T, kmeans.cluster_centers_, rtol=1e-4)
+    assert_allclose(inertia, kmeans.inertia_, rtol=1e-4)
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_kmeans_memory_budget(dtype):
+    random_seed = 42
+    n_samples, n_features, n_clusters = 10_000, 4, 3
+    X, _ = make_blobs(
+        n_samples=n_samples,
+        n_features=n_features,
+        centers=n_clusters,
+        random_state=random_seed,
+    )
+    X = X.astype(dtype)
+    device = dpctl.SyclDevice()
+
+    default_plan = plan_kmeans_fit(
+        n_samples, n_features, n_clusters, dtype=dtype, device=device
+    )
+    assert default_plan.peak_nbytes == sum(default_plan.buffers.values())
+    assert default_plan.buffers["X_t"] == X.nbytes
+    # The scratch memory of the relocation of empty clusters is planned too.
+    assert default_plan.buffers["relocate_empty_clusters"] > n_samples * X.itemsize
+    if default_plan.n_centroids_private_copies == 1:
+        pytest.skip(f"The device {device.name} does not use private copies.")
+
+    # With a budget that is slightly too small for the default plan, the centroids are
+    # updated with a segmented reduction rather than in private copies, and the
+    # results are unchanged.
+    reduced_plan = plan_kmeans_fit(
+        n_samples,
+        n_features,
+        n_clusters,
+        dtype=dtype,
+        device=device,
+        memory_budget=default_plan.peak_nbytes - 1,
+    )
+    assert default_plan.centroid_update == "private_copies"
+    assert reduced_plan.centroid_update == "segmented"
+    assert "centroids_private_copies" not in reduced_plan.buffers
+    assert reduced_plan.peak_nbytes < default_plan.peak_nbytes
+
+    kmeans = KMeans(n_clusters=n_clusters, n_init=1, random_state=random_seed, tol=0)
+    kmeans_truth = clone(kmeans).fit(X)
+    try:
+        set_memory_budget(reduced_plan.peak_nbytes)
+        with config_context(engine_provider="sklearn_numba_dpex"):
+            kmeans.fit(X)
+
+        # With a budget that is the size of the data, the data is streamed to the
+        # device for the prediction.
+        set_memory_budget(X.nbytes)
+        predict_plan = plan_kmeans_predict(
+            n_samples, n_features, n_clusters, dtype=dtype, device=device
+        )
+        assert predict_plan.chunk_size is not None
+        assert predict_plan.peak_nbytes <= X.nbytes
+        with config_context(engine_provider="sklearn_numba_dpex"):
+            labels = kmeans.predict(X)
+            score = kmeans.score(X)
+
+        # With a budget that can't even hold the labels, a fit is not possible.
+        set_memory_budget(n_samples)
+        with config_context(engine_provider="sklearn_numba_dpex"):
+            with pytest.raises(MemoryError, match="exceeds the memory budget"):
+                clone(kmeans).fit(X)
+    finally:
+        set_memory_budget(None)
+
+    assert_array_equal(asnumpy(kmeans.labels_), kmeans_truth.labels_)
+    assert_allclose(asnumpy(kmeans.cluster_centers_), kmeans_truth.cluster_centers_)
+    assert_array_equal(asnumpy(labels), kmeans_truth.labels_)
+    assert_allclose(score, kmeans_truth.score(X), rtol=1e-4)
+
+
+def test_kmeans_plan_uses_segmented_update_for_large_n_clusters():
+    device = dpctl.SyclDevice()
+    if device.max_compute_units == 1:
+        pytest.skip(f"The device {device.name} does not use private copies.")
+    n_samples, n_features = 10_000, 4
+
+    small_plan = plan_kmeans_fit(n_samples, n_features, 8, device=device)
+    assert small_plan.centroid_update == "private_copies"
+
+    # The private copies would be larger than the data, while there are few samples
+    # per cluster to collide.
+    n_features = 64
+    large_plan = plan_kmeans_fit(n_samples, n_features, 5000, device=device)
+    assert large_plan.centroid_update == "segmented"
+    assert "segmented_update" in large_plan.buffers
+    assert "centroids_private_copies" not in large_plan.buffers
+
+
+def test_kmeans_elkan_plan_uses_hamerly_for_small_n_clusters_only():
+    device = dpctl.SyclDevice()
+    n_samples, n_features = 10_000, 4
+
+    small_plan = plan_kmeans_fit(
+        n_samples, n_features, 8, device=device, algorithm="elkan"
+    )
+    assert "hamerly_bounds" in small_plan.buffers
+    assert "centroid_sq_distances" in small_plan.buffers
+
+    large_plan = plan_kmeans_fit(
+        n_samples, n_features, 1024, device=device, algorithm="elkan"
+    )
+    assert "hamerly_bounds" not in large_plan.buffers
+    assert (
+        large_plan.buffers
+        == plan_kmeans_fit(
+            n_samples, n_features, 1024, device=device, algorithm="lloyd"
+        ).buffers
+    )
+
+
+def test_kmeans_elkan_warns_for_large_n_clusters():
+    random_seed = 42
+    n_clusters = 129
+    X, _ = make_blobs(n_samples=1000, n_features=4, random_state=random_seed)
+
+    kmeans = KMeans(
+        n_clusters=n_clusters,
+        algorithm="elkan",
+        n_init=1,
+        random_state=random_seed,
+        tol=0,
+    )
+    kmeans_lloyd = clone(kmeans).set_params(algorithm="lloyd")
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        with pytest.warns(UserWarning, match="Lloyd's algorithm is used instead"):
+            kmeans.fit(X)
+        kmeans_lloyd.fit(X)
+
+    assert_array_equal(asnumpy(kmeans.labels_), asnumpy(kmeans_lloyd.labels_))
+    assert_allclose(
+        asnumpy(kmeans.cluster_centers_), asnumpy(kmeans_lloyd.cluster_centers_)
+    )
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_predict_kernels_do_not_depend_on_n_samples(dtype):
+    rng = default_rng(42)
+    n_features = 3
+    n_clusters = 5
+    centroids = rng.random((n_clusters, n_features), dtype=dtype)
+    centroids_t = dpt.asarray(centroids.T, order="C")
+
+    cache_misses = None
+    for n_samples in (17, 100, 1):
+        X = rng.random((n_samples, n_features), dtype=dtype)
+        X_t = dpt.asarray(X.T, order="C")
+        sample_weight = dpt.ones(n_samples, dtype=dtype, device=X_t.device)
+
+        labels, _ = get_labels_inertia(X_t, centroids_t, sample_weight, True)
+        distances = get_euclidean_distances(X_t, centroids_t)
+
+        expected_distances = np.sqrt(
+            ((X[:, None, :] - centroids[None, :, :]) ** 2).sum(axis=2)
+        )
+        assert_allclose(dpt.asnumpy(distances), expected_distances, rtol=1e-4)
+        assert_array_equal(dpt.asnumpy(labels), expected_distances.argmin(axis=1))
+
+        # After the first iteration, a change of n_samples must not trigger new
+        # compilations of the kernels.
+        new_cache_misses = (
+            make_label_assignment_fixed_window_kernel.cache_info().misses,
+            make_compute_euclidean_distances_fixed_window_kernel.cache_info().misses,
+        )
+        if cache_misses is not None:
+            assert new_cache_misses == cache_misses
+        cache_misses = new_cache_misses
+
+
 def test_get_nb_distinct_clusters_kernel():
     labels = [0, 1, 0, 2, 2, 7, 6, 5, 3, 3]  # NB: all values up to 7 except 4
     expected_nb_distinct_clusters = 7
@@ -455,3 +1402,182 @@ def test_get_nb_distinct_clusters_kernel():
     actual_nb_distinct_clusters = int(get_nb_distinct_clusters(labels, n_clusters))
 
     assert actual_nb_distinct_clusters == expected_nb_distinct_clusters
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_iter_kmeans_predict(dtype):
+    random_seed = 42
+    n_samples, n_features, n_clusters, n_nearest = 1000, 4, 5, 3
+    X, _ = make_blobs(
+        n_samples=n_samples,
+        n_features=n_features,
+        centers=n_clusters,
+        random_state=random_seed,
+    )
+    X = X.astype(dtype)
+    kmeans = KMeans(n_clusters=n_clusters, n_init=1, random_state=random_seed).fit(X)
+    expected_distances = kmeans.transform(X)
+    expected_nearest = np.argsort(expected_distances, axis=1)[:, :n_nearest]
+
+    # The data is streamed from an array, or from an iterator of chunks.
+    for X_stream in [X, (X[start : start + 300] for start in range(0, n_samples, 300))]:
+        labels = np.concatenate(
+            list(iter_kmeans_predict(kmeans, X_stream, chunk_size=300))
+        )
+        assert_array_equal(labels, kmeans.predict(X))
+
+    distances = np.concatenate(
+        list(iter_kmeans_predict(kmeans, X, output="distances", chunk_size=300))
+    )
+    assert_allclose(distances, expected_distances, rtol=1e-4)
+
+    nearest_distances, nearest_labels = map(
+        np.concatenate,
+        zip(
+            *iter_kmeans_predict(
+                kmeans, X, output="nearest", n_nearest=n_nearest, chunk_size=300
+            )
+        ),
+    )
+    assert_array_equal(nearest_labels, expected_nearest)
+    assert_allclose(
+        nearest_distances,
+        np.take_along_axis(expected_distances, expected_nearest, axis=1),
+        rtol=1e-4,
+    )
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_kmeans_predict_reuses_fitted_state(dtype):
+    random_seed = 42
+    X, _ = make_blobs(n_samples=500, n_features=4, centers=3, random_state=random_seed)
+    X = X.astype(dtype)
+    kmeans = KMeans(n_clusters=3, n_init=1, random_state=random_seed)
+
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        kmeans.fit(X)
+        labels = asnumpy(kmeans.predict(X))
+        fitted_state = _fitted_states[kmeans]
+
+        # The centroids and their norms are copied and computed only once.
+        assert_array_equal(asnumpy(kmeans.predict(X[:100])), labels[:100])
+        kmeans.transform(X)
+        assert _fitted_states[kmeans] is fitted_state
+
+        # The state holds a copy of the centroids.
+        cluster_centers = asnumpy(kmeans.cluster_centers_)
+        assert_array_equal(asnumpy(fitted_state.centroids_t).T, cluster_centers)
+        if isinstance(kmeans.cluster_centers_, dpt.usm_ndarray):
+            kmeans.cluster_centers_[...] = 0
+            assert_array_equal(asnumpy(fitted_state.centroids_t).T, cluster_centers)
+            kmeans.cluster_centers_[...] = dpt.asarray(
+                cluster_centers, device=kmeans.cluster_centers_.device
+            )
+
+        # Assigning new centroids invalidates the state.
+        kmeans.cluster_centers_ = asnumpy(kmeans.cluster_centers_)[::-1].copy()
+        reversed_labels = asnumpy(kmeans.predict(X))
+        assert _fitted_states[kmeans] is not fitted_state
+
+        # So does a new fit.
+        fitted_state = _fitted_states[kmeans]
+        kmeans.fit(X)
+        kmeans.predict(X)
+        assert _fitted_states[kmeans] is not fitted_state
+
+    assert_array_equal(reversed_labels, 2 - labels)
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_kmeans_fit_transform_single_pass(dtype):
+    random_seed = 42
+    X, _ = make_blobs(n_samples=500, n_features=4, centers=3, random_state=random_seed)
+    X = X.astype(dtype)
+    kmeans = KMeans(n_clusters=3, n_init=1, random_state=random_seed)
+
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        # NB: the distances are only computed during the fit if it is enabled, else
+        # the labels of the fit are computed with the assignment kernel.
+        with profiling.record() as profile:
+            kmeans.fit_transform(X)
+        assert any(
+            kernel_name.endswith("make_label_assignment_fixed_window_kernel")
+            for kernel_name in profile.summary()
+        )
+
+        with kmeans_config_context(fused_fit_transform=True), profiling.record() as (
+            profile
+        ):
+            distances = asnumpy(kmeans.fit_transform(X))
+        expected_distances = asnumpy(kmeans.transform(X))
+        expected_labels = asnumpy(kmeans.predict(X))
+
+    # The distances are computed in the final pass of the fit, the labels are
+    # derived from the distances, and the data is not read again by `transform`.
+    summary = profile.summary()
+    distances_kernel_name, *_ = (
+        kernel_name
+        for kernel_name in summary
+        if kernel_name.endswith("make_compute_euclidean_distances_fixed_window_kernel")
+    )
+    assert summary[distances_kernel_name]["n_launches"] == 1
+    assert not any(
+        kernel_name.endswith("make_label_assignment_fixed_window_kernel")
+        for kernel_name in summary
+    )
+
+    assert_allclose(distances, expected_distances, rtol=1e-4)
+    assert_array_equal(asnumpy(kmeans.labels_), expected_labels)
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_kmeans_parallel_init(dtype):
+    random_seed = 42
+    n_samples, n_features, n_clusters = 5000, 4, 20
+    X, _ = make_blobs(
+        n_samples=n_samples,
+        n_features=n_features,
+        centers=n_clusters,
+        random_state=random_seed,
+    )
+    X = X.astype(dtype)
+
+    # The centers are distinct samples of the data.
+    centers = asnumpy(kmeans_parallel_init(X, n_clusters, random_state=random_seed))
+    assert centers.shape == (n_clusters, n_features)
+    assert len(np.unique(centers, axis=0)) == n_clusters
+    assert (centers[:, None, :] == X[None, :, :]).all(axis=2).any(axis=1).all()
+
+    # The initialization is better than a random initialization.
+    def potential(centers):
+        sq_distances = ((X[:, None, :] - centers[None, :, :]) ** 2).sum(axis=2)
+        return sq_distances.min(axis=1).sum()
+
+    random_centers = default_rng(random_seed).choice(X, size=n_clusters, replace=False)
+    assert potential(centers) < potential(random_centers)
+
+    # The candidates are padded to a fixed number, so that the k-means++ selection
+    # among the candidates is not compiled again for another number of candidates.
+    misses = make_kmeansplusplus_single_step_fixed_window_kernel.cache_info().misses
+    for seed in range(3):
+        kmeans_parallel_init(X, n_clusters, random_state=seed)
+    assert (
+        make_kmeansplusplus_single_step_fixed_window_kernel.cache_info().misses
+        == misses
+    )
+
+    kmeans = KMeans(
+        n_clusters=n_clusters,
+        init=kmeans_parallel_init,
+        n_init=1,
+        random_state=random_seed,
+    )
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        kmeans.fit(X)
+
+    assert len(np.unique(asnumpy(kmeans.labels_))) == n_clusters
+
+    # k-means|| falls back to k-means++ for sparse data.
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        with pytest.warns(UserWarning, match="only supported for dense data"):
+            clone(kmeans).fit(sp.csr_matrix(X))
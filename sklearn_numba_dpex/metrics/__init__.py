@@ -0,0 +1,11 @@
+from ._pairwise import (
+    pairwise_distances,
+    pairwise_distances_argmin_min,
+    pairwise_distances_chunked,
+)
+
+__all__ = (
+    "pairwise_distances",
+    "pairwise_distances_argmin_min",
+    "pairwise_distances_chunked",
+)
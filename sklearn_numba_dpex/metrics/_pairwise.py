@@ -0,0 +1,210 @@
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.common._memory import _check_memory_budget, get_memory_budget
+from sklearn_numba_dpex.common._utils import _get_input_device_and_dtype, _to_device
+
+_METRICS = ("euclidean", "sqeuclidean")
+_REDUCTIONS = (None, "min", "argmin", "argmin_min", "topk")
+
+
+def pairwise_distances(
+    X,
+    Y=None,
+    metric="euclidean",
+    reduce=None,
+    k=1,
+    chunk_size=None,
+    memory_budget=None,
+):
+    """Compute the distances between the rows of `X` and the rows of `Y` on device,
+    optionally reduced for each row of `X`.
+
+    The distances are computed by chunks of rows of `X` with the matmul kernel. The
+    `min` and `argmin` reductions are fused in the matmul kernel, and the `topk`
+    reduction is computed on the fly by tiles with the top-k kernel (see
+    `sklearn_numba_dpex.kneighbors`), so that the full distance matrix is never
+    stored.
+
+    Parameters
+    ----------
+    X : array-like of shape (n_samples_X, n_features)
+        Data that is not already on device is copied to the default device.
+
+    Y : array-like of shape (n_samples_Y, n_features) or None
+        Copied to the device of `X` if needed. If None, `Y` is `X`.
+
+    metric : {"euclidean", "sqeuclidean"}
+        The euclidean distance or the squared euclidean distance.
+
+    reduce : {None, "min", "argmin", "argmin_min", "topk"}
+        The reduction that is applied to the distances of each row of `X` to the rows
+        of `Y`:
+
+        - `None`: no reduction, the distance matrix is returned,
+        - `"min"`: the distance to the closest row of `Y`,
+        - `"argmin"`: the index of the closest row of `Y`,
+        - `"argmin_min"`: a tuple `(argmin, min)`, as in
+          `sklearn.metrics.pairwise_distances_argmin_min`,
+        - `"topk"`: a tuple `(distances, indices)` of arrays of shape
+          (n_samples_X, k) with the distances to the `k` closest rows of `Y` and their
+          indices, sorted by increasing distance.
+
+    k : int
+        The number of closest rows of `Y` if `reduce="topk"`.
+
+    chunk_size : int or None
+        The number of rows of `X` that are processed at a time. If None, the largest
+        chunk size such that the device buffers fit in a quarter of the memory budget
+        is used.
+
+    memory_budget : int or None
+        The memory budget in bytes that is used to choose `chunk_size`. If None, the
+        budget set with `sklearn_numba_dpex.set_memory_budget` is used.
+
+    Returns
+    -------
+    result : numpy.ndarray or tuple of numpy.ndarray
+        The distances or their reduction, see `reduce`.
+    """
+    if reduce not in _REDUCTIONS:
+        raise ValueError(f"Expected reduce to be one of {_REDUCTIONS}, got {reduce}.")
+
+    if reduce is None:
+        return np.concatenate(
+            list(
+                pairwise_distances_chunked(
+                    X,
+                    Y,
+                    metric=metric,
+                    chunk_size=chunk_size,
+                    memory_budget=memory_budget,
+                )
+            )
+        )
+
+    _check_metric(metric)
+
+    if reduce == "topk":
+        from sklearn_numba_dpex.neighbors._kneighbors import kneighbors
+
+        distances, indices = kneighbors(
+            Y if Y is not None else X,
+            X,
+            n_neighbors=k,
+            query_chunk_size=chunk_size,
+            memory_budget=memory_budget,
+        )
+        if metric == "sqeuclidean":
+            distances **= 2
+        return distances, indices
+
+    from sklearn_numba_dpex.metrics.drivers import (
+        pairwise_distances_argmin_min as _pairwise_distances_argmin_min,
+    )
+
+    X, Y = _validate_data(X, Y)
+    # NB: the partial reductions of the work groups are much smaller than the chunks
+    # of distances, the chunk size of `pairwise_distances_chunked` is an upper bound.
+    chunk_size = _get_chunk_size(X, Y, chunk_size, memory_budget)
+    argmin, min_distances = _pairwise_distances_argmin_min(
+        X, Y, metric == "sqeuclidean", chunk_size
+    )
+
+    if reduce == "min":
+        return dpt.asnumpy(min_distances)
+    if reduce == "argmin":
+        return dpt.asnumpy(argmin)
+    return dpt.asnumpy(argmin), dpt.asnumpy(min_distances)
+
+
+def pairwise_distances_argmin_min(
+    X, Y, metric="euclidean", chunk_size=None, memory_budget=None
+):
+    """Compute, for each row of `X`, the index of the closest row of `Y` and the
+    distance to this row, without storing the full distance matrix.
+
+    Equivalent to `pairwise_distances(X, Y, metric, reduce="argmin_min")`.
+
+    Returns
+    -------
+    argmin : numpy.ndarray of shape (n_samples_X,)
+
+    distances : numpy.ndarray of shape (n_samples_X,)
+    """
+    return pairwise_distances(
+        X,
+        Y,
+        metric=metric,
+        reduce="argmin_min",
+        chunk_size=chunk_size,
+        memory_budget=memory_budget,
+    )
+
+
+def pairwise_distances_chunked(
+    X, Y=None, metric="euclidean", chunk_size=None, memory_budget=None
+):
+    """Generate the distance matrix chunk by chunk of rows of `X`, with bounded device
+    memory.
+
+    The parameters are the same than for `pairwise_distances`.
+
+    Yields
+    ------
+    distances : numpy.ndarray of shape (n_samples_chunk, n_samples_Y)
+        The distances of the next chunk of rows of `X` to the rows of `Y`.
+    """
+    # NB: the arguments are validated eagerly, rather than when the first chunk is
+    # requested.
+    _check_metric(metric)
+    X, Y = _validate_data(X, Y)
+
+    chunk_size = _get_chunk_size(X, Y, chunk_size, memory_budget)
+
+    return _iter_pairwise_distances_chunks(X, Y, metric, chunk_size)
+
+
+def _iter_pairwise_distances_chunks(X, Y, metric, chunk_size):
+    # NB: imported lazily so that importing `sklearn_numba_dpex` does not import
+    # `numba_dpex`.
+    from sklearn_numba_dpex.metrics.drivers import iter_pairwise_distances
+
+    for _, _, distances in iter_pairwise_distances(
+        X, Y, metric == "sqeuclidean", chunk_size
+    ):
+        yield dpt.asnumpy(distances)
+
+
+def _get_chunk_size(X, Y, chunk_size, memory_budget):
+    if chunk_size is not None:
+        return chunk_size
+
+    device = X.device.sycl_device
+    if memory_budget is None:
+        memory_budget = get_memory_budget(device)
+    else:
+        memory_budget = _check_memory_budget(memory_budget)
+    # NB: the buffers whose size depends on the chunk size are the augmented rows of
+    # the chunk, and the chunk of distances.
+    per_sample_nbytes = (X.shape[1] + 2 + Y.shape[0]) * X.dtype.itemsize
+    return max((memory_budget // 4) // per_sample_nbytes, 1)
+
+
+def _check_metric(metric):
+    if metric not in _METRICS:
+        raise ValueError(f"Expected metric to be one of {_METRICS}, got {metric}.")
+
+
+def _validate_data(X, Y):
+    X, device, dtype = _get_input_device_and_dtype(X)
+    X = _to_device(X, dtype, device)
+    Y = X if Y is None else _to_device(Y, dtype, device)
+
+    if X.ndim != 2 or Y.ndim != 2 or X.shape[1] != Y.shape[1]:
+        raise ValueError(
+            "Expected X and Y to be 2D arrays with the same number of features, got "
+            f"shapes {X.shape} and {Y.shape}."
+        )
+
+    return X, Y
@@ -0,0 +1,159 @@
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.common._utils import _positive_part, _sqrt_of_positive_part
+from sklearn_numba_dpex.common.kernels import make_sq_distances_operands_kernel
+from sklearn_numba_dpex.common.matmul import make_matmul_2d_kernel
+
+
+def iter_pairwise_distances(X, Y, squared, chunk_size):
+    """Compute the euclidean distances between the rows of `X` and the rows of `Y`, by
+    chunks of `chunk_size` rows of `X`.
+
+    The distances are computed with the matmul kernel on operands augmented with the
+    squared norms of the rows (see `make_sq_distances_operands_kernel`), and the
+    square root is fused in the matmul kernel, so that a chunk of distances is computed
+    with a single pass. Only one chunk of distances is stored on device at a time.
+
+    Yields `(start, stop, distances)`, where `distances` is the device array of shape
+    (stop - start, n_samples_Y) of the distances of the rows `X[start:stop]`, that is
+    overwritten at the next iteration.
+    """
+    compute_dtype = X.dtype.type
+    n_samples_X, n_features = X.shape
+    n_samples_Y = Y.shape[0]
+    device = X.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+    chunk_size = min(chunk_size, n_samples_X)
+
+    left_operands_kernel = make_sq_distances_operands_kernel(
+        n_features, True, max_work_group_size, compute_dtype
+    )
+    right_operands_kernel = make_sq_distances_operands_kernel(
+        n_features, False, max_work_group_size, compute_dtype
+    )
+
+    right_operands = dpt.empty(
+        (n_samples_Y, n_features + 2), dtype=compute_dtype, device=device
+    )
+    right_operands_kernel(
+        Y,
+        # OUT
+        right_operands,
+    )
+
+    left_operands = dpt.empty(
+        (chunk_size, n_features + 2), dtype=compute_dtype, device=device
+    )
+    # NB: the chunks of distances are C-contiguous views on a flat buffer, including
+    # the smaller last chunk.
+    distances_buffer = dpt.empty(
+        (chunk_size * n_samples_Y,), dtype=compute_dtype, device=device
+    )
+
+    for start in range(0, n_samples_X, chunk_size):
+        stop = min(start + chunk_size, n_samples_X)
+        n_chunk_samples = stop - start
+
+        chunk_left_operands = left_operands[:n_chunk_samples]
+        left_operands_kernel(
+            X[start:stop],
+            # OUT
+            chunk_left_operands,
+        )
+
+        # NB: the squared distances can be slightly negative because of rounding
+        # errors.
+        matmul_kernel = make_matmul_2d_kernel(
+            n_chunk_samples,
+            n_samples_Y,
+            n_features + 2,
+            compute_dtype,
+            device,
+            out_fused_elementwise_fn=(
+                _positive_part if squared else _sqrt_of_positive_part
+            ),
+        )
+        distances = dpt.reshape(
+            distances_buffer[: n_chunk_samples * n_samples_Y],
+            (n_chunk_samples, n_samples_Y),
+        )
+        matmul_kernel(
+            chunk_left_operands,
+            right_operands,
+            # OUT
+            distances,
+        )
+
+        yield start, stop, distances
+
+
+def pairwise_distances_argmin_min(X, Y, squared, chunk_size):
+    """For each row of `X`, find the closest row of `Y` and the distance to this row,
+    by chunks of `chunk_size` rows of `X`.
+
+    The distances are reduced with the row reduction epilogue of the matmul kernel, so
+    that the distances are never written to global memory.
+
+    Returns `(argmin, min_distances)`, two device arrays of shape (n_samples_X,).
+    """
+    compute_dtype = X.dtype.type
+    n_samples_X, n_features = X.shape
+    n_samples_Y = Y.shape[0]
+    device = X.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+    chunk_size = min(chunk_size, n_samples_X)
+
+    left_operands_kernel = make_sq_distances_operands_kernel(
+        n_features, True, max_work_group_size, compute_dtype
+    )
+    right_operands_kernel = make_sq_distances_operands_kernel(
+        n_features, False, max_work_group_size, compute_dtype
+    )
+
+    right_operands = dpt.empty(
+        (n_samples_Y, n_features + 2), dtype=compute_dtype, device=device
+    )
+    right_operands_kernel(
+        Y,
+        # OUT
+        right_operands,
+    )
+
+    left_operands = dpt.empty(
+        (chunk_size, n_features + 2), dtype=compute_dtype, device=device
+    )
+    argmin = dpt.empty((n_samples_X,), dtype=np.int64, device=device)
+    min_distances = dpt.empty((n_samples_X,), dtype=compute_dtype, device=device)
+
+    for start in range(0, n_samples_X, chunk_size):
+        stop = min(start + chunk_size, n_samples_X)
+        n_chunk_samples = stop - start
+
+        chunk_left_operands = left_operands[:n_chunk_samples]
+        left_operands_kernel(
+            X[start:stop],
+            # OUT
+            chunk_left_operands,
+        )
+
+        matmul_argmin_kernel = make_matmul_2d_kernel(
+            n_chunk_samples,
+            n_samples_Y,
+            n_features + 2,
+            compute_dtype,
+            device,
+            out_fused_elementwise_fn=(
+                _positive_part if squared else _sqrt_of_positive_part
+            ),
+            out_row_reduction="argmin",
+        )
+        matmul_argmin_kernel(
+            chunk_left_operands,
+            right_operands,
+            # OUT
+            min_distances[start:stop],
+            argmin[start:stop],
+        )
+
+    return argmin, min_distances
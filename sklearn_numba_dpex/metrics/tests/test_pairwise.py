@@ -0,0 +1,98 @@
+import dpctl.tensor as dpt
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+from sklearn.metrics import pairwise_distances as sklearn_pairwise_distances
+from sklearn.utils._testing import assert_allclose
+
+from sklearn_numba_dpex.metrics import (
+    pairwise_distances,
+    pairwise_distances_argmin_min,
+    pairwise_distances_chunked,
+)
+from sklearn_numba_dpex.testing.config import float_dtype_params
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+@pytest.mark.parametrize("metric", ["euclidean", "sqeuclidean"])
+@pytest.mark.parametrize("chunk_size", [None, 1, 7])
+def test_pairwise_distances(dtype, metric, chunk_size):
+    rng = np.random.default_rng(42)
+    X = rng.random((50, 6)).astype(dtype)
+    Y = rng.random((30, 6)).astype(dtype)
+
+    expected_distances = sklearn_pairwise_distances(X, Y, metric=metric)
+
+    distances = pairwise_distances(
+        dpt.asarray(X), Y, metric=metric, chunk_size=chunk_size
+    )
+    assert distances.shape == (50, 30)
+    assert_allclose(expected_distances, distances, rtol=1e-4, atol=1e-4)
+
+    chunks = list(pairwise_distances_chunked(X, Y, metric=metric, chunk_size=7))
+    assert [len(chunk) for chunk in chunks] == [7] * 7 + [1]
+    assert_allclose(expected_distances, np.concatenate(chunks), rtol=1e-4, atol=1e-4)
+
+    # The distances of a set of samples to itself.
+    assert_allclose(
+        sklearn_pairwise_distances(X, metric=metric),
+        pairwise_distances(X, metric=metric, chunk_size=chunk_size),
+        rtol=1e-4,
+        atol=1e-3,
+    )
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+@pytest.mark.parametrize("metric", ["euclidean", "sqeuclidean"])
+def test_pairwise_distances_reductions(dtype, metric):
+    rng = np.random.default_rng(42)
+    X = rng.random((50, 6)).astype(dtype)
+    Y = rng.random((30, 6)).astype(dtype)
+
+    expected_distances = sklearn_pairwise_distances(X, Y, metric=metric)
+    expected_argmin = expected_distances.argmin(axis=1)
+    expected_min = expected_distances.min(axis=1)
+
+    assert_array_equal(
+        expected_argmin, pairwise_distances(X, Y, metric=metric, reduce="argmin")
+    )
+    assert_allclose(
+        expected_min,
+        pairwise_distances(X, Y, metric=metric, reduce="min"),
+        rtol=1e-4,
+        atol=1e-5,
+    )
+
+    argmin, min_distances = pairwise_distances_argmin_min(X, Y, metric=metric)
+    assert_array_equal(expected_argmin, argmin)
+    assert_allclose(expected_min, min_distances, rtol=1e-4, atol=1e-5)
+
+    distances, indices = pairwise_distances(X, Y, metric=metric, reduce="topk", k=3)
+    expected_indices = np.argsort(expected_distances, axis=1)[:, :3]
+    assert_array_equal(expected_indices, indices)
+    assert_allclose(
+        np.take_along_axis(expected_distances, expected_indices, axis=1),
+        distances,
+        rtol=1e-4,
+        atol=1e-5,
+    )
+
+
+def test_pairwise_distances_validation():
+    X = np.zeros((10, 3), dtype=np.float32)
+    with pytest.raises(ValueError, match="Expected metric"):
+        pairwise_distances(X, metric="cosine")
+
+    with pytest.raises(ValueError, match="Expected reduce"):
+        pairwise_distances(X, reduce="max")
+
+    with pytest.raises(ValueError, match="same number of features"):
+        pairwise_distances(X, np.zeros((5, 2), dtype=np.float32))
+
+    # NB: the arguments of `pairwise_distances_chunked` are validated when it is
+    # called, not when the first chunk is requested.
+    with pytest.raises(ValueError, match="Expected metric"):
+        pairwise_distances_chunked(X, metric="cosine")
+
+    with pytest.raises(ValueError, match="same number of features"):
+        pairwise_distances_chunked(X, np.zeros((5, 2), dtype=np.float32))
@@ -0,0 +1,112 @@
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.common._memory import _check_memory_budget, get_memory_budget
+from sklearn_numba_dpex.common._utils import _get_input_device_and_dtype, _to_device
+
+
+def kneighbors(
+    X,
+    queries,
+    n_neighbors=5,
+    return_distance=True,
+    query_chunk_size=None,
+    index_chunk_size=None,
+    memory_budget=None,
+):
+    """Find the nearest neighbors in `X` of each query, with a brute force search on
+    device.
+
+    This is the equivalent of `NearestNeighbors(algorithm="brute").fit(X).kneighbors(
+    queries)`, for the euclidean distance. The distances are computed by tiles with the
+    matmul kernel, and the nearest neighbors are selected in each tile and merged
+    across tiles with the top-k kernel, so that the device memory that is used besides
+    the data is bounded.
+
+    Parameters
+    ----------
+    X : array-like of shape (n_samples, n_features)
+        The samples in which the neighbors are searched. Data that is not already on
+        device is copied to the default device.
+
+    queries : array-like of shape (n_queries, n_features)
+        The query points, copied to the device of `X` if needed.
+
+    n_neighbors : int
+        The number of neighbors of each query.
+
+    return_distance : bool
+        Whether the distances to the neighbors are returned.
+
+    query_chunk_size : int or None
+        The number of queries that are processed at a time. If None, the largest
+        number of queries such that the buffers fit in a quarter of the memory budget
+        is used.
+
+    index_chunk_size : int or None
+        The number of samples of `X` in each tile. If None, tiles of 4096 samples are
+        used.
+
+    memory_budget : int or None
+        The memory budget in bytes that is used to choose `query_chunk_size`. If None,
+        the budget set with `sklearn_numba_dpex.set_memory_budget` is used.
+
+    Returns
+    -------
+    neigh_dist : numpy.ndarray of shape (n_queries, n_neighbors)
+        The euclidean distances to the neighbors, only returned if `return_distance`
+        is True.
+
+    neigh_ind : numpy.ndarray of shape (n_queries, n_neighbors)
+        The indices of the neighbors in `X`, sorted by increasing distance.
+    """
+    # NB: imported lazily so that importing `sklearn_numba_dpex` does not import
+    # `numba_dpex`.
+    from sklearn_numba_dpex.neighbors.drivers import kneighbors_brute_force
+
+    X, device, dtype = _get_input_device_and_dtype(X)
+    X = _to_device(X, dtype, device)
+    queries = _to_device(queries, dtype, device)
+
+    if X.ndim != 2 or queries.ndim != 2 or queries.shape[1] != X.shape[1]:
+        raise ValueError(
+            "Expected X and queries to be 2D arrays with the same number of features, "
+            f"got shapes {X.shape} and {queries.shape}."
+        )
+
+    n_samples = X.shape[0]
+    if not 1 <= n_neighbors <= n_samples:
+        raise ValueError(
+            f"Expected n_neighbors to be between 1 and n_samples={n_samples}, got "
+            f"{n_neighbors}."
+        )
+
+    if index_chunk_size is None:
+        index_chunk_size = max(4096, n_neighbors)
+
+    if query_chunk_size is None:
+        if memory_budget is None:
+            memory_budget = get_memory_budget(device)
+        else:
+            memory_budget = _check_memory_budget(memory_budget)
+        # NB: the buffers that depend on the number of queries in a chunk are the
+        # augmented queries, the tile of scores, and two pairs of arrays of scores and
+        # ids of `2 * n_neighbors` candidates.
+        per_query_nbytes = (
+            X.shape[1] + 1 + min(index_chunk_size, n_samples) + 4 * n_neighbors
+        ) * dtype.itemsize + 4 * n_neighbors * np.dtype(np.int64).itemsize
+        query_chunk_size = max((memory_budget // 4) // per_query_nbytes, 1)
+
+    distances, neighbors_ids = kneighbors_brute_force(
+        X, queries, n_neighbors, query_chunk_size, index_chunk_size
+    )
+
+    # NB: the neighbors are sorted on host, it only requires sorting `n_neighbors`
+    # items for each query.
+    distances = dpt.asnumpy(distances)
+    neighbors_ids = dpt.asnumpy(neighbors_ids)
+    order = np.argsort(distances, axis=1, kind="stable")
+    neighbors_ids = np.take_along_axis(neighbors_ids, order, axis=1)
+    if not return_distance:
+        return neighbors_ids
+    return np.take_along_axis(distances, order, axis=1), neighbors_ids
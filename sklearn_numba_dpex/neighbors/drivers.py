@@ -0,0 +1,187 @@
+import dpctl.tensor as dpt
+import numpy as np
+
+from sklearn_numba_dpex.common.kernels import make_sq_distances_operands_kernel
+from sklearn_numba_dpex.common.matmul import make_matmul_2d_kernel
+from sklearn_numba_dpex.common.topk import topk_idx
+from sklearn_numba_dpex.neighbors.kernels import (
+    make_gather_tile_neighbors_kernel,
+    make_merge_neighbors_kernel,
+    make_neighbors_distances_kernel,
+)
+
+
+def kneighbors_brute_force(
+    X,
+    queries,
+    n_neighbors,
+    query_chunk_size,
+    index_chunk_size,
+):
+    """Search the `n_neighbors` nearest neighbors in `X` of each row of `queries`, for
+    the euclidean distance.
+
+    The queries are processed by chunks of `query_chunk_size` queries. For each chunk,
+    the index `X` is processed by tiles of `index_chunk_size` samples: the scores
+    `-||q - x||^2` of the queries and of the samples in the tile are computed with
+    the matmul kernel (see `make_sq_distances_operands_kernel`), and the
+    `n_neighbors` best candidates in the tile are selected with `topk_idx`. They are
+    then merged with the best candidates of the previous tiles, with another
+    `topk_idx` on the `2 * n_neighbors` candidates. Hence the device memory that is
+    used in addition to the inputs is bounded by the size of a tile of scores, of
+    shape (query_chunk_size, index_chunk_size).
+
+    Returns `(distances, neighbors_ids)`, two arrays of shape
+    (n_queries, n_neighbors). The neighbors of each query are not sorted.
+    """
+    compute_dtype = X.dtype.type
+    n_samples, n_features = X.shape
+    n_queries = queries.shape[0]
+    device = X.device.sycl_device
+    max_work_group_size = device.max_work_group_size
+
+    query_chunk_size = min(query_chunk_size, n_queries)
+    index_chunk_size = min(index_chunk_size, n_samples)
+
+    index_operands_kernel = make_sq_distances_operands_kernel(
+        n_features, False, max_work_group_size, compute_dtype, negative=True
+    )
+    query_operands_kernel = make_sq_distances_operands_kernel(
+        n_features, True, max_work_group_size, compute_dtype
+    )
+    gather_tile_neighbors_kernel = make_gather_tile_neighbors_kernel(
+        n_neighbors, max_work_group_size, compute_dtype
+    )
+    merge_neighbors_kernel = make_merge_neighbors_kernel(
+        n_neighbors, max_work_group_size
+    )
+    neighbors_distances_kernel = make_neighbors_distances_kernel(
+        n_neighbors, max_work_group_size, compute_dtype
+    )
+
+    index_operands = dpt.empty(
+        (n_samples, n_features + 2), dtype=compute_dtype, device=device
+    )
+    index_operands_kernel(
+        X,
+        # OUT
+        index_operands,
+    )
+
+    distances = dpt.empty((n_queries, n_neighbors), dtype=compute_dtype, device=device)
+    neighbors_ids = dpt.empty((n_queries, n_neighbors), dtype=np.int64, device=device)
+
+    query_operands = dpt.empty(
+        (query_chunk_size, n_features + 2), dtype=compute_dtype, device=device
+    )
+    # NB: the tiles of scores are C-contiguous views on a flat buffer, including the
+    # smaller tiles of the last chunk of queries and of the last tile of the index.
+    tile_scores_buffer = dpt.empty(
+        (query_chunk_size * index_chunk_size,), dtype=compute_dtype, device=device
+    )
+    # NB: the first `n_neighbors` columns store the best candidates of the previous
+    # tiles, and the last `n_neighbors` columns the best candidates of the current
+    # tile. The candidates are merged from one pair of arrays into the other.
+    candidate_scores, merged_scores = (
+        dpt.full(
+            (query_chunk_size, 2 * n_neighbors),
+            -np.inf,
+            dtype=compute_dtype,
+            device=device,
+        )
+        for _ in range(2)
+    )
+    candidate_ids, merged_ids = (
+        dpt.zeros((query_chunk_size, 2 * n_neighbors), dtype=np.int64, device=device)
+        for _ in range(2)
+    )
+
+    for query_start in range(0, n_queries, query_chunk_size):
+        query_stop = min(query_start + query_chunk_size, n_queries)
+        n_chunk_queries = query_stop - query_start
+        queries_chunk = queries[query_start:query_stop]
+
+        chunk_query_operands = query_operands[:n_chunk_queries]
+        query_operands_kernel(
+            queries_chunk,
+            # OUT
+            chunk_query_operands,
+        )
+
+        chunk_candidate_scores = candidate_scores[:n_chunk_queries]
+        chunk_candidate_ids = candidate_ids[:n_chunk_queries]
+        chunk_merged_scores = merged_scores[:n_chunk_queries]
+        chunk_merged_ids = merged_ids[:n_chunk_queries]
+
+        # Reset the best candidates of the previous tiles.
+        chunk_candidate_scores[:, :n_neighbors] = -np.inf
+
+        for tile_start in range(0, n_samples, index_chunk_size):
+            tile_stop = min(tile_start + index_chunk_size, n_samples)
+            tile_size = tile_stop - tile_start
+
+            # NB: the matmul kernel is specialized for the shape of its inputs, the
+            # kernels for the last chunk of queries and the last tile of the index
+            # are compiled (and cached) separately.
+            matmul_kernel = make_matmul_2d_kernel(
+                n_chunk_queries,
+                tile_size,
+                n_features + 2,
+                compute_dtype,
+                device,
+            )
+            chunk_tile_scores = dpt.reshape(
+                tile_scores_buffer[: n_chunk_queries * tile_size],
+                (n_chunk_queries, tile_size),
+            )
+            matmul_kernel(
+                chunk_query_operands,
+                index_operands[tile_start:tile_stop],
+                # OUT
+                chunk_tile_scores,
+            )
+
+            tile_selected_idx = topk_idx(chunk_tile_scores, min(n_neighbors, tile_size))
+            gather_tile_neighbors_kernel(
+                chunk_tile_scores,
+                tile_selected_idx,
+                tile_start,
+                # OUT
+                chunk_candidate_scores,
+                chunk_candidate_ids,
+            )
+
+            selected_idx = topk_idx(chunk_candidate_scores, n_neighbors)
+            merge_neighbors_kernel(
+                chunk_candidate_scores,
+                chunk_candidate_ids,
+                selected_idx,
+                # OUT
+                chunk_merged_scores,
+                chunk_merged_ids,
+            )
+
+            (
+                chunk_candidate_scores,
+                chunk_merged_scores,
+                chunk_candidate_ids,
+                chunk_merged_ids,
+            ) = (
+                chunk_merged_scores,
+                chunk_candidate_scores,
+                chunk_merged_ids,
+                chunk_candidate_ids,
+            )
+
+        chunk_distances = dpt.empty(
+            (n_chunk_queries, n_neighbors), dtype=compute_dtype, device=device
+        )
+        neighbors_distances_kernel(
+            chunk_candidate_scores,
+            # OUT
+            chunk_distances,
+        )
+        distances[query_start:query_stop] = chunk_distances
+        neighbors_ids[query_start:query_stop] = chunk_candidate_ids[:, :n_neighbors]
+
+    return distances, neighbors_ids
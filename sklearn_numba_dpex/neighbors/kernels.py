@@ -0,0 +1,163 @@
+import math
+
+import numba_dpex as dpex
+import numpy as np
+
+from sklearn_numba_dpex.common._kernel_cache import kernel_cache
+
+zero_idx = np.int64(0)
+one_idx = np.int64(1)
+
+
+@kernel_cache
+def make_gather_tile_neighbors_kernel(n_neighbors, work_group_size, dtype):
+    """Returns a function that gathers the scores and the ids of the candidates
+    selected in a tile of scores, in the last `n_neighbors` columns of the
+    candidates arrays.
+
+    The ids of the candidates are offset with the index of the first sample of the
+    tile. If less than `n_neighbors` candidates are selected in the tile, the
+    remaining columns are filled with a score of `-inf`, so that they are never
+    selected afterwards.
+
+    The returned function accepts arrays with any number of queries.
+    """
+    minus_inf = dtype(-math.inf)
+    n_neighbors = np.int64(n_neighbors)
+
+    @dpex.kernel
+    # fmt: off
+    def gather_tile_neighbors(
+        tile_scores,            # IN        (n_queries, tile_size)
+        selected_idx,           # IN        (n_queries, n_selected)
+        tile_start,             # PARAM
+        candidate_scores,       # OUT       (n_queries, 2 * n_neighbors)
+        candidate_ids,          # OUT       (n_queries, 2 * n_neighbors)
+    ):
+        # fmt: on
+        n_queries = tile_scores.shape[zero_idx]
+        n_selected = selected_idx.shape[one_idx]
+        item_idx = dpex.get_global_id(zero_idx)
+        query_idx = item_idx // n_neighbors
+        if query_idx >= n_queries:
+            return
+
+        neighbor_idx = item_idx % n_neighbors
+        candidate_col_idx = n_neighbors + neighbor_idx
+        if neighbor_idx < n_selected:
+            tile_idx = selected_idx[query_idx, neighbor_idx]
+            candidate_scores[query_idx, candidate_col_idx] = tile_scores[
+                query_idx, tile_idx
+            ]
+            candidate_ids[query_idx, candidate_col_idx] = tile_start + tile_idx
+        else:
+            candidate_scores[query_idx, candidate_col_idx] = minus_inf
+
+    def _gather_tile_neighbors(
+        tile_scores, selected_idx, tile_start, candidate_scores, candidate_ids
+    ):
+        n_queries = tile_scores.shape[0]
+        global_size = (
+            math.ceil(n_queries * n_neighbors / work_group_size) * work_group_size
+        )
+        gather_tile_neighbors[global_size, work_group_size](
+            tile_scores,
+            selected_idx,
+            np.int64(tile_start),
+            candidate_scores,
+            candidate_ids,
+        )
+
+    return _gather_tile_neighbors
+
+
+@kernel_cache
+def make_merge_neighbors_kernel(n_neighbors, work_group_size):
+    """Returns a function that gathers the `n_neighbors` candidates selected among
+    the `2 * n_neighbors` candidates of each query in the first `n_neighbors` columns
+    of the output arrays, that are the candidates arrays of the next tile.
+
+    NB: the output arrays can not be the input arrays, since a work item could
+    overwrite a candidate that another work item has not read yet.
+
+    The returned function accepts arrays with any number of queries.
+    """
+    n_neighbors = np.int64(n_neighbors)
+
+    @dpex.kernel
+    # fmt: off
+    def merge_neighbors(
+        candidate_scores,       # IN        (n_queries, 2 * n_neighbors)
+        candidate_ids,          # IN        (n_queries, 2 * n_neighbors)
+        selected_idx,           # IN        (n_queries, n_neighbors)
+        merged_scores,          # OUT       (n_queries, 2 * n_neighbors)
+        merged_ids,             # OUT       (n_queries, 2 * n_neighbors)
+    ):
+        # fmt: on
+        n_queries = candidate_scores.shape[zero_idx]
+        item_idx = dpex.get_global_id(zero_idx)
+        query_idx = item_idx // n_neighbors
+        if query_idx >= n_queries:
+            return
+
+        neighbor_idx = item_idx % n_neighbors
+        candidate_idx = selected_idx[query_idx, neighbor_idx]
+        merged_scores[query_idx, neighbor_idx] = candidate_scores[
+            query_idx, candidate_idx
+        ]
+        merged_ids[query_idx, neighbor_idx] = candidate_ids[query_idx, candidate_idx]
+
+    def _merge_neighbors(
+        candidate_scores, candidate_ids, selected_idx, merged_scores, merged_ids
+    ):
+        n_queries = candidate_scores.shape[0]
+        global_size = (
+            math.ceil(n_queries * n_neighbors / work_group_size) * work_group_size
+        )
+        merge_neighbors[global_size, work_group_size](
+            candidate_scores, candidate_ids, selected_idx, merged_scores, merged_ids
+        )
+
+    return _merge_neighbors
+
+
+@kernel_cache
+def make_neighbors_distances_kernel(n_neighbors, work_group_size, dtype):
+    """Returns a function that computes the euclidean distances of the queries to their
+    neighbors, given the scores `-||q - x||^2` of the neighbors in the first
+    `n_neighbors` columns of `scores`.
+
+    The returned function accepts arrays with any number of queries.
+    """
+    zero = dtype(0.0)
+    n_neighbors = np.int64(n_neighbors)
+
+    @dpex.kernel
+    # fmt: off
+    def neighbors_distances(
+        scores,         # IN        (n_queries, 2 * n_neighbors)
+        distances,      # OUT       (n_queries, n_neighbors)
+    ):
+        # fmt: on
+        n_queries = scores.shape[zero_idx]
+        item_idx = dpex.get_global_id(zero_idx)
+        query_idx = item_idx // n_neighbors
+        if query_idx >= n_queries:
+            return
+
+        neighbor_idx = item_idx % n_neighbors
+        # NB: the squared distance can be slightly negative because of rounding
+        # errors.
+        sq_distance = -scores[query_idx, neighbor_idx]
+        if sq_distance < zero:
+            sq_distance = zero
+        distances[query_idx, neighbor_idx] = math.sqrt(sq_distance)
+
+    def _neighbors_distances(scores, distances):
+        n_queries = scores.shape[0]
+        global_size = (
+            math.ceil(n_queries * n_neighbors / work_group_size) * work_group_size
+        )
+        neighbors_distances[global_size, work_group_size](scores, distances)
+
+    return _neighbors_distances
@@ -0,0 +1,56 @@
+import dpctl.tensor as dpt
+import numpy as np
+import pytest
+from numpy.testing import assert_array_equal
+from sklearn.neighbors import NearestNeighbors
+from sklearn.utils._testing import assert_allclose
+
+from sklearn_numba_dpex import kneighbors
+from sklearn_numba_dpex.testing.config import float_dtype_params
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+@pytest.mark.parametrize(
+    "n_neighbors, query_chunk_size, index_chunk_size",
+    [(1, None, None), (5, 7, 16), (12, 50, 5), (5, 1, 200)],
+)
+def test_kneighbors(dtype, n_neighbors, query_chunk_size, index_chunk_size):
+    rng = np.random.default_rng(42)
+    X = rng.random((200, 6)).astype(dtype)
+    queries = rng.random((30, 6)).astype(dtype)
+
+    expected_distances, expected_ids = (
+        NearestNeighbors(n_neighbors=n_neighbors, algorithm="brute")
+        .fit(X)
+        .kneighbors(queries)
+    )
+
+    distances, ids = kneighbors(
+        dpt.asarray(X),
+        queries,
+        n_neighbors=n_neighbors,
+        query_chunk_size=query_chunk_size,
+        index_chunk_size=index_chunk_size,
+    )
+
+    assert_allclose(expected_distances, distances, rtol=1e-4, atol=1e-5)
+    assert_array_equal(expected_ids, ids)
+
+    ids = kneighbors(
+        X,
+        queries,
+        n_neighbors=n_neighbors,
+        return_distance=False,
+        query_chunk_size=query_chunk_size,
+        index_chunk_size=index_chunk_size,
+    )
+    assert_array_equal(expected_ids, ids)
+
+
+def test_kneighbors_validation():
+    X = np.zeros((10, 3), dtype=np.float32)
+    with pytest.raises(ValueError, match="same number of features"):
+        kneighbors(X, np.zeros((5, 2), dtype=np.float32))
+
+    with pytest.raises(ValueError, match="Expected n_neighbors"):
+        kneighbors(X, X, n_neighbors=11)
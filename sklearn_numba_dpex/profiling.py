@@ -0,0 +1,280 @@
+"""Opt-in instrumentation of the kernels launched by the engines.
+
+Example
+-------
+>>> from sklearn_numba_dpex import profiling
+>>> with profiling.record() as profile:  # doctest: +SKIP
+...     kmeans.fit(X)
+>>> profile.summary()  # doctest: +SKIP
+>>> profile.to_chrome_trace("kmeans_fit_trace.json")  # doctest: +SKIP
+
+While a recording is active, the kernels returned by the kernel factories are wrapped
+so that each launch is timed and logged. Outside of `record` the factories return the
+kernels unchanged, so the instrumentation has no overhead by default.
+"""
+import json
+import numbers
+import threading
+import time
+import types
+from contextlib import contextmanager
+from functools import wraps
+
+import dpctl.tensor as dpt
+
+_active_profiles = []
+_lock = threading.Lock()
+
+
+class KernelProfile:
+    """Launches of kernels logged during a `record` context.
+
+    Attributes
+    ----------
+    events : list of dict
+        One dict per kernel launch, in launch order, with keys:
+
+        - `name`: the qualified name of the factory that created the kernel,
+        - `start`: the time of the launch in seconds, relative to the start of the
+          recording,
+        - `duration`: the wall time of the launch in seconds,
+        - `global_size` and `work_group_size`: the launch configuration, or None if
+          it is computed at call time by the kernel wrapper returned by the factory,
+        - `n_bytes`: the total size of the array arguments, i.e an estimate of the
+          amount of global memory that is read or written by the launch.
+    """
+
+    def __init__(self):
+        self.events = []
+        self._start = time.perf_counter()
+
+    def summary(self):
+        """Aggregate the events per kernel.
+
+        Returns
+        -------
+        summary : dict
+            Maps the name of each kernel to a dict with keys `n_launches`,
+            `total_time`, `mean_time`, `n_bytes` (summed over all launches), and
+            `launch_configurations`, the list of distinct `(global_size,
+            work_group_size)` pairs that were used. The kernels are sorted by
+            decreasing `total_time`.
+        """
+        summary = dict()
+        for event in self.events:
+            kernel_summary = summary.setdefault(
+                event["name"],
+                dict(
+                    n_launches=0,
+                    total_time=0.0,
+                    n_bytes=0,
+                    launch_configurations=[],
+                ),
+            )
+            kernel_summary["n_launches"] += 1
+            kernel_summary["total_time"] += event["duration"]
+            kernel_summary["n_bytes"] += event["n_bytes"]
+            launch_configuration = (event["global_size"], event["work_group_size"])
+            if launch_configuration not in kernel_summary["launch_configurations"]:
+                kernel_summary["launch_configurations"].append(launch_configuration)
+
+        for kernel_summary in summary.values():
+            kernel_summary["mean_time"] = (
+                kernel_summary["total_time"] / kernel_summary["n_launches"]
+            )
+
+        return dict(
+            sorted(
+                summary.items(), key=lambda item: item[1]["total_time"], reverse=True
+            )
+        )
+
+    def to_json(self, path=None):
+        """Serialize the events and the summary to JSON.
+
+        If `path` is None the JSON document is returned as a string, else it is
+        written to `path`.
+        """
+        document = dict(events=self.events, summary=self.summary())
+        return _dump(document, path)
+
+    def to_chrome_trace(self, path=None):
+        """Serialize the events to the Chrome trace event format.
+
+        The output can be loaded in `chrome://tracing` or in https://ui.perfetto.dev.
+        If `path` is None the JSON document is returned as a string, else it is
+        written to `path`.
+        """
+        trace_events = [
+            dict(
+                name=event["name"].rsplit(".", 1)[-1],
+                cat="kernel",
+                ph="X",
+                ts=event["start"] * 1e6,
+                dur=event["duration"] * 1e6,
+                pid=0,
+                tid=event["thread_id"],
+                args=dict(
+                    factory=event["name"],
+                    global_size=event["global_size"],
+                    work_group_size=event["work_group_size"],
+                    n_bytes=event["n_bytes"],
+                ),
+            )
+            for event in self.events
+        ]
+        document = dict(traceEvents=trace_events, displayTimeUnit="ms")
+        return _dump(document, path)
+
+    def _add_event(self, name, start, duration, global_size, work_group_size, n_bytes):
+        self.events.append(
+            dict(
+                name=name,
+                start=start - self._start,
+                duration=duration,
+                global_size=global_size,
+                work_group_size=work_group_size,
+                n_bytes=n_bytes,
+                thread_id=threading.get_ident(),
+            )
+        )
+
+
+def _dump(document, path):
+    if path is None:
+        return json.dumps(document)
+    with open(path, "w") as f:
+        json.dump(document, f)
+
+
+@contextmanager
+def record():
+    """Record the kernel launches that happen within the context.
+
+    Only the kernels that are created by a kernel factory within the context are
+    instrumented: for instance a `KMeans` estimator must be fitted inside the
+    context, rather than only the kernels be launched inside the context.
+
+    Each launch waits for the queue of its array arguments to be empty before and
+    after running, so that the wall time of asynchronous operations is not
+    attributed to the wrong kernel. It makes the instrumented code slower, but the
+    timings of the kernels are accurate.
+
+    Yields
+    ------
+    profile : KernelProfile
+        The events are appended to `profile` as the kernels are launched.
+    """
+    profile = KernelProfile()
+    with _lock:
+        _active_profiles.append(profile)
+    try:
+        yield profile
+    finally:
+        with _lock:
+            _active_profiles.remove(profile)
+
+
+def profiled(factory):
+    """Instrument the output of a kernel factory while a recording is active.
+
+    Factories decorated with `kernel_cache` are already instrumented, this decorator
+    is meant for the factories that are not cached.
+    """
+    factory_name = f"{factory.__module__}.{factory.__qualname__}"
+
+    @wraps(factory)
+    def profiled_factory(*args, **kwargs):
+        return _instrument_factory_output(factory_name, factory(*args, **kwargs))
+
+    return profiled_factory
+
+
+def _instrument_factory_output(factory_name, output):
+    if not _active_profiles:
+        return output
+
+    # NB: some factories return a tuple made of the kernel and of some metadata about
+    # the kernel, e.g the number of private copies it uses.
+    if isinstance(output, tuple):
+        return tuple(_instrument(factory_name, item) for item in output)
+
+    return _instrument(factory_name, output)
+
+
+def _instrument(factory_name, item):
+    if isinstance(item, _InstrumentedKernel) or not _is_launchable(item):
+        return item
+
+    return _InstrumentedKernel(factory_name, item)
+
+
+def _is_launchable(item):
+    # Kernels created with `dpex.kernel` and the python functions that wrap kernel
+    # calls can be launched from the host. Device functions created with `dpex.func`,
+    # and data such as arrays or scalars, are left untouched.
+    if isinstance(item, types.FunctionType):
+        return True
+    return callable(item) and hasattr(type(item), "__getitem__")
+
+
+def _get_launch_configuration(kernel):
+    global_size = work_group_size = None
+    for global_attribute, local_attribute in (
+        ("global_range", "local_range"),
+        ("_global_range", "_local_range"),
+        ("global_size", "local_size"),
+    ):
+        global_size = getattr(kernel, global_attribute, None)
+        if global_size is not None:
+            work_group_size = getattr(kernel, local_attribute, None)
+            break
+    return _to_list(global_size), _to_list(work_group_size)
+
+
+def _to_list(size):
+    if size is None:
+        return None
+    if isinstance(size, numbers.Integral):
+        return [int(size)]
+    return [int(s) for s in size]
+
+
+class _InstrumentedKernel:
+    def __init__(self, name, kernel, launch_configuration=None):
+        self.name = name
+        self.kernel = kernel
+        if launch_configuration is None:
+            launch_configuration = _get_launch_configuration(kernel)
+        self.launch_configuration = launch_configuration
+
+    def __getitem__(self, sizes):
+        global_size, work_group_size = sizes
+        return _InstrumentedKernel(
+            self.name,
+            self.kernel[sizes],
+            (_to_list(global_size), _to_list(work_group_size)),
+        )
+
+    def __getattr__(self, name):
+        return getattr(self.kernel, name)
+
+    def __call__(self, *args):
+        arrays = [arg for arg in args if isinstance(arg, dpt.usm_ndarray)]
+        queue = arrays[0].sycl_queue if arrays else None
+
+        if queue is not None:
+            queue.wait()
+        start = time.perf_counter()
+        result = self.kernel(*args)
+        if queue is not None:
+            queue.wait()
+        duration = time.perf_counter() - start
+
+        n_bytes = sum(array.nbytes for array in arrays)
+        with _lock:
+            for profile in _active_profiles:
+                profile._add_event(
+                    self.name, start, duration, *self.launch_configuration, n_bytes
+                )
+        return result
@@ -0,0 +1,84 @@
+import json
+
+import dpctl
+import numpy as np
+import pytest
+
+from sklearn_numba_dpex import autotune
+from sklearn_numba_dpex.testing.config import float_dtype_params
+
+
+@pytest.fixture
+def profile_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("SKLEARN_NUMBA_DPEX_AUTOTUNE_DIR", str(tmp_path))
+    return tmp_path
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_tune_stores_the_best_parameters(profile_dir, dtype):
+    device = dpctl.SyclDevice()
+    assert autotune.load_profile(device) is None
+    assert (
+        autotune.get_tuned_parameters("label_assignment", device, dtype, (1000, 4, 8))
+        == autotune.DEFAULT_PARAMETERS["label_assignment"]
+    )
+
+    candidates = [
+        dict(sub_group_size=4, work_group_size=64),
+        dict(sub_group_size=8, work_group_size="max"),
+    ]
+    profile = autotune.tune(
+        device,
+        dtypes=[dtype],
+        shapes=[(1000, 4, 8)],
+        kernel_names=["label_assignment"],
+        candidates=dict(label_assignment=candidates),
+        n_repeats=1,
+    )
+
+    path = autotune.get_profile_path(device)
+    assert path.parent == profile_dir
+    with open(path) as f:
+        assert json.load(f) == profile
+
+    (entry,) = profile["kernels"]["label_assignment"][np.dtype(dtype).name].values()
+    assert entry["parameters"] in candidates
+
+    # The tuned parameters are used for the tuned bucket, and for the closest bucket
+    # when no bucket matches.
+    for shape in [(1000, 4, 8), (10, 200, 3)]:
+        assert (
+            autotune.get_tuned_parameters("label_assignment", device, dtype, shape)
+            == entry["parameters"]
+        )
+
+    # The kernels that have not been tuned still use the defaults.
+    assert (
+        autotune.get_tuned_parameters("matmul_2d", device, dtype, (1000, 4, 8))
+        == autotune.DEFAULT_PARAMETERS["matmul_2d"]
+    )
+
+
+def test_autotune_command_line(profile_dir, capsys):
+    autotune.main(["--show"])
+    assert "No profile" in capsys.readouterr().out
+
+    autotune.main(
+        [
+            "--dtype",
+            "float32",
+            "--shape",
+            "1000,4,8",
+            "--kernel",
+            "matmul_2d",
+            "--n-repeats",
+            "1",
+        ]
+    )
+    assert "Saved the profile" in capsys.readouterr().out
+
+    autotune.main(["--show"])
+    assert "matmul_2d" in json.loads(capsys.readouterr().out)["kernels"]
+
+    autotune.main(["--reset"])
+    assert autotune.load_profile(dpctl.SyclDevice()) is None
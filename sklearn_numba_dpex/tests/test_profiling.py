@@ -0,0 +1,62 @@
+import json
+
+import numpy as np
+import pytest
+from sklearn import config_context
+from sklearn.cluster import KMeans
+from sklearn.datasets import make_blobs
+
+from sklearn_numba_dpex import profiling
+from sklearn_numba_dpex.testing.config import float_dtype_params
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_profiling_records_kernel_launches(dtype):
+    X, _ = make_blobs(n_samples=500, n_features=4, centers=3, random_state=0)
+    X = X.astype(dtype)
+    kmeans = KMeans(n_clusters=3, n_init=1, random_state=0, tol=0)
+
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        with profiling.record() as profile:
+            kmeans.fit(X)
+
+    summary = profile.summary()
+    lloyd_step = summary[
+        "sklearn_numba_dpex.kmeans.kernels.lloyd_single_step"
+        ".make_lloyd_single_step_fixed_window_kernel"
+    ]
+    assert lloyd_step["n_launches"] == kmeans.n_iter_
+    assert lloyd_step["total_time"] > 0
+    assert lloyd_step["n_bytes"] >= lloyd_step["n_launches"] * X.nbytes
+    (global_size, work_group_size), *_ = lloyd_step["launch_configurations"]
+    assert global_size is not None and work_group_size is not None
+
+    assert len(profile.events) == sum(
+        kernel_summary["n_launches"] for kernel_summary in summary.values()
+    )
+    assert json.loads(profile.to_json())["summary"] == json.loads(json.dumps(summary))
+
+    trace_events = json.loads(profile.to_chrome_trace())["traceEvents"]
+    assert len(trace_events) == len(profile.events)
+    assert all(event["ph"] == "X" for event in trace_events)
+
+    # The kernels that are created outside of a recording are not instrumented.
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        kmeans.fit(X)
+    assert len(profile.events) == sum(
+        kernel_summary["n_launches"] for kernel_summary in summary.values()
+    )
+
+
+def test_profiling_nested_recordings():
+    X = np.random.default_rng(0).random((100, 2), dtype=np.float32)
+
+    with config_context(engine_provider="sklearn_numba_dpex"):
+        with profiling.record() as outer_profile:
+            KMeans(n_clusters=2, n_init=1, random_state=0).fit(X)
+            n_outer_events = len(outer_profile.events)
+            with profiling.record() as inner_profile:
+                KMeans(n_clusters=2, n_init=1, random_state=0).fit(X)
+
+    assert len(inner_profile.events) > 0
+    assert len(outer_profile.events) == n_outer_events + len(inner_profile.events)
@@ -0,0 +1,48 @@
+import dpctl
+import numpy as np
+import pytest
+
+from sklearn_numba_dpex import kernel_cache_info, warmup
+from sklearn_numba_dpex.testing.config import float_dtype_params
+
+
+@pytest.mark.parametrize("dtype", float_dtype_params)
+def test_warmup_compiles_kernels_in_process(dtype):
+    device = dpctl.SyclDevice()
+    # NB: use a shape that is not used elsewhere in the test suite to ensure that the
+    # kernels are not already cached.
+    shapes = [(257, 3, 5)]
+
+    report = warmup(device, dtypes=[dtype], shapes=shapes)
+    assert report["elapsed_time"] > 0
+    assert sum(info["misses"] for info in report["cache_info"].values()) > 0
+
+    # All the kernels are already compiled, so a second warmup should only hit the
+    # cache.
+    report = warmup(device, dtypes=[dtype], shapes=shapes)
+    assert len(report["cache_info"]) > 0
+    assert all(info["misses"] == 0 for info in report["cache_info"].values())
+    assert all(info["hits"] > 0 for info in report["cache_info"].values())
+
+    cache_info = kernel_cache_info()
+    assert set(report["cache_info"]).issubset(cache_info["factories"])
+
+
+def test_warmup_raises_on_unsupported_dtype():
+    device = dpctl.SyclDevice()
+    if device.has_aspect_fp64:
+        pytest.skip(f"The device {device.name} supports the float64 data type.")
+
+    with pytest.raises(ValueError, match="does not support the float64"):
+        warmup(device, dtypes=[np.float64])
+
+
+def test_warmup_checks_dtypes_before_compiling():
+    device = dpctl.SyclDevice()
+    if device.has_aspect_fp64:
+        pytest.skip(f"The device {device.name} supports the float64 data type.")
+
+    cache_info_before = kernel_cache_info()
+    with pytest.raises(ValueError, match="does not support the float64"):
+        warmup(device, dtypes=[np.float32, np.float64], shapes=[(263, 3, 5)])
+    assert kernel_cache_info()["misses"] == cache_info_before["misses"]